@@ -0,0 +1,230 @@
+"""
+ADB Bulma Modülü
+Bulunan adb yolunu, sürümünü ve dosya bilgisini (mtime/boyut) küçük bir durum
+dosyasında saklar. Sonraki açılışlarda dosya bilgisi eşleşiyorsa `adb version`
+çalıştırılmaz; kurulum modülü ve ADBManager aynı kaydı paylaşır.
+"""
+import os
+import sys
+import json
+import shutil
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+
+STATE_VERSION = 1
+
+PROJECT_ROOT = Path(__file__).parent
+
+
+def _state_file() -> str:
+    return config.ADB_DISCOVERY["state_file"]
+
+
+def _fingerprint(path: str) -> Optional[Dict]:
+    """Çalıştırılabilir dosyanın değişip değişmediğini anlamak için mtime/boyut"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def resolve_executable(adb_path: str) -> Optional[str]:
+    """
+    adb yolunu mutlak dosya yoluna çevirir (süreç başlatmadan)
+
+    Args:
+        adb_path: "adb" gibi bir komut adı ya da dosya yolu
+
+    Returns:
+        Mutlak yol veya bulunamazsa None
+    """
+    found = shutil.which(adb_path)
+    if found:
+        return os.path.abspath(found)
+    if os.path.isfile(adb_path):
+        return os.path.abspath(adb_path)
+    return None
+
+
+def _load_state() -> Optional[Dict]:
+    try:
+        with open(_state_file(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def _save_state(state: Dict):
+    path = _state_file()
+    try:
+        parent_dir = os.path.dirname(path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError:
+        # Durum dosyası yalnızca hızlandırma içindir; yazılamazsa sorun değil
+        pass
+
+
+def clear_state():
+    """Kaydedilmiş adb bilgisini siler (sonraki açılışta yeniden aranır)"""
+    try:
+        os.remove(_state_file())
+    except OSError:
+        pass
+
+
+def _is_valid(state: Optional[Dict]) -> bool:
+    """Kaydın hâlâ geçerli olup olmadığını süreç başlatmadan kontrol eder"""
+    if not state or not state.get("path"):
+        return False
+    if _fingerprint(state["path"]) != state.get("fingerprint"):
+        return False
+    if state.get("source") == "system":
+        # PATH değişmiş ve başka bir adb öne geçmiş olabilir
+        return resolve_executable("adb") == state["path"]
+    return True
+
+
+def probe_version(adb_path: str, timeout: int = 5) -> Optional[str]:
+    """
+    `adb version` çalıştırarak sürüm satırını döndürür
+
+    Returns:
+        Sürüm satırı (örn. "Android Debug Bridge version 1.0.41") veya None
+    """
+    try:
+        result = subprocess.run(
+            [adb_path, "version"],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else ""
+
+
+def remember(adb_path: str, version: str, source: str) -> Optional[Dict]:
+    """
+    Çalıştığı doğrulanmış bir adb'yi durum dosyasına yazar
+
+    Args:
+        adb_path: adb yolu
+        version: `adb version` çıktısının ilk satırı
+        source: "local" (proje klasörü) veya "system" (PATH)
+
+    Returns:
+        Kaydedilen durum veya yol çözülemezse None
+    """
+    path = resolve_executable(adb_path)
+    if not path:
+        return None
+    state = {
+        "version": STATE_VERSION,
+        "path": path,
+        "source": source,
+        "adb_version": version,
+        "fingerprint": _fingerprint(path)
+    }
+    _save_state(state)
+    return state
+
+
+def get_cached(adb_path: str) -> Optional[Dict]:
+    """
+    Verilen adb için geçerli bir kayıt varsa döndürür (süreç başlatmaz)
+
+    Args:
+        adb_path: adb yolu veya komut adı
+
+    Returns:
+        Durum sözlüğü veya None
+    """
+    state = _load_state()
+    if not _is_valid(state):
+        return None
+    if resolve_executable(adb_path) != state["path"]:
+        return None
+    return state
+
+
+def _candidates(project_root: Path) -> List[Tuple[str, str]]:
+    """Denenecek adb yolları (önce proje klasörü, sonra sistem PATH)"""
+    names = ["adb.exe"] if sys.platform == "win32" else ["adb.exe", "adb"]
+    candidates = []
+    for name in names:
+        local_adb = project_root / "platform-tools" / name
+        if local_adb.is_file():
+            candidates.append((str(local_adb), "local"))
+    system_adb = resolve_executable("adb")
+    if system_adb:
+        candidates.append((system_adb, "system"))
+    return candidates
+
+
+def locate_adb(project_root: Optional[Path] = None, refresh: bool = False) -> Optional[Dict]:
+    """
+    Kullanılacak adb'yi bulur
+
+    Kayıt geçerliyse (aynı yol, aynı mtime/boyut) doğrudan döndürülür; değilse
+    adaylar sırayla `adb version` ile denenir ve sonuç kaydedilir.
+
+    Args:
+        project_root: platform-tools klasörünü içeren proje klasörü
+        refresh: True ise kayıt yok sayılıp yeniden aranır
+
+    Returns:
+        {"path", "source", "adb_version", "fingerprint", "cached"} veya None
+    """
+    if not refresh:
+        state = _load_state()
+        if _is_valid(state):
+            return dict(state, cached=True)
+
+    for path, source in _candidates(project_root or PROJECT_ROOT):
+        version = probe_version(path)
+        if version is not None:
+            state = remember(path, version, source)
+            if state:
+                return dict(state, cached=False)
+
+    clear_state()
+    return None
+
+
+def start_server_background(adb_path: str) -> threading.Thread:
+    """
+    adb sunucusunu arka planda başlatır (menü beklemeden açılabilsin diye)
+
+    Returns:
+        Başlatma iş parçacığı; ilk adb komutundan önce join() edilebilir
+    """
+    def start():
+        try:
+            subprocess.run(
+                [adb_path, "start-server"],
+                capture_output=True,
+                timeout=config.TIMEOUTS["command"]
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    thread = threading.Thread(target=start, name="adb-start-server", daemon=True)
+    thread.start()
+    return thread
@@ -4,62 +4,99 @@ Android Debug Bridge ile telefon verilerini almak için yardımcı fonksiyonlar
 """
 import subprocess
 import os
+import re
+import locale
 import json
+import shlex
+import heapq
+import tarfile
+import hashlib
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 
+import config
+import integrity
+import adb_locator
+import media_filter
+import stream_copy
+import whatsapp_restore
+from command_stream import CommandStream
+from device_links import LinkManager, RoutingTransport
+from deadline import CountingReader, Deadline, LocalGrowth, Watchdog, kill_process
+from object_store import ObjectStore
+from pack_store import PackStore
+from metrics import MetricsCollector, command_type
+from tracing import Tracer, traced
+from transport import SubprocessTransport
+
 
 class ADBManager:
     """ADB komutlarını yöneten sınıf"""
     
-    def __init__(self, adb_path: Optional[str] = None):
+    def __init__(self, adb_path: Optional[str] = None,
+                 metrics: Optional[MetricsCollector] = None,
+                 tracer: Optional[Tracer] = None,
+                 transport=None):
         """
         Args:
             adb_path: ADB komutunun yolu (None ise otomatik bulunur)
+            metrics: Metrik toplayıcı (None ise yenisi oluşturulur)
+            tracer: Span toplayıcı (None ise config.TRACING'e göre oluşturulur)
+            transport: Komutları çalıştıran taşıma (None ise yerel adb süreci;
+                       kayıt/tekrar oynatma için bkz. transport.py)
         """
+        self.metrics = metrics or MetricsCollector()
+        self.tracer = tracer or Tracer(enabled=config.TRACING["enabled"])
+        # Aktarım ilerleme olayları için geri çağırma (GUI/servis); olaylar
+        # çağıran iş parçacığında gelir: {"event", "serial", "path", "bytes"/"total"/"success"}
+        self.progress: Optional[Callable[[Dict], None]] = None
+        self._server_thread = None
+        self._server_lock = threading.Lock()
         if adb_path is None:
-            self.adb_path = self._find_adb()
-        else:
-            self.adb_path = adb_path
-        self._check_adb_available()
+            if transport is not None:
+                adb_path = getattr(transport, "adb_path", "adb")
+            else:
+                adb_path = self._find_adb()
+        self.adb_path = adb_path
+        self.transport = transport or SubprocessTransport(self.adb_path)
+        if transport is None and config.LINKS["enabled"]:
+            # Aynı cihaza USB ve kablosuz bağlantı varsa komutlar uygun olana gider
+            self.transport = RoutingTransport(self.transport)
+        self._check_adb_available(use_cache=transport is None)
+        if transport is None and config.ADB_DISCOVERY["start_server"]:
+            self._server_thread = adb_locator.start_server_background(self.adb_path)
     
     def _find_adb(self) -> str:
         """ADB'yi otomatik olarak bulur (önce proje klasörü, sonra sistem PATH)"""
-        # Önce proje klasöründeki platform-tools'u kontrol et
-        project_root = Path(__file__).parent
-        local_adb = project_root / "platform-tools" / "adb.exe"
-        
-        if local_adb.exists():
-            return str(local_adb)
-        
-        # Sistem PATH'inde kontrol et
-        try:
-            result = subprocess.run(
-                ["adb", "version"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                return "adb"
-        except:
-            pass
+        found = adb_locator.locate_adb(Path(__file__).parent)
+        if found:
+            return found["path"]
         
         # Varsayılan olarak "adb" döndür (hata kontrolü _check_adb_available'da yapılacak)
         return "adb"
     
-    def _check_adb_available(self) -> bool:
-        """ADB'nin sistemde mevcut olup olmadığını kontrol eder"""
+    def _check_adb_available(self, use_cache: bool = True) -> bool:
+        """
+        ADB'nin sistemde mevcut olup olmadığını kontrol eder
+        
+        Args:
+            use_cache: True ise adb_locator kaydı bu adb için geçerliyse
+                       `adb version` çalıştırılmaz
+        """
+        if use_cache:
+            cached = adb_locator.get_cached(self.adb_path)
+            if cached:
+                print(f"[OK] ADB bulundu: {cached['adb_version']}")
+                return True
         try:
-            result = subprocess.run(
-                [self.adb_path, "version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                print(f"[OK] ADB bulundu: {result.stdout.split()[0]}")
+            returncode, stdout, _ = self.transport.run(["version"], timeout=5)
+            if returncode == 0:
+                version = self._decode_output(stdout).strip().splitlines()
+                print(f"[OK] ADB bulundu: {version[0] if version else self.adb_path}")
                 return True
             else:
                 raise Exception("ADB komutu çalıştırılamadı")
@@ -71,51 +108,310 @@ class ADBManager:
         except Exception as e:
             raise Exception(f"ADB kontrolü başarısız: {str(e)}")
     
-    def _run_command(self, command: List[str], timeout: int = 30) -> Dict:
+    def _wait_for_server(self):
+        """
+        Arka planda başlatılan adb sunucusunun hazır olmasını bekler
+        
+        Birden fazla iş parçacığı aynı anda ilk komutu çalıştırabilir
+        (JobScheduler); bekleme ve sıfırlama kilit altında yapılır.
+        """
+        if self._server_thread is None:
+            return
+        with self._server_lock:
+            if self._server_thread is not None:
+                self._server_thread.join()
+                self._server_thread = None
+    
+    def _run_command(self, command: List[str], timeout: Optional[int] = None,
+                     encoding: Optional[str] = None) -> Dict:
         """
         ADB komutunu çalıştırır ve sonucu döndürür
         
         Args:
             command: Çalıştırılacak komut listesi
-            timeout: Komut timeout süresi (saniye)
+            timeout: Komut timeout süresi (saniye, None ise config.TIMEOUTS["command"])
+            encoding: Çıktı kodlaması (None ise sistem yerel ayarı; telefondaki
+                      dosya yollarını içeren çıktılar için "utf-8")
         
         Returns:
             Komut sonucu ve bilgileri içeren dict
         """
+        timeout = timeout or config.TIMEOUTS["command"]
+        self._wait_for_server()
+        
+        kind = command_type(command)
+        span = self.tracer.span(kind, "adb_command",
+                                serial=command[1] if command[:1] == ["-s"] else None)
+        start = time.perf_counter()
+        timed_out = False
         try:
-            result = subprocess.run(
-                [self.adb_path] + command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return {
-                "success": result.returncode == 0,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode
+            with span:
+                returncode, stdout, stderr = self.transport.run(command, timeout)
+            response = {
+                "success": returncode == 0,
+                "stdout": self._decode_output(stdout, encoding),
+                "stderr": self._decode_output(stderr, encoding),
+                "returncode": returncode
             }
         except subprocess.TimeoutExpired:
-            return {
+            timed_out = True
+            response = {
                 "success": False,
                 "stdout": "",
                 "stderr": "Komut zaman aşımına uğradı",
                 "returncode": -1
             }
         except Exception as e:
-            return {
+            response = {
+                "success": False,
+                "stdout": "",
+                "stderr": str(e),
+                "returncode": -1
+            }
+        
+        self.metrics.record_command(kind, time.perf_counter() - start,
+                                    response["success"], timed_out)
+        return response
+    
+    def stream_command(self, command: List[str], timeout: Optional[float] = None) -> CommandStream:
+        """
+        ADB komutunu başlatır ve çıktısını akış olarak döndürür
+        
+        _run_command'dan farkı: çıktı belleğe toplanmaz, geldikçe satır/metin
+        (UTF-8 ile artımlı çözülerek) veya ham byte parçaları olarak okunur.
+        Metrik ve izleme kaydı akış kapanınca yapılır.
+        
+        Args:
+            command: Çalıştırılacak komut listesi
+            timeout: Toplam süre sınırı (saniye, None ise sınırsız)
+        
+        Returns:
+            CommandStream (with bloğuyla veya sonuna kadar okunarak kullanılır)
+        """
+        self._wait_for_server()
+        
+        kind = command_type(command)
+        span = self.tracer.span(kind, "adb_command",
+                                serial=command[1] if command[:1] == ["-s"] else None)
+        span.__enter__()
+        
+        def on_close(stream: CommandStream):
+            span.set_tag("bytes", stream.bytes_read)
+            span.__exit__(None, None, None)
+            self.metrics.record_command(kind, time.perf_counter() - stream.start,
+                                        stream.success, stream.timed_out)
+        
+        try:
+            process = self.transport.popen(command)
+        except Exception:
+            span.__exit__(None, None, None)
+            self.metrics.record_command(kind, 0.0, False)
+            raise
+        return CommandStream(process, timeout=timeout, on_close=on_close)
+    
+    def stream_shell_command(self, command: str, device_serial: Optional[str] = None,
+                             timeout: Optional[float] = None) -> CommandStream:
+        """Shell komutunun çıktısını akış olarak döndürür (bkz. stream_command)"""
+        cmd = ["shell", command]
+        if device_serial:
+            cmd = ["-s", device_serial] + cmd
+        return self.stream_command(cmd, timeout=timeout)
+    
+    def enable_link_routing(self, probe: bool = True) -> LinkManager:
+        """
+        USB / kablosuz bağlantı seçimini açar: cihazlar taranır, aynı telefona
+        giden bağlantılar ölçülür ve komutlar uygun bağlantıya yönlendirilir
+        (bkz. device_links.py)
+        
+        Args:
+            probe: True ise bağlantıların gecikmesi ve hızı hemen ölçülür
+        
+        Returns:
+            Bağlantı yöneticisi (status() ile ölçüm sonuçları)
+        """
+        self._wait_for_server()
+        if not isinstance(self.transport, RoutingTransport):
+            self.transport = RoutingTransport(self.transport)
+        links = self.transport.links
+        links.discover()
+        if probe:
+            links.probe_all()
+        links.start_refresh()
+        self.transport._ready = True
+        return links
+    
+    def device_key(self, serial: str) -> str:
+        """
+        Cihaz kilitleri için anahtar: bağlantı yönlendirmesi açıksa aynı telefonun
+        USB ve kablosuz seri numaraları aynı anahtarı verir
+        """
+        if isinstance(self.transport, RoutingTransport):
+            return self.transport.links.device_id(serial)
+        return serial
+    
+    def transfer_deadline(self, expected_bytes: Optional[int] = None, **kwargs) -> Deadline:
+        """
+        Aktarım için ilerlemeye bağlı süre sınırı oluşturur; tahmini sürede bu
+        oturumda ölçülen ortalama aktarım hızı kullanılır (bkz. deadline.Deadline)
+        """
+        return Deadline(expected_bytes, throughput=self.metrics.throughput(), **kwargs)
+    
+    def _watch(self, deadline: Deadline, progress: Callable[[], int], process,
+               on_sample: Optional[Callable[[int], None]] = None) -> Optional[Watchdog]:
+        """Süreç için süre sınırı izlemesini başlatır (kayıttan oynatmada None)"""
+        if not getattr(self.transport, "live", True):
+            return None
+        return Watchdog(deadline, progress, kill_process(process), on_sample).start()
+    
+    def _run_watched(self, command: List[str], deadline: Deadline,
+                     progress: Callable[[], int],
+                     on_sample: Optional[Callable[[int], None]] = None,
+                     stdin: bool = False) -> Dict:
+        """
+        ADB komutunu sabit süre yerine ilerlemeye bağlı süre sınırıyla çalıştırır
+        
+        Args:
+            command: Çalıştırılacak komut listesi
+            deadline: Süre sınırı
+            progress: O ana kadar aktarılan byte sayısını döndürür
+            on_sample: Her ölçümde ilerlemeyle çağrılır
+            stdin: Sürece stdin borusu açılsın mı (etkileşimli komutlar)
+        
+        Returns:
+            _run_command ile aynı dict ve "timed_out"
+        """
+        self._wait_for_server()
+        
+        kind = command_type(command)
+        span = self.tracer.span(kind, "adb_command",
+                                serial=command[1] if command[:1] == ["-s"] else None)
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            with span:
+                process = self.transport.popen(command, stdin=stdin)
+                watchdog = self._watch(deadline, progress, process, on_sample)
+                try:
+                    stdout, stderr = process.communicate()
+                finally:
+                    if watchdog is not None:
+                        watchdog.stop()
+            timed_out = watchdog is not None and watchdog.expired
+            response = {
+                "success": process.returncode == 0 and not timed_out,
+                "stdout": self._decode_output(stdout or b""),
+                "stderr": watchdog.message if timed_out else self._decode_output(stderr or b""),
+                "returncode": process.returncode
+            }
+        except subprocess.TimeoutExpired:
+            # Kayıttan oynatmada kaydedilmiş süre aşımı
+            timed_out = True
+            response = {
+                "success": False,
+                "stdout": "",
+                "stderr": "Komut zaman aşımına uğradı",
+                "returncode": -1
+            }
+        except Exception as e:
+            response = {
                 "success": False,
                 "stdout": "",
                 "stderr": str(e),
                 "returncode": -1
             }
+        
+        self.metrics.record_command(kind, time.perf_counter() - start,
+                                    response["success"], timed_out)
+        response["timed_out"] = timed_out
+        return response
+    
+    def _emit_progress(self, event: str, device_serial: Optional[str], **data):
+        """progress geri çağırması ayarlıysa ilerleme olayı gönderir"""
+        if self.progress is not None:
+            data.update(event=event, serial=device_serial, time=time.time())
+            self.progress(data)
     
+    @staticmethod
+    def _fresh_files_size(paths: List[str], since: float) -> int:
+        """Verilen yerel dosyalardan `since` (epoch) sonrasında yazılanların toplam boyutu"""
+        total = 0
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # adb pull -a değişiklik zamanını geri aldığından ctime da kontrol edilir
+            if max(stat.st_mtime, stat.st_ctime) >= since:
+                total += stat.st_size
+        return total
+    
+    def _run_pull_with_progress(self, cmd: List[str], remote_path: str,
+                                local_target: str, device_serial: Optional[str],
+                                deadline: Deadline):
+        """
+        adb pull'u çalıştırır; yerel hedefin büyümesi hem süre sınırı için
+        ilerleme olarak kullanılır hem de ilerleme olayı olarak gönderilir
+        
+        Returns:
+            (komut sonucu, ilerleme olarak bildirilen byte sayısı)
+        """
+        since = time.time() - 1
+        reported = [0]
+        
+        def on_sample(size: int):
+            if self.progress is not None and size > reported[0]:
+                self._emit_progress("transfer_progress", device_serial,
+                                    path=remote_path, bytes=size - reported[0])
+                reported[0] = size
+        
+        result = self._run_watched(cmd, deadline, LocalGrowth(local_target, since), on_sample)
+        return result, reported[0]
+    
+    @staticmethod
+    def _decode_output(data: bytes, encoding: Optional[str] = None) -> str:
+        """Komut çıktısını metin moduna (text=True) eşdeğer şekilde çözer"""
+        text = data.decode(encoding or locale.getpreferredencoding(False), errors="replace")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    
+    def export_metrics(self) -> List[str]:
+        """
+        Toplanan metrikleri config.METRICS'te tanımlı dosyalara yazar
+        
+        Returns:
+            Yazılan dosya yolları
+        """
+        written = []
+        json_file = config.METRICS.get("json_file")
+        if json_file and self.metrics.export_json(json_file):
+            written.append(json_file)
+        
+        prometheus_file = config.METRICS.get("prometheus_file")
+        if prometheus_file and self.metrics.export_prometheus(prometheus_file):
+            written.append(prometheus_file)
+        
+        return written
+    
+    def export_trace(self) -> Optional[str]:
+        """
+        Toplanan span'ları config.TRACING'te tanımlı dosyaya Chrome trace
+        formatında yazar (izleme hiç açılmadıysa bir şey yazılmaz)
+        
+        Returns:
+            Yazılan dosya yolu veya None
+        """
+        trace_file = config.TRACING.get("trace_file")
+        if trace_file and self.tracer.events() and self.tracer.export_chrome_trace(trace_file):
+            return trace_file
+        return None
+    
+    @traced()
     def get_devices(self) -> List[Dict]:
         """
         Bağlı Android cihazların listesini döndürür
         
         Returns:
-            Cihaz bilgileri içeren liste
+            Cihaz bilgileri içeren liste (bağlantı yönlendirmesi açıksa aynı
+            telefonun bağlantıları tek satırda, "links" alanında)
         """
         result = self._run_command(["devices", "-l"])
         devices = []
@@ -133,8 +429,13 @@ class ADBManager:
                         }
                         devices.append(device_info)
         
+        if isinstance(self.transport, RoutingTransport):
+            # Aynı telefon USB ve kablosuz bağlıysa tek cihaz olarak listelenir
+            # (komutlar zaten en uygun bağlantıya yönlendirilir)
+            devices = self.transport.collapse_devices(devices)
         return devices
     
+    @traced()
     def get_device_info(self, device_serial: Optional[str] = None) -> Dict:
         """
         Cihaz bilgilerini alır
@@ -149,7 +450,7 @@ class ADBManager:
         if device_serial:
             cmd = ["-s", device_serial] + cmd
         
-        result = self._run_command(cmd, timeout=60)
+        result = self._run_command(cmd, timeout=config.TIMEOUTS["shell"])
         
         info = {}
         if result["success"]:
@@ -182,8 +483,12 @@ class ADBManager:
         
         return device_info
     
+    @traced()
     def pull_file(self, remote_path: str, local_path: str, 
-                  device_serial: Optional[str] = None) -> Dict:
+                  device_serial: Optional[str] = None,
+                  resumable: bool = False,
+                  verify: bool = False,
+                  expected_size: Optional[int] = None) -> Dict:
         """
         Telefondan dosya çeker
         
@@ -191,30 +496,819 @@ class ADBManager:
             remote_path: Telefondaki dosya yolu
             local_path: Kaydedilecek yerel yol
             device_serial: Cihaz seri numarası
+            resumable: True ise bağlantı koptuğunda kalınan yerden devam eder
+                       (sadece tek dosyalar için, dizinlerde normal pull yapılır;
+                       config.STRIPED_PULL["min_size"] üzerindeki dosyalar
+                       paralel akışlarla çekilir)
+            verify: True ise indirilen dosyalar telefondaki hash'lerle karşılaştırılır
+            expected_size: Bilinen toplam boyut (ilerleme olayları ve süre tahmini için;
+                           None ise sadece hareketsizlik sınırı uygulanır)
+        
+        Returns:
+            İşlem sonucu (verify=True ise "verification" raporu içerir)
+        """
+        # adb pull, hedef mevcut bir dizinse kaynağı onun içine koyar
+        local_target = local_path
+        if os.path.isdir(local_path):
+            local_target = os.path.join(local_path, os.path.basename(remote_path.rstrip("/")))
+        
+        remote_checksums = None
+        if verify:
+            # Telefon tarafındaki hash'ler aktarımla eş zamanlı hesaplanır
+            remote_checksums = self._start_remote_checksums(remote_path, device_serial)
+        
+        result = None
+        if resumable:
+            remote_stat = self._get_remote_stat(remote_path, device_serial)
+            if remote_stat and remote_stat["type"] == "file":
+                self._emit_progress("transfer_started", device_serial,
+                                    path=remote_path, total=remote_stat["size"])
+                if self._should_stripe(remote_stat["size"]):
+                    result = self.pull_file_striped(remote_path, local_path,
+                                                    device_serial, remote_stat)
+                else:
+                    result = self.pull_file_resumable(remote_path, local_path,
+                                                      device_serial, remote_stat)
+        
+        if result is None:
+            # -a: telefondaki değişiklik zamanı korunur (geri yüklemede galeri sırası)
+            cmd = ["pull", "-a", remote_path, local_path]
+            if device_serial:
+                cmd = ["-s", device_serial] + cmd
+            
+            self._emit_progress("transfer_started", device_serial,
+                                path=remote_path, total=expected_size)
+            start = time.perf_counter()
+            result, reported = self._run_pull_with_progress(cmd, remote_path, local_target,
+                                                            device_serial,
+                                                            self.transfer_deadline(expected_size))
+            
+            if result["success"]:
+                # Dosyanın başarıyla indirildiğini kontrol et
+                if os.path.exists(local_path):
+                    file_size = os.path.getsize(local_path)
+                    result["file_size"] = file_size
+                    result["message"] = f"Dosya başarıyla indirildi: {file_size} bytes"
+                    
+                    pulled_files, pulled_bytes = self._parse_pull_summary(result["stdout"])
+                    if pulled_bytes is None and os.path.isfile(local_target):
+                        pulled_files, pulled_bytes = 1, os.path.getsize(local_target)
+                    if pulled_bytes is not None:
+                        self.metrics.record_transfer(pulled_bytes, pulled_files,
+                                                     time.perf_counter() - start)
+                        if pulled_bytes > reported:
+                            self._emit_progress("transfer_progress", device_serial,
+                                                path=remote_path, bytes=pulled_bytes - reported)
+                else:
+                    result["success"] = False
+                    result["message"] = "Dosya indirildi ancak bulunamadı"
+        
+        self._emit_progress("transfer_finished", device_serial,
+                            path=remote_path, success=result["success"])
+        
+        if verify and result["success"]:
+            with self.tracer.span("verify_hash_local"):
+                verification = self._verify_against(remote_checksums, remote_path, local_target)
+            result["verification"] = verification
+            if not verification["verified"]:
+                result["success"] = False
+                result["message"] = (
+                    f"Bütünlük doğrulaması başarısız: {len(verification['mismatches'])} "
+                    f"uyuşmayan, {len(verification['missing'])} eksik dosya"
+                )
+        
+        return result
+    
+    @staticmethod
+    def _parse_pull_summary(output: str):
+        """
+        adb pull özet satırından dosya ve byte sayısını çıkarır
+        ("12 files pulled, 0 skipped. 30.1 MB/s (123456 bytes in 0.004s)")
+        
+        Returns:
+            (dosya sayısı, byte sayısı) veya özet yoksa (None, None)
+        """
+        files_match = re.search(r"(\d+) files? pulled", output)
+        bytes_match = re.search(r"\((\d+) bytes in", output)
+        if not files_match or not bytes_match:
+            return None, None
+        return int(files_match.group(1)), int(bytes_match.group(1))
+    
+    @traced()
+    def get_remote_checksums(self, remote_path: str, algorithm: Optional[str] = None,
+                             device_serial: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Telefondaki dosya veya dizinin hash değerlerini tek komutla hesaplar
+        
+        Args:
+            remote_path: Telefondaki dosya veya dizin yolu
+            algorithm: Hash algoritması (None ise config.VERIFY'dan alınır)
+            device_serial: Cihaz seri numarası
+        
+        Returns:
+            Göreli yol -> hash değeri veya None (komut başarısızsa)
+        """
+        algorithm = algorithm or config.VERIFY["algorithm"]
+        hash_command = integrity.REMOTE_HASH_COMMANDS[algorithm]
+        quoted_path = shlex.quote(remote_path.rstrip("/") or "/")
+        
+        # find ... -exec {} + ile tüm dosyalar tek süreçte, toplu olarak hash'lenir
+        cmd = ["shell", f"find {quoted_path} -type f -exec {hash_command} {{}} +"]
+        if device_serial:
+            cmd = ["-s", device_serial] + cmd
+        
+        # Telefon yolları UTF-8'dir; yerel ayarla (cp1254 vb.) çözülürse
+        # Türkçe karakterli dosyalar eşleşmez ve eksik sanılır
+        result = self._run_command(cmd, timeout=config.TIMEOUTS["checksum"], encoding="utf-8")
+        if not result["success"]:
+            return None
+        
+        return integrity.parse_checksum_output(result["stdout"], remote_path)
+    
+    def _start_remote_checksums(self, remote_path: str,
+                                device_serial: Optional[str] = None,
+                                algorithm: Optional[str] = None) -> Future:
+        """Telefondaki hash hesaplamasını arka planda başlatır"""
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self.get_remote_checksums, remote_path,
+                                 algorithm, device_serial)
+        executor.shutdown(wait=False)
+        return future
+    
+    def _verify_against(self, remote_checksums: Future, remote_path: str,
+                        local_path: str, algorithm: Optional[str] = None) -> Dict:
+        """
+        Yerel hash'leri hesaplar ve arka planda hesaplanan telefon
+        hash'leriyle karşılaştırır
+        """
+        algorithm = algorithm or config.VERIFY["algorithm"]
+        file_key = os.path.basename(remote_path.rstrip("/"))
+        
+        if os.path.exists(local_path):
+            local_checksums = integrity.hash_local_tree(local_path, algorithm,
+                                                        file_key=file_key)
+        else:
+            local_checksums = {}
+        
+        remote = remote_checksums.result()
+        if remote is None:
+            return {
+                "verified": False,
+                "algorithm": algorithm,
+                "checked": 0,
+                "mismatches": [],
+                "missing": [],
+                "error": "Telefonda hash hesaplanamadı"
+            }
+        
+        return integrity.compare_checksums(remote, local_checksums, algorithm)
+    
+    @traced()
+    def verify_pull(self, remote_path: str, local_path: str,
+                    algorithm: Optional[str] = None,
+                    device_serial: Optional[str] = None) -> Dict:
+        """
+        Daha önce indirilmiş dosya veya dizini telefondaki asılla karşılaştırır
+        
+        Telefon ve bilgisayar tarafındaki hash hesaplamaları eş zamanlı yapılır.
+        
+        Args:
+            remote_path: Telefondaki dosya veya dizin yolu
+            local_path: İndirilmiş yerel dosya veya dizin yolu
+            algorithm: Hash algoritması (md5, sha1, sha256)
+            device_serial: Cihaz seri numarası
+        
+        Returns:
+            Doğrulama raporu (verified, checked, mismatches, missing)
+        """
+        remote_checksums = self._start_remote_checksums(remote_path, device_serial,
+                                                        algorithm)
+        return self._verify_against(remote_checksums, remote_path, local_path, algorithm)
+    
+    def _get_remote_stat(self, remote_path: str,
+                         device_serial: Optional[str] = None) -> Optional[Dict]:
+        """
+        Telefondaki dosyanın boyutunu, değiştirilme zamanını ve tipini alır
+        
+        Args:
+            remote_path: Telefondaki dosya yolu
+            device_serial: Cihaz seri numarası
+        
+        Returns:
+            {"size", "mtime", "type"} içeren dict veya None (bulunamazsa)
+        """
+        result = self.execute_shell_command(
+            f"stat -c '%s %Y %F' {shlex.quote(remote_path)}",
+            device_serial
+        )
+        if not result["success"]:
+            return None
+        
+        parts = result["stdout"].strip().split(" ", 2)
+        if len(parts) < 3 or not parts[0].isdigit():
+            return None
+        
+        file_type = "directory" if "directory" in parts[2] else "file"
+        return {
+            "size": int(parts[0]),
+            "mtime": int(parts[1]) if parts[1].isdigit() else 0,
+            "type": file_type
+        }
+    
+    def _get_remote_tail_hash(self, remote_path: str, length: int,
+                              device_serial: Optional[str] = None) -> Optional[str]:
+        """Telefondaki dosyanın son `length` byte'ının MD5 özetini alır"""
+        result = self.execute_shell_command(
+            f"tail -c {length} {shlex.quote(remote_path)} | md5sum",
+            device_serial
+        )
+        if result["success"] and result["stdout"].strip():
+            return result["stdout"].split()[0].lower()
+        return None
+    
+    @staticmethod
+    def _get_local_tail_hash(local_path: str, length: int) -> str:
+        """Yerel dosyanın son `length` byte'ının MD5 özetini hesaplar"""
+        digest = hashlib.md5()
+        with open(local_path, "rb") as f:
+            f.seek(max(0, os.path.getsize(local_path) - length))
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _write_journal(journal_path: str, journal: Dict):
+        """Devam ettirme günlüğünü (sidecar journal) atomik olarak yazar"""
+        temp_path = journal_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(journal, f, ensure_ascii=False)
+        os.replace(temp_path, journal_path)
+    
+    def _stream_remote_range(self, remote_path: str, part_path: str,
+                             offset: int, journal_path: str, journal: Dict,
+                             device_serial: Optional[str] = None) -> Dict:
+        """
+        Telefondaki dosyanın `offset` byte'ından sonrasını exec-out ile
+        yerel .part dosyasının sonuna ekler
+        
+        Aktarım metriği çağıran tarafından dosya başına bir kez kaydedilir.
+        
+        Returns:
+            {"success", "stderr", "bytes", "seconds"} içeren dict
+        """
+        settings = config.RESUMABLE_PULL
+        cmd = ["exec-out", f"tail -c +{offset + 1} {shlex.quote(remote_path)}"]
+        if device_serial:
+            cmd = ["-s", device_serial] + cmd
+        
+        state = {"received": 0, "since_journal": 0}
+        deadline = self.transfer_deadline(max(journal["remote_size"] - offset, 0))
+        start = time.perf_counter()
+        watchdog = None
+        try:
+            process = self.transport.popen(cmd)
+            watchdog = self._watch(deadline, lambda: state["received"], process)
+            # "ab" yerine r+b: O_APPEND dosyalara os.splice yazamaz
+            with open(part_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                
+                def on_progress(count: int):
+                    state["received"] += count
+                    state["since_journal"] += count
+                    self._emit_progress("transfer_progress", device_serial,
+                                        path=remote_path, bytes=count)
+                    
+                    # Günlüğü belirli aralıklarla güncelle
+                    if state["since_journal"] >= settings["journal_interval"]:
+                        f.flush()
+                        journal["offset"] = offset + state["received"]
+                        self._write_journal(journal_path, journal)
+                        state["since_journal"] = 0
+                
+                # Tek tampon + readinto (Linux'ta boru -> dosya os.splice)
+                stream_copy.copy_stream(process.stdout, f, settings["chunk_size"],
+                                        on_progress=on_progress)
+            
+            received = state["received"]
+            stderr = process.stderr.read()
+            returncode = process.wait()
+            timed_out = watchdog is not None and watchdog.expired
+            duration = time.perf_counter() - start
+            self.metrics.record_command(command_type(cmd), duration,
+                                        returncode == 0 and not timed_out, timed_out)
+            if timed_out:
+                # Takılan bağlantı: kalınan yerden tekrar denenir
+                stderr = watchdog.message.encode("utf-8")
+            return {
+                "success": returncode == 0 and not timed_out,
+                "stderr": stderr.decode("utf-8", errors="ignore") if stderr else "",
+                "bytes": received,
+                "seconds": duration
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "stderr": str(e),
+                "bytes": state["received"],
+                "seconds": time.perf_counter() - start
+            }
+        finally:
+            if watchdog is not None:
+                watchdog.stop()
+    
+    @traced()
+    def pull_file_resumable(self, remote_path: str, local_path: str,
+                            device_serial: Optional[str] = None,
+                            remote_stat: Optional[Dict] = None) -> Dict:
+        """
+        Telefondan dosyayı devam ettirilebilir şekilde çeker
+        
+        Aktarım `<local_path>.part` dosyasına yazılır, yanında
+        `<local_path>.part.json` günlüğü tutulur. Bağlantı koparsa (veya
+        program yeniden başlatılırsa) sadece kalan byte aralığı aktarılır.
+        Sonunda dosya boyutu ve son bölümün MD5 özeti ile doğrulanır.
+        
+        Args:
+            remote_path: Telefondaki dosya yolu
+            local_path: Kaydedilecek yerel yol
+            device_serial: Cihaz seri numarası
+            remote_stat: Önceden alınmış stat bilgisi (None ise sorgulanır)
         
         Returns:
             İşlem sonucu
         """
-        cmd = ["pull", remote_path, local_path]
+        settings = config.RESUMABLE_PULL
+        
+        if remote_stat is None:
+            remote_stat = self._get_remote_stat(remote_path, device_serial)
+        if not remote_stat or remote_stat["type"] != "file":
+            return {
+                "success": False,
+                "stdout": "",
+                "stderr": f"Dosya bulunamadı: {remote_path}",
+                "returncode": -1
+            }
+        
+        if os.path.isdir(local_path):
+            local_path = os.path.join(local_path, os.path.basename(remote_path))
+        parent_dir = os.path.dirname(local_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        
+        part_path = local_path + ".part"
+        journal_path = part_path + ".json"
+        journal = {
+            "remote_path": remote_path,
+            "remote_size": remote_stat["size"],
+            "remote_mtime": remote_stat["mtime"],
+            "device_serial": device_serial,
+            "offset": 0
+        }
+        
+        # Önceki yarım kalan aktarımı kontrol et
+        offset = 0
+        if os.path.exists(part_path) and os.path.exists(journal_path):
+            try:
+                with open(journal_path, "r", encoding="utf-8") as f:
+                    old_journal = json.load(f)
+            except (OSError, ValueError):
+                old_journal = {}
+            
+            same_source = all(
+                old_journal.get(key) == journal[key]
+                for key in ("remote_path", "remote_size", "remote_mtime")
+            ) and "stripes" not in old_journal  # Şeritli aktarımın .part dosyası tam boyutludur
+            part_size = os.path.getsize(part_path)
+            if same_source and part_size <= remote_stat["size"]:
+                offset = part_size
+        
+        if offset == 0:
+            # Kaynak değişmiş veya günlük yok: baştan başla
+            open(part_path, "wb").close()
+        else:
+            print(f"[BILGI] Yarım kalan aktarım bulundu, {offset} byte'tan devam ediliyor")
+        
+        resumed_from = offset
+        if offset:
+            self._emit_progress("transfer_progress", device_serial,
+                                path=remote_path, bytes=offset, resumed=True)
+        journal["offset"] = offset
+        self._write_journal(journal_path, journal)
+        
+        last_error = ""
+        attempt = 0
+        transferred, transfer_seconds = 0, 0.0
+        while offset < remote_stat["size"] and attempt <= settings["retries"]:
+            if attempt > 0:
+                print(f"[UYARI] Aktarım kesildi, tekrar deneniyor "
+                      f"({attempt}/{settings['retries']}, {offset} byte)")
+                self.metrics.record_retry("pull")
+                time.sleep(settings["retry_delay"])
+            
+            stream_result = self._stream_remote_range(
+                remote_path, part_path, offset, journal_path, journal, device_serial
+            )
+            offset = os.path.getsize(part_path)
+            journal["offset"] = offset
+            self._write_journal(journal_path, journal)
+            transferred += stream_result["bytes"]
+            transfer_seconds += stream_result["seconds"]
+            
+            if not stream_result["success"]:
+                last_error = stream_result["stderr"] or "Aktarım kesildi"
+            # İlerleme olmayan denemeler hakkı tüketir
+            if stream_result["bytes"] == 0 or not stream_result["success"]:
+                attempt += 1
+        
+        result = {
+            "success": False,
+            "stdout": "",
+            "stderr": last_error,
+            "returncode": -1,
+            "resumed_from": resumed_from
+        }
+        
+        # Boyut doğrulaması
+        if offset != remote_stat["size"]:
+            result["message"] = (f"Dosya eksik indirildi: {offset}/"
+                                 f"{remote_stat['size']} bytes (tekrar deneyince devam eder)")
+            self.metrics.record_transfer(transferred, 0, transfer_seconds)
+            return result
+        
+        # Son bölümün hash doğrulaması
+        tail_length = min(settings["tail_hash_bytes"], remote_stat["size"])
+        if tail_length > 0:
+            remote_hash = self._get_remote_tail_hash(remote_path, tail_length, device_serial)
+            local_hash = self._get_local_tail_hash(part_path, tail_length)
+            if remote_hash != local_hash:
+                # Bozuk veri: bir sonraki denemede baştan başlansın
+                os.remove(journal_path)
+                result["stderr"] = "Hash uyuşmazlığı"
+                result["message"] = "Dosya doğrulanamadı: son bölümün hash değeri uyuşmuyor"
+                self.metrics.record_transfer(transferred, 0, transfer_seconds)
+                return result
+        
+        os.replace(part_path, local_path)
+        os.remove(journal_path)
+        if remote_stat["mtime"]:
+            # adb pull -a gibi telefondaki değişiklik zamanı korunur
+            os.utime(local_path, (remote_stat["mtime"], remote_stat["mtime"]))
+        # Tüm aralıklar tek aktarım olarak kaydedilir (dosya sayısı, byte ve süreyle)
+        self.metrics.record_transfer(transferred, 1, transfer_seconds)
+        
+        result.update({
+            "success": True,
+            "stderr": "",
+            "returncode": 0,
+            "file_size": offset,
+            "message": f"Dosya başarıyla indirildi: {offset} bytes"
+        })
+        return result
+    
+    def _should_stripe(self, size: int) -> bool:
+        """Dosya şeritli (paralel) çekilecek kadar büyük mü"""
+        settings = config.STRIPED_PULL
+        return settings["streams"] > 1 and bool(settings["min_size"]) and size >= settings["min_size"]
+    
+    @staticmethod
+    def _plan_stripes(size: int, streams: int, block_size: int) -> List[Dict]:
+        """Dosyayı blok hizalı, eşit büyüklükte şeritlere böler"""
+        blocks = -(-size // block_size)
+        per_stripe = max(1, -(-blocks // streams))
+        return [
+            {
+                "start": first * block_size,
+                "end": min(size, (first + per_stripe) * block_size),
+                "done": 0
+            }
+            for first in range(0, blocks, per_stripe)
+        ]
+    
+    @staticmethod
+    def _preallocate(path: str, size: int):
+        """Yerel dosyayı tam boyutunda oluşturur (destekleniyorsa disk alanı ayrılır)"""
+        with open(path, "wb") as f:
+            if hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                    return
+                except OSError:
+                    pass  # Dosya sistemi desteklemiyor: seyrek dosya
+            f.truncate(size)
+    
+    @staticmethod
+    def _dd_command(remote_path: str, start: int, length: int, block_size: int) -> str:
+        """[start, start+length) aralığını okuyan dd komutu (start blok hizalı olmalı)"""
+        return (f"dd if={shlex.quote(remote_path)} bs={block_size} skip={start // block_size} "
+                f"count={-(-length // block_size)} 2>/dev/null")
+    
+    def _stream_remote_stripe(self, remote_path: str, part_path: str, stripe: Dict,
+                              block_size: int, save_journal: Callable[[], None],
+                              device_serial: Optional[str] = None) -> Dict:
+        """
+        Şeridin kalan kısmını exec-out dd ile çekip .part dosyasındaki kendi
+        konumuna yazar (her akış dosyayı ayrı tanıtıcıyla açar)
+        
+        stripe["done"] sadece veri dosyaya yazıldıktan sonra artırılır.
+        
+        Returns:
+            {"success", "stderr", "bytes"} içeren dict
+        """
+        settings = config.RESUMABLE_PULL
+        length = stripe["end"] - stripe["start"]
+        # dd blok hizalı okur: yarım kalan blok baştan çekilir
+        position = stripe["start"] + stripe["done"] // block_size * block_size
+        cmd = ["exec-out", self._dd_command(remote_path, position, stripe["end"] - position,
+                                            block_size)]
         if device_serial:
             cmd = ["-s", device_serial] + cmd
         
-        result = self._run_command(cmd, timeout=300)
+        state = {"received": 0, "unsaved": 0}
+        deadline = self.transfer_deadline(stripe["end"] - position)
+        start = time.perf_counter()
+        watchdog = None
+        try:
+            process = self.transport.popen(cmd)
+            watchdog = self._watch(deadline, lambda: state["received"], process)
+            with open(part_path, "r+b") as f:
+                f.seek(position)
+                
+                def commit():
+                    f.flush()
+                    stripe["done"] = min(length, max(stripe["done"],
+                                                     position - stripe["start"] + state["received"]))
+                    save_journal()
+                    state["unsaved"] = 0
+                
+                def on_progress(count: int):
+                    state["received"] += count
+                    state["unsaved"] += count
+                    self._emit_progress("transfer_progress", device_serial,
+                                        path=remote_path, bytes=count)
+                    if state["unsaved"] >= settings["journal_interval"]:
+                        commit()
+                
+                stream_copy.copy_stream(process.stdout, f, settings["chunk_size"],
+                                        on_progress=on_progress)
+                commit()
+            
+            stderr = process.stderr.read()
+            returncode = process.wait()
+            timed_out = watchdog is not None and watchdog.expired
+            self.metrics.record_command(command_type(cmd), time.perf_counter() - start,
+                                        returncode == 0 and not timed_out, timed_out)
+            if timed_out:
+                stderr = watchdog.message.encode("utf-8")
+            return {
+                "success": returncode == 0 and not timed_out,
+                "stderr": stderr.decode("utf-8", errors="ignore") if stderr else "",
+                "bytes": state["received"]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "stderr": str(e),
+                "bytes": state["received"]
+            }
+        finally:
+            if watchdog is not None:
+                watchdog.stop()
+    
+    def _pull_stripe(self, remote_path: str, part_path: str, stripe: Dict, block_size: int,
+                     save_journal: Callable[[], None],
+                     device_serial: Optional[str] = None) -> Optional[str]:
+        """
+        Şeridi tamamlanana kadar çeker (bağlantı koparsa kalınan bloktan tekrar dener)
         
-        if result["success"]:
-            # Dosyanın başarıyla indirildiğini kontrol et
-            if os.path.exists(local_path):
-                file_size = os.path.getsize(local_path)
-                result["file_size"] = file_size
-                result["message"] = f"Dosya başarıyla indirildi: {file_size} bytes"
-            else:
-                result["success"] = False
-                result["message"] = "Dosya indirildi ancak bulunamadı"
+        Returns:
+            Hata mesajı veya None (şerit tamamlandı)
+        """
+        settings = config.RESUMABLE_PULL
+        length = stripe["end"] - stripe["start"]
+        last_error = ""
+        attempt = 0
+        while stripe["done"] < length and attempt <= settings["retries"]:
+            if attempt > 0:
+                self.metrics.record_retry("pull")
+                time.sleep(settings["retry_delay"])
+            before = stripe["done"]
+            stream_result = self._stream_remote_stripe(remote_path, part_path, stripe,
+                                                       block_size, save_journal, device_serial)
+            if not stream_result["success"]:
+                last_error = stream_result["stderr"] or "Aktarım kesildi"
+            elif stripe["done"] < length:
+                last_error = "Dosya beklenenden kısa"
+            # İlerleme olmayan denemeler hakkı tüketir
+            if stripe["done"] <= before or not stream_result["success"]:
+                attempt += 1
+        if stripe["done"] < length:
+            return f"{stripe['start']}-{stripe['end']}: {last_error}"
+        return None
+    
+    @staticmethod
+    def _hash_local_range(local_path: str, start: int, length: int, algorithm: str) -> str:
+        """Yerel dosyanın [start, start+length) aralığının hash değeri"""
+        digest = hashlib.new(algorithm)
+        with open(local_path, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(1024 * 1024, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return digest.hexdigest()
+    
+    def _verify_stripes(self, remote_path: str, part_path: str, stripes: List[Dict],
+                        block_size: int, executor: ThreadPoolExecutor,
+                        device_serial: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Şeritleri telefonda (eş zamanlı) ve bilgisayarda hash'leyip karşılaştırır
+        
+        Returns:
+            Uyuşmayan şeritler veya None (telefonda hash hesaplanamadıysa)
+        """
+        algorithm = config.VERIFY["algorithm"]
+        hash_command = integrity.REMOTE_HASH_COMMANDS[algorithm]
+        
+        def remote_hash(stripe: Dict) -> Optional[str]:
+            dd = self._dd_command(remote_path, stripe["start"],
+                                  stripe["end"] - stripe["start"], block_size)
+            cmd = ["shell", f"{dd} | {hash_command}"]
+            if device_serial:
+                cmd = ["-s", device_serial] + cmd
+            result = self._run_command(cmd, timeout=config.TIMEOUTS["checksum"])
+            if result["success"] and result["stdout"].strip():
+                return result["stdout"].split()[0].lower()
+            return None
+        
+        with self.tracer.span("verify_stripes", serial=device_serial):
+            remote_futures = [executor.submit(remote_hash, stripe) for stripe in stripes]
+            local_hashes = [self._hash_local_range(part_path, stripe["start"],
+                                                   stripe["end"] - stripe["start"], algorithm)
+                            for stripe in stripes]
+            remote_hashes = [future.result() for future in remote_futures]
+        if None in remote_hashes:
+            return None
+        return [stripe for stripe, remote, local in zip(stripes, remote_hashes, local_hashes)
+                if remote != local]
+    
+    @traced()
+    def pull_file_striped(self, remote_path: str, local_path: str,
+                          device_serial: Optional[str] = None,
+                          remote_stat: Optional[Dict] = None,
+                          streams: Optional[int] = None) -> Dict:
+        """
+        Büyük tek bir dosyayı birden çok eş zamanlı akışla (şerit) çeker
+        
+        Dosya blok hizalı bayt aralıklarına bölünür; her aralık ayrı bir
+        `exec-out dd` akışıyla çekilip önceden ayrılmış `<local_path>.part`
+        dosyasındaki kendi konumuna yazılır. Şeritlerin ilerlemesi
+        `<local_path>.part.json` günlüğünde tutulur, yarıda kalan aktarım
+        kalan aralıklardan devam eder. Sonunda her şerit telefonda ve
+        bilgisayarda hash'lenir; uyuşmayan şeritler bir kez yeniden çekilir.
+        
+        Args:
+            remote_path: Telefondaki dosya yolu
+            local_path: Kaydedilecek yerel yol
+            device_serial: Cihaz seri numarası
+            remote_stat: Önceden alınmış stat bilgisi (None ise sorgulanır)
+            streams: Eş zamanlı akış sayısı (None ise config.STRIPED_PULL["streams"])
+        
+        Returns:
+            İşlem sonucu
+        """
+        settings = config.STRIPED_PULL
+        block_size = settings["block_size"]
+        
+        if remote_stat is None:
+            remote_stat = self._get_remote_stat(remote_path, device_serial)
+        if not remote_stat or remote_stat["type"] != "file":
+            return {
+                "success": False,
+                "stdout": "",
+                "stderr": f"Dosya bulunamadı: {remote_path}",
+                "returncode": -1
+            }
+        
+        if os.path.isdir(local_path):
+            local_path = os.path.join(local_path, os.path.basename(remote_path))
+        parent_dir = os.path.dirname(local_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        
+        size = remote_stat["size"]
+        part_path = local_path + ".part"
+        journal_path = part_path + ".json"
+        journal = {
+            "remote_path": remote_path,
+            "remote_size": size,
+            "remote_mtime": remote_stat["mtime"],
+            "device_serial": device_serial,
+            "block_size": block_size,
+            "stripes": self._plan_stripes(size, streams or settings["streams"], block_size)
+        }
         
+        # Önceki yarım kalan şeritli aktarımı kontrol et
+        resumed = False
+        if os.path.exists(part_path) and os.path.exists(journal_path):
+            try:
+                with open(journal_path, "r", encoding="utf-8") as f:
+                    old_journal = json.load(f)
+            except (OSError, ValueError):
+                old_journal = {}
+            resumed = (
+                all(old_journal.get(key) == journal[key]
+                    for key in ("remote_path", "remote_size", "remote_mtime", "block_size"))
+                and "stripes" in old_journal
+                and os.path.getsize(part_path) == size
+            )
+            if resumed:
+                journal["stripes"] = old_journal["stripes"]
+        if not resumed:
+            self._preallocate(part_path, size)
+        
+        stripes = journal["stripes"]
+        resumed_from = sum(stripe["done"] for stripe in stripes)
+        if resumed_from:
+            print(f"[BILGI] Yarım kalan aktarım bulundu, {resumed_from} byte'tan devam ediliyor")
+            self._emit_progress("transfer_progress", device_serial,
+                                path=remote_path, bytes=resumed_from, resumed=True)
+        
+        journal_lock = threading.Lock()
+        
+        def save_journal():
+            with journal_lock:
+                self._write_journal(journal_path, journal)
+        
+        save_journal()
+        
+        start = time.perf_counter()
+        errors = []
+        verified = False
+        with ThreadPoolExecutor(max_workers=max(1, len(stripes)),
+                                thread_name_prefix="stripe") as executor:
+            for repair in (False, True):
+                pending = [stripe for stripe in stripes
+                           if stripe["done"] < stripe["end"] - stripe["start"]]
+                futures = [executor.submit(self._pull_stripe, remote_path, part_path, stripe,
+                                           block_size, save_journal, device_serial)
+                           for stripe in pending]
+                errors = [error for error in (future.result() for future in futures) if error]
+                if errors:
+                    break
+                
+                mismatched = self._verify_stripes(remote_path, part_path, stripes,
+                                                  block_size, executor, device_serial)
+                if mismatched is None:
+                    errors = ["Telefonda hash hesaplanamadı"]
+                    break
+                if not mismatched:
+                    verified = True
+                    break
+                # Bozuk şeritler bir sonraki denemede (veya çalıştırmada) baştan çekilir
+                for stripe in mismatched:
+                    stripe["done"] = 0
+                save_journal()
+                if repair:
+                    errors = [f"{len(mismatched)} şeridin hash değeri uyuşmuyor"]
+                else:
+                    print(f"[UYARI] {len(mismatched)} şerit doğrulanamadı, yeniden çekiliyor")
+        
+        done = sum(stripe["done"] for stripe in stripes)
+        result = {
+            "success": False,
+            "stdout": "",
+            "stderr": "; ".join(errors),
+            "returncode": -1,
+            "resumed_from": resumed_from,
+            "streams": len(stripes)
+        }
+        if not verified:
+            result["message"] = (f"Dosya eksik indirildi: {done}/{size} bytes "
+                                 f"(tekrar deneyince devam eder)")
+            return result
+        
+        os.replace(part_path, local_path)
+        os.remove(journal_path)
+        if remote_stat["mtime"]:
+            os.utime(local_path, (remote_stat["mtime"], remote_stat["mtime"]))
+        self.metrics.record_transfer(size - resumed_from, 1, time.perf_counter() - start)
+        
+        result.update({
+            "success": True,
+            "stderr": "",
+            "returncode": 0,
+            "file_size": size,
+            "message": f"Dosya {len(stripes)} akışla indirildi: {size} bytes"
+        })
         return result
     
     def pull_directory(self, remote_path: str, local_path: str,
-                      device_serial: Optional[str] = None) -> Dict:
+                      device_serial: Optional[str] = None,
+                      verify: bool = False,
+                      expected_size: Optional[int] = None) -> Dict:
         """
         Telefondan dizin çeker
         
@@ -222,20 +1316,26 @@ class ADBManager:
             remote_path: Telefondaki dizin yolu
             local_path: Kaydedilecek yerel yol
             device_serial: Cihaz seri numarası
+            verify: True ise indirilen dosyalar telefondaki hash'lerle karşılaştırılır
+            expected_size: Bilinen toplam boyut (ilerleme olayları ve süre tahmini için;
+                           None ise sadece hareketsizlik sınırı uygulanır)
         
         Returns:
             İşlem sonucu
         """
-        return self.pull_file(remote_path, local_path, device_serial)
+        return self.pull_file(remote_path, local_path, device_serial, verify=verify,
+                              expected_size=expected_size)
     
     def execute_shell_command(self, command: str,
-                              device_serial: Optional[str] = None) -> Dict:
+                              device_serial: Optional[str] = None,
+                              encoding: Optional[str] = None) -> Dict:
         """
         Shell komutu çalıştırır
         
         Args:
             command: Çalıştırılacak shell komutu
             device_serial: Cihaz seri numarası
+            encoding: Çıktı kodlaması (None ise sistem yerel ayarı)
         
         Returns:
             Komut çıktısı
@@ -244,8 +1344,9 @@ class ADBManager:
         if device_serial:
             cmd = ["-s", device_serial] + cmd
         
-        return self._run_command(cmd, timeout=60)
+        return self._run_command(cmd, timeout=config.TIMEOUTS["shell"], encoding=encoding)
     
+    @traced()
     def get_installed_apps(self, device_serial: Optional[str] = None) -> List[str]:
         """
         Yüklü uygulamaların listesini alır
@@ -256,20 +1357,16 @@ class ADBManager:
         Returns:
             Uygulama paket isimleri listesi
         """
-        result = self.execute_shell_command(
-            "pm list packages",
-            device_serial
-        )
-        
         apps = []
-        if result["success"]:
-            lines = result["stdout"].strip().split("\n")
-            for line in lines:
+        with self.stream_shell_command("pm list packages", device_serial,
+                                       timeout=config.TIMEOUTS["shell"]) as stream:
+            for line in stream.iter_lines():
                 if line.startswith("package:"):
                     apps.append(line.replace("package:", "").strip())
         
-        return apps
+        return apps if stream.success else []
     
+    @traced()
     def get_app_info(self, package_name: str,
                     device_serial: Optional[str] = None) -> Dict:
         """
@@ -282,39 +1379,29 @@ class ADBManager:
         Returns:
             Uygulama bilgileri
         """
-        # Uygulama bilgilerini al
-        result = self.execute_shell_command(
-            f"dumpsys package {package_name}",
-            device_serial
-        )
-        
-        info = {
-            "package": package_name,
-            "installed": result["success"]
-        }
-        
-        if result["success"]:
-            output = result["stdout"]
-            # Version bilgisi
-            if "versionName=" in output:
-                try:
-                    version_line = [l for l in output.split("\n") 
-                                  if "versionName=" in l][0]
-                    info["version"] = version_line.split("versionName=")[1].split()[0]
-                except:
-                    pass
-            
-            # UID bilgisi
-            if "userId=" in output:
-                try:
-                    uid_line = [l for l in output.split("\n") 
-                              if "userId=" in l][0]
-                    info["uid"] = uid_line.split("userId=")[1].split()[0]
-                except:
-                    pass
-        
+        # Uygulama bilgilerini al (dumpsys çıktısı satır satır taranır)
+        info = {"package": package_name}
+        with self.stream_shell_command(f"dumpsys package {shlex.quote(package_name)}",
+                                       device_serial,
+                                       timeout=config.TIMEOUTS["shell"]) as stream:
+            for line in stream.iter_lines():
+                # Version ve UID bilgisi (ilk geçtikleri satır)
+                if "version" not in info and "versionName=" in line:
+                    value = line.split("versionName=")[1].split()
+                    if value:
+                        info["version"] = value[0]
+                if "uid" not in info and "userId=" in line:
+                    value = line.split("userId=")[1].split()
+                    if value:
+                        info["uid"] = value[0]
+        
+        info["installed"] = stream.success
+        if not stream.success:
+            info.pop("version", None)
+            info.pop("uid", None)
         return info
     
+    @traced()
     def get_logcat(self, lines: int = 100,
                   device_serial: Optional[str] = None) -> str:
         """
@@ -327,13 +1414,13 @@ class ADBManager:
         Returns:
             Logcat çıktısı
         """
-        result = self.execute_shell_command(
-            f"logcat -d -t {lines}",
-            device_serial
-        )
+        with self.stream_shell_command(f"logcat -d -t {lines}", device_serial,
+                                       timeout=config.TIMEOUTS["shell"]) as stream:
+            output = stream.read_text()
         
-        return result["stdout"] if result["success"] else ""
+        return output if stream.success else ""
     
+    @traced()
     def save_logcat(self, output_file: str, lines: int = 1000,
                    device_serial: Optional[str] = None) -> bool:
         """
@@ -347,16 +1434,22 @@ class ADBManager:
         Returns:
             Başarı durumu
         """
-        logcat_output = self.get_logcat(lines, device_serial)
-        
+        # Çıktı geldikçe dosyaya yazılır (bellekte tutulmaz)
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(logcat_output)
+            with open(output_file, "w", encoding="utf-8", newline="") as f, \
+                    self.stream_shell_command(f"logcat -d -t {lines}", device_serial,
+                                              timeout=config.TIMEOUTS["shell"]) as stream:
+                for text in stream.iter_text():
+                    f.write(text)
+            if not stream.success:
+                # get_logcat ile aynı davranış: başarısız komutta boş dosya
+                open(output_file, "w").close()
             return True
         except Exception as e:
             print(f"Logcat kaydetme hatası: {str(e)}")
             return False
     
+    @traced()
     def list_files(self, remote_path: str = "/sdcard",
                   device_serial: Optional[str] = None) -> List[str]:
         """
@@ -369,20 +1462,16 @@ class ADBManager:
         Returns:
             Dosya/dizin listesi
         """
-        result = self.execute_shell_command(
-            f"ls -la {remote_path}",
-            device_serial
-        )
-        
         files = []
-        if result["success"]:
-            lines = result["stdout"].strip().split("\n")
-            for line in lines:
+        with self.stream_shell_command(f"ls -la {remote_path}", device_serial,
+                                       timeout=config.TIMEOUTS["shell"]) as stream:
+            for line in stream.iter_lines():
                 if line.strip():
                     files.append(line)
         
-        return files
+        return files if stream.success else []
     
+    @traced()
     def create_backup(self, output_file: str,
                      include_apk: bool = True,
                      include_shared: bool = True,
@@ -441,43 +1530,40 @@ class ADBManager:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             # ADB backup komutunu çalıştır
-            # Bu komut telefon ekranında onay bekler
-            process = subprocess.Popen(
-                [self.adb_path] + cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE
-            )
-            
-            # Kullanıcı telefon ekranında onaylayana kadar bekle
-            # Timeout 5 dakika (yedekleme uzun sürebilir)
-            try:
-                stdout, stderr = process.communicate(timeout=300)
-                returncode = process.returncode
-            except subprocess.TimeoutExpired:
-                process.kill()
+            # Bu komut telefon ekranında onay bekler: ilk byte için onay süresi,
+            # sonrasında yedek dosyası büyüdükçe süre sınırı işlemez
+            since = time.time() - 1
+            deadline = self.transfer_deadline(first_progress=config.TIMEOUTS["confirmation"])
+            start = time.perf_counter()
+            result = self._run_watched(cmd, deadline, LocalGrowth(output_file, since),
+                                       stdin=True)
+            if result["timed_out"]:
                 return {
                     "success": False,
-                    "message": "Yedekleme zaman aşımına uğradı (5 dakika)",
+                    "message": f"Yedekleme zaman aşımına uğradı: {result['stderr']}",
                     "stderr": "Timeout"
                 }
             
+            duration = time.perf_counter() - start
+            backup_created = os.path.exists(output_file)
+            
             # Dosyanın oluşup oluşmadığını kontrol et
-            if os.path.exists(output_file):
+            if backup_created:
                 file_size = os.path.getsize(output_file)
+                self.metrics.record_transfer(file_size, 1, duration)
                 return {
                     "success": True,
                     "message": f"Yedekleme başarıyla oluşturuldu",
                     "file_size": file_size,
                     "file_path": output_file,
-                    "stdout": stdout.decode('utf-8', errors='ignore') if stdout else "",
-                    "stderr": stderr.decode('utf-8', errors='ignore') if stderr else ""
+                    "stdout": result["stdout"],
+                    "stderr": result["stderr"]
                 }
             else:
                 return {
                     "success": False,
                     "message": "Yedekleme dosyası oluşturulamadı",
-                    "stderr": stderr.decode('utf-8', errors='ignore') if stderr else "Bilinmeyen hata"
+                    "stderr": result["stderr"] or "Bilinmeyen hata"
                 }
                 
         except Exception as e:
@@ -487,6 +1573,7 @@ class ADBManager:
                 "stderr": str(e)
             }
     
+    @traced()
     def restore_backup(self, backup_file: str,
                       device_serial: Optional[str] = None) -> Dict:
         """
@@ -520,37 +1607,34 @@ class ADBManager:
         print("[BILGI] Geri yükleme başlatılıyor...\n")
         
         try:
-            process = subprocess.Popen(
-                [self.adb_path] + cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE
-            )
-            
-            # Timeout 10 dakika (geri yükleme uzun sürebilir)
-            try:
-                stdout, stderr = process.communicate(timeout=600)
-                returncode = process.returncode
-            except subprocess.TimeoutExpired:
-                process.kill()
+            # Gönderilen byte'lar bilgisayardan izlenemediği için süre sınırı
+            # yedek boyutu ve ölçülen hızdan tahmin edilir (onay süresi eklenir)
+            deadline = self.transfer_deadline(os.path.getsize(backup_file), inactivity=0,
+                                              startup=config.TIMEOUTS["confirmation"])
+            start = time.perf_counter()
+            result = self._run_watched(cmd, deadline, lambda: 0, stdin=True)
+            if result["timed_out"]:
                 return {
                     "success": False,
-                    "message": "Geri yükleme zaman aşımına uğradı (10 dakika)",
+                    "message": f"Geri yükleme zaman aşımına uğradı: {result['stderr']}",
                     "stderr": "Timeout"
                 }
             
-            if returncode == 0:
+            duration = time.perf_counter() - start
+            
+            if result["success"]:
+                self.metrics.record_transfer(os.path.getsize(backup_file), 1, duration)
                 return {
                     "success": True,
                     "message": "Geri yükleme tamamlandı",
-                    "stdout": stdout.decode('utf-8', errors='ignore') if stdout else "",
-                    "stderr": stderr.decode('utf-8', errors='ignore') if stderr else ""
+                    "stdout": result["stdout"],
+                    "stderr": result["stderr"]
                 }
             else:
                 return {
                     "success": False,
                     "message": "Geri yükleme başarısız",
-                    "stderr": stderr.decode('utf-8', errors='ignore') if stderr else "Bilinmeyen hata"
+                    "stderr": result["stderr"] or "Bilinmeyen hata"
                 }
                 
         except Exception as e:
@@ -560,6 +1644,230 @@ class ADBManager:
                 "stderr": str(e)
             }
     
+    def _list_remote_files(self, remote_base: str,
+                           device_serial: Optional[str]) -> Optional[Dict[str, tuple]]:
+        """
+        Telefondaki klasörün altındaki dosyaları tek find çağrısıyla listeler
+        (klasör yoksa oluşturulur)
+        
+        Returns:
+            Göreli yol -> (boyut, mtime); liste alınamazsa None
+        """
+        find_command = media_filter.build_find_command(
+            [remote_base], media_filter.normalize_filters(None), media_filter.STAT_ACTION
+        )
+        prefix = remote_base.rstrip("/") + "/"
+        with self.stream_shell_command(
+                f"mkdir -p {shlex.quote(remote_base)} && {find_command} 2>/dev/null", device_serial,
+                timeout=Deadline(inactivity=config.TIMEOUTS["shell"])) as listing:
+            files = {entry["path"][len(prefix):]: (entry["size"], entry["mtime"])
+                     for entry in media_filter.parse_stat_output(listing.iter_lines())
+                     if entry["path"].startswith(prefix)}
+        return None if listing.timed_out else files
+    
+    @staticmethod
+    def _balance_streams(items: List[Dict], streams: int) -> List[List[Dict]]:
+        """Dosyaları toplam boyutları dengeli olacak şekilde akışlara dağıtır (büyükten küçüğe)"""
+        heap = [(0, index) for index in range(streams)]
+        groups = [[] for _ in range(streams)]
+        for item in sorted(items, key=lambda item: item["size"], reverse=True):
+            load, index = heapq.heappop(heap)
+            groups[index].append(item)
+            heapq.heappush(heap, (load + item["size"] + tarfile.BLOCKSIZE, index))
+        return [sorted(group, key=lambda item: item["path"]) for group in groups if group]
+    
+    def _push_tar(self, remote_base: str, items: List[Dict],
+                  device_serial: Optional[str]) -> Optional[str]:
+        """
+        Dosyaları bilgisayarda tar akışı olarak üretip exec-in ile telefondaki
+        tar -x'e yazar (değişiklik zamanları tar başlığıyla korunur)
+        
+        Returns:
+            Hata mesajı veya None
+        """
+        cmd = ["exec-in", f"tar -xf - -C {shlex.quote(remote_base)}"]
+        if device_serial:
+            cmd = ["-s", device_serial] + cmd
+        
+        chunk_size = config.RESTORE["chunk_size"]
+        sent = [0]
+        
+        def on_progress(count: int):
+            sent[0] += count
+        
+        start = time.perf_counter()
+        process = self.transport.popen(cmd, stdin=True)
+        watchdog = self._watch(self.transfer_deadline(sum(item["size"] for item in items)),
+                               lambda: sent[0], process)
+        error = None
+        try:
+            target = process.stdin
+            for item in items:
+                info = tarfile.TarInfo(item["path"])
+                info.size, info.mtime, info.mode = item["size"], item["mtime"], 0o660
+                target.write(info.tobuf(tarfile.PAX_FORMAT))
+                with item["open"]() as source:
+                    count = stream_copy.copy_stream(source, target, chunk_size,
+                                                    on_progress=on_progress)
+                if count != item["size"]:
+                    raise OSError(f"{item['path']}: boyut değişti ({item['size']} -> {count})")
+                if count % tarfile.BLOCKSIZE:
+                    target.write(b"\0" * (tarfile.BLOCKSIZE - count % tarfile.BLOCKSIZE))
+                self._emit_progress("transfer_progress", device_serial, path=remote_base,
+                                    bytes=item["size"])
+            target.write(b"\0" * (tarfile.BLOCKSIZE * 2))
+            target.close()
+            returncode = process.wait()
+        except OSError as e:
+            # BrokenPipeError: telefondaki tar erken çıktı (nedeni stderr'de)
+            error = str(e)
+            process.kill()
+            returncode = process.wait()
+        finally:
+            if watchdog is not None:
+                watchdog.stop()
+        stderr = self._decode_output(process.stderr.read() or b"").strip()
+        timed_out = watchdog is not None and watchdog.expired
+        if timed_out:
+            stderr, returncode = watchdog.message, -1
+        self.metrics.record_command(command_type(cmd), time.perf_counter() - start,
+                                    returncode == 0 and error is None, timed_out)
+        if returncode != 0 or error is not None:
+            return f"{remote_base}: {stderr or error or 'Bilinmeyen hata'}"
+        return None
+    
+    @traced()
+    def push_files(self, items: List[Dict], remote_base: str,
+                   device_serial: Optional[str] = None, streams: Optional[int] = None,
+                   skip_existing: bool = True) -> Dict:
+        """
+        Dosyaları telefondaki klasöre paralel tar akışlarıyla yazar
+        
+        Telefondaki dosyalar önce tek find çağrısıyla listelenir; boyutu ve
+        değişiklik zamanı aynı olanlar atlanır. Kalanlar toplam boyutları
+        dengeli akışlara bölünür, her akış tek bir adb exec-in sürecidir (çok
+        sayıda küçük dosyada dosya başına adb çağrısı yapılmaz). Bitince
+        klasör tekrar listelenir; boyutu veya tarihi tutmayan dosyalar başarısız sayılır.
+        
+        Args:
+            items: [{"path": remote_base'e göre yol, "size", "mtime", "open": akış açan fonksiyon}]
+            remote_base: Telefondaki hedef klasör
+            device_serial: Cihaz seri numarası
+            streams: Paralel akış sayısı (None ise config.RESTORE["streams"])
+            skip_existing: Telefonda aynısı olan dosyaları atla
+        
+        Returns:
+            {"success", "restored", "restored_count", "restored_bytes", "skipped_count",
+             "failed", "errors", "seconds"}
+        """
+        streams = max(1, streams or config.RESTORE["streams"])
+        start = time.perf_counter()
+        errors = []
+        
+        with self.tracer.span("remote_listing", serial=device_serial):
+            existing = self._list_remote_files(remote_base, device_serial)
+        if existing is None:
+            errors.append(f"{remote_base}: telefondaki dosyalar listelenemedi")
+            existing = {}
+        pending = [item for item in items
+                   if not skip_existing or existing.get(item["path"]) != (item["size"], item["mtime"])]
+        
+        total_bytes = sum(item["size"] for item in pending)
+        self._emit_progress("transfer_started", device_serial, path=remote_base, total=total_bytes)
+        groups = self._balance_streams(pending, streams)
+        if groups:
+            with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="push") as executor:
+                for error in executor.map(
+                        lambda group: self._push_tar(remote_base, group, device_serial), groups):
+                    if error:
+                        errors.append(error)
+        
+        failed = []
+        if pending:
+            with self.tracer.span("remote_listing", serial=device_serial):
+                written = self._list_remote_files(remote_base, device_serial) or {}
+            failed = [item["path"] for item in pending
+                      if written.get(item["path"]) != (item["size"], item["mtime"])]
+        failed_set = set(failed)
+        restored = [item for item in pending if item["path"] not in failed_set]
+        restored_bytes = sum(item["size"] for item in restored)
+        duration = time.perf_counter() - start
+        if restored:
+            self.metrics.record_transfer(restored_bytes, len(restored), duration)
+        self._emit_progress("transfer_finished", device_serial, path=remote_base,
+                            success=not failed)
+        
+        return {
+            "success": not failed and not (errors and pending),
+            "restored": [item["path"] for item in restored],
+            "restored_count": len(restored),
+            "restored_bytes": restored_bytes,
+            "skipped_count": len(items) - len(pending),
+            "failed": failed,
+            "errors": errors,
+            "seconds": duration
+        }
+    
+    def scan_media(self, remote_paths: List[str], device_serial: Optional[str] = None) -> bool:
+        """
+        Medya taramasını tek shell çağrısında başlatır (klasörler alt
+        klasörleriyle taranır; komut config.RESTORE["scan_command"])
+        """
+        if not remote_paths:
+            return True
+        template = config.RESTORE["scan_command"]
+        command = " ; ".join(template.format(uri=shlex.quote(f"file://{path}"))
+                             for path in remote_paths)
+        return self.execute_shell_command(command, device_serial)["success"]
+    
+    @traced()
+    def restore_whatsapp(self, source: str, device_serial: Optional[str] = None,
+                         streams: Optional[int] = None, skip_existing: Optional[bool] = None,
+                         media_scan: Optional[bool] = None,
+                         store_root: Optional[str] = None) -> Dict:
+        """
+        WhatsApp yedeğini (veritabanları + medya) telefona geri yükler
+        
+        Args:
+            source: whatsapp_backup klasörü, onu içeren çıktı klasörü veya nesne
+                    deposu manifest kimliği (bkz. whatsapp_restore.load_items)
+            device_serial: Hedef cihaz seri numarası
+            streams: Paralel akış sayısı (None ise config.RESTORE["streams"])
+            skip_existing: Telefonda aynısı olan dosyaları atla (None ise config.RESTORE)
+            media_scan: Bitince medya taramasını başlat (None ise config.RESTORE)
+            store_root: Nesne deposu klasörü (manifest kaynağı için)
+        
+        Returns:
+            push_files sonucu ve "remote_base", "total_count", "scanned"
+        """
+        settings = config.RESTORE
+        # Manifest kaynağında nesneler aktarım sırasında okunur; gc beklesin
+        with whatsapp_restore.source_session(source, store_root):
+            try:
+                items = whatsapp_restore.load_items(source, store_root)
+            except whatsapp_restore.RestoreSourceError as e:
+                return {"success": False, "message": str(e), "restored": [], "restored_count": 0,
+                        "restored_bytes": 0, "skipped_count": 0, "failed": [], "errors": [str(e)],
+                        "seconds": 0.0, "total_count": 0, "remote_base": None, "scanned": False}
+            
+            # Yeni telefonda WhatsApp klasörü henüz yoksa güncel Android konumu kullanılır
+            media_path = self.find_whatsapp_paths(device_serial).get("media")
+            remote_base = media_path.rsplit("/", 1)[0] if media_path else settings["whatsapp_base"]
+            
+            result = self.push_files(
+                items, remote_base, device_serial, streams,
+                settings["skip_existing"] if skip_existing is None else skip_existing
+            )
+            result.update(remote_base=remote_base, total_count=len(items), scanned=False)
+            if settings["media_scan"] if media_scan is None else media_scan:
+                folders = sorted({"/".join(path.split("/")[:2]) for path in result["restored"]
+                                  if path.startswith("Media/")})
+                if folders:
+                    result["scanned"] = self.scan_media([f"{remote_base}/{folder}" for folder in folders],
+                                                        device_serial)
+            return result
+    
+    @traced()
     def find_whatsapp_paths(self, device_serial: Optional[str] = None) -> Dict:
         """
         WhatsApp klasörlerini ve dosyalarını bulur
@@ -610,14 +1918,17 @@ class ADBManager:
         
         return paths
     
+    @traced()
     def backup_whatsapp_databases(self, output_dir: str,
-                                  device_serial: Optional[str] = None) -> Dict:
+                                  device_serial: Optional[str] = None,
+                                  verify: bool = False) -> Dict:
         """
         WhatsApp veritabanı dosyalarını yedekler
         
         Args:
             output_dir: Yedek dosyalarının kaydedileceği klasör
             device_serial: Cihaz seri numarası
+            verify: True ise indirilen dosyalar hash ile doğrulanır
         
         Returns:
             İşlem sonucu ve indirilen dosyalar
@@ -630,6 +1941,7 @@ class ADBManager:
         
         downloaded_files = []
         errors = []
+        verification = {}
         
         # WhatsApp klasörlerini bul
         whatsapp_paths = self.find_whatsapp_paths(device_serial)
@@ -645,11 +1957,14 @@ class ADBManager:
                     remote_path = f"{sdcard_db_path}/{file}"
                     local_path = os.path.join(databases_dir, file)
                     
-                    pull_result = self.pull_file(remote_path, local_path, device_serial)
+                    pull_result = self.pull_file(remote_path, local_path, device_serial,
+                                                 resumable=True, verify=verify)
+                    if "verification" in pull_result:
+                        verification[file] = pull_result["verification"]
                     if pull_result["success"]:
                         downloaded_files.append(local_path)
                     else:
-                        errors.append(f"{file}: {pull_result.get('stderr', 'Bilinmeyen hata')}")
+                        errors.append(f"{file}: {pull_result.get('message') or pull_result.get('stderr', 'Bilinmeyen hata')}")
         
         # /data/data/com.whatsapp/databases/ klasöründen çekmeyi dene (root gerektirir)
         app_db_path = "/data/data/com.whatsapp/databases"
@@ -669,7 +1984,10 @@ class ADBManager:
                     )
                     
                     if pull_result["success"]:
-                        temp_pull = self.pull_file(f"/sdcard/temp_{file}", local_path, device_serial)
+                        temp_pull = self.pull_file(f"/sdcard/temp_{file}", local_path,
+                                                   device_serial, verify=verify)
+                        if "verification" in temp_pull:
+                            verification[f"root_{file}"] = temp_pull["verification"]
                         if temp_pull["success"]:
                             downloaded_files.append(local_path)
                             # Geçici dosyayı sil
@@ -679,15 +1997,21 @@ class ADBManager:
             "success": len(downloaded_files) > 0,
             "downloaded_files": downloaded_files,
             "errors": errors,
+            "verification": verification,
             "output_dir": databases_dir
         }
     
+    @traced()
     def backup_whatsapp_media(self, output_dir: str,
                               include_images: bool = True,
                               include_videos: bool = True,
                               include_audio: bool = True,
                               include_documents: bool = True,
-                              device_serial: Optional[str] = None) -> Dict:
+                              device_serial: Optional[str] = None,
+                              verify: bool = False,
+                              filters: Optional[Dict] = None,
+                              pipeline=None,
+                              storage: str = "files") -> Dict:
         """
         WhatsApp medya dosyalarını yedekler
         
@@ -698,15 +2022,37 @@ class ADBManager:
             include_audio: Ses dosyalarını dahil et
             include_documents: Belgeleri dahil et
             device_serial: Cihaz seri numarası
+            verify: True ise indirilen dosyalar hash ile doğrulanır
+            filters: Tarih/boyut/tür filtreleri (bkz. media_filter.DEFAULT_FILTERS);
+                     telefonda tek find çağrısıyla değerlendirilir, sadece
+                     eşleşen dosyalar aktarılır
+            pipeline: media_pipeline.MediaPipeline; verilirse dosyalar klasör
+                      grupları halinde çekilir ve her grup iner inmez işlenmeye
+                      gönderilir (hash/tarih/küçük resim aktarımla eş zamanlı)
+            storage: "files" (her dosya ayrı), "pack" (dosyalar telefondan tar
+                     akışıyla okunup whatsapp_backup/media.pack paket deposuna
+                     eklenir; bilgisayarda tek tek dosya oluşturulmaz) veya
+                     "objects" (içerik adresli ortak depo, bkz. object_store.py;
+                     depoda zaten olan içerik tekrar aktarılmaz ve saklanmaz;
+                     manifest sadece hatasız çalıştırmada yazılır)
         
         Returns:
             İşlem sonucu
+        
+        Raises:
+            ValueError: Filtreler veya storage geçersizse
         """
+        if storage not in ("files", "pack", "objects"):
+            raise ValueError(f"Geçersiz storage: {storage} (geçerli: files, pack, objects)")
+        if storage != "files" and pipeline is not None:
+            raise ValueError("İşleme hattı paket deposuyla kullanılamaz (dosyalar diske yazılmıyor)")
+        
         whatsapp_dir = os.path.join(output_dir, "whatsapp_backup")
         os.makedirs(whatsapp_dir, exist_ok=True)
         
         media_dir = os.path.join(whatsapp_dir, "media")
-        os.makedirs(media_dir, exist_ok=True)
+        if storage == "files":
+            os.makedirs(media_dir, exist_ok=True)
         
         media_folders = []
         if include_images:
@@ -720,38 +2066,428 @@ class ADBManager:
         
         downloaded_count = 0
         errors = []
+        verification = {}
         
         # WhatsApp medya klasörünü bul
         whatsapp_paths = self.find_whatsapp_paths(device_serial)
         media_base = whatsapp_paths.get("media") or "/sdcard/WhatsApp/Media"
         
+        if storage == "pack":
+            with PackStore(os.path.join(whatsapp_dir, config.PACK_STORE["dir_name"])) as pack:
+                return self._backup_filtered_media(media_base, media_folders, pack.root,
+                                                   media_filter.normalize_filters(filters),
+                                                   device_serial, verify, pack=pack)
+        if storage == "objects":
+            objects = ObjectStore()
+            # Oturum açıkken gc depoda bulunan nesneleri silemez (manifest yazılana kadar)
+            with objects.session():
+                return self._backup_filtered_media(media_base, media_folders, objects.root,
+                                                   media_filter.normalize_filters(filters),
+                                                   device_serial, verify, objects=objects)
+        if media_filter.is_active(filters) or pipeline is not None:
+            return self._backup_filtered_media(media_base, media_folders, media_dir,
+                                               media_filter.normalize_filters(filters),
+                                               device_serial, verify, pipeline)
+        
         for remote_folder, local_folder in media_folders:
             remote_path = f"{media_base}/{remote_folder}"
             local_path = os.path.join(media_dir, local_folder)
             
-            # Klasörün varlığını kontrol et
-            check_result = self.execute_shell_command(f"test -d {remote_path} && echo 'exists'", device_serial)
+            # Klasörün varlığını kontrol et (aynı çağrıda boyutu da alınır;
+            # ilerleme çubuğu ve kalan süre tahmini için)
+            # Klasör adlarında boşluk olduğu için yol tırnak içine alınmalı
+            quoted = shlex.quote(remote_path)
+            check_result = self.execute_shell_command(
+                f"test -d {quoted} && echo 'exists' && du -sk {quoted} 2>/dev/null", device_serial
+            )
             if check_result["success"] and "exists" in check_result["stdout"]:
-                pull_result = self.pull_directory(remote_path, local_path, device_serial)
-                if pull_result["success"]:
+                size_match = re.search(r"^(\d+)\s", check_result["stdout"], re.MULTILINE)
+                expected_size = int(size_match.group(1)) * 1024 if size_match else None
+                with self.tracer.span("media_folder", folder=local_folder, serial=device_serial):
+                    pull_result = self.pull_directory(remote_path, local_path, device_serial,
+                                                      verify=verify, expected_size=expected_size)
+                if "verification" in pull_result:
+                    verification[local_folder] = pull_result["verification"]
+                if pull_result["success"] or "verification" in pull_result:
                     # İndirilen dosya sayısını say
                     if os.path.exists(local_path):
-                        file_count = sum([len(files) for _, _, files in os.walk(local_path)])
+                        with self.tracer.span("count_local_files", folder=local_folder) as span:
+                            file_count = sum([len(files) for _, _, files in os.walk(local_path)])
+                            span.set_tag("files", file_count)
                         downloaded_count += file_count
-                else:
-                    errors.append(f"{remote_folder}: {pull_result.get('stderr', 'Bilinmeyen hata')}")
+                if not pull_result["success"]:
+                    errors.append(f"{remote_folder}: {pull_result.get('message') or pull_result.get('stderr', 'Bilinmeyen hata')}")
         
         return {
             "success": downloaded_count > 0,
             "downloaded_count": downloaded_count,
             "errors": errors,
+            "verification": verification,
+            "output_dir": media_dir
+        }
+    
+    def _backup_filtered_media(self, media_base: str, media_folders: List, media_dir: str,
+                               filters: Dict, device_serial: Optional[str],
+                               verify: bool, pipeline=None, pack=None,
+                               objects=None) -> Dict:
+        """
+        Filtreli medya yedeği: tüm klasörler telefonda tek find ile taranır,
+        eşleşen dosyalar klasör yapısı korunarak toplu adb pull ile çekilir
+        (her grup indikten sonra varsa pipeline'a verilir). pack verilirse
+        dosyalar tar akışıyla doğrudan paket deposuna eklenir; objects verilirse
+        sadece depoda olmayan içerik aktarılır ve çalıştırmanın manifesti yazılır.
+        """
+        roots = {f"{media_base}/{remote_folder}": local_folder
+                 for remote_folder, local_folder in media_folders}
+        errors = []
+        
+        # Telefonun saati aynı çağrıda alınır (tarih filtreleri -mmin ile
+        # telefonun saatine göre değerlendirilir)
+        with self.tracer.span("media_filter_find", serial=device_serial) as span:
+            date_result = self.execute_shell_command("date +%s", device_serial)
+            device_now = None
+            if date_result["success"] and date_result["stdout"].strip().isdigit():
+                device_now = int(date_result["stdout"].strip())
+            find_command = media_filter.build_find_command(list(roots), filters,
+                                                           media_filter.STAT_ACTION, device_now)
+            remote_checksums = None
+            if verify:
+                # Aynı filtrelerle telefondaki hash'ler aktarımla eş zamanlı hesaplanır
+                hash_command = media_filter.build_find_command(
+                    list(roots), filters, integrity.REMOTE_HASH_COMMANDS[config.VERIFY["algorithm"]],
+                    device_now
+                )
+                executor = ThreadPoolExecutor(max_workers=1)
+                remote_checksums = executor.submit(self.execute_shell_command,
+                                                   f"{hash_command} 2>/dev/null", device_serial,
+                                                   "utf-8")
+                executor.shutdown(wait=False)
+            
+            # Liste satır satır işlenir (on binlerce dosyada tüm çıktı belleğe alınmaz);
+            # süre sabit değil, çıktı config.TIMEOUTS["shell"] saniye durursa kesilir
+            complete = []
+            
+            def listing_lines(lines):
+                for line in lines:
+                    if line.strip() == media_filter.LISTING_END:
+                        complete.append(True)
+                    else:
+                        yield line
+            
+            with self.stream_shell_command(
+                    f"{find_command} 2>/dev/null; echo {media_filter.LISTING_END}", device_serial,
+                    timeout=Deadline(inactivity=config.TIMEOUTS["shell"])) as listing:
+                entries = [entry for entry
+                           in media_filter.parse_stat_output(listing_lines(listing.iter_lines()))
+                           if media_filter.matches(entry, filters)]
+            span.set_tag("files", len(entries))
+        
+        if not listing.success or not complete:
+            # Yarım liste yedeklenirse eksik dosyalar hatasız görünür; hiçbir şey aktarılmaz
+            reason = listing.timeout_message or listing.stderr.strip() or "liste tamamlanmadı"
+            result = {
+                "success": False,
+                "downloaded_count": 0,
+                "downloaded_bytes": 0,
+                "matched_count": len(entries),
+                "errors": [f"{media_base}: dosya listesi alınamadı ({reason})"],
+                "verification": {},
+                "output_dir": media_dir
+            }
+            if pack is not None or objects is not None:
+                result["reused_count"] = 0
+            if objects is not None:
+                result["manifest"] = None
+            return result
+        
+        # Uzak yol -> yerel dizin; adb pull birden çok kaynağı aynı hedef dizine koyar
+        batches = {}
+        for entry in entries:
+            root = next((r for r in roots if entry["path"].startswith(r + "/")), None)
+            if root is None:
+                continue
+            relative_dir = os.path.dirname(entry["path"][len(root) + 1:])
+            if pack is not None or objects is not None:
+                entry["store_path"] = f"{roots[root]}/{entry['path'][len(root) + 1:]}"
+                batches.setdefault(None, []).append(entry)
+                continue
+            local_dir = os.path.join(media_dir, roots[root], *filter(None, relative_dir.split("/")))
+            entry["local_path"] = os.path.join(local_dir, os.path.basename(entry["path"]))
+            batches.setdefault(local_dir, []).append(entry)
+        
+        limit = config.MEDIA_FILTER["pull_batch_chars"]
+        reused = []
+        if objects is not None:
+            with self.tracer.span("object_store_dedup", serial=device_serial) as span:
+                reused, pending = self._find_stored_objects(objects, batches.get(None, []),
+                                                            device_serial, limit)
+                span.set_tag("reused", len(reused))
+            batches = {None: pending}
+        elif pack is not None:
+            # Paketteki kaydı yolu, boyutu ve tarihi aynı olan dosyalar tekrar eklenmez
+            pending = []
+            for entry in batches.get(None, []):
+                if pack.is_current(entry["store_path"], entry["size"], entry["mtime"]):
+                    reused.append(entry)
+                else:
+                    pending.append(entry)
+            batches = {None: pending}
+        
+        total_bytes = sum(entry["size"] for entry in entries) - sum(e["size"] for e in reused)
+        self._emit_progress("transfer_started", device_serial, path=media_base, total=total_bytes)
+        start = time.perf_counter()
+        downloaded = []
+        
+        if pack is not None or objects is not None:
+            def consume(entry, stream, member):
+                if pack is not None:
+                    pack.add_stream(entry["store_path"], stream, mtime=member.mtime,
+                                    size=member.size)
+                else:
+                    entry["hash"] = objects.put_stream(stream)[0]
+            
+            for batch in self._split_batches(batches.get(None, []), limit):
+                stored, error = self._stream_tar(media_base, batch, consume, device_serial)
+                if pack is not None:
+                    pack.flush()
+                downloaded.extend(stored)
+                if error:
+                    errors.append(error)
+            batches = {}
+        
+        for local_dir, batch_entries in batches.items():
+            os.makedirs(local_dir, exist_ok=True)
+            batch, length = [], 0
+            for entry in batch_entries + [None]:
+                if entry is not None and (not batch or length + len(entry["path"]) < limit):
+                    batch.append(entry)
+                    length += len(entry["path"]) + 1
+                    continue
+                cmd = ["pull", "-a"] + [e["path"] for e in batch] + [local_dir]
+                if device_serial:
+                    cmd = ["-s", device_serial] + cmd
+                local_paths = [e["local_path"] for e in batch]
+                since = time.time() - 1
+                result = self._run_watched(
+                    cmd, self.transfer_deadline(sum(e["size"] for e in batch)),
+                    lambda: self._fresh_files_size(local_paths, since)
+                )
+                pulled = [e for e in batch if os.path.isfile(e["local_path"])]
+                downloaded.extend(pulled)
+                if pipeline is not None:
+                    pipeline.submit([e["local_path"] for e in pulled])
+                self._emit_progress("transfer_progress", device_serial, path=media_base,
+                                    bytes=sum(e["size"] for e in pulled))
+                if not result["success"] or len(pulled) < len(batch):
+                    errors.append(f"{local_dir}: {len(batch) - len(pulled)} dosya indirilemedi "
+                                  f"({result['stderr'].strip() or 'Bilinmeyen hata'})")
+                if entry is not None:
+                    batch, length = [entry], len(entry["path"]) + 1
+        
+        downloaded_bytes = sum(entry["size"] for entry in downloaded)
+        if downloaded:
+            self.metrics.record_transfer(downloaded_bytes, len(downloaded),
+                                         time.perf_counter() - start)
+        self._emit_progress("transfer_finished", device_serial, path=media_base,
+                            success=not errors)
+        
+        verification = {}
+        if remote_checksums is not None:
+            with self.tracer.span("verify_hash_local"):
+                algorithm = config.VERIFY["algorithm"]
+                matched_paths = {entry["path"] for entry in entries}
+                remote_output = remote_checksums.result()["stdout"]
+                if pack is not None:
+                    local_hashes = {e["store_path"]: pack.hash_entry(e["store_path"], algorithm)
+                                    for e in downloaded}
+                elif objects is not None:
+                    local_hashes = {e["store_path"]: e["hash"] if algorithm == "sha256"
+                                    else integrity.hash_file(objects.path(e["hash"]), algorithm)
+                                    for e in downloaded}
+                else:
+                    local_hashes = integrity.hash_files([e["local_path"] for e in downloaded],
+                                                        algorithm)
+                for root, local_folder in roots.items():
+                    # Sınırda kalıp matches() ile elenen dosyalar karşılaştırılmaz
+                    remote = {relative: digest for relative, digest
+                              in integrity.parse_checksum_output(remote_output, root).items()
+                              if f"{root}/{relative}" in matched_paths}
+                    if pack is not None or objects is not None:
+                        local = {path[len(local_folder) + 1:]: digest
+                                 for path, digest in local_hashes.items()
+                                 if path.startswith(local_folder + "/")}
+                    else:
+                        local_root = os.path.join(media_dir, local_folder)
+                        local = {os.path.relpath(path, local_root).replace(os.sep, "/"): digest
+                                 for path, digest in local_hashes.items()
+                                 if path.startswith(local_root + os.sep)}
+                    if pack is not None or objects is not None:
+                        # Depodan alınan dosyalar bu çalıştırmada aktarılmadı
+                        transferred = {e["path"] for e in downloaded}
+                        remote = {relative: digest for relative, digest in remote.items()
+                                  if f"{root}/{relative}" in transferred}
+                    if remote:
+                        verification[local_folder] = integrity.compare_checksums(remote, local,
+                                                                                 algorithm)
+        
+        manifest_id = None
+        if objects is not None:
+            stored = reused + downloaded
+            # Eksik çalıştırma manifest bırakmaz; yoksa saklama politikası onu
+            # yedek sayıp eski tam yedekleri silebilir
+            if not errors:
+                manifest_id = objects.write_manifest(
+                    device_serial or "unknown",
+                    [{"path": e["store_path"], "hash": e["hash"], "size": e["size"],
+                      "mtime": e["mtime"]} for e in sorted(stored, key=lambda e: e["store_path"])],
+                    {"source": media_base}
+                )
+            downloaded = stored
+        elif pack is not None:
+            downloaded = reused + downloaded
+        
+        result = {
+            "success": manifest_id is not None if objects is not None else len(downloaded) > 0,
+            "downloaded_count": len(downloaded),
+            "downloaded_bytes": downloaded_bytes,
+            "matched_count": len(entries),
+            "errors": errors,
+            "verification": verification,
             "output_dir": media_dir
         }
+        if pack is not None:
+            result["reused_count"] = len(reused)
+        if objects is not None:
+            result["manifest"] = manifest_id
+            result["reused_count"] = len(reused)
+        return result
+    
+    @staticmethod
+    def _split_batches(entries: List[Dict], limit: int) -> List[List[Dict]]:
+        """Dosyaları toplam yol uzunluğu `limit`i geçmeyecek gruplara böler"""
+        batches, batch, length = [], [], 0
+        for entry in entries:
+            if batch and length + len(entry["path"]) >= limit:
+                batches.append(batch)
+                batch, length = [], 0
+            batch.append(entry)
+            length += len(entry["path"]) + 1
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _find_stored_objects(self, objects, entries: List[Dict],
+                             device_serial: Optional[str], limit: int):
+        """
+        Nesne deposunda zaten bulunan dosyaları ayırır
+        
+        Önce cihazın son manifestine bakılır (yol, boyut ve değişiklik zamanı
+        aynıysa hash'i bilinir). Kalan dosyalar config.OBJECT_STORE["remote_hash"]
+        açıksa telefonda sha256sum ile hash'lenir; başka cihazdan veya eski bir
+        çalıştırmadan depoda olan içerik aktarılmaz.
+        
+        Returns:
+            (depodan alınan girdiler, aktarılacak girdiler)
+        """
+        previous = objects.latest_manifest(device_serial or "unknown")
+        known = {e["path"]: e for e in previous["entries"]} if previous else {}
+        reused, pending = [], []
+        for entry in entries:
+            old = known.get(entry["store_path"])
+            if old and old["size"] == entry["size"] and old["mtime"] == entry["mtime"] \
+                    and objects.has(old["hash"]):
+                entry["hash"] = old["hash"]
+                objects.touch(old["hash"])
+                reused.append(entry)
+            else:
+                pending.append(entry)
+        
+        if not pending or not config.OBJECT_STORE["remote_hash"]:
+            return reused, pending
+        
+        remaining = []
+        for batch in self._split_batches(pending, limit):
+            result = self.execute_shell_command(
+                "sha256sum " + " ".join(shlex.quote(e["path"]) for e in batch) + " 2>/dev/null",
+                device_serial, encoding="utf-8"
+            )
+            digests = {}
+            for line in result["stdout"].splitlines():
+                parts = integrity.split_checksum_line(line)
+                if parts is not None:
+                    digests[parts[1]] = parts[0]
+            for entry in batch:
+                digest = digests.get(entry["path"])
+                if digest and objects.has(digest):
+                    entry["hash"] = digest
+                    objects.touch(digest)
+                    reused.append(entry)
+                else:
+                    remaining.append(entry)
+        return reused, remaining
     
+    def _stream_tar(self, media_base: str, batch: List[Dict], consume: Callable,
+                    device_serial: Optional[str]):
+        """
+        Dosyaları telefonda tar ile paketleyip exec-out akışından okur ve her
+        dosyayı consume(girdi, akış, tar üyesi) ile depoya verir (bilgisayarda
+        ara dosya oluşturulmaz)
+        
+        Returns:
+            (eklenen girdiler, hata mesajı veya None)
+        """
+        by_name = {entry["path"][len(media_base) + 1:]: entry for entry in batch}
+        command = f"tar -cf - -C {shlex.quote(media_base)} " + \
+                  " ".join(shlex.quote(name) for name in by_name)
+        cmd = ["exec-out", command]
+        if device_serial:
+            cmd = ["-s", device_serial] + cmd
+        
+        stored = []
+        start = time.perf_counter()
+        process = self.transport.popen(cmd)
+        stdout = CountingReader(process.stdout)
+        watchdog = self._watch(self.transfer_deadline(sum(entry["size"] for entry in batch)),
+                               lambda: stdout.count, process)
+        try:
+            with tarfile.open(fileobj=stdout, mode="r|") as archive:
+                for member in archive:
+                    name = member.name[2:] if member.name.startswith("./") else member.name
+                    entry = by_name.get(name)
+                    if entry is None or not member.isfile():
+                        continue
+                    consume(entry, archive.extractfile(member), member)
+                    stored.append(entry)
+                    self._emit_progress("transfer_progress", device_serial, path=media_base,
+                                        bytes=member.size)
+            stderr = process.stderr.read().decode("utf-8", errors="ignore")
+            returncode = process.wait()
+        except (tarfile.TarError, OSError) as e:
+            process.kill()
+            process.wait()
+            stderr, returncode = str(e), -1
+        finally:
+            if watchdog is not None:
+                watchdog.stop()
+        timed_out = watchdog is not None and watchdog.expired
+        if timed_out:
+            stderr, returncode = watchdog.message, -1
+        self.metrics.record_command(command_type(cmd), time.perf_counter() - start,
+                                    returncode == 0, timed_out)
+        
+        if returncode != 0 or len(stored) < len(batch):
+            return stored, (f"{media_base}: {len(batch) - len(stored)} dosya depoya eklenemedi "
+                            f"({stderr.strip() or 'Bilinmeyen hata'})")
+        return stored, None
+    
+    @traced()
     def backup_whatsapp_complete(self, output_dir: str,
                                 include_databases: bool = True,
                                 include_media: bool = True,
-                                device_serial: Optional[str] = None) -> Dict:
+                                device_serial: Optional[str] = None,
+                                verify: bool = False,
+                                pipeline=None,
+                                storage: str = "files") -> Dict:
         """
         WhatsApp'ın tam yedeğini alır (veritabanları + medya)
         
@@ -760,6 +2496,9 @@ class ADBManager:
             include_databases: Veritabanlarını dahil et
             include_media: Medya dosyalarını dahil et
             device_serial: Cihaz seri numarası
+            verify: True ise indirilen dosyalar hash ile doğrulanır
+            pipeline: Medya için işleme hattı (bkz. backup_whatsapp_media)
+            storage: Medya depolama biçimi: "files" veya "pack" (bkz. backup_whatsapp_media)
         
         Returns:
             İşlem sonucu
@@ -775,7 +2514,8 @@ class ADBManager:
         
         if include_databases:
             print("\n[KURULUM] WhatsApp veritabanları yedekleniyor...")
-            results["databases"] = self.backup_whatsapp_databases(output_dir, device_serial)
+            results["databases"] = self.backup_whatsapp_databases(output_dir, device_serial,
+                                                                  verify=verify)
             if results["databases"]["success"]:
                 print(f"[OK] {len(results['databases']['downloaded_files'])} veritabanı dosyası indirildi")
             else:
@@ -783,14 +2523,42 @@ class ADBManager:
         
         if include_media:
             print("\n[KURULUM] WhatsApp medya dosyaları yedekleniyor...")
-            results["media"] = self.backup_whatsapp_media(output_dir, device_serial=device_serial)
+            results["media"] = self.backup_whatsapp_media(output_dir, device_serial=device_serial,
+                                                          verify=verify, pipeline=pipeline,
+                                                          storage=storage)
             if results["media"]["success"]:
                 print(f"[OK] {results['media']['downloaded_count']} medya dosyası indirildi")
             else:
                 print("[UYARI] Medya dosyaları bulunamadı")
         
+        if verify:
+            self._print_verification_summary(results)
+        
         results["success"] = (results["databases"] and results["databases"]["success"]) or \
                             (results["media"] and results["media"]["success"])
         
         return results
-
+    
+    @staticmethod
+    def _print_verification_summary(results: Dict):
+        """Yedekleme sonuçlarındaki doğrulama raporlarını özetler"""
+        checked = 0
+        failed = []
+        for part in ("databases", "media"):
+            if not results.get(part):
+                continue
+            for name, report in results[part].get("verification", {}).items():
+                checked += report["checked"]
+                for relative in report["mismatches"] + report["missing"]:
+                    failed.append(f"{name}/{relative}" if relative != name else name)
+                if report.get("error"):
+                    failed.append(f"{name}: {report['error']}")
+        
+        if failed:
+            print(f"[UYARI] Bütünlük doğrulaması: {len(failed)} sorunlu dosya")
+            for item in failed[:20]:
+                print(f"  - {item}")
+            if len(failed) > 20:
+                print(f"  ... ve {len(failed) - 20} dosya daha")
+        else:
+            print(f"[OK] Bütünlük doğrulaması: {checked} dosya telefondakiyle aynı")
@@ -0,0 +1,536 @@
+"""
+Yerel Cihaz Servisi (Agent)
+ADBManager'ı sürekli açık tutan, cihazları izleyen ve işlemleri yerel HTTP
+API üzerinden sunan servis. Scriptler ve GUI her seferinde adb'yi bulmak,
+cihazları listelemek ve WhatsApp yollarını taramak yerine bu servise bağlanır.
+
+Kullanım:
+    python agent.py                 # 127.0.0.1:8765 üzerinde başlatır
+    python agent.py --port 9000
+
+API (JSON):
+    GET  /status                    servis durumu
+    GET  /devices                   bağlı cihazlar (arka planda izlenir)
+    GET  /devices/<seri>            cihaz bilgileri (önbellekli, ?refresh=1)
+    GET  /devices/<seri>/whatsapp   WhatsApp yolları (önbellekli, ?refresh=1)
+    GET  /jobs                      işler
+    POST /jobs                      iş gönder (batch_runner ile aynı iş formatı)
+    GET  /jobs/<id>                 iş durumu ve sonuçları
+    GET  /jobs/<id>/events          ilerleme olayları (NDJSON akışı, ?from=N)
+    POST /devices/<seri>/whatsapp/backup
+                                    WhatsApp yedeği (output/whatsapp_backup, tek başına
+                                    çalışan baslat_whatsapp_yedek.py ile aynı konum)
+    GET  /metrics                   Prometheus metrikleri
+    POST /shutdown                  servisi kapatır
+
+Güvenlik: Servis yalnızca Host başlığı 127.0.0.1/localhost olan istekleri kabul
+eder (DNS rebinding), her istekte config.AGENT["token_file"] dosyasındaki anahtar
+"Authorization: Bearer <anahtar>" olarak gönderilmelidir ve POST gövdesi
+application/json olmalıdır (tarayıcıların basit text/plain isteklerine kapalı).
+Anahtar her açılışta yeniden üretilir. Çıktılar her zaman servisin seçtiği
+klasöre yazılır; iş tanımındaki "output_dir" kabul edilmez.
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import uuid
+import secrets
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+import config
+import jobs
+from adb_manager import ADBManager
+from installer import AutoInstaller
+
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+# WhatsApp yol taraması bu süre boyunca tekrar kullanılır (saniye)
+WHATSAPP_PATHS_TTL = 60
+
+# Kabul edilen Host başlıkları (port hariç)
+ALLOWED_HOSTS = ("127.0.0.1", "localhost")
+
+
+def write_token(path: str, token: str):
+    """Erişim anahtarını yalnızca kullanıcının okuyabileceği dosyaya yazar"""
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    os.replace(temp_path, path)
+
+
+def remove_token(path: str, token: str):
+    """Anahtar dosyası hâlâ bu servise aitse siler"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read().strip() == token:
+                os.remove(path)
+    except OSError:
+        pass
+
+
+class CachingADBManager(ADBManager):
+    """find_whatsapp_paths sonucunu cihaz başına kısa süre önbelleğe alan ADBManager"""
+
+    def __init__(self, *args, **kwargs):
+        self._paths_cache: Dict[str, tuple] = {}
+        self._paths_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def find_whatsapp_paths(self, device_serial: Optional[str] = None) -> Dict:
+        now = time.monotonic()
+        with self._paths_lock:
+            cached = self._paths_cache.get(device_serial)
+        if cached and now - cached[0] < WHATSAPP_PATHS_TTL:
+            return json.loads(cached[1])
+        paths = super().find_whatsapp_paths(device_serial)
+        with self._paths_lock:
+            self._paths_cache[device_serial] = (now, json.dumps(paths))
+        return paths
+
+    def forget_device(self, device_serial: str):
+        """Cihazın önbelleğe alınmış yollarını siler"""
+        with self._paths_lock:
+            self._paths_cache.pop(device_serial, None)
+
+
+class AgentJob:
+    """Servise gönderilmiş bir iş ve ilerleme olayları"""
+
+    def __init__(self, spec: Dict, tasks: List[Dict], output_root: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.spec = spec
+        self.tasks = tasks
+        self.output_root = output_root
+        self.status = "queued"
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.finished_at = None
+        self.summary = None
+        self.events: List[Dict] = []
+        self._condition = threading.Condition()
+
+    def add_event(self, event: Dict):
+        with self._condition:
+            event["seq"] = len(self.events)
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def wait_events(self, start: int, timeout: float = 15.0) -> List[Dict]:
+        """
+        `start` sırasından itibaren olayları döndürür; yeni olay yoksa
+        `timeout` kadar bekler (iş bittiyse beklemez)
+        """
+        with self._condition:
+            if len(self.events) <= start and self.status not in ("finished", "failed"):
+                self._condition.wait(timeout)
+            return self.events[start:]
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("finished", "failed")
+
+    def to_dict(self, include_tasks: bool = True) -> Dict:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "output_dir": os.path.abspath(self.output_root),
+            "summary": self.summary,
+            "events": len(self.events)
+        }
+        if include_tasks:
+            data["tasks"] = self.tasks
+        return data
+
+
+class DeviceAgent:
+    """ADBManager durumunu, cihaz izlemeyi ve işleri sahiplenen servis çekirdeği"""
+
+    def __init__(self, adb: CachingADBManager, poll_interval: float = 2.0,
+                 max_parallel: int = 4, max_jobs: int = 100):
+        self.adb = adb
+        self.poll_interval = poll_interval
+        self.max_parallel = max_parallel
+        self.max_jobs = max_jobs
+        self.started_at = time.time()
+        self._devices: List[Dict] = []
+        self._device_info: Dict[str, Dict] = {}
+        self._device_locks: Dict[str, threading.Lock] = {}
+        self._jobs: "OrderedDict[str, AgentJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._tracker = None
+
+    def start(self):
+        """Cihaz izleme iş parçacığını başlatır"""
+        self.refresh_devices()
+        self._tracker = threading.Thread(target=self._track_devices, name="device-tracker", daemon=True)
+        self._tracker.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _track_devices(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh_devices()
+            except Exception as e:
+                print(f"[UYARI] Cihaz listesi alınamadı: {str(e)}")
+
+    def refresh_devices(self) -> List[Dict]:
+        """Cihaz listesini yeniler; ayrılan cihazların önbelleğini temizler"""
+        devices = self.adb.get_devices()
+        online = {d["serial"] for d in devices if d["status"] == "device"}
+        with self._lock:
+            previous = {d["serial"] for d in self._devices if d["status"] == "device"}
+            self._devices = devices
+            for serial in previous - online:
+                self._device_info.pop(serial, None)
+                self.adb.forget_device(serial)
+        for serial in online - previous:
+            print(f"[OK] Cihaz bağlandı: {serial}")
+        for serial in previous - online:
+            print(f"[BILGI] Cihaz ayrıldı: {serial}")
+        return devices
+
+    def devices(self) -> List[Dict]:
+        with self._lock:
+            return list(self._devices)
+
+    def connected_serials(self) -> List[str]:
+        return [d["serial"] for d in self.devices() if d["status"] == "device"]
+
+    def device_info(self, serial: str, refresh: bool = False) -> Optional[Dict]:
+        with self._lock:
+            info = self._device_info.get(serial)
+        if info is None or refresh:
+            info = self.adb.get_device_info(serial)
+            if info:
+                with self._lock:
+                    self._device_info[serial] = info
+        return info
+
+    def whatsapp_paths(self, serial: str, refresh: bool = False) -> Dict:
+        if refresh:
+            self.adb.forget_device(serial)
+        return self.adb.find_whatsapp_paths(serial)
+
+    def submit(self, spec: Dict, task_output_dir: Optional[str] = None) -> AgentJob:
+        """
+        İşi kuyruğa alır ve arka planda çalıştırır
+
+        Çıktılar output/agent/<çalıştırma>/ altına yazılır; klasörü istemci seçemez.
+
+        Args:
+            spec: İş tanımı (batch_runner formatı)
+            task_output_dir: Görevlerin çıktı klasörü (servis içinden; None ise
+                             output/agent/<çalıştırma>/<iş>/<seri>)
+
+        Raises:
+            ValueError: İş tanımı geçersizse
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("İş tanımı bir sözlük olmalı")
+        if "output_dir" in spec:
+            raise ValueError("'output_dir' desteklenmiyor; çıktı klasörünü servis belirler")
+        errors = jobs.validate_job_spec(spec)
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        tasks = jobs.build_tasks(spec, self.connected_serials())
+        if task_output_dir:
+            for task in tasks:
+                task["output_dir"] = task_output_dir
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_root = os.path.join(config.OUTPUT_DIR, "agent", f"{run_id}_{uuid.uuid4().hex[:6]}")
+        job = AgentJob(spec, tasks, output_root)
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, j in self._jobs.items() if j.done]
+            for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+                del self._jobs[job_id]
+
+        threading.Thread(target=self._run_job, args=(job,), name=f"agent-job-{job.id}",
+                         daemon=True).start()
+        return job
+
+    def backup_whatsapp(self, serial: str) -> AgentJob:
+        """
+        WhatsApp yedeğini (veritabanları + medya) tek başına çalışan
+        baslat_whatsapp_yedek.py ile aynı yere (output/whatsapp_backup) alır
+        """
+        spec = {"jobs": [{"name": "whatsapp_backup", "devices": [serial],
+                          "operations": [{"type": "whatsapp_backup"}]}]}
+        return self.submit(spec, task_output_dir=config.OUTPUT_DIR)
+
+    def _run_job(self, job: AgentJob):
+        job.status = "running"
+        job.add_event({"event": "job_started", "job_id": job.id, "time": time.time()})
+        scheduler = jobs.JobScheduler(
+            self.adb,
+            max_parallel=job.spec.get("max_parallel", self.max_parallel),
+            limits=job.spec.get("limits"),
+            continue_on_error=job.spec.get("continue_on_error", True),
+            progress=job.add_event,
+            device_locks=self._device_locks
+        )
+        try:
+            scheduler.run(job.tasks, job.output_root)
+            job.summary = jobs.summarize(job.tasks)
+            jobs.write_report(os.path.join(job.output_root, "report.json"),
+                              dict(job.to_dict(), spec=job.spec))
+            job.status = "finished"
+        except Exception as e:
+            job.summary = {"error": f"{type(e).__name__}: {str(e)}"}
+            job.status = "failed"
+        job.finished_at = datetime.now().isoformat(timespec="seconds")
+        job.add_event({"event": "job_finished", "job_id": job.id, "status": job.status,
+                       "summary": job.summary, "time": time.time()})
+
+    def get_job(self, job_id: str) -> Optional[AgentJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict]:
+        with self._lock:
+            return [job.to_dict(include_tasks=False) for job in self._jobs.values()]
+
+    def status(self) -> Dict:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if not job.done)
+        return {
+            "pid": os.getpid(),
+            "adb_path": self.adb.adb_path,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "devices": self.connected_serials(),
+            "jobs_running": running
+        }
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """DeviceAgent'ı HTTP üzerinden sunan istek işleyici"""
+
+    agent: DeviceAgent = None
+    token: str = ""
+    server_version = "ADBManagerAgent/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status: int = 200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json({"error": message}, status)
+
+    def _read_json(self) -> Optional[Dict]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return None
+
+    def _authorize(self, require_json: bool = False) -> bool:
+        """
+        Host, erişim anahtarı ve (POST için) içerik türünü kontrol eder;
+        uygun değilse hata yanıtını gönderip False döndürür
+        """
+        host = (self.headers.get("Host") or "").strip().lower()
+        if host.startswith("["):
+            name = host.split("]", 1)[0] + "]"
+        else:
+            name = host.rsplit(":", 1)[0] if ":" in host else host
+        if name not in ALLOWED_HOSTS:
+            self._send_error(403, "Geçersiz Host başlığı")
+            return False
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() != "bearer" or not self.token \
+                or not hmac.compare_digest(token.strip().encode("utf-8"), self.token.encode("utf-8")):
+            self._send_error(401, "Geçersiz veya eksik erişim anahtarı")
+            return False
+        if require_json:
+            content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+            if content_type != "application/json":
+                self._send_error(415, "İstek gövdesi application/json olmalı")
+                return False
+        return True
+
+    def do_GET(self):
+        if not self._authorize():
+            return
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = parse_qs(url.query)
+        refresh = query.get("refresh", ["0"])[0] == "1"
+        agent = self.agent
+
+        if parts == ["status"]:
+            return self._send_json(agent.status())
+        if parts == ["devices"]:
+            return self._send_json(agent.devices())
+        if len(parts) == 2 and parts[0] == "devices":
+            if parts[1] not in agent.connected_serials():
+                return self._send_error(404, "Cihaz bağlı değil")
+            info = agent.device_info(parts[1], refresh)
+            if not info:
+                return self._send_error(502, "Cihaz bilgileri alınamadı")
+            return self._send_json(info)
+        if len(parts) == 3 and parts[0] == "devices" and parts[2] == "whatsapp":
+            if parts[1] not in agent.connected_serials():
+                return self._send_error(404, "Cihaz bağlı değil")
+            return self._send_json(agent.whatsapp_paths(parts[1], refresh))
+        if parts == ["jobs"]:
+            return self._send_json(agent.list_jobs())
+        if len(parts) >= 2 and parts[0] == "jobs":
+            job = agent.get_job(parts[1])
+            if job is None:
+                return self._send_error(404, "İş bulunamadı")
+            if len(parts) == 2:
+                return self._send_json(job.to_dict())
+            if len(parts) == 3 and parts[2] == "events":
+                return self._stream_events(job, int(query.get("from", ["0"])[0]))
+        if parts == ["metrics"]:
+            body = agent.adb.metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self._send_error(404, "Bilinmeyen adres")
+
+    def _stream_events(self, job: AgentJob, start: int):
+        """İlerleme olaylarını iş bitene kadar satır satır (NDJSON) gönderir"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        position = start
+        try:
+            while True:
+                events = job.wait_events(position)
+                for event in events:
+                    self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                if not events:
+                    # Uzun işlemlerde bağlantının açık kaldığını bildiren boş satır
+                    self.wfile.write(b"\n")
+                self.wfile.flush()
+                position += len(events)
+                if job.done and position >= len(job.events):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self):
+        if not self._authorize(require_json=True):
+            return
+        parts = [unquote(p) for p in urlparse(self.path).path.strip("/").split("/") if p]
+        if parts == ["jobs"]:
+            spec = self._read_json()
+            if spec is None:
+                return self._send_error(400, "Geçersiz JSON")
+            try:
+                job = self.agent.submit(spec)
+            except ValueError as e:
+                return self._send_error(400, str(e))
+            return self._send_json(job.to_dict(), 202)
+        if len(parts) == 4 and parts[0] == "devices" and parts[2:] == ["whatsapp", "backup"]:
+            if parts[1] not in self.agent.connected_serials():
+                return self._send_error(404, "Cihaz bağlı değil")
+            return self._send_json(self.agent.backup_whatsapp(parts[1]).to_dict(), 202)
+        if parts == ["shutdown"]:
+            self._send_json({"status": "stopping"})
+            self.agent.stop()
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        self._send_error(404, "Bilinmeyen adres")
+
+
+def create_server(agent: DeviceAgent, host: str, port: int, token: str) -> ThreadingHTTPServer:
+    """
+    Agent için HTTP sunucusu oluşturur (port 0 ise boş bir port seçilir)
+
+    Args:
+        token: İsteklerde beklenen erişim anahtarı (bkz. write_token)
+    """
+    handler = type("BoundAgentRequestHandler", (AgentRequestHandler,),
+                   {"agent": agent, "token": token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    settings = config.AGENT
+    parser = argparse.ArgumentParser(description="ADBManager yerel servis")
+    parser.add_argument("--host", default=settings["host"], help="Dinlenecek adres")
+    parser.add_argument("--port", type=int, default=settings["port"], help="Dinlenecek port")
+    parser.add_argument("--adb", default=None, help="adb yolu (None ise otomatik bulunur)")
+    args = parser.parse_args()
+
+    adb_path = args.adb
+    if adb_path is None:
+        is_installed, adb_location = AutoInstaller().check_adb()
+        if not is_installed:
+            print("[HATA] ADB bulunamadı!")
+            sys.exit(1)
+        if adb_location != "system":
+            adb_path = adb_location
+
+    adb = CachingADBManager(adb_path=adb_path)
+    agent = DeviceAgent(adb, settings["poll_interval"], settings["max_parallel"], settings["max_jobs"])
+    agent.start()
+    token = secrets.token_urlsafe(32)
+    try:
+        server = create_server(agent, args.host, args.port, token)
+    except OSError as e:
+        print(f"[HATA] {args.host}:{args.port} dinlenemedi: {str(e)}")
+        sys.exit(1)
+    # Anahtar port alındıktan sonra yazılır; çalışan başka bir servisin anahtarı ezilmez
+    write_token(settings["token_file"], token)
+
+    print(f"[OK] Servis çalışıyor: http://{args.host}:{server.server_port}")
+    print("[BILGI] Durdurmak için Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+        server.server_close()
+        remove_token(settings["token_file"], token)
+        adb.export_metrics()
+        adb.export_trace()
+        print("\n[OK] Servis durduruldu")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Yerel Servis İstemcisi
+agent.py servisine bağlanan ince istemci (yalnızca standart kütüphane)
+"""
+import json
+from http.client import HTTPException
+from typing import Dict, Iterator, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+import config
+
+
+class AgentError(Exception):
+    """Servis hatası veya servise ulaşılamaması"""
+
+
+class AgentClient:
+    """agent.py HTTP API'si için istemci"""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 timeout: float = 10.0, token_file: Optional[str] = None):
+        """
+        Args:
+            host: Servis adresi (None ise config.AGENT["host"])
+            port: Servis portu (None ise config.AGENT["port"])
+            timeout: İstek zaman aşımı (saniye; olay akışı için kullanılmaz)
+            token_file: Servisin erişim anahtarı dosyası (None ise config.AGENT["token_file"])
+        """
+        self.base_url = f"http://{host or config.AGENT['host']}:{port or config.AGENT['port']}"
+        self.timeout = timeout
+        self.token_file = token_file or config.AGENT["token_file"]
+
+    def _token(self) -> Optional[str]:
+        """Servisin bu açılıştaki anahtarı (her istekte okunur; servis yeniden başlamış olabilir)"""
+        try:
+            with open(self.token_file, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _request(self, method: str, path: str, data: Optional[Dict] = None,
+                 timeout: Optional[float] = None):
+        token = self._token()
+        if token is None:
+            raise AgentError("Servis çalışmıyor (erişim anahtarı yok)")
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        request = Request(self.base_url + path, data=body, method=method)
+        request.add_header("Authorization", f"Bearer {token}")
+        if body is not None:
+            request.add_header("Content-Type", "application/json")
+        try:
+            return urlopen(request, timeout=timeout or self.timeout)
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise AgentError(message)
+        except (URLError, OSError) as e:
+            raise AgentError(f"Servise ulaşılamadı: {str(e)}")
+
+    def _json(self, method: str, path: str, data: Optional[Dict] = None):
+        with self._request(method, path, data) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def is_running(self) -> bool:
+        """Servis çalışıyor mu (kısa zaman aşımıyla kontrol eder)"""
+        try:
+            with self._request("GET", "/status", timeout=0.5):
+                return True
+        except AgentError:
+            return False
+
+    def status(self) -> Dict:
+        return self._json("GET", "/status")
+
+    def devices(self) -> List[Dict]:
+        return self._json("GET", "/devices")
+
+    def device_info(self, serial: str, refresh: bool = False) -> Dict:
+        return self._json("GET", f"/devices/{quote(serial, safe='')}" + ("?refresh=1" if refresh else ""))
+
+    def whatsapp_paths(self, serial: str, refresh: bool = False) -> Dict:
+        return self._json("GET", f"/devices/{quote(serial, safe='')}/whatsapp" + ("?refresh=1" if refresh else ""))
+
+    def submit_job(self, spec: Dict) -> Dict:
+        """İş gönderir (batch_runner ile aynı format); iş durumunu döndürür"""
+        return self._json("POST", "/jobs", spec)
+
+    def backup_whatsapp(self, serial: str) -> Dict:
+        """WhatsApp yedeğini output/whatsapp_backup klasörüne aldırır; iş durumunu döndürür"""
+        return self._json("POST", f"/devices/{quote(serial, safe='')}/whatsapp/backup", {})
+
+    def job(self, job_id: str) -> Dict:
+        return self._json("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> List[Dict]:
+        return self._json("GET", "/jobs")
+
+    def events(self, job_id: str, start: int = 0) -> Iterator[Dict]:
+        """İşin ilerleme olaylarını iş bitene kadar akış olarak döndürür"""
+        with self._request("GET", f"/jobs/{job_id}/events?from={start}", timeout=3600) as response:
+            while True:
+                # Akış okunurken kopan bağlantı da servis hatası olarak bildirilir
+                try:
+                    line = response.readline()
+                except (OSError, HTTPException) as e:
+                    raise AgentError(f"Olay akışı kesildi: {str(e)}")
+                if not line:
+                    return
+                if line.strip():
+                    yield json.loads(line.decode("utf-8"))
+
+    def shutdown(self) -> Dict:
+        return self._json("POST", "/shutdown", {})
@@ -0,0 +1,260 @@
+"""
+Zamanlanmış Artımlı Yedekleme
+Bilinen bir cihaz bağlandığında, zamanı geldiyse (örn. her gece 02:00'den
+sonraki ilk bağlantıda) WhatsApp yedeğini içerik adresli nesne deposuna
+(object_store.py) alır. Değişmeyen medya tekrar aktarılmaz; her çalıştırma
+veritabanları ve medyayı içeren tek bir zaman noktası manifesti bırakır.
+Yedekten sonra günlük/haftalık saklama politikası uygulanır ve artık
+kullanılmayan nesneler silinir.
+
+Kullanım:
+    python backup_scheduler.py --device FAKE0001            # sürekli çalışır
+    python backup_scheduler.py --device FAKE0001 --at 03:30
+    python backup_scheduler.py --once                       # zamanı gelenleri yedekle ve çık
+    python backup_scheduler.py --once --force               # zamana bakmadan yedekle
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import threading
+from datetime import datetime, timedelta
+from datetime import time as day_time
+from typing import Dict, List, Optional
+
+import config
+from adb_manager import ADBManager
+from installer import AutoInstaller
+from object_store import ObjectStore, ObjectStoreError
+
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+class BackupScheduler:
+    """
+    Cihaz bağlantılarını izleyip zamanı gelen artımlı yedekleri çalıştırır
+
+    Son yedeğin zamanı deponun manifest kimliklerinden okunur; ayrı bir durum
+    dosyası tutulmaz, program yeniden başlasa da takvim kaldığı yerden sürer.
+    """
+
+    def __init__(self, adb: ADBManager, settings: Optional[Dict] = None,
+                 store: Optional[ObjectStore] = None):
+        """
+        Args:
+            adb: ADBManager
+            settings: config.SCHEDULE biçiminde ayarlar (None ise config.SCHEDULE)
+            store: Nesne deposu (None ise config.OBJECT_STORE["root"]; medya yedeği
+                   de bu depoya yazıldığı için varsayılan kök kullanılmalıdır)
+        """
+        self.adb = adb
+        self.settings = dict(config.SCHEDULE, **(settings or {}))
+        self.store = store or ObjectStore()
+        self._failed_at: Dict[str, float] = {}
+        self._stop = threading.Event()
+
+    def known_devices(self) -> List[str]:
+        """Ayarlardaki cihazlar ve depoda manifesti olan cihazlar"""
+        devices = set(self.settings["devices"])
+        if not self.settings["devices"]:
+            devices.update(self.store.devices())
+        return sorted(devices)
+
+    def last_backup(self, serial: str) -> Optional[datetime]:
+        manifests = self.store.list_manifests(serial)
+        return self.store.manifest_time(manifests[-1]) if manifests else None
+
+    def is_due(self, serial: str, now: Optional[datetime] = None) -> bool:
+        """
+        Cihazın yedek zamanı geldi mi
+
+        every_hours verilmişse son yedekten bu kadar süre geçtiyse; yoksa son
+        yedek, en son geçilen günlük "at" saatinden önce alındıysa.
+        """
+        now = now or datetime.now()
+        failed_at = self._failed_at.get(serial)
+        if failed_at is not None and time.time() - failed_at < self.settings["retry_minutes"] * 60:
+            return False
+        last = self.last_backup(serial)
+        if last is None:
+            return True
+        if self.settings["every_hours"]:
+            return now - last >= timedelta(hours=self.settings["every_hours"])
+        slot = datetime.combine(now.date(), day_time.fromisoformat(self.settings["at"]))
+        if slot > now:
+            slot -= timedelta(days=1)
+        return last < slot
+
+    def _store_databases(self, files: List[str]) -> List[Dict]:
+        """İndirilen veritabanlarını depoya ekler, manifest girdilerini döndürür"""
+        entries = []
+        for local_path in files:
+            digest, size, _ = self.store.put_file(local_path)
+            entries.append({"path": f"Databases/{os.path.basename(local_path)}", "hash": digest,
+                            "size": size, "mtime": int(os.path.getmtime(local_path))})
+        return entries
+
+    def backup_device(self, serial: str) -> Dict:
+        """
+        Cihazın artımlı yedeğini alır, saklama politikasını uygular ve çöp toplar
+
+        Returns:
+            {"success", "manifest", "files", "reused", "pruned", "gc"}
+        """
+        settings = self.settings
+        staging_dir = os.path.join(settings["staging_dir"], serial.replace(":", "_"))
+        print(f"\n[BILGI] {serial}: zamanlanmış yedekleme başlıyor")
+        manifest_id = None
+        success = False
+        try:
+            # gc (bu veya başka bir süreçte) oturum bitene kadar bekler; oturum
+            # içinde retain/gc çağrılmaz
+            with self.store.session():
+                results = self.adb.backup_whatsapp_complete(
+                    staging_dir,
+                    include_databases=settings["databases"],
+                    include_media=settings["media"],
+                    device_serial=serial,
+                    verify=settings["verify"],
+                    storage="objects"
+                )
+                media = results["media"]
+                databases = results["databases"]
+                manifest_id = media.get("manifest") if media else None
+                # İstenen her bölüm tamamlanmadıysa yedek sayılmaz (yarım manifest
+                # saklama politikasında eski tam yedeklerin yerini almasın)
+                success = (not settings["media"] or manifest_id is not None) and \
+                          (not settings["databases"] or bool(databases and databases.get("success")))
+                if success and databases:
+                    entries = self._store_databases(databases["downloaded_files"])
+                    if manifest_id:
+                        self.store.add_entries(manifest_id, entries)
+                    else:
+                        manifest_id = self.store.write_manifest(serial, entries, {"source": "scheduled"})
+        finally:
+            # Veritabanları artık depoda; geçici kopyalar silinir
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if not success and manifest_id:
+                # Yarım manifest son yedek sayılmasın
+                self.store.delete_manifest(manifest_id)
+
+        if not success:
+            self._failed_at[serial] = time.time()
+            print(f"[HATA] {serial}: yedekleme başarısız, "
+                  f"{settings['retry_minutes']} dakika sonra tekrar denenecek")
+            return {"success": False, "manifest": None}
+
+        self._failed_at.pop(serial, None)
+        manifest = self.store.load_manifest(manifest_id)
+        retention = settings["retention"]
+        pruned = self.store.retain(retention["daily"], retention["weekly"], serial)
+        collected = self.store.gc()
+        print(f"[OK] {serial}: {manifest_id} ({manifest['files']} dosya, "
+              f"{results['media'].get('reused_count', 0) if results['media'] else 0} dosya depodan)")
+        if pruned:
+            print(f"[OK] {serial}: {len(pruned)} eski yedek silindi, "
+                  f"{collected['freed_bytes']} bytes boşaltıldı")
+        return {
+            "success": True,
+            "manifest": manifest_id,
+            "files": manifest["files"],
+            "reused": results["media"].get("reused_count", 0) if results["media"] else 0,
+            "pruned": pruned,
+            "gc": collected
+        }
+
+    def run_once(self, force: bool = False) -> List[Dict]:
+        """
+        Bağlı ve zamanı gelen bilinen cihazları sırayla yedekler
+
+        Args:
+            force: True ise zamana bakılmadan bağlı tüm bilinen cihazlar yedeklenir
+        """
+        known = set(self.known_devices())
+        connected = [d["serial"] for d in self.adb.get_devices() if d["status"] == "device"]
+        results = []
+        for serial in connected:
+            if serial in known and (force or self.is_due(serial)):
+                try:
+                    results.append(dict(self.backup_device(serial), serial=serial))
+                except (OSError, ObjectStoreError) as e:
+                    self._failed_at[serial] = time.time()
+                    print(f"[HATA] {serial}: {str(e)}")
+                    results.append({"serial": serial, "success": False, "error": str(e)})
+        return results
+
+    def run_forever(self):
+        """Cihaz listesini config.SCHEDULE["poll_interval"] aralıkla kontrol eder (stop() ile durur)"""
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[UYARI] Zamanlanmış yedekleme hatası: {str(e)}")
+            if self._stop.wait(self.settings["poll_interval"]):
+                return
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    settings = config.SCHEDULE
+    parser = argparse.ArgumentParser(description="Zamanlanmış artımlı WhatsApp yedeklemesi")
+    parser.add_argument("--device", action="append", default=None,
+                        help="Yedeklenecek cihaz (birden fazla verilebilir)")
+    parser.add_argument("--at", default=settings["at"], help="Günlük yedek saati (SS:DD)")
+    parser.add_argument("--every-hours", type=float, default=settings["every_hours"],
+                        help="Saat yerine bu aralıkla yedek al")
+    parser.add_argument("--once", action="store_true", help="Bir kez kontrol et ve çık")
+    parser.add_argument("--force", action="store_true", help="Zamana bakmadan yedekle (--once ile)")
+    parser.add_argument("--adb", default=None, help="adb yolu (None ise otomatik bulunur)")
+    args = parser.parse_args()
+
+    try:
+        day_time.fromisoformat(args.at)
+    except ValueError:
+        print(f"[HATA] Geçersiz saat: {args.at}")
+        sys.exit(1)
+
+    adb_path = args.adb
+    if adb_path is None:
+        is_installed, adb_location = AutoInstaller().check_adb()
+        if not is_installed:
+            print("[HATA] ADB bulunamadı!")
+            sys.exit(1)
+        if adb_location != "system":
+            adb_path = adb_location
+
+    adb = ADBManager(adb_path=adb_path)
+    scheduler = BackupScheduler(adb, {"devices": args.device or settings["devices"],
+                                      "at": args.at, "every_hours": args.every_hours})
+    if not scheduler.known_devices():
+        print("[UYARI] Bilinen cihaz yok; --device ile veya config.SCHEDULE[\"devices\"] ile ekleyin")
+        sys.exit(1)
+
+    if args.once:
+        results = scheduler.run_once(force=args.force)
+        if not results:
+            print("[BILGI] Zamanı gelen bağlı cihaz yok")
+        sys.exit(0 if all(r["success"] for r in results) else 1)
+
+    when = f"her {args.every_hours:g} saatte" if args.every_hours else f"her gün {args.at} sonrası"
+    print(f"[OK] Zamanlayıcı çalışıyor ({when}): {', '.join(scheduler.known_devices())}")
+    print("[BILGI] Durdurmak için Ctrl+C")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        adb.export_metrics()
+        adb.export_trace()
+        print("\n[OK] Zamanlayıcı durduruldu")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,113 @@
 """
 GUI Başlatıcı - Tek tıkla çalıştırma
 Windows için basit grafik arayüz
+
+Uzun işlemler (WhatsApp yedeği) iş parçacıklarında çalışır; ilerleme olayları
+bir kuyruğa yazılır ve Tk olay döngüsünde root.after ile boşaltılır, böylece
+pencere yedekleme sırasında donmaz.
 """
 import os
 import sys
+import time
+import queue
 import subprocess
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from collections import deque
+from datetime import datetime
+from tkinter import messagebox, scrolledtext, ttk
 from threading import Thread
 
+import config
+
+# Kuyruk boşaltma aralığı (ms) ve tek seferde işlenecek en fazla olay
+POLL_INTERVAL_MS = 100
+MAX_EVENTS_PER_POLL = 2000
+
+# Hız hesabında kullanılan kayan pencere (saniye)
+THROUGHPUT_WINDOW = 5.0
+
+
+def format_bytes(size: float) -> str:
+    """Byte değerini okunabilir biçime çevirir"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_duration(seconds: float) -> str:
+    """Saniyeyi "1 sa 5 dk" / "3 dk 20 sn" biçimine çevirir"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600} sa {seconds % 3600 // 60} dk"
+    if seconds >= 60:
+        return f"{seconds // 60} dk {seconds % 60} sn"
+    return f"{seconds} sn"
+
+
+class TransferStats:
+    """Bir cihazın aktarım ilerlemesi: toplam, aktarılan, anlık hız ve kalan süre"""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.current = ""
+        self.status = "bekliyor"
+        self._samples = deque()
+
+    def add_total(self, total):
+        if total:
+            self.total += total
+
+    def add_bytes(self, count: int, now: float, resumed: bool = False):
+        self.done += count
+        if not resumed:
+            # Devam ettirilen aktarımın önceden inmiş kısmı hızı şişirmesin
+            self._samples.append((now, count))
+        while self._samples and now - self._samples[0][0] > THROUGHPUT_WINDOW:
+            self._samples.popleft()
+
+    def throughput(self, now: float) -> float:
+        """Son THROUGHPUT_WINDOW saniyedeki ortalama hız (byte/sn)"""
+        while self._samples and now - self._samples[0][0] > THROUGHPUT_WINDOW:
+            self._samples.popleft()
+        if not self._samples:
+            return 0.0
+        elapsed = max(now - self._samples[0][0], 1.0)
+        return sum(count for _, count in self._samples) / elapsed
+
+    def percent(self) -> float:
+        if self.total <= 0:
+            return 0.0
+        return min(100.0, self.done * 100.0 / self.total)
+
+    def eta(self, now: float):
+        """Kalan süre (saniye) veya toplam bilinmiyorsa None"""
+        speed = self.throughput(now)
+        if self.total <= 0 or speed <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / speed)
+
+
+class QueueWriter:
+    """print çıktılarını GUI kuyruğuna yönlendiren dosya benzeri nesne"""
+
+    def __init__(self, events: queue.Queue):
+        self.events = events
+        self._buffer = ""
+
+    def write(self, text: str):
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if line.strip():
+                self.events.put(("log", line))
+        return len(text)
+
+    def flush(self):
+        pass
+
 
 class AppLauncher:
     """GUI Başlatıcı sınıfı"""
@@ -16,7 +115,7 @@ class AppLauncher:
     def __init__(self, root):
         self.root = root
         self.root.title("ADB Telefon Veri Alma Uygulaması")
-        self.root.geometry("600x400")
+        self.root.geometry("680x600")
         self.root.resizable(False, False)
         
         # Pencereyi ortala
@@ -26,6 +125,7 @@ class AppLauncher:
         bg_color = "#2b2b2b"
         fg_color = "#ffffff"
         button_color = "#4CAF50"
+        self.bg_color = bg_color
         
         self.root.configure(bg=bg_color)
         
@@ -37,7 +137,7 @@ class AppLauncher:
             bg=bg_color,
             fg=fg_color
         )
-        title_label.pack(pady=20)
+        title_label.pack(pady=15)
         
         # Alt başlık
         subtitle_label = tk.Label(
@@ -53,15 +153,21 @@ class AppLauncher:
         self.status_text = scrolledtext.ScrolledText(
             root,
             height=12,
-            width=65,
+            width=75,
             bg="#1e1e1e",
             fg="#00ff00",
             font=("Consolas", 9),
             wrap=tk.WORD
         )
-        self.status_text.pack(pady=20, padx=20)
+        self.status_text.pack(pady=10, padx=20)
         self.status_text.insert("1.0", "[BILGI] Hazır! Başlat butonuna tıklayın.\n")
         self.status_text.config(state=tk.DISABLED)
+
+        # Cihaz başına ilerleme çubukları (yedekleme sırasında doldurulur)
+        self.progress_frame = tk.Frame(root, bg=bg_color)
+        self.progress_frame.pack(fill=tk.X, padx=20)
+        self.device_rows = {}
+        self.device_stats = {}
         
         # Butonlar
         button_frame = tk.Frame(root, bg=bg_color)
@@ -74,11 +180,24 @@ class AppLauncher:
             bg=button_color,
             fg="white",
             font=("Arial", 12, "bold"),
-            width=20,
+            width=18,
+            height=2,
+            cursor="hand2"
+        )
+        self.start_button.pack(side=tk.LEFT, padx=8)
+
+        self.backup_button = tk.Button(
+            button_frame,
+            text="💾 WhatsApp Yedeği Al",
+            command=self.start_backup,
+            bg="#2196F3",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=18,
             height=2,
             cursor="hand2"
         )
-        self.start_button.pack(side=tk.LEFT, padx=10)
+        self.backup_button.pack(side=tk.LEFT, padx=8)
         
         self.exit_button = tk.Button(
             button_frame,
@@ -87,11 +206,11 @@ class AppLauncher:
             bg="#f44336",
             fg="white",
             font=("Arial", 12, "bold"),
-            width=15,
+            width=10,
             height=2,
             cursor="hand2"
         )
-        self.exit_button.pack(side=tk.LEFT, padx=10)
+        self.exit_button.pack(side=tk.LEFT, padx=8)
         
         # Bilgi etiketi
         info_label = tk.Label(
@@ -101,9 +220,14 @@ class AppLauncher:
             bg=bg_color,
             fg="#ffa500"
         )
-        info_label.pack(pady=10)
+        info_label.pack(pady=5)
         
         self.process = None
+        self.busy = False
+
+        # İş parçacıklarından gelen olaylar; sadece Tk iş parçacığında boşaltılır
+        self.events = queue.Queue()
+        self.root.after(POLL_INTERVAL_MS, self.drain_events)
     
     def center_window(self):
         """Pencereyi ekranın ortasına yerleştir"""
@@ -115,12 +239,49 @@ class AppLauncher:
         self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def log(self, message):
-        """Durum alanına mesaj yaz"""
+        """Durum alanına mesaj yaz (her iş parçacığından çağrılabilir)"""
+        self.events.put(("log", message))
+
+    def call_in_gui(self, func, *args):
+        """Fonksiyonu Tk iş parçacığında çalıştırır (örn. messagebox)"""
+        self.events.put(("call", (func, args)))
+
+    def drain_events(self):
+        """Kuyruktaki olayları işler; günlük satırları tek seferde eklenir"""
+        lines = []
+        progress_changed = False
+        try:
+            for _ in range(MAX_EVENTS_PER_POLL):
+                kind, payload = self.events.get_nowait()
+                if kind == "log":
+                    lines.append(payload)
+                elif kind == "progress":
+                    self.handle_progress(payload)
+                    progress_changed = True
+                elif kind == "job":
+                    self.handle_job_event(payload)
+                    progress_changed = True
+                elif kind == "call":
+                    if lines:
+                        self.append_log(lines)
+                        lines = []
+                    func, args = payload
+                    func(*args)
+        except queue.Empty:
+            pass
+
+        if lines:
+            self.append_log(lines)
+        if progress_changed or self.busy:
+            self.refresh_progress()
+        self.root.after(POLL_INTERVAL_MS, self.drain_events)
+
+    def append_log(self, lines):
+        """Birden fazla satırı tek insert ile ekler"""
         self.status_text.config(state=tk.NORMAL)
-        self.status_text.insert(tk.END, f"{message}\n")
+        self.status_text.insert(tk.END, "\n".join(lines) + "\n")
         self.status_text.see(tk.END)
         self.status_text.config(state=tk.DISABLED)
-        self.root.update()
     
     def check_python(self):
         """Python'un yüklü olup olmadığını kontrol et"""
@@ -146,16 +307,20 @@ class AppLauncher:
         self.start_button.config(state=tk.DISABLED)
         self.log("=" * 50)
         self.log("[BILGI] Uygulama başlatılıyor...")
+        Thread(target=self._launch_main, name="launch-main", daemon=True).start()
         
+    def _launch_main(self):
+        """main.py'yi ayrı konsolda başlatır (iş parçacığında çalışır)"""
         # Python kontrolü
         if not self.check_python():
-            messagebox.showerror(
+            self.call_in_gui(
+                messagebox.showerror,
                 "Hata",
                 "Python bulunamadı!\n\n"
                 "Lütfen Python'u yükleyin:\n"
                 "https://www.python.org/downloads/"
             )
-            self.start_button.config(state=tk.NORMAL)
+            self.call_in_gui(self.start_button.config, {"state": tk.NORMAL})
             return
         
         # Ana uygulamayı başlat
@@ -179,12 +344,157 @@ class AppLauncher:
             self.log("[BILGI] Bu pencereyi kapatabilirsiniz.")
             
             # 3 saniye sonra pencereyi kapat
-            self.root.after(3000, self.minimize_window)
+            self.call_in_gui(self.root.after, 3000, self.minimize_window)
             
         except Exception as e:
             self.log(f"[HATA] Başlatma hatası: {str(e)}")
-            messagebox.showerror("Hata", f"Uygulama başlatılamadı:\n{str(e)}")
-            self.start_button.config(state=tk.NORMAL)
+            self.call_in_gui(messagebox.showerror, "Hata", f"Uygulama başlatılamadı:\n{str(e)}")
+            self.call_in_gui(self.start_button.config, {"state": tk.NORMAL})
+
+    def start_backup(self):
+        """Bağlı tüm cihazlarda WhatsApp yedeğini arka planda başlatır"""
+        if self.busy:
+            return
+        self.busy = True
+        self.backup_button.config(state=tk.DISABLED)
+        for row in self.device_rows.values():
+            row["frame"].destroy()
+        self.device_rows = {}
+        self.device_stats = {}
+        self.log("=" * 50)
+        self.log("[BILGI] WhatsApp yedeklemesi başlatılıyor...")
+        Thread(target=self._run_backup, name="gui-backup", daemon=True).start()
+
+    def _run_backup(self):
+        """Yedekleme iş parçacığı: ADBManager ve JobScheduler'ı çalıştırır"""
+        stdout = sys.stdout
+        sys.stdout = QueueWriter(self.events)
+        try:
+            from adb_manager import ADBManager
+            from installer import AutoInstaller
+            import jobs
+
+            is_installed, adb_location = AutoInstaller().check_adb()
+            if not is_installed:
+                self.log("[HATA] ADB bulunamadı! Önce 'Uygulamayı Başlat' ile kurulumu yapın.")
+                return
+            if adb_location and adb_location != "system":
+                adb = ADBManager(adb_path=adb_location)
+            else:
+                adb = ADBManager()
+            adb.progress = lambda event: self.events.put(("progress", event))
+
+            serials = [d["serial"] for d in adb.get_devices() if d["status"] == "device"]
+            if not serials:
+                self.log("[HATA] Yetkilendirilmiş cihaz bulunamadı!")
+                return
+            for serial in serials:
+                self.events.put(("job", {"event": "device_added", "serial": serial}))
+
+            spec = {"jobs": [{"name": "whatsapp",
+                              "devices": "all",
+                              "operations": [{"type": "whatsapp_backup"}]}]}
+            tasks = jobs.build_tasks(spec, serials)
+            output_root = os.path.join(config.OUTPUT_DIR, "gui",
+                                       datetime.now().strftime("%Y%m%d_%H%M%S"))
+            scheduler = jobs.JobScheduler(
+                adb,
+                max_parallel=len(serials),
+                progress=lambda event: self.events.put(("job", event))
+            )
+            scheduler.run(tasks, output_root)
+            summary = jobs.summarize(tasks)
+            self.log(f"[OK] {summary['ok']} cihaz yedeklendi, {summary['failed']} başarısız")
+            self.log(f"[OK] Yedekler: {os.path.abspath(output_root)}")
+            adb.export_metrics()
+        except Exception as e:
+            self.log(f"[HATA] Yedekleme hatası: {str(e)}")
+        finally:
+            sys.stdout = stdout
+            self.call_in_gui(self._backup_finished)
+
+    def _backup_finished(self):
+        self.busy = False
+        self.backup_button.config(state=tk.NORMAL)
+        self.refresh_progress()
+
+    def _device_row(self, serial):
+        """Cihaz için ilerleme satırını oluşturur"""
+        row = self.device_rows.get(serial)
+        if row is not None:
+            return row
+        frame = tk.Frame(self.progress_frame, bg=self.bg_color)
+        frame.pack(fill=tk.X, pady=2)
+        name = tk.Label(frame, text=serial, width=16, anchor="w",
+                        font=("Consolas", 9), bg=self.bg_color, fg="#ffffff")
+        name.pack(side=tk.LEFT)
+        bar = ttk.Progressbar(frame, length=260, mode="determinate", maximum=100)
+        bar.pack(side=tk.LEFT, padx=5)
+        info = tk.Label(frame, text="bekliyor", anchor="w", font=("Consolas", 9),
+                        bg=self.bg_color, fg="#cccccc")
+        info.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        row = {"frame": frame, "bar": bar, "info": info, "indeterminate": False}
+        self.device_rows[serial] = row
+        self.device_stats[serial] = TransferStats()
+        return row
+
+    def handle_progress(self, event):
+        """ADBManager aktarım olayını işler"""
+        serial = event.get("serial")
+        if serial is None:
+            return
+        self._device_row(serial)
+        stats = self.device_stats[serial]
+        if event["event"] == "transfer_started":
+            stats.add_total(event.get("total"))
+            stats.current = os.path.basename(event["path"].rstrip("/"))
+        elif event["event"] == "transfer_progress":
+            stats.add_bytes(event["bytes"], event["time"], event.get("resumed", False))
+
+    def handle_job_event(self, event):
+        """Zamanlayıcı olayını işler (görev başladı/bitti)"""
+        serial = event.get("serial")
+        if serial is None:
+            return
+        self._device_row(serial)
+        stats = self.device_stats[serial]
+        if event["event"] == "task_started":
+            stats.status = "çalışıyor"
+        elif event["event"] == "task_finished":
+            stats.status = "tamamlandı" if event["status"] == "ok" else "başarısız"
+            stats.current = ""
+        elif event["event"] == "operation_finished" and event["status"] != "ok":
+            self.log(f"[HATA] {serial}: {event['error']}")
+
+    def refresh_progress(self):
+        """İlerleme çubuklarını ve hız/kalan süre etiketlerini günceller"""
+        now = time.time()
+        for serial, row in self.device_rows.items():
+            stats = self.device_stats[serial]
+            bar = row["bar"]
+            running = stats.status == "çalışıyor"
+            if stats.total > 0 or not running:
+                if row["indeterminate"]:
+                    bar.stop()
+                    bar.config(mode="determinate")
+                    row["indeterminate"] = False
+                bar["value"] = 100 if stats.status == "tamamlandı" else stats.percent()
+            elif not row["indeterminate"]:
+                # Toplam boyut henüz bilinmiyor
+                bar.config(mode="indeterminate")
+                bar.start(50)
+                row["indeterminate"] = True
+
+            parts = [stats.status, format_bytes(stats.done)]
+            if running:
+                speed = stats.throughput(now)
+                parts.append(f"{format_bytes(speed)}/s")
+                eta = stats.eta(now)
+                if eta is not None:
+                    parts.append(f"kalan {format_duration(eta)}")
+                if stats.current:
+                    parts.append(stats.current)
+            row["info"].config(text=" • ".join(parts))
     
     def minimize_window(self):
         """Pencereyi simge durumuna küçült"""
@@ -192,7 +502,10 @@ class AppLauncher:
     
     def exit_app(self):
         """Uygulamadan çık"""
-        if messagebox.askyesno("Çıkış", "Çıkmak istediğinizden emin misiniz?"):
+        message = "Çıkmak istediğinizden emin misiniz?"
+        if self.busy:
+            message = "Yedekleme devam ediyor! Yine de çıkılsın mı?"
+        if messagebox.askyesno("Çıkış", message):
             self.root.destroy()
 
 
@@ -205,4 +518,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
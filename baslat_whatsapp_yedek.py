@@ -3,8 +3,10 @@ WhatsApp Yedekleme Hızlı Başlatıcı
 """
 import sys
 import os
+import time
 from datetime import datetime
 from adb_manager import ADBManager
+from agent_client import AgentClient, AgentError
 from installer import AutoInstaller
 
 if sys.platform == "win32":
@@ -17,6 +19,83 @@ print("=" * 60)
 print("WhatsApp Yedekleme - Hızlı Başlatıcı")
 print("=" * 60)
 
+
+def follow_job(client: AgentClient, job_id: str, poll_interval: float = 2.0) -> dict:
+    """İşin ilerlemesini yazdırır ve bitince son durumunu döndürür
+
+    Olay akışı koparsa iş bitene kadar durum sorgulanarak beklenir.
+    """
+    try:
+        for event in client.events(job_id):
+            if event["event"] == "operation_finished":
+                status = "[OK]" if event["status"] == "ok" else "[HATA]"
+                print(f"{status} {event['operation']} ({event['seconds']:.1f} s)")
+    except AgentError as e:
+        print(f"[UYARI] İlerleme akışı kesildi ({str(e)}), iş durumu bekleniyor")
+    
+    while True:
+        job = client.job(job_id)
+        if job["status"] in ("finished", "failed"):
+            return job
+        time.sleep(poll_interval)
+
+
+def backup_with_agent(client: AgentClient) -> int:
+    """Yerel servis (agent.py) çalışıyorsa yedeklemeyi ona yaptırır"""
+    print("[OK] Yerel servis kullanılıyor")
+    available_devices = [d for d in client.devices() if d['status'] == 'device']
+    if not available_devices:
+        print("[HATA] Cihaz bulunamadı!")
+        return 1
+    
+    selected_device = available_devices[0]['serial']
+    print(f"[OK] Cihaz: {selected_device}")
+    
+    print("\n[KONTROL] WhatsApp kontrol ediliyor...")
+    whatsapp_paths = client.whatsapp_paths(selected_device)
+    if not whatsapp_paths.get("databases_sdcard") and not whatsapp_paths.get("media"):
+        print("[UYARI] WhatsApp klasörleri bulunamadı!")
+        print("[BILGI] WhatsApp'ı açıp birkaç mesaj gönderin, böylece klasörler oluşur.")
+        return 1
+    print("[OK] WhatsApp klasörleri bulundu!")
+    
+    print("\n[BILGI] Tam yedekleme yapılıyor (Veritabanları + Medya)")
+    # Servis yedeği doğrudan çalıştırmadaki gibi output/whatsapp_backup klasörüne alır
+    job = client.backup_whatsapp(selected_device)
+    # İş kabul edildi: bundan sonraki hatalarda doğrudan ADB'ye dönülmez
+    # (aynı klasöre ikinci bir yedek başlardı); iş durumu sorgulanır
+    try:
+        job = follow_job(client, job["id"])
+    except AgentError as e:
+        print(f"\n[HATA] Servis yedeklemesinin durumu alınamadı: {str(e)}")
+        print(f"[BILGI] İş servis üzerinde sürüyor olabilir (iş: {job['id']})")
+        return 1
+    result = job["tasks"][0]["results"][0] if job["tasks"] and job["tasks"][0]["results"] else None
+    if not result or result["status"] != "ok":
+        print("\n[HATA] WhatsApp yedeklemesi başarısız!")
+        if result and result["error"]:
+            print(f"[BILGI] {result['error']}")
+        return 1
+    
+    details = result["details"]
+    print("\n" + "=" * 60)
+    print("[OK] WhatsApp yedeklemesi tamamlandı!")
+    print("=" * 60)
+    if "databases" in details:
+        print(f"[OK] İndirilen veritabanı sayısı: {details['databases']}")
+    if "media_files" in details:
+        print(f"[OK] İndirilen medya dosyası sayısı: {details['media_files']}")
+    print(f"\n[OK] Tüm yedekler: {details['output_dir']}")
+    return 0
+
+
+agent = AgentClient()
+if agent.is_running():
+    try:
+        sys.exit(backup_with_agent(agent))
+    except AgentError as e:
+        print(f"[UYARI] Servis hatası ({str(e)}), doğrudan ADB ile devam ediliyor")
+
 # ADB ve cihaz kontrolü
 installer = AutoInstaller()
 is_installed, adb_location = installer.check_adb()
@@ -99,4 +178,10 @@ else:
         for error in result["databases"]["errors"]:
             print(f"  - {error}")
 
+for metrics_file in adb.export_metrics():
+    print(f"[OK] Metrikler kaydedildi: {metrics_file}")
+trace_file = adb.export_trace()
+if trace_file:
+    print(f"[OK] Trace kaydedildi: {trace_file} (Perfetto ile açılabilir)")
+
 print("\n" + "=" * 60)
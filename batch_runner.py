@@ -0,0 +1,139 @@
+"""
+Toplu İş Çalıştırıcı
+Menüye gerek kalmadan bir iş dosyasındaki işlemleri bağlı cihazlarda
+paralel çalıştırır ve makine tarafından okunabilir bir rapor yazar
+
+Kullanım:
+    python batch_runner.py gece_yedegi.json
+    python batch_runner.py gece_yedegi.yaml --max-parallel 8 --report output/rapor.json
+    python batch_runner.py gece_yedegi.json --dry-run
+
+Çıkış kodları: 0 = tümü başarılı, 1 = başarısız görev var, 2 = geçersiz iş dosyası / ADB yok
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+import jobs
+from adb_manager import ADBManager
+from installer import AutoInstaller
+
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def print_progress(event: dict):
+    """Zamanlayıcı olaylarını tek satırlık günlük olarak yazar"""
+    prefix = f"[{datetime.fromtimestamp(event['time']).strftime('%H:%M:%S')}] {event['serial']} ({event['job']})"
+    name = event["event"]
+    if name == "task_started":
+        print(f"{prefix} başladı")
+    elif name == "operation_finished":
+        status = "OK" if event["status"] == "ok" else "HATA"
+        suffix = f" - {event['error']}" if event["error"] else ""
+        print(f"{prefix} [{status}] {event['operation']} ({event['seconds']:.1f} s){suffix}")
+    elif name == "task_finished":
+        print(f"{prefix} bitti: {event['status']} ({event['seconds']:.1f} s)")
+    elif name == "task_skipped":
+        print(f"{prefix} atlandı: {event['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ADB toplu iş çalıştırıcı (etkileşimsiz)")
+    parser.add_argument("job_file", help="İş dosyası (.json, .yaml/.yml)")
+    parser.add_argument("--max-parallel", type=int, default=None,
+                        help="Aynı anda işlenecek en fazla cihaz (iş dosyasındaki değeri geçersiz kılar)")
+    parser.add_argument("--output", default=None, help="Çıktı klasörü")
+    parser.add_argument("--report", default=None, help="Rapor dosyası (JSON)")
+    parser.add_argument("--dry-run", action="store_true", help="Sadece planı göster, çalıştırma")
+    args = parser.parse_args()
+
+    try:
+        spec = jobs.load_job_file(args.job_file)
+    except (OSError, ValueError) as e:
+        print(f"[HATA] İş dosyası okunamadı: {str(e)}")
+        sys.exit(2)
+    errors = jobs.validate_job_spec(spec)
+    if errors:
+        print("[HATA] İş dosyası geçersiz:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(2)
+
+    is_installed, adb_location = AutoInstaller().check_adb()
+    if not is_installed:
+        print("[HATA] ADB bulunamadı!")
+        sys.exit(2)
+    try:
+        if adb_location and adb_location != "system":
+            adb = ADBManager(adb_path=adb_location)
+        else:
+            adb = ADBManager()
+    except Exception as e:
+        print(f"[HATA] Hata: {str(e)}")
+        sys.exit(2)
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_root = args.output or spec.get("output_dir") or os.path.join("output", "batch", run_id)
+    report_file = args.report or spec.get("report") or os.path.join(output_root, "report.json")
+    max_parallel = args.max_parallel or spec.get("max_parallel", 4)
+
+    connected = [d["serial"] for d in adb.get_devices() if d["status"] == "device"]
+    tasks = jobs.build_tasks(spec, connected)
+
+    print("=" * 60)
+    print(f"Toplu İş: {args.job_file}")
+    print(f"[BILGI] {len(connected)} cihaz bağlı, {len(tasks)} görev, en fazla {max_parallel} paralel")
+    print(f"[BILGI] Çıktı klasörü: {output_root}")
+    print("=" * 60)
+    for task in tasks:
+        operations = ", ".join(op["type"] for op in task["operations"])
+        marker = "[ATLA]" if task["status"] == "skipped" else "[PLAN]"
+        print(f"{marker} {task['serial']} ({task['job']}): {operations}")
+    if args.dry_run:
+        return
+
+    scheduler = jobs.JobScheduler(
+        adb,
+        max_parallel=max_parallel,
+        limits=spec.get("limits"),
+        continue_on_error=spec.get("continue_on_error", True),
+        progress=print_progress
+    )
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+    scheduler.run(tasks, output_root)
+    wall_seconds = time.perf_counter() - start
+
+    summary = jobs.summarize(tasks)
+    report = {
+        "job_file": os.path.abspath(args.job_file),
+        "started_at": started_at,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(wall_seconds, 3),
+        "max_parallel": max_parallel,
+        "output_dir": os.path.abspath(output_root),
+        "connected_devices": connected,
+        "summary": summary,
+        "tasks": tasks,
+        "metrics": adb.metrics.snapshot()
+    }
+    jobs.write_report(report_file, report)
+    adb.export_metrics()
+    adb.export_trace()
+
+    print("\n" + "=" * 60)
+    print(f"[OK] {summary['ok']} görev başarılı, {summary['failed']} başarısız, "
+          f"{summary['skipped']} atlandı ({wall_seconds:.1f} s)")
+    print(f"[OK] Rapor: {report_file}")
+    print("=" * 60)
+    sys.exit(1 if summary["failed"] or summary["skipped"] else 0)
+
+
+if __name__ == "__main__":
+    main()
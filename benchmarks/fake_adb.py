@@ -0,0 +1,1022 @@
+"""
+Sahte ADB
+Gerçek telefon olmadan ADBManager'ı çalıştırmak için adb komut satırını taklit eder
+
+Cihaz dosya sistemi bir profil JSON dosyasından (FAKE_ADB_PROFILE ortam
+değişkeni) sentetik olarak üretilir; dosya içerikleri yol adından
+deterministik olarak türetilir, diske yazılmaz. Her çağrıya profildeki
+gecikme eklenir, veri aktarımı profildeki bant genişliğiyle sınırlanır.
+Profilde "storage_dir" verilirse telefona yazılan dosyalar (exec-in tar -x)
+bu klasörde saklanır ve sentetik dosya sisteminin üzerine eklenir.
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import fnmatch
+import hashlib
+import posixpath
+import tarfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# İçerik üretiminde kullanılan blok boyutu
+BLOCK_SIZE = 64 * 1024
+
+# Sabit zaman tabanı (2024-01-01 00:00:00 UTC)
+BASE_MTIME = 1704067200
+
+DEFAULT_PROFILE = {
+    "serial": "FAKE0001",
+    "model": "Pixel Fake",
+    "brand": "google",
+    "android_version": "14",
+    "sdk": "34",
+    "latency_ms": 2,
+    "bandwidth_mbps": 200,
+    "rooted": False,
+    "whatsapp_base": "/sdcard/Android/media/com.whatsapp/WhatsApp",
+    "databases": {
+        "msgstore.db.crypt14": 20 * 1024 * 1024,
+        "msgstore-2024-01-01.1.db.crypt14": 18 * 1024 * 1024,
+        "wa.db.crypt14": 512 * 1024
+    },
+    "media": {
+        "WhatsApp Images": {"count": 500, "size": 150 * 1024, "ext": ".jpg", "prefix": "IMG"},
+        "WhatsApp Video": {"count": 2, "size": 20 * 1024 * 1024, "ext": ".mp4", "prefix": "VID"},
+        "WhatsApp Audio": {"count": 100, "size": 40 * 1024, "ext": ".opus", "prefix": "AUD"},
+        "WhatsApp Documents": {"count": 20, "size": 300 * 1024, "ext": ".pdf", "prefix": "DOC"}
+    },
+    "sent_ratio": 0.2,
+    "packages": 150,
+    "logcat_lines": 20000
+}
+
+
+def load_profile() -> Dict:
+    """FAKE_ADB_PROFILE ile verilen profili varsayılanların üzerine yükler"""
+    profile = dict(DEFAULT_PROFILE)
+    path = os.environ.get("FAKE_ADB_PROFILE")
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            profile.update(json.load(f))
+    return profile
+
+
+class FakeDevice:
+    """
+    Profilden üretilen sentetik cihaz dosya sistemi
+
+    Medya klasörlerindeki dosyalar önceden listelenmez; adları ve boyutları
+    sıra numarasından hesaplanır. Böylece 50k dosyalık profillerde bile her
+    adb çağrısı hızlı başlar.
+    """
+
+    def __init__(self, profile: Dict):
+        self.profile = profile
+        self.storage_dir = profile.get("storage_dir")
+        self._static_files: Dict[str, Tuple[int, int]] = {}   # yol -> (boyut, mtime)
+        self._children: Dict[str, set] = {}                   # dizin -> alt öğe adları
+        self._media: Dict[str, Tuple[Dict, int, bool]] = {}   # dizin -> (spec, sent_every, sent mi)
+        self._build()
+
+    def _add_dir(self, path: str):
+        if path not in self._children:
+            self._children[path] = set()
+            if path != "/":
+                parent, name = posixpath.split(path)
+                self._add_dir(parent)
+                self._children[parent].add(name)
+
+    def _add_file(self, path: str, size: int, mtime: int):
+        parent, name = posixpath.split(path)
+        self._add_dir(parent)
+        self._children[parent].add(name)
+        self._static_files[path] = (size, mtime)
+
+    def _build(self):
+        base = self.profile["whatsapp_base"]
+        for path in ("/sdcard/Download", "/sdcard/DCIM", "/sdcard/Pictures",
+                     f"{base}/Backups", f"{base}/Databases", f"{base}/Media"):
+            self._add_dir(path)
+
+        for i, (name, size) in enumerate(sorted(self.profile["databases"].items())):
+            self._add_file(f"{base}/Databases/{name}", size, BASE_MTIME + i * 86400)
+
+        sent_ratio = self.profile.get("sent_ratio", 0)
+        sent_every = int(1 / sent_ratio) if sent_ratio else 0
+        for folder, spec in self.profile["media"].items():
+            folder_path = f"{base}/Media/{folder}"
+            self._add_dir(folder_path)
+            self._media[folder_path] = (spec, sent_every, False)
+            if sent_every and spec["count"] > 0:
+                self._add_dir(f"{folder_path}/Sent")
+                self._media[f"{folder_path}/Sent"] = (spec, sent_every, True)
+
+    @staticmethod
+    def _media_name(spec: Dict, i: int) -> str:
+        return f"{spec['prefix']}-2024{(i // 28) % 12 + 1:02d}{i % 28 + 1:02d}-WA{i:05d}{spec['ext']}"
+
+    @staticmethod
+    def _media_info(spec: Dict, i: int) -> Tuple[int, int]:
+        # Boyutlar dosyadan dosyaya biraz değişsin
+        size = spec["size"] + (i * 7919) % max(1, spec["size"] // 4)
+        return size, BASE_MTIME + i * 3600
+
+    def _media_indices(self, directory: str) -> Iterator[int]:
+        spec, sent_every, is_sent = self._media[directory]
+        for i in range(spec["count"]):
+            if bool(sent_every and i % sent_every == 0) == is_sent:
+                yield i
+
+    def _media_file(self, path: str) -> Optional[Tuple[int, int]]:
+        directory, name = posixpath.split(path)
+        entry = self._media.get(directory)
+        if entry is None:
+            return None
+        spec, sent_every, is_sent = entry
+        marker = name.rfind("-WA")
+        digits = name[marker + 3:len(name) - len(spec["ext"])] if marker >= 0 else ""
+        if not digits.isdigit():
+            return None
+        i = int(digits)
+        if i >= spec["count"] or name != self._media_name(spec, i):
+            return None
+        if bool(sent_every and i % sent_every == 0) != is_sent:
+            return None
+        return self._media_info(spec, i)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """/storage/emulated/0 ve /sdcard yollarını tek biçime getirir"""
+        path = posixpath.normpath(path) if path else path
+        for alias in ("/storage/emulated/0", "/storage/self/primary", "/mnt/sdcard"):
+            if path == alias or path.startswith(alias + "/"):
+                return "/sdcard" + path[len(alias):]
+        return path
+
+    def local_path(self, path: str) -> Optional[str]:
+        """Yazılabilir katmandaki karşılığı (storage_dir yoksa None)"""
+        if not self.storage_dir:
+            return None
+        return os.path.join(self.storage_dir, *self.normalize(path).strip("/").split("/"))
+
+    def is_dir(self, path: str) -> bool:
+        path = self.normalize(path)
+        if path in self._children:
+            return True
+        local = self.local_path(path)
+        return local is not None and os.path.isdir(local)
+
+    def is_file(self, path: str) -> bool:
+        return self.file_info(path) is not None
+
+    def file_info(self, path: str) -> Optional[Tuple[int, int]]:
+        """Dosyanın (boyut, mtime) bilgisini döndürür (dosya değilse None)"""
+        path = self.normalize(path)
+        local = self.local_path(path)
+        if local is not None and os.path.isfile(local):
+            stat = os.stat(local)
+            return stat.st_size, int(stat.st_mtime)
+        return self._static_files.get(path) or self._media_file(path)
+
+    def list_dir(self, path: str) -> List[str]:
+        """Dizindeki öğe adlarını sıralı döndürür"""
+        path = self.normalize(path)
+        names = set(self._children.get(path, ()))
+        if path in self._media:
+            spec = self._media[path][0]
+            names.update(self._media_name(spec, i) for i in self._media_indices(path))
+        local = self.local_path(path)
+        if local is not None and os.path.isdir(local):
+            names.update(os.listdir(local))
+        return sorted(names)
+
+    def make_dirs(self, path: str):
+        local = self.local_path(path)
+        if local is None:
+            raise OSError("Read-only file system")
+        os.makedirs(local, exist_ok=True)
+
+    def write_file(self, path: str, stream, mtime: int):
+        """Dosyayı yazılabilir katmana yazar"""
+        local = self.local_path(path)
+        if local is None:
+            raise OSError("Read-only file system")
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        with open(local, "wb") as f:
+            for chunk in iter(lambda: stream.read(BLOCK_SIZE), b""):
+                f.write(chunk)
+        os.utime(local, (mtime, mtime))
+
+    def walk_files(self, path: str) -> Iterator[str]:
+        """Dizin altındaki tüm dosyaları (derinlik öncelikli, sıralı) döndürür"""
+        path = self.normalize(path)
+        if not self.is_dir(path):
+            if self.is_file(path):
+                yield path
+            return
+        for name in self.list_dir(path):
+            child = posixpath.join(path, name)
+            if self.is_dir(child):
+                yield from self.walk_files(child)
+            else:
+                yield child
+
+    def walk_all(self, path: str) -> Iterator[str]:
+        """Dizin ve dosyaların hepsini (dizinin kendisi dahil) döndürür"""
+        path = self.normalize(path)
+        yield path
+        if not self.is_dir(path):
+            return
+        for name in self.list_dir(path):
+            child = posixpath.join(path, name)
+            if self.is_dir(child):
+                yield from self.walk_all(child)
+            else:
+                yield child
+
+    def content(self, path: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Dosya içeriğini [start, end) aralığında parça parça üretir"""
+        path = self.normalize(path)
+        size = self.file_info(path)[0]
+        end = size if end is None else min(end, size)
+        local = self.local_path(path)
+        if local is not None and os.path.isfile(local):
+            with open(local, "rb") as f:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = f.read(min(BLOCK_SIZE, remaining))
+                    if not chunk:
+                        return
+                    remaining -= len(chunk)
+                    yield chunk
+            return
+        seed = hashlib.sha256(path.encode("utf-8")).digest()
+        block = (seed * (BLOCK_SIZE // len(seed) + 1))[:BLOCK_SIZE]
+        position = start
+        while position < end:
+            offset = position % BLOCK_SIZE
+            length = min(BLOCK_SIZE - offset, end - position)
+            yield block[offset:offset + length]
+            position += length
+
+
+class Throttle:
+    """Profildeki bant genişliğine göre yazma hızını sınırlar"""
+
+    def __init__(self, bandwidth_mbps: float):
+        self.bytes_per_second = bandwidth_mbps * 1024 * 1024 if bandwidth_mbps else 0
+        self.start = time.perf_counter()
+        self.sent = 0
+
+    def consume(self, count: int):
+        self.sent += count
+        if not self.bytes_per_second:
+            return
+        ahead = self.sent / self.bytes_per_second - (time.perf_counter() - self.start)
+        if ahead > 0.002:
+            time.sleep(ahead)
+
+
+class Shell:
+    """Cihaz kabuğunun (sh + toybox) ADBManager'ın kullandığı alt kümesi"""
+
+    def __init__(self, device_loader, profile: Dict):
+        """
+        Args:
+            device_loader: FakeDevice döndüren fonksiyon (dosya sistemi
+                           sadece gerektiğinde yüklenir)
+            profile: Cihaz profili
+        """
+        self._device_loader = device_loader
+        self._device = None
+        self.profile = profile
+
+    @property
+    def device(self) -> FakeDevice:
+        if self._device is None:
+            self._device = self._device_loader()
+        return self._device
+
+    # --- Komut satırı ayrıştırma ---
+
+    def run(self, command_line: str, stdin: Iterable[bytes] = ()) -> Tuple[int, Iterable[bytes], bytes]:
+        """
+        Komut satırını çalıştırır
+
+        Args:
+            command_line: Kabuk komut satırı
+            stdin: adb sürecinin stdin parçaları (exec-in / shell)
+
+        Returns:
+            (çıkış kodu, stdout parçaları, stderr)
+        """
+        lexer = shlex.shlex(command_line, posix=True, punctuation_chars=True)
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+
+        # && / || ile ayrılmış pipeline'lar
+        sequence = [[]]
+        operators = []
+        for token in tokens:
+            if token in ("&&", "||", ";"):
+                operators.append(token)
+                sequence.append([])
+            else:
+                sequence[-1].append(token)
+
+        output: List[Iterable[bytes]] = []
+        stderr = b""
+        returncode = 0
+        for i, pipeline in enumerate(sequence):
+            if i > 0:
+                operator = operators[i - 1]
+                if operator == "&&" and returncode != 0:
+                    continue
+                if operator == "||" and returncode == 0:
+                    continue
+            if not pipeline:
+                continue
+            returncode, stdout, err = self._run_pipeline(pipeline, stdin)
+            output.append(stdout)
+            stderr += err
+        return returncode, _chain(output), stderr
+
+    def _run_pipeline(self, tokens: List[str],
+                      stdin: Iterable[bytes] = ()) -> Tuple[int, Iterable[bytes], bytes]:
+        stages = [[]]
+        for token in tokens:
+            if token == "|":
+                stages.append([])
+            else:
+                stages[-1].append(token)
+
+        returncode, stderr = 0, b""
+        for stage in stages:
+            args, silence_stderr = _strip_redirects(stage)
+            returncode, stdin, err = self._run_simple(args, stdin)
+            if not silence_stderr:
+                stderr += err
+        return returncode, stdin, stderr
+
+    def _run_simple(self, args: List[str], stdin: Iterable[bytes]):
+        if not args:
+            return 0, (), b""
+        handler = getattr(self, "cmd_" + args[0].replace("-", "_"), None)
+        if handler is None:
+            return 127, (), f"/system/bin/sh: {args[0]}: inaccessible or not found\n".encode()
+        return handler(args[1:], stdin)
+
+    # --- Komutlar ---
+
+    def cmd_echo(self, args, stdin):
+        return 0, [(" ".join(args) + "\n").encode("utf-8")], b""
+
+    def cmd_true(self, args, stdin):
+        return 0, (), b""
+
+    def cmd_rm(self, args, stdin):
+        return 0, (), b""
+
+    def cmd_mkdir(self, args, stdin):
+        if self.device.storage_dir:
+            for path in args:
+                if not path.startswith("-"):
+                    self.device.make_dirs(path)
+        return 0, (), b""
+
+    def cmd_am(self, args, stdin):
+        if args[:1] != ["broadcast"]:
+            return 1, (), b"am: unsupported\n"
+        return 0, [b"Broadcasting: Intent { }\nBroadcast completed: result=0\n"], b""
+
+    def cmd_test(self, args, stdin):
+        if len(args) != 2:
+            return 2, (), b"test: unknown operand\n"
+        flag, path = args
+        if flag == "-d":
+            ok = self.device.is_dir(path)
+        elif flag == "-f":
+            ok = self.device.is_file(path)
+        elif flag == "-e":
+            ok = self.device.is_dir(path) or self.device.is_file(path)
+        else:
+            return 2, (), b"test: unknown operand\n"
+        return (0 if ok else 1), (), b""
+
+    def cmd_su(self, args, stdin):
+        if not self.profile.get("rooted"):
+            return 127, (), b"/system/bin/sh: su: inaccessible or not found\n"
+        if len(args) >= 2 and args[0] == "-c":
+            return self.run(args[1])
+        return 1, (), b""
+
+    def cmd_getprop(self, args, stdin):
+        props = {
+            "ro.product.model": self.profile["model"],
+            "ro.product.brand": self.profile["brand"],
+            "ro.product.device": "fake",
+            "ro.build.version.release": self.profile["android_version"],
+            "ro.build.version.sdk": self.profile["sdk"],
+            "ro.serialno": self.profile.get("hardware_serial", self.profile["serial"])
+        }
+        for i in range(self.profile.get("extra_props", 400)):
+            props[f"persist.fake.prop{i:04d}"] = str(i)
+        if args:
+            return 0, [(props.get(args[0], "") + "\n").encode("utf-8")], b""
+        lines = "".join(f"[{key}]: [{value}]\n" for key, value in sorted(props.items()))
+        return 0, [lines.encode("utf-8")], b""
+
+    def cmd_pm(self, args, stdin):
+        if args[:2] != ["list", "packages"]:
+            return 1, (), b"pm: unsupported\n"
+        packages = ["com.whatsapp", "com.android.settings"]
+        packages += [f"com.example.app{i:04d}" for i in range(self.profile["packages"])]
+        versions = self.profile.get("app_versions", {})
+        lines = []
+        for package in packages:
+            version = versions.get(package, 1)
+            line = "package:"
+            if "-f" in args:
+                line += f"/data/app/~~fake/{package}-v{version}/base.apk="
+            line += package
+            if "--show-versioncode" in args:
+                line += f" versionCode:{version}"
+            lines.append(line + "\n")
+        return 0, ["".join(lines).encode("utf-8")], b""
+
+    def cmd_dumpsys(self, args, stdin):
+        if len(args) >= 2 and args[0] == "package":
+            package = args[1]
+            body = [f"Packages:\n  Package [{package}] (fake):\n",
+                    "    userId=10123\n", "    versionCode=241 minSdk=21 targetSdk=34\n",
+                    "    versionName=2.24.1.6\n"]
+            body += [f"    permission.fake{i}: granted=true\n" for i in range(300)]
+            return 0, ["".join(body).encode("utf-8")], b""
+        return 0, [b""], b""
+
+    def cmd_logcat(self, args, stdin):
+        count = self.profile["logcat_lines"]
+        if "-t" in args:
+            index = args.index("-t")
+            count = min(count, int(args[index + 1]))
+
+        def generate():
+            batch = []
+            for i in range(count):
+                seconds = i // 10
+                batch.append(
+                    f"01-01 {seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}."
+                    f"{(i % 10) * 100:03d}  1234  {1234 + i % 17} I FakeTag{i % 13}: "
+                    f"fake log message number {i}\n"
+                )
+                if len(batch) >= 1000:
+                    yield "".join(batch).encode("utf-8")
+                    batch = []
+            if batch:
+                yield "".join(batch).encode("utf-8")
+
+        return 0, generate(), b""
+
+    def cmd_ls(self, args, stdin):
+        long_format = any(a.startswith("-") and "l" in a for a in args)
+        paths = [a for a in args if not a.startswith("-")] or ["/sdcard"]
+        lines = []
+        for path in paths:
+            normalized = self.device.normalize(path)
+            if self.device.is_dir(normalized):
+                entries = [(name, posixpath.join(normalized, name))
+                           for name in self.device.list_dir(normalized)]
+            elif self.device.is_file(normalized):
+                entries = [(posixpath.basename(normalized), normalized)]
+            else:
+                return 1, (), f"ls: {path}: No such file or directory\n".encode("utf-8")
+
+            if long_format:
+                lines.append(f"total {len(entries)}\n")
+            for name, full_path in entries:
+                if long_format:
+                    if self.device.is_dir(full_path):
+                        size, mtime, mode = 3452, BASE_MTIME, "drwxrws---"
+                    else:
+                        size, mtime = self.device.file_info(full_path)
+                        mode = "-rw-rw----"
+                    stamp = time.strftime("%Y-%m-%d %H:%M", time.gmtime(mtime))
+                    lines.append(f"{mode} 1 u0_a123 media_rw {size:>9} {stamp} {name}\n")
+                else:
+                    lines.append(f"{name}\n")
+        return 0, ["".join(lines).encode("utf-8")], b""
+
+    def cmd_stat(self, args, stdin):
+        fmt = "%n"
+        paths = []
+        i = 0
+        while i < len(args):
+            if args[i] == "-c":
+                fmt = args[i + 1]
+                i += 2
+            else:
+                paths.append(args[i])
+                i += 1
+
+        lines = []
+        for path in paths:
+            info = self.device.file_info(path)
+            if info is not None:
+                size, mtime = info
+                kind = "regular file"
+            elif self.device.is_dir(path):
+                size, mtime, kind = 3452, BASE_MTIME, "directory"
+            else:
+                return 1, (), f"stat: '{path}': No such file or directory\n".encode("utf-8")
+            line = (fmt.replace("%s", str(size)).replace("%Y", str(mtime))
+                    .replace("%F", kind).replace("%n", path))
+            lines.append(line + "\n")
+        return 0, ["".join(lines).encode("utf-8")], b""
+
+    def cmd_cat(self, args, stdin):
+        if not args:
+            return 0, stdin, b""
+        path = args[0]
+        if not self.device.is_file(path):
+            return 1, (), f"cat: {path}: No such file or directory\n".encode("utf-8")
+        return 0, self.device.content(path), b""
+
+    def cmd_tail(self, args, stdin):
+        if len(args) != 3 or args[0] != "-c":
+            return 1, (), b"tail: unsupported\n"
+        count, path = args[1], args[2]
+        if not self.device.is_file(path):
+            return 1, (), f"tail: {path}: No such file or directory\n".encode("utf-8")
+        size = self.device.file_info(path)[0]
+        if count.startswith("+"):
+            start = max(0, int(count[1:]) - 1)
+        else:
+            start = max(0, size - int(count))
+        return 0, self.device.content(path, start), b""
+
+    def cmd_dd(self, args, stdin):
+        # Sadece "dd if=yol bs=N skip=N count=N" (bloklar stdout'a)
+        options = dict(arg.split("=", 1) for arg in args if "=" in arg)
+        path = options.get("if")
+        if path == "/dev/zero" and "count" in options:
+            block = int(options.get("bs", 512))
+            return 0, (b"\0" * block for _ in range(int(options["count"]))), b""
+        if not path or not self.device.is_file(path):
+            return 1, (), f"dd: {path}: No such file or directory\n".encode("utf-8")
+        block = int(options.get("bs", 512))
+        start = int(options.get("skip", 0)) * block
+        end = start + int(options["count"]) * block if "count" in options else None
+        return 0, self.device.content(path, start, end), b""
+
+    def cmd_tar(self, args, stdin):
+        # "tar -cf - [-C dizin] yol..." (ustar/pax akışı stdout'a) veya
+        # "tar -xf - [-C dizin]" (stdin'deki akış yazılabilir katmana açılır)
+        if args[:2] == ["-xf", "-"]:
+            return self._tar_extract(args[2:], stdin)
+        if args[:2] != ["-cf", "-"]:
+            return 1, (), b"tar: unsupported\n"
+        args = args[2:]
+        base = ""
+        if args[:1] == ["-C"]:
+            base, args = args[1], args[2:]
+        for name in args:
+            path = posixpath.join(base, name) if base else name
+            if not self.device.is_file(path):
+                return 1, (), f"tar: {name}: No such file or directory\n".encode("utf-8")
+
+        def generate():
+            for name in args:
+                path = posixpath.join(base, name) if base else name
+                size, mtime = self.device.file_info(path)
+                info = tarfile.TarInfo(name)
+                info.size, info.mtime = size, mtime
+                yield info.tobuf(tarfile.PAX_FORMAT)
+                yield from self.device.content(path)
+                if size % tarfile.BLOCKSIZE:
+                    yield b"\0" * (tarfile.BLOCKSIZE - size % tarfile.BLOCKSIZE)
+            yield b"\0" * (tarfile.BLOCKSIZE * 2)
+        return 0, generate(), b""
+
+    def _tar_extract(self, args, stdin):
+        base = args[1] if args[:1] == ["-C"] else ""
+        if base and not self.device.is_dir(base):
+            return 1, (), f"tar: chdir '{base}': No such file or directory\n".encode("utf-8")
+        try:
+            with tarfile.open(fileobj=_ChunkReader(stdin), mode="r|") as archive:
+                for member in archive:
+                    name = member.name.lstrip("/")
+                    if ".." in name.split("/"):
+                        return 1, (), f"tar: {member.name}: bad path\n".encode("utf-8")
+                    path = posixpath.join(base, name) if base else name
+                    if member.isdir():
+                        self.device.make_dirs(path)
+                    elif member.isfile():
+                        self.device.write_file(path, archive.extractfile(member), int(member.mtime))
+        except tarfile.TarError as e:
+            return 1, (), f"tar: {e}\n".encode("utf-8")
+        except OSError as e:
+            return 1, (), f"tar: {e}\n".encode("utf-8")
+        return 0, (), b""
+
+    def cmd_du(self, args, stdin):
+        paths = [a for a in args if not a.startswith("-")]
+        lines = []
+        for path in paths:
+            if not self.device.is_dir(path) and not self.device.is_file(path):
+                return 1, ["".join(lines).encode("utf-8")], f"du: {path}: No such file or directory\n".encode()
+            total = sum(self.device.file_info(f)[0] for f in self.device.walk_files(path))
+            lines.append(f"{(total + 1023) // 1024}\t{path}\n")
+        return 0, ["".join(lines).encode("utf-8")], b""
+
+    def cmd_wc(self, args, stdin):
+        lines = sum(chunk.count(b"\n") for chunk in stdin)
+        return 0, [f"{lines}\n".encode()], b""
+
+    def _hash(self, algorithm, args, stdin):
+        if not args:
+            digest = hashlib.new(algorithm)
+            for chunk in stdin:
+                digest.update(chunk)
+            return 0, [f"{digest.hexdigest()}  -\n".encode()], b""
+
+        lines = []
+        for path in args:
+            if not self.device.is_file(path):
+                continue
+            digest = hashlib.new(algorithm)
+            for chunk in self.device.content(path):
+                digest.update(chunk)
+            lines.append(f"{digest.hexdigest()}  {path}\n")
+        return 0, ["".join(lines).encode("utf-8")], b""
+
+    def cmd_md5sum(self, args, stdin):
+        return self._hash("md5", args, stdin)
+
+    def cmd_sha1sum(self, args, stdin):
+        return self._hash("sha1", args, stdin)
+
+    def cmd_sha256sum(self, args, stdin):
+        return self._hash("sha256", args, stdin)
+
+    def cmd_date(self, args, stdin):
+        if args == ["+%s"]:
+            return 0, [f"{int(time.time())}\n".encode("utf-8")], b""
+        return 0, [time.strftime("%a %b %d %H:%M:%S UTC %Y\n", time.gmtime()).encode("utf-8")], b""
+
+    def cmd_find(self, args, stdin):
+        roots = []
+        while args and not args[0].startswith("-") and args[0] not in ("(", "!"):
+            roots.append(args[0])
+            args = args[1:]
+        if not roots:
+            return 1, (), b"find: missing path\n"
+        # Gerçek find gibi olmayan kökleri bildirip diğerleriyle devam et
+        missing = [root for root in roots
+                   if not (self.device.is_dir(root) or self.device.is_file(root))]
+        errors = "".join(f"find: {root}: No such file or directory\n" for root in missing)
+        roots = [root for root in roots if root not in missing]
+        returncode = 1 if missing else 0
+
+        try:
+            parser = _FindExpression(self.device, args)
+            expression = parser.parse()
+        except ValueError as e:
+            return 1, (), f"find: {e}\n".encode("utf-8")
+
+        # Kullanıcıya verilen kök yolu biçimini koru
+        printed, executed = [], []
+        for root in roots:
+            normalized_root = self.device.normalize(root)
+            stack = [normalized_root]
+            while stack:
+                path = stack.pop()
+                state = {"prune": False, "print": printed, "exec": executed,
+                         "shown": root.rstrip("/") + path[len(normalized_root):]
+                         if path != normalized_root else root}
+                if expression(path, state) and not parser.has_action:
+                    printed.append(state["shown"])
+                if self.device.is_dir(path) and not state["prune"]:
+                    children = [posixpath.join(path, n) for n in self.device.list_dir(path)]
+                    stack.extend(reversed(children))
+
+        output = ["".join(p + "\n" for p in printed).encode("utf-8")]
+        if parser.exec_command and executed:
+            exec_code, stdout, stderr = self._run_simple(parser.exec_command + executed, ())
+            return returncode or exec_code, _chain([output, stdout]), errors.encode("utf-8") + stderr
+        return returncode, output, errors.encode("utf-8")
+
+
+class _FindExpression:
+    """toybox find ifadelerinin alt kümesi: ( ) ! -o -a -type -name -iname
+    -path -size -mtime -mmin -prune -print -exec"""
+
+    def __init__(self, device: FakeDevice, tokens: List[str]):
+        self.device = device
+        self.tokens = tokens
+        self.pos = 0
+        self.has_action = False
+        self.exec_command = None
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError("missing argument")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if self._peek() is None:
+            return lambda p, s: True
+        expression = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"unsupported expression {self._peek()}")
+        return expression
+
+    def _or(self):
+        left = self._and()
+        while self._peek() == "-o":
+            self._next()
+            right = self._and()
+            left = lambda p, s, l=left, r=right: l(p, s) or r(p, s)
+        return left
+
+    def _and(self):
+        left = self._not()
+        while self._peek() not in (None, "-o", ")"):
+            if self._peek() == "-a":
+                self._next()
+            right = self._not()
+            left = lambda p, s, l=left, r=right: l(p, s) and r(p, s)
+        return left
+
+    def _not(self):
+        if self._peek() == "!":
+            self._next()
+            inner = self._not()
+            return lambda p, s: not inner(p, s)
+        return self._primary()
+
+    @staticmethod
+    def _compare(value: float, spec: str) -> bool:
+        if spec.startswith("+"):
+            return value > float(spec[1:])
+        if spec.startswith("-"):
+            return value < float(spec[1:])
+        return int(value) == int(spec)
+
+    def _age(self, path: str, unit: int) -> float:
+        info = self.device.file_info(path)
+        mtime = info[1] if info else BASE_MTIME
+        return (time.time() - mtime) / unit
+
+    def _primary(self):
+        token = self._next()
+        device = self.device
+        if token == "(":
+            inner = self._or()
+            if self._next() != ")":
+                raise ValueError("missing )")
+            return inner
+        if token == "-type":
+            kind = self._next()
+            return lambda p, s: device.is_dir(p) == (kind == "d")
+        if token in ("-name", "-iname"):
+            pattern = self._next()
+            if token == "-iname":
+                return lambda p, s, pat=pattern.lower(): \
+                    fnmatch.fnmatchcase(posixpath.basename(p).lower(), pat)
+            return lambda p, s: fnmatch.fnmatchcase(posixpath.basename(p), pattern)
+        if token == "-path":
+            pattern = self._next()
+            return lambda p, s: fnmatch.fnmatchcase(s["shown"], pattern)
+        if token == "-size":
+            spec = self._next()
+            units = {"c": 1, "k": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+            unit = units.get(spec[-1], 512)
+            number = spec.rstrip("ckMG")
+
+            def size_test(p, s):
+                info = device.file_info(p)
+                size = info[0] if info else 3452
+                return self._compare(-(-size // unit), number)
+            return size_test
+        if token in ("-mtime", "-mmin"):
+            spec = self._next()
+            unit = 86400 if token == "-mtime" else 60
+            return lambda p, s: self._compare(self._age(p, unit), spec)
+        if token == "-prune":
+            def prune(p, s):
+                s["prune"] = True
+                return True
+            return prune
+        if token == "-print":
+            self.has_action = True
+
+            def show(p, s):
+                s["print"].append(s["shown"])
+                return True
+            return show
+        if token == "-exec":
+            command = []
+            while self._peek() not in ("+", ";"):
+                command.append(self._next())
+            self._next()
+            self.has_action = True
+            self.exec_command = [a for a in command if a != "{}"]
+
+            def execute(p, s):
+                s["exec"].append(s["shown"])
+                return True
+            return execute
+        raise ValueError(f"unsupported expression {token}")
+
+
+def _strip_redirects(tokens: List[str]) -> Tuple[List[str], bool]:
+    """'2>/dev/null' ve '> dosya' yönlendirmelerini kaldırır"""
+    args = []
+    silence_stderr = False
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in (">", ">>"):
+            if args and args[-1] == "2":
+                args.pop()
+                silence_stderr = True
+            i += 2
+            continue
+        args.append(token)
+        i += 1
+    return args, silence_stderr
+
+
+class _ChunkReader:
+    """Byte parçası üreteçini read() destekleyen akışa çevirir"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _read_stdin(throttle: "Throttle") -> Iterator[bytes]:
+    """adb sürecinin stdin'ini bant genişliği sınırıyla okur"""
+    stream = sys.stdin.buffer
+    while True:
+        chunk = stream.read1(BLOCK_SIZE) if hasattr(stream, "read1") else stream.read(BLOCK_SIZE)
+        if not chunk:
+            return
+        throttle.consume(len(chunk))
+        yield chunk
+
+
+def _chain(parts: List[Iterable[bytes]]) -> Iterator[bytes]:
+    for part in parts:
+        yield from part
+
+
+def _pull(device: FakeDevice, profile: Dict, remote: str, local: str,
+          preserve: bool = False) -> int:
+    """
+    adb pull davranışını taklit eder (hedef mevcut dizinse içine kopyalar;
+    değişiklik zamanı sadece -a ile telefondaki zamana ayarlanır)
+    """
+    if not (device.is_dir(remote) or device.is_file(remote)):
+        sys.stderr.write(f"adb: error: failed to stat remote object '{remote}': "
+                         f"No such file or directory\n")
+        return 1
+
+    target = local
+    if os.path.isdir(local):
+        target = os.path.join(local, posixpath.basename(remote.rstrip("/")))
+
+    start = time.perf_counter()
+    throttle = Throttle(profile["bandwidth_mbps"])
+    normalized_root = device.normalize(remote)
+    files = 0
+    total = 0
+
+    if device.is_dir(remote):
+        os.makedirs(target, exist_ok=True)
+        for path in device.walk_all(normalized_root):
+            relative = path[len(normalized_root):].lstrip("/")
+            if device.is_dir(path):
+                os.makedirs(os.path.join(target, relative), exist_ok=True)
+    for path in device.walk_files(normalized_root):
+        relative = path[len(normalized_root):].lstrip("/")
+        local_path = os.path.join(target, relative) if relative else target
+        with open(local_path, "wb") as f:
+            for chunk in device.content(path):
+                f.write(chunk)
+                throttle.consume(len(chunk))
+                total += len(chunk)
+        if preserve:
+            mtime = device.file_info(path)[1]
+            os.utime(local_path, (mtime, mtime))
+        files += 1
+
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    speed = total / elapsed / (1024 * 1024)
+    noun = "file" if files == 1 else "files"
+    sys.stdout.write(f"{remote}: {files} {noun} pulled, 0 skipped. "
+                     f"{speed:.1f} MB/s ({total} bytes in {elapsed:.3f}s)\n")
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    profile = load_profile()
+    serial = None
+    if len(argv) >= 2 and argv[0] == "-s":
+        serial, argv = argv[1], argv[2:]
+    # Aynı cihazın başka bağlantısı (örn. kablosuz ADB) için ayrı gecikme/hız
+    profile.update(profile.get("links", {}).get(serial, {}))
+    time.sleep(profile["latency_ms"] / 1000.0)
+
+    if not argv:
+        sys.stderr.write("adb: no command\n")
+        return 1
+
+    serials = [profile["serial"]] + profile.get("aliases", [])
+    offline = profile.get("offline", [])
+    command = argv[0]
+
+    if command == "version":
+        sys.stdout.write("Android Debug Bridge version 1.0.41\nVersion 35.0.2-fake\n"
+                         f"Installed as {os.path.abspath(__file__)}\n")
+        return 0
+    if command in ("start-server", "kill-server"):
+        return 0
+    if command == "devices":
+        lines = ["List of devices attached"]
+        for number, s in enumerate(serials, 1):
+            usb = "" if ":" in s else "usb:1-1 "
+            lines.append(f"{s}\t{'offline' if s in offline else 'device'} {usb}product:fake model:"
+                         f"{profile['model'].replace(' ', '_')} device:fake transport_id:{number}")
+        sys.stdout.write("\n".join(lines) + "\n\n")
+        return 0
+
+    if serial is not None and serial not in serials:
+        sys.stderr.write(f"adb: device '{serial}' not found\n")
+        return 1
+    if serial in offline:
+        sys.stderr.write("adb: device offline\n")
+        return 1
+
+    if command == "get-state":
+        sys.stdout.write("device\n")
+        return 0
+    if command == "get-serialno":
+        sys.stdout.write(f"{serial or profile['serial']}\n")
+        return 0
+
+    def load_device():
+        return FakeDevice(profile)
+
+    if command == "pull" and len(argv) >= 3:
+        device = load_device()
+        preserve = argv[1] == "-a"
+        sources, local = argv[2 if preserve else 1:-1], argv[-1]
+        if len(sources) > 1 and not os.path.isdir(local):
+            sys.stderr.write(f"adb: error: target '{local}' is not a directory\n")
+            return 1
+        return max(_pull(device, profile, remote, local, preserve) for remote in sources)
+
+    if command in ("shell", "exec-out", "exec-in"):
+        shell = Shell(load_device, profile)
+        stdin = _read_stdin(Throttle(profile["bandwidth_mbps"])) if sys.stdin else ()
+        returncode, stdout, stderr = shell.run(" ".join(argv[1:]), stdin)
+        throttle = Throttle(profile["bandwidth_mbps"])
+        out = sys.stdout.buffer
+        try:
+            for chunk in stdout:
+                out.write(chunk)
+                throttle.consume(len(chunk))
+            out.flush()
+        except BrokenPipeError:
+            return 1
+        sys.stderr.buffer.write(stderr)
+        return returncode
+
+    sys.stderr.write(f"adb: unknown command {command}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,297 @@
+"""
+Performans Testi (Benchmark) Çalıştırıcısı
+ADBManager'ı sahte adb'ye karşı çalıştırır ve sonuçları JSON olarak kaydeder
+
+Kullanım:
+    python benchmarks/run_benchmarks.py                       # hızlı profil
+    python benchmarks/run_benchmarks.py --profile full        # 50k medya + 2 GB videolar
+    python benchmarks/run_benchmarks.py --latency-ms 10 --bandwidth-mbps 30
+    python benchmarks/run_benchmarks.py --compare eski_sonuc.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from adb_manager import ADBManager  # noqa: E402
+from fake_adb import DEFAULT_PROFILE  # noqa: E402
+
+
+# Hazır profiller (DEFAULT_PROFILE üzerine uygulanır)
+PROFILES = {
+    "quick": {},
+    "full": {
+        "latency_ms": 5,
+        "bandwidth_mbps": 40,
+        "databases": {
+            "msgstore.db.crypt14": 300 * 1024 * 1024,
+            "msgstore-2024-01-01.1.db.crypt14": 290 * 1024 * 1024,
+            "wa.db.crypt14": 4 * 1024 * 1024
+        },
+        "media": {
+            "WhatsApp Images": {"count": 40000, "size": 150 * 1024, "ext": ".jpg", "prefix": "IMG"},
+            "WhatsApp Video": {"count": 3, "size": 2 * 1024 * 1024 * 1024, "ext": ".mp4", "prefix": "VID"},
+            "WhatsApp Audio": {"count": 8000, "size": 40 * 1024, "ext": ".opus", "prefix": "AUD"},
+            "WhatsApp Documents": {"count": 2000, "size": 300 * 1024, "ext": ".pdf", "prefix": "DOC"}
+        },
+        "packages": 400,
+        "logcat_lines": 200000
+    }
+}
+
+# Karşılaştırmada gerileme sayılacak yavaşlama oranı
+REGRESSION_THRESHOLD = 0.10
+
+
+def create_fake_adb(workspace: str, profile: Dict) -> str:
+    """
+    Profil dosyasını ve sahte adb başlatıcısını oluşturur
+
+    Returns:
+        ADBManager'a verilecek adb yolu
+    """
+    profile_path = os.path.join(workspace, "profile.json")
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+
+    fake_adb = os.path.join(BENCHMARK_DIR, "fake_adb.py")
+    if sys.platform == "win32":
+        launcher = os.path.join(workspace, "adb.cmd")
+        with open(launcher, "w", encoding="utf-8") as f:
+            f.write(f'@set FAKE_ADB_PROFILE={profile_path}\n'
+                    f'@"{sys.executable}" "{fake_adb}" %*\n')
+    else:
+        launcher = os.path.join(workspace, "adb")
+        with open(launcher, "w", encoding="utf-8") as f:
+            f.write(f'#!/bin/sh\nFAKE_ADB_PROFILE="{profile_path}" '
+                    f'exec "{sys.executable}" "{fake_adb}" "$@"\n')
+        os.chmod(launcher, 0o755)
+    return launcher
+
+
+def measure(name: str, adb: ADBManager, func: Callable, repeat: int,
+            reset: Optional[Callable] = None) -> Dict:
+    """
+    Bir senaryoyu `repeat` kez çalıştırır, süre ve metrikleri toplar
+
+    Args:
+        name: Senaryo adı
+        adb: Ölçülen ADBManager
+        func: Senaryo fonksiyonu
+        repeat: Tekrar sayısı
+        reset: Her çalıştırmadan önce çağrılır (örn. çıktı klasörünü temizlemek için)
+
+    Returns:
+        Senaryo sonucu
+    """
+    durations = []
+    snapshot = {}
+    for _ in range(repeat):
+        if reset:
+            reset()
+        adb.metrics.reset()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+        snapshot = adb.metrics.snapshot()
+
+    calls = sum(stats["calls"] for stats in snapshot["commands"].values())
+    result = {
+        "wall_seconds": {
+            "min": round(min(durations), 4),
+            "median": round(statistics.median(durations), 4),
+            "max": round(max(durations), 4)
+        },
+        "adb_calls": calls,
+        "calls_by_command": {cmd: stats["calls"] for cmd, stats in snapshot["commands"].items()},
+        "bytes": snapshot["transfer"]["bytes"],
+        "files": snapshot["transfer"]["files"],
+        "throughput_mb_s": round(snapshot["transfer"]["throughput_bytes_per_second"] / (1024 * 1024), 2)
+    }
+    print(f"[OK] {name}: {result['wall_seconds']['median']:.3f} s (medyan), "
+          f"{calls} adb çağrısı, {result['bytes']} byte")
+    return result
+
+
+def run_suite(profile: Dict, repeat: int, workspace: str) -> Dict[str, Dict]:
+    """Tüm senaryoları çalıştırır"""
+    storage_dir = os.path.join(workspace, "storage")
+    adb_path = create_fake_adb(workspace, dict(profile, storage_dir=storage_dir))
+    adb = ADBManager(adb_path=adb_path)
+    serial = profile["serial"]
+    output_dir = os.path.join(workspace, "output")
+
+    def clean_output():
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir)
+
+    scenarios = {}
+    scenarios["device_enumeration"] = measure(
+        "Cihaz listeleme", adb,
+        lambda: (adb.get_devices(), adb.get_device_info(serial)), repeat
+    )
+    scenarios["path_probing"] = measure(
+        "WhatsApp yol taraması", adb,
+        lambda: adb.find_whatsapp_paths(serial), repeat
+    )
+    scenarios["database_backup"] = measure(
+        "Veritabanı yedekleme", adb,
+        lambda: adb.backup_whatsapp_databases(output_dir, serial), repeat, clean_output
+    )
+    scenarios["media_backup"] = measure(
+        "Medya yedekleme", adb,
+        lambda: adb.backup_whatsapp_media(output_dir, device_serial=serial), repeat, clean_output
+    )
+    scenarios["media_backup_pack"] = measure(
+        "Medya yedekleme (paket deposu)", adb,
+        lambda: adb.backup_whatsapp_media(output_dir, device_serial=serial, storage="pack"),
+        repeat, clean_output
+    )
+    large_file = f"{profile['whatsapp_base']}/Databases/msgstore.db.crypt14"
+    scenarios["large_file_pull"] = measure(
+        "Büyük dosya (tek akış)", adb,
+        lambda: adb.pull_file_resumable(large_file, os.path.join(output_dir, "large.db"), serial),
+        repeat, clean_output
+    )
+    scenarios["large_file_pull_striped"] = measure(
+        "Büyük dosya (şeritli)", adb,
+        lambda: adb.pull_file_striped(large_file, os.path.join(output_dir, "large.db"), serial),
+        repeat, clean_output
+    )
+    scenarios["logcat_capture"] = measure(
+        "Logcat kaydetme", adb,
+        lambda: adb.save_logcat(os.path.join(output_dir, "logcat.txt"),
+                                profile["logcat_lines"], serial),
+        repeat, clean_output
+    )
+
+    # Geri yükleme kaynağı bir kez alınır; sahte telefonda aynı dosyalar zaten
+    # bulunduğundan atlama kapatılır, her tekrarda telefona yazılanlar silinir
+    restore_source = os.path.join(workspace, "restore_source")
+    adb.backup_whatsapp_media(restore_source, device_serial=serial)
+
+    def clean_storage():
+        shutil.rmtree(storage_dir, ignore_errors=True)
+
+    scenarios["whatsapp_restore"] = measure(
+        "WhatsApp geri yükleme", adb,
+        lambda: adb.restore_whatsapp(restore_source, serial, skip_existing=False, media_scan=False),
+        repeat, clean_storage
+    )
+    return scenarios
+
+
+def git_revision() -> str:
+    """Ölçülen kodun git sürümünü döndürür"""
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, timeout=10, cwd=PROJECT_ROOT
+        )
+        return result.stdout.strip() or "unknown"
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+
+
+def compare_results(current: Dict, baseline: Dict) -> List[str]:
+    """
+    İki sonuç dosyasını karşılaştırır
+
+    Returns:
+        Gerileme gösteren senaryoların listesi
+    """
+    regressions = []
+    print("\n[KARŞILAŞTIRMA] " + baseline.get("revision", "?") + " -> " + current["revision"])
+    for name, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        old_time = old["wall_seconds"]["median"]
+        new_time = result["wall_seconds"]["median"]
+        change = (new_time - old_time) / old_time if old_time else 0.0
+        marker = "[GERILEME]" if change > REGRESSION_THRESHOLD else "[OK]"
+        print(f"{marker} {name}: {old_time:.3f}s -> {new_time:.3f}s ({change:+.1%}), "
+              f"adb çağrısı {old['adb_calls']} -> {result['adb_calls']}")
+        if change > REGRESSION_THRESHOLD:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ADBManager performans testleri (sahte adb ile)")
+    parser.add_argument("--profile", default="quick",
+                        help="Profil adı (quick, full) veya profil JSON dosyası")
+    parser.add_argument("--latency-ms", type=float, help="Çağrı başına gecikme (ms)")
+    parser.add_argument("--bandwidth-mbps", type=float, help="Bağlantı hızı (MB/s, 0 = sınırsız)")
+    parser.add_argument("--repeat", type=int, default=3, help="Senaryo tekrar sayısı")
+    parser.add_argument("--output", default=None, help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak eski sonuç dosyası")
+    parser.add_argument("--keep-workspace", action="store_true", help="Geçici klasörü silme")
+    args = parser.parse_args()
+
+    profile = dict(DEFAULT_PROFILE)
+    if args.profile in PROFILES:
+        profile.update(PROFILES[args.profile])
+    else:
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile.update(json.load(f))
+    if args.latency_ms is not None:
+        profile["latency_ms"] = args.latency_ms
+    if args.bandwidth_mbps is not None:
+        profile["bandwidth_mbps"] = args.bandwidth_mbps
+
+    workspace = tempfile.mkdtemp(prefix="adb_bench_")
+    print("=" * 60)
+    print(f"ADBManager Benchmark - profil: {args.profile}")
+    print(f"[BILGI] Gecikme: {profile['latency_ms']} ms, bant genişliği: {profile['bandwidth_mbps']} MB/s")
+    print(f"[BILGI] Çalışma klasörü: {workspace}")
+    print("=" * 60)
+
+    try:
+        scenarios = run_suite(profile, args.repeat, workspace)
+    finally:
+        if not args.keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile_name": args.profile,
+        "profile": profile,
+        "repeat": args.repeat,
+        "scenarios": scenarios
+    }
+
+    output_file = args.output or os.path.join(
+        PROJECT_ROOT, "output", "benchmarks",
+        f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n[OK] Sonuçlar kaydedildi: {output_file}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Komut Çıktısı Akışı
+adb komutunun çıktısını tamamı belleğe alınmadan, geldikçe satır satır
+(UTF-8 ile artımlı çözülerek), metin parçaları veya ham byte parçaları
+halinde okur. find, dumpsys, logcat gibi büyük çıktılar sabit bellekle işlenir.
+"""
+import codecs
+import subprocess
+import threading
+import time
+from typing import Callable, Iterator, Optional, Union
+
+from deadline import Deadline, Watchdog
+
+# Tek okumada alınan en fazla byte
+CHUNK_SIZE = 64 * 1024
+
+
+class CommandStream:
+    """
+    Çalışan bir adb sürecinin çıktı akışı
+
+    Tek bir okuma yöntemiyle (iter_lines / iter_text / iter_bytes / read_text)
+    bir kez tüketilir. Akış bitince veya close() çağrılınca returncode ve
+    stderr dolar; erken kapatılırsa süreç sonlandırılır.
+
+        with adb.stream_command(["shell", "dumpsys package"]) as stream:
+            for line in stream.iter_lines():
+                ...
+        stream.success
+    """
+
+    def __init__(self, process, timeout: Union[float, Deadline, None] = None,
+                 on_close: Optional[Callable[["CommandStream"], None]] = None,
+                 encoding: str = "utf-8"):
+        """
+        Args:
+            process: transport.popen() ile başlatılmış süreç
+            timeout: Toplam süre sınırı (saniye) veya ilerlemeye bağlı Deadline
+                     (ilerleme okunan byte'tır); aşılırsa süreç sonlandırılır
+            on_close: Akış kapanınca bir kez çağrılır (metrik/izleme için)
+            encoding: Metin modlarında kullanılan kodlama
+        """
+        self.process = process
+        self.encoding = encoding
+        self.returncode: Optional[int] = None
+        self.stderr = ""
+        self.timed_out = False
+        self.bytes_read = 0
+        self.start = time.perf_counter()
+        self._on_close = on_close
+        self._closed = False
+        self._consumed = False
+        self._eof = False
+        self._stderr_chunks = []
+        # stderr ayrı okunur; dolan stderr borusu stdout'u kilitlemesin
+        self._stderr_thread = threading.Thread(target=self._drain_stderr,
+                                               name="adb-stderr", daemon=True)
+        self._stderr_thread.start()
+        self._watchdog = None
+        if timeout:
+            if not isinstance(timeout, Deadline):
+                timeout = Deadline(limit=timeout, inactivity=0)
+            self._watchdog = Watchdog(timeout, lambda: self.bytes_read, self._expire).start()
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def _drain_stderr(self):
+        try:
+            for chunk in iter(lambda: self.process.stderr.read(CHUNK_SIZE), b""):
+                self._stderr_chunks.append(chunk)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def timeout_message(self) -> str:
+        """Süre aşımının nedeni (süre aşılmadıysa boş)"""
+        return self._watchdog.message if self._watchdog is not None else ""
+
+    def _expire(self, reason: str):
+        self.timed_out = True
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def iter_bytes(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Ham çıktıyı byte parçaları halinde üretir"""
+        if self._consumed:
+            raise RuntimeError("Komut çıktısı zaten okundu")
+        self._consumed = True
+        # read1 tek okuma yapar: tampon dolmasını beklemeden gelen veri alınır
+        # (yavaş ama sağlıklı çıktıda Deadline ilerlemeyi görür)
+        read = getattr(self.process.stdout, "read1", None) or self.process.stdout.read
+        try:
+            while True:
+                chunk = read(chunk_size)
+                if not chunk:
+                    self._eof = True
+                    break
+                self.bytes_read += len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def iter_text(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """
+        Çıktıyı artımlı çözülmüş metin parçaları halinde üretir; satır sonları
+        "\\n"e çevrilir (parça sınırında bölünen çok byte'lı karakterler ve
+        "\\r\\n" çiftleri doğru birleştirilir)
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        carriage_return = False
+        for chunk in self.iter_bytes(chunk_size):
+            text = decoder.decode(chunk)
+            if carriage_return:
+                text = "\r" + text
+            carriage_return = text.endswith("\r")
+            if carriage_return:
+                text = text[:-1]
+            if text:
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+        text = decoder.decode(b"", final=True) + ("\r" if carriage_return else "")
+        if text:
+            yield text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def iter_lines(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """Çıktıyı satır satır üretir (satır sonu karakteri olmadan)"""
+        pending = ""
+        for text in self.iter_text(chunk_size):
+            lines = (pending + text).split("\n")
+            pending = lines.pop()
+            yield from lines
+        if pending:
+            yield pending
+
+    def read_text(self) -> str:
+        """Çıktının tamamını metin olarak döndürür (küçük çıktılar için)"""
+        return "".join(self.iter_text())
+
+    def close(self):
+        """Süreci bekler (okuma bitmediyse sonlandırır) ve sonucu kaydeder"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._eof and self.process.poll() is None:
+            try:
+                self.process.kill()
+            except OSError:
+                pass
+        try:
+            self.returncode = self.process.wait()
+        except subprocess.TimeoutExpired:
+            # Kayıttan oynatmada kaydedilmiş süre aşımı
+            self.timed_out = True
+            self.returncode = -1
+        if self._watchdog is not None:
+            self._watchdog.stop()
+        self._stderr_thread.join()
+        self.stderr = codecs.decode(b"".join(self._stderr_chunks), self.encoding, "replace")
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
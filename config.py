@@ -2,6 +2,7 @@
 Yapılandırma dosyası
 ADB ve uygulama ayarları
 """
+import os
 
 # ADB yolu (sistem PATH'inde ise "adb" yeterli)
 ADB_PATH = "adb"
@@ -23,8 +24,179 @@ DEFAULT_REMOTE_PATHS = {
 
 # Timeout süreleri (saniye)
 TIMEOUTS = {
-    "command": 30,
-    "pull": 300,
-    "shell": 60
+    "command": 30,                          # Kısa adb komutları
+    "shell": 60,                            # Shell komutları
+    "checksum": 300,                        # Telefonda hash hesaplama (çıktı sonda gelir)
+    # Aktarımlar (pull, yedekleme, geri yükleme) sabit süreyle değil ilerlemeye
+    # göre sınırlanır (bkz. deadline.py)
+    "inactivity": 30,                       # Hiç byte aktarılmadan geçebilecek en uzun süre
+    "confirmation": 180,                    # Telefonda onay beklenen işlemlerde ilk byte için süre
+    "expected_throughput": 8 * 1024 * 1024, # Ölçüm yokken tahminde kullanılan hız (byte/s)
+    "min_throughput": 256 * 1024,           # Süre uzatması için gereken en düşük hız (byte/s)
+    "slack": 3,                             # Tahmini süre çarpanı
+    "grace": 30                             # Tahmini süreye eklenen sabit pay
 }
 
+
+# Devam ettirilebilir (resumable) dosya çekme ayarları
+RESUMABLE_PULL = {
+    "retries": 3,                          # Bağlantı kopunca tekrar deneme sayısı
+    "retry_delay": 2,                      # Denemeler arası bekleme (saniye)
+    "chunk_size": 1024 * 1024,             # Okuma parça boyutu (byte)
+    "journal_interval": 64 * 1024 * 1024,  # Günlük (journal) güncelleme aralığı (byte)
+    "tail_hash_bytes": 1024 * 1024         # Doğrulamada hash'lenen son bölüm (byte)
+}
+
+# USB / kablosuz ADB bağlantı seçimi (device_links.py)
+LINKS = {
+    "enabled": False,                      # Aynı cihazın bağlantılarını birleştir, ölç ve yönlendir
+    "probe_bytes": 8 * 1024 * 1024,        # Hız ölçümünde okunan veri (byte)
+    "latency_samples": 5,                  # Gecikme ölçümündeki komut sayısı
+    "recheck_interval": 30                 # Kopan bağlantının yeniden denenme aralığı (saniye)
+}
+
+# Büyük tek dosyaların paralel (şeritli) çekilmesi (resumable=True iken)
+STRIPED_PULL = {
+    "min_size": 512 * 1024 * 1024,         # Bu boyut ve üzerindeki dosyalar şeritli çekilir (0 ise kapalı)
+    "streams": 4,                          # Eş zamanlı exec-out dd akışı sayısı
+    "block_size": 1024 * 1024              # dd blok boyutu; şeritler bu boyuta hizalanır (byte)
+}
+
+# İndirme sonrası bütünlük doğrulaması ayarları
+VERIFY = {
+    "algorithm": "md5",                    # md5, sha1 veya sha256
+    "workers": min(8, os.cpu_count() or 1) # Yerel hash iş parçacığı sayısı
+}
+
+# Metrik dışa aktarma ayarları (program kapanırken yazılır)
+METRICS = {
+    "json_file": "output/metrics.json",  # None ise JSON yazılmaz
+    "prometheus_file": None              # Örn. node exporter textfile dizini: ".../adb_manager.prom"
+}
+
+# adb bulma ayarları - bulunan yol/sürüm kaydedilir, sonraki açılışlarda `adb version` çalıştırılmaz
+ADB_DISCOVERY = {
+    "state_file": os.path.join(os.path.dirname(os.path.abspath(__file__)), "output", ".adb_state.json"),
+    "start_server": True                 # adb sunucusunu arka planda başlat
+}
+
+# Platform Tools indirme ayarları (otomatik kurulum)
+PLATFORM_TOOLS = {
+    # İndirilen arşiv her zaman doğrulanır, doğrulanamayan dosya kurulmaz:
+    # - url ve sha256 birlikte verilirse sürüm sabitlenir, SHA-256 ile doğrulanır
+    # - sha256 verilmezse Google'ın SDK deposu manifestindeki (sürüm sabitlemez,
+    #   yalnızca SHA-1 yayımlar) güncel arşiv ve SHA-1 değeri kullanılır; bu
+    #   durumda güven manifestin HTTPS ile alınmasına dayanır.
+    #   "manifest_sha1": False ise sabit sha256 olmadan indirme yapılmaz.
+    "url": None,
+    "sha256": None,
+    "manifest_url": "https://dl.google.com/android/repository/repository2-1.xml",
+    "manifest_sha1": True,
+    "host_os": "windows",                  # Manifestte seçilecek arşiv
+    # ZIP'ten yalnızca bu dosyalar çıkarılır (None ise platform-tools klasörünün tamamı)
+    "members": ["adb.exe", "AdbWinApi.dll", "AdbWinUsbApi.dll"],
+    "retries": 5,                          # Bağlantı kopunca tekrar deneme sayısı (kaldığı yerden)
+    "retry_delay": 3,                      # Denemeler arası bekleme (saniye)
+    "timeout": 30,                         # Bağlantı/okuma zaman aşımı (saniye)
+    "chunk_size": 256 * 1024               # Okuma parça boyutu (byte)
+}
+
+# Yerel servis (agent.py) ayarları - yalnızca bu bilgisayardan erişilebilir
+AGENT = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    # Her açılışta üretilen erişim anahtarı; istemciler bu dosyadan okur
+    "token_file": os.path.join(os.path.dirname(os.path.abspath(__file__)), "output", ".agent_token"),
+    "poll_interval": 2.0,   # Cihaz listesi yenileme aralığı (saniye)
+    "max_parallel": 4,      # İşler için en fazla paralel cihaz
+    "max_jobs": 100         # Bellekte tutulacak bitmiş iş sayısı
+}
+
+# İlerleme olayları (GUI) ayarları
+PROGRESS = {
+    "interval": 0.5     # Dizin aktarımlarında yerel boyut kontrol aralığı (saniye)
+}
+
+# Filtreli medya yedeği ayarları (media_filter.py)
+MEDIA_FILTER = {
+    "pull_batch_chars": 8000    # Tek "adb pull a b c ... hedef" komutundaki en fazla yol uzunluğu
+}
+
+# Aktarım sırasında medya işleme hattı (media_pipeline.py)
+MEDIA_PIPELINE = {
+    "workers": max(1, (os.cpu_count() or 2) - 1),  # Süreç sayısı (bir çekirdek aktarıma kalır)
+    "algorithm": "sha256",                 # Tablodaki hash algoritması
+    "thumbnails": False,                   # Küçük resim üret (Pillow gerekir)
+    "thumbnail_size": (256, 256),
+    "thumbnail_dir": "thumbnails",         # Tablonun bulunduğu klasöre göre
+    "table": "media_metadata.csv"          # Medya klasörünün bir üstüne yazılır
+}
+
+# Paket deposu ayarları (pack_store.py) - medya tek tek dosya yerine büyük paketlere yazılır
+PACK_STORE = {
+    "pack_size": 1024 * 1024 * 1024,   # Paket dosyası boyut sınırı (byte)
+    "algorithm": "sha256",             # Dizindeki hash algoritması
+    "chunk_size": 1024 * 1024,         # Okuma/yazma parça boyutu (byte)
+    "index_interval": 500,             # Bu kadar dosyada bir dizin diske yazılır
+    "dir_name": "media.pack"           # whatsapp_backup altındaki depo klasörü
+}
+
+# İçerik adresli nesne deposu (object_store.py) - tüm cihaz ve çalıştırmalar paylaşır
+OBJECT_STORE = {
+    "root": os.path.join("output", "objects"),
+    "remote_hash": True,        # Yeni görünen dosyaları telefonda hash'le; depodaysa aktarma
+    "chunk_size": 1024 * 1024,  # Okuma/yazma parça boyutu (byte)
+    "gc_grace_seconds": 3600    # Bundan yeni referanssız nesneler silinmez (süren yedekler için)
+}
+
+# Yedeği telefona geri yükleme ayarları (whatsapp_restore.py)
+RESTORE = {
+    "whatsapp_base": "/sdcard/Android/media/com.whatsapp/WhatsApp",  # Telefonda WhatsApp klasörü yoksa
+    "streams": 4,               # Paralel tar akışı (exec-in) sayısı
+    "chunk_size": 1024 * 1024,  # Okuma/yazma parça boyutu (byte)
+    "skip_existing": True,      # Telefonda boyutu ve tarihi aynı olan dosyaları atla
+    "media_scan": True,         # Bitince medya taramasını tek komutta başlat
+    "scan_command": "am broadcast -a android.intent.action.MEDIA_SCANNER_SCAN_FILE -d {uri}"
+}
+
+# Zamanlanmış artımlı yedekleme ayarları (backup_scheduler.py) - yedekler nesne deposuna yazılır
+SCHEDULE = {
+    "devices": [],              # Yedeklenecek cihazlar (boşsa depoda manifesti olan cihazlar)
+    "at": "02:00",              # Her gün bu saatten sonra ilk bağlantıda yedek alınır
+    "every_hours": None,        # Verilirse saat yerine bu aralıkla yedek alınır
+    "poll_interval": 60,        # Cihaz listesi kontrol aralığı (saniye)
+    "retry_minutes": 30,        # Başarısız yedekten sonra tekrar deneme beklemesi
+    "databases": True,          # Veritabanları da aynı manifeste eklenir
+    "media": True,
+    "verify": False,
+    "staging_dir": os.path.join("output", "scheduled"),  # Veritabanlarının geçici indirme klasörü
+    "retention": {
+        "daily": 7,             # Son 7 günün her birinden en yeni yedek
+        "weekly": 4             # Son 4 haftanın her birinden en yeni yedek
+    }
+}
+
+# Cihaz anlık görüntüsü ayarları (snapshot.py)
+SNAPSHOT = {
+    "dir": os.path.join("output", "snapshots"),
+    "roots": ["/sdcard"],     # Dosya listesi alınacak telefondaki dizinler
+    "compress_level": 6,      # gzip sıkıştırma seviyesi
+    "summary_limit": 20       # Karşılaştırma özetinde bölüm başına gösterilen öğe
+}
+
+# WhatsApp veritabanı şifre çözme ayarları (whatsapp_crypt.py)
+DECRYPT = {
+    "chunk_size": 1024 * 1024   # Okuma parça boyutu (byte); bellek kullanımı bununla sınırlı kalır
+}
+
+# WhatsApp mesaj dışa aktarma ayarları (whatsapp_export.py)
+EXPORT = {
+    "format": "ndjson",     # ndjson veya parquet (pyarrow gerekir)
+    "batch_size": 20000     # Sayfa başına mesaj; bellek kullanımı bununla sınırlı kalır
+}
+
+# İzleme (tracing) ayarları - Chrome trace formatı, Perfetto ile açılabilir
+TRACING = {
+    "enabled": os.environ.get("ADB_TRACE", "") == "1",  # Çalışırken adb.tracer.enable() ile de açılabilir
+    "trace_file": "output/trace.json"
+}
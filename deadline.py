@@ -0,0 +1,281 @@
+"""
+İlerlemeye Bağlı Süre Sınırları
+Aktarımlar (pull, yedekleme, geri yükleme) sabit bir süreyle değil
+ilerlemeye göre sınırlanır:
+
+- Belirli bir süre (config.TIMEOUTS["inactivity"]) hiç byte aktarılmazsa
+  süreç sonlandırılır; takılan aktarım saniyeler içinde hata verir
+- Beklenen boyut biliniyorsa ölçülen (yoksa varsayılan) hıza göre tahmini
+  süre hesaplanır; aktarım config.TIMEOUTS["min_throughput"] üzerinde bir
+  hızla ilerledikçe süre uzatılır, böylece büyük ama sağlıklı aktarımlar biter
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import config
+
+# Süre aşımı nedenleri
+INACTIVITY = "inactivity"
+DEADLINE = "deadline"
+
+
+class Deadline:
+    """
+    Tek bir işlemin süre sınırı
+
+    check() düzenli olarak o ana kadarki ilerlemeyle (byte) çağrılır ve süre
+    aşıldıysa nedeni döndürür. Sabit süreli sınır için Deadline(limit=60, inactivity=0).
+    """
+
+    def __init__(self, expected_bytes: Optional[int] = None,
+                 throughput: Optional[float] = None,
+                 limit: Optional[float] = None,
+                 inactivity: Optional[float] = None,
+                 first_progress: Optional[float] = None,
+                 startup: float = 0.0):
+        """
+        Args:
+            expected_bytes: Aktarılması beklenen byte sayısı (None ise tahmini süre yok)
+            throughput: Ölçülmüş aktarım hızı (byte/s; None veya 0 ise
+                        config.TIMEOUTS["expected_throughput"])
+            limit: Sabit toplam süre (saniye; verilirse tahmin yapılmaz ve uzatılmaz)
+            inactivity: İlerlemesiz geçebilecek en uzun süre (None ise
+                        config.TIMEOUTS["inactivity"], 0 ise kontrol edilmez)
+            first_progress: İlk ilerlemeye kadar beklenecek süre (None ise inactivity;
+                            telefonda onay bekleyen işlemler için daha uzun verilir)
+            startup: Tahmini süreye eklenen bekleme (örn. onay süresi)
+        """
+        settings = config.TIMEOUTS
+        self.expected_bytes = expected_bytes
+        self.inactivity = settings["inactivity"] if inactivity is None else inactivity
+        self.first_progress = first_progress or self.inactivity
+        self.extendable = limit is None
+        if limit is None and expected_bytes is not None:
+            rate = throughput or settings["expected_throughput"]
+            limit = startup + settings["grace"] + settings["slack"] * expected_bytes / rate
+        self.limit = limit
+        self.progress = 0
+        self.start = time.perf_counter()
+        self.last_progress = self.start
+
+    def check(self, progress: int, now: Optional[float] = None) -> Optional[str]:
+        """
+        İlerlemeyi kaydeder ve süre aşıldıysa nedenini döndürür
+
+        Args:
+            progress: O ana kadar aktarılan toplam byte
+
+        Returns:
+            INACTIVITY, DEADLINE veya None
+        """
+        now = time.perf_counter() if now is None else now
+        if progress > self.progress:
+            self.progress = progress
+            self.last_progress = now
+
+        if self.inactivity:
+            allowed = self.inactivity if self.progress else self.first_progress
+            if now - self.last_progress > allowed:
+                return INACTIVITY
+
+        elapsed = now - self.start
+        if self.limit is None or elapsed <= self.limit:
+            return None
+        if self.extendable and self.expected_bytes is not None:
+            if self.progress >= self.expected_bytes:
+                # Beklenenden büyük çıktı; hareketsizlik sınırı yeterli
+                return None
+            rate = self.progress / elapsed
+            if rate >= config.TIMEOUTS["min_throughput"]:
+                remaining = self.expected_bytes - self.progress
+                self.limit = elapsed + config.TIMEOUTS["slack"] * remaining / rate
+                return None
+        return DEADLINE
+
+    def describe(self, reason: str) -> str:
+        """Süre aşımı nedenini kullanıcıya gösterilecek mesaja çevirir"""
+        if reason == INACTIVITY:
+            allowed = self.inactivity if self.progress else self.first_progress
+            return f"İşlem {allowed:g} saniye boyunca ilerlemedi ({self.progress} byte aktarıldı)"
+        return f"İşlem süre sınırını aştı ({self.limit:.0f} saniye, {self.progress} byte aktarıldı)"
+
+
+class Watchdog:
+    """
+    Süre sınırını arka planda izleyen iş parçacığı
+
+    progress() her config.PROGRESS["interval"] saniyede okunur; süre aşılınca
+    on_expire(neden) bir kez çağrılır (genellikle süreci sonlandırır).
+
+        with Watchdog(deadline, lambda: received, process.kill):
+            process.communicate()
+    """
+
+    def __init__(self, deadline: Deadline, progress: Callable[[], int],
+                 on_expire: Callable[[str], None],
+                 on_sample: Optional[Callable[[int], None]] = None,
+                 interval: Optional[float] = None):
+        """
+        Args:
+            deadline: İzlenecek süre sınırı
+            progress: O ana kadar aktarılan byte sayısını döndürür
+            on_expire: Süre aşılınca nedenle çağrılır
+            on_sample: Her ölçümde ilerlemeyle çağrılır (ilerleme olayları için)
+            interval: Ölçüm aralığı (None ise config.PROGRESS["interval"])
+        """
+        self.deadline = deadline
+        self.reason: Optional[str] = None
+        self._progress = progress
+        self._on_expire = on_expire
+        self._on_sample = on_sample
+        self._interval = interval or config.PROGRESS["interval"]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="deadline-watchdog",
+                                        daemon=True)
+
+    @property
+    def expired(self) -> bool:
+        return self.reason is not None
+
+    @property
+    def message(self) -> str:
+        return self.deadline.describe(self.reason) if self.reason else ""
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            value = self._progress()
+            if self._on_sample is not None:
+                self._on_sample(value)
+            reason = self.deadline.check(value)
+            if reason is not None:
+                self.reason = reason
+                self._on_expire(reason)
+                return
+
+    def start(self) -> "Watchdog":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def kill_process(process) -> Callable[[str], None]:
+    """Watchdog için süreci sonlandıran on_expire fonksiyonu döndürür"""
+    def on_expire(reason: str):
+        try:
+            process.kill()
+        except OSError:
+            pass
+    return on_expire
+
+
+class CountingReader:
+    """Okunan byte'ları sayan akış sarmalayıcısı (ilerleme ölçümü için)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+
+class LocalGrowth:
+    """
+    Yerel dosya veya klasöre `since` (epoch) sonrasında yazılan byte'lar
+    (adb pull/backup ilerlemesi için Watchdog'a progress olarak verilir)
+
+    Her ölçümde ağacın tamamı taranmaz: sadece değişiklik zamanı değişen
+    klasörler listelenir ve içlerinde henüz sayılmamış dosyalar stat edilir.
+    adb dosyaları sırayla yazdığından yeni dosyalar görününce öncekiler
+    bitmiş sayılır; tekrar ölçülen sadece en son yazılan dosyadır.
+    """
+
+    # Zaman damgası kaba olan dosya sistemlerinde (FAT: 2 sn) bu kadar yeni
+    # değişmiş klasörler, zamanı aynı görünse de tekrar listelenir
+    RECENT_SECONDS = 2.0
+
+    def __init__(self, path: str, since: float):
+        self.path = path
+        self.since = since
+        self._dirs: Dict[str, Tuple[int, List[str]]] = {}   # klasör -> (mtime_ns, alt klasörler)
+        self._counted: Set[str] = set()
+        self._finished = 0
+        self._open: Dict[str, int] = {}                     # yazımı sürüyor olabilecek dosya
+
+    @staticmethod
+    def _written(stat: os.stat_result) -> float:
+        # adb pull -a değişiklik zamanını geri aldığından ctime da kontrol edilir
+        return max(stat.st_mtime, stat.st_ctime)
+
+    def _scan(self, directory: str, found: Dict[str, Tuple[float, int]]):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        known = self._dirs.get(directory)
+        if known is not None and known[0] == mtime \
+                and time.time() - mtime / 1e9 > self.RECENT_SECONDS:
+            subdirs = known[1]
+        else:
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.path not in self._counted and entry.path not in found:
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            if self._written(stat) >= self.since:
+                                found[entry.path] = (self._written(stat), stat.st_size)
+            except OSError:
+                return
+            self._dirs[directory] = (mtime, subdirs)
+        for subdir in subdirs:
+            self._scan(subdir, found)
+
+    def __call__(self) -> int:
+        for path in list(self._open):
+            try:
+                self._open[path] = os.stat(path).st_size
+            except OSError:
+                del self._open[path]
+
+        found: Dict[str, Tuple[float, int]] = {}
+        if os.path.isdir(self.path):
+            self._scan(self.path, found)
+        elif self.path not in self._counted:
+            try:
+                stat = os.stat(self.path)
+                if self._written(stat) >= self.since:
+                    found[self.path] = (self._written(stat), stat.st_size)
+            except OSError:
+                pass
+
+        if found:
+            # Yeni dosyalar göründü: öncekilerin ve yenilerden en son yazılan
+            # dışındakilerin yazımı bitmiştir
+            self._counted.update(found)
+            self._finished += sum(self._open.values())
+            latest = max(written for written, _ in found.values())
+            self._open = {path: size for path, (written, size) in found.items()
+                          if written == latest}
+            self._finished += sum(size for path, (_, size) in found.items()
+                                  if path not in self._open)
+        return self._finished + sum(self._open.values())
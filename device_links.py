@@ -0,0 +1,431 @@
+"""
+Cihaz Bağlantı Seçimi (USB / Kablosuz ADB)
+Aynı telefon hem USB hem `adb connect` ile bağlıysa adb onu iki ayrı seri
+numarasıyla gösterir. Bu modül seri numaralarını ro.serialno ile tek fiziksel
+cihazda birleştirir, her bağlantının gecikmesini ve aktarım hızını ölçer ve
+komutları uygun bağlantıya yönlendirir:
+
+- Toplu aktarımlar (pull, push, exec-out, backup, restore, install) en hızlı
+  bağlantıdan, kısa komutlar (shell, getprop...) en düşük gecikmeli bağlantıdan
+- Bir bağlantı koparsa komut diğer bağlantıdan tekrarlanır
+- Cihazlar arka planda config.LINKS["recheck_interval"] saniyede bir yeniden
+  taranır (yeni bağlantılar ölçülür, geri gelen bağlantılar kullanılır);
+  yönlendirme kararı komut çalıştırmaz, sadece bu taramanın sonucunu okur
+
+RoutingTransport diğer taşımalar gibi (bkz. transport.py) ADBManager'a verilir;
+config.LINKS["enabled"] açıksa ADBManager bunu kendisi yapar.
+"""
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+# Toplu veri taşıyan adb komutları
+BULK_COMMANDS = {"pull", "push", "sync", "exec-out", "exec-in", "backup", "restore",
+                 "install", "install-multiple"}
+
+# Bağlantının koptuğunu gösteren adb hata mesajları
+# ("sh: x: not found" gibi shell hatalarıyla karışmaması için adb'nin kendi biçimleri)
+LINK_ERRORS = ("device offline", "' not found", "no devices/emulators found",
+               "device unauthorized", "error: closed", "protocol fault",
+               "connection reset", "failed to connect")
+
+
+def link_kind(serial: str) -> str:
+    """Seri numarasından bağlantı türü: "wifi" (ip:port veya mDNS) ya da "usb" """
+    if ":" in serial or "._adb-tls-" in serial:
+        return "wifi"
+    return "usb"
+
+
+def is_link_error(stderr: bytes) -> bool:
+    """adb hata çıktısı bağlantı kopmasını mı gösteriyor"""
+    text = stderr.decode("utf-8", errors="ignore").lower()
+    return any(pattern in text for pattern in LINK_ERRORS)
+
+
+def split_serial(args: List[str]) -> Tuple[Optional[str], List[str]]:
+    """["-s", seri, ...] -> (seri, kalan argümanlar)"""
+    if len(args) >= 2 and args[0] == "-s":
+        return args[1], args[2:]
+    return None, args
+
+
+class Link:
+    """Bir fiziksel cihaza giden tek bağlantı (bir adb seri numarası)"""
+
+    def __init__(self, serial: str, device_id: str):
+        self.serial = serial
+        self.device_id = device_id
+        self.kind = link_kind(serial)
+        self.latency: Optional[float] = None       # saniye
+        self.throughput: Optional[float] = None    # byte/s
+        self.alive = True
+        self.failed_at = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "serial": self.serial,
+            "device_id": self.device_id,
+            "kind": self.kind,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "throughput_mb_s": (round(self.throughput / (1024 * 1024), 1)
+                                if self.throughput is not None else None),
+            "alive": self.alive
+        }
+
+
+class LinkManager:
+    """
+    Fiziksel cihazları ve bağlantılarını tutar, yönlendirme kararını verir
+
+    Komutlar doğrudan sarılan taşımayla (inner) çalıştırılır; yönlendirme
+    ve ölçüm birbirini etkilemez. Tarama ve ölçüm komutları kilit dışında
+    çalışır, sonuçlar kilit altında yerine konur.
+    """
+
+    def __init__(self, inner):
+        """
+        Args:
+            inner: Ölçüm ve kontrol komutlarını çalıştıran taşıma
+        """
+        self.inner = inner
+        self.links: Dict[str, Link] = {}
+        self.groups: Dict[str, List[str]] = {}
+        self.discovered_at = 0.0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def _run(self, serial: Optional[str], args: List[str],
+             timeout: float) -> Tuple[int, bytes, bytes]:
+        if serial is not None:
+            args = ["-s", serial] + args
+        return self.inner.run(args, timeout)
+
+    def discover(self) -> Dict[str, List[str]]:
+        """
+        Bağlı seri numaralarını listeler ve ro.serialno ile gruplar
+
+        Returns:
+            Fiziksel cihaz kimliği -> seri numaraları
+        """
+        returncode, stdout, _ = self._run(None, ["devices", "-l"], config.TIMEOUTS["command"])
+        serials = []
+        if returncode == 0:
+            for line in stdout.decode("utf-8", errors="replace").splitlines()[1:]:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1] == "device":
+                    serials.append(parts[0])
+
+        device_ids = {}
+        for serial in serials:
+            returncode, stdout, _ = self._run(serial, ["shell", "getprop ro.serialno"],
+                                              config.TIMEOUTS["command"])
+            device_id = stdout.decode("utf-8", errors="replace").strip() if returncode == 0 else ""
+            device_ids[serial] = device_id or serial
+
+        links, groups = {}, {}
+        with self._lock:
+            for serial, device_id in device_ids.items():
+                link = self.links.get(serial)
+                if link is None or link.device_id != device_id:
+                    link = Link(serial, device_id)
+                elif not link.alive:
+                    print(f"[BILGI] Bağlantı geri geldi: {serial} ({link.kind})")
+                link.alive = True
+                links[serial] = link
+                groups.setdefault(link.device_id, []).append(serial)
+            # Kopmuş ama bilinen bağlantılar kaybolmasın (yeniden bağlanabilir)
+            for serial, link in self.links.items():
+                if serial not in links:
+                    link.alive = False
+                    link.failed_at = link.failed_at or time.time()
+                    links[serial] = link
+                    groups.setdefault(link.device_id, []).append(serial)
+            self.links, self.groups = links, groups
+            self.discovered_at = time.time()
+        return groups
+
+    def probe(self, serial: str) -> Link:
+        """
+        Bağlantının gecikmesini (boş shell komutu) ve aktarım hızını
+        (exec-out ile /dev/zero okuma) ölçer
+        """
+        settings = config.LINKS
+        with self._lock:
+            link = self.links[serial]
+        samples = []
+        for _ in range(settings["latency_samples"]):
+            start = time.perf_counter()
+            returncode, _, _ = self._run(serial, ["shell", "true"], config.TIMEOUTS["command"])
+            if returncode != 0:
+                self.mark_down(serial)
+                return link
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        latency = samples[len(samples) // 2]
+
+        block = 1024 * 1024
+        count = max(1, settings["probe_bytes"] // block)
+        start = time.perf_counter()
+        returncode, stdout, _ = self._run(
+            serial, ["exec-out", f"dd if=/dev/zero bs={block} count={count} 2>/dev/null"],
+            config.TIMEOUTS["shell"]
+        )
+        elapsed = time.perf_counter() - start - latency
+        with self._lock:
+            link.latency = latency
+            link.throughput = len(stdout) / max(elapsed, 1e-3) if returncode == 0 and stdout else None
+        return link
+
+    def probe_all(self, force: bool = False) -> List[Link]:
+        """
+        Birden fazla bağlantısı olan cihazların bağlantılarını ölçer
+
+        Args:
+            force: False ise daha önce ölçülmüş bağlantılar tekrar ölçülmez
+        """
+        with self._lock:
+            pending = [serial for serials in self.groups.values() if len(serials) >= 2
+                       for serial in serials
+                       if self.links[serial].alive and (force or self.links[serial].throughput is None)]
+        return [self.probe(serial) for serial in pending]
+
+    def refresh(self):
+        """Cihazları yeniden tarar ve yeni bağlantıları ölçer (geri gelen bağlantılar canlanır)"""
+        self.discover()
+        self.probe_all()
+
+    def start_refresh(self):
+        """Arka planda config.LINKS["recheck_interval"] saniyede bir refresh() çalıştırır"""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name="link-refresh",
+                                               daemon=True)
+            self._refresher.start()
+
+    def stop_refresh(self):
+        with self._lock:
+            refresher, self._refresher = self._refresher, None
+        self._stop.set()
+        if refresher is not None and refresher is not threading.current_thread():
+            refresher.join()
+
+    def _refresh_loop(self):
+        # Sonradan bağlanan cihaz veya bağlantılar (örn. adb connect) için
+        while not self._stop.wait(config.LINKS["recheck_interval"]):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[UYARI] Bağlantı taraması başarısız: {str(e)}")
+
+    def mark_down(self, serial: str):
+        """Bağlantıyı kopmuş olarak işaretler"""
+        with self._lock:
+            link = self.links.get(serial)
+            if link is not None and link.alive:
+                link.alive = False
+                link.failed_at = time.time()
+                print(f"[UYARI] Bağlantı koptu: {serial} ({link.kind})")
+
+    def check(self, serial: str) -> bool:
+        """Bağlantının hâlâ çalışıp çalışmadığını `adb get-state` ile kontrol eder"""
+        try:
+            returncode, stdout, _ = self._run(serial, ["get-state"], config.TIMEOUTS["command"])
+        except Exception:
+            returncode, stdout = -1, b""
+        alive = returncode == 0 and stdout.strip() == b"device"
+        if alive:
+            with self._lock:
+                link = self.links.get(serial)
+                if link is not None:
+                    link.alive = True
+        else:
+            self.mark_down(serial)
+        return alive
+
+    def route(self, serial: str, bulk: bool) -> str:
+        """
+        İstenen seri numarasının ait olduğu cihaz için kullanılacak bağlantıyı seçer
+
+        Args:
+            serial: Çağıranın kullandığı seri numarası (cihazın herhangi bir bağlantısı)
+            bulk: True ise en hızlı, False ise en düşük gecikmeli bağlantı
+
+        Returns:
+            Komutun gönderileceği seri numarası (seçenek yoksa aynısı)
+        """
+        with self._lock:
+            if serial not in self.links:
+                return serial
+            group = [self.links[s] for s in self.groups[self.links[serial].device_id]]
+            alive = [link for link in group if link.alive]
+            if not alive:
+                return serial
+            if bulk:
+                # Ölçülmemiş bağlantılarda USB tercih edilir
+                best = max(alive, key=lambda l: (l.throughput or 0, l.kind == "usb"))
+            else:
+                best = min(alive, key=lambda l: (l.latency if l.latency is not None else float("inf"),
+                                                 l.kind != "usb"))
+            return best.serial
+
+    def alternative(self, serial: str) -> Optional[str]:
+        """Aynı cihaza giden, çalışan başka bir bağlantı"""
+        with self._lock:
+            link = self.links.get(serial)
+            if link is None:
+                return None
+            for other in self.groups.get(link.device_id, []):
+                if other != serial and self.links[other].alive:
+                    return other
+        return None
+
+    def device_id(self, serial: str) -> str:
+        """Seri numarasının ait olduğu fiziksel cihaz (bilinmiyorsa seri numarasının kendisi)"""
+        with self._lock:
+            link = self.links.get(serial)
+            return link.device_id if link is not None else serial
+
+    def collapse(self, devices: List[Dict]) -> List[Dict]:
+        """
+        get_devices() listesinde aynı fiziksel cihaza ait satırları birleştirir
+
+        Cihaz, ilk göründüğü sırada tek satır olarak kalır (USB bağlantısı
+        varsa onun seri numarasıyla); "links" alanında tüm seri numaraları bulunur.
+        """
+        with self._lock:
+            rows: Dict[str, List[Dict]] = {}
+            order = []
+            for device in devices:
+                link = self.links.get(device["serial"])
+                key = link.device_id if link is not None and device["status"] == "device" \
+                    else f"serial:{device['serial']}"
+                if key not in rows:
+                    order.append(key)
+                rows.setdefault(key, []).append(device)
+        merged = []
+        for key in order:
+            group = rows[key]
+            primary = min(group, key=lambda d: link_kind(d["serial"]) != "usb")
+            merged.append(dict(primary, links=[d["serial"] for d in group])
+                          if len(group) > 1 else primary)
+        return merged
+
+    def status(self) -> List[Dict]:
+        """Tüm bağlantıların durumu (cihaza göre gruplu sırada)"""
+        with self._lock:
+            return [self.links[serial].to_dict()
+                    for serials in self.groups.values() for serial in serials]
+
+
+class _RoutedProcess:
+    """
+    Yönlendirilmiş süreç; hata ile biterse bağlantının durumunu kontrol eder.
+    communicate() ile kullanılıyorsa (çıktı henüz okunmadıysa) kopan
+    bağlantıdaki komut diğer bağlantıdan tekrarlanır.
+    """
+
+    def __init__(self, transport: "RoutingTransport", process, serial: str,
+                 args: List[str], stdin: bool):
+        self._transport = transport
+        self._process = process
+        self._links = transport.links
+        self._serial = serial
+        self._args = args
+        self._stdin = stdin
+        self._checked = False
+
+    def __getattr__(self, name):
+        return getattr(self._process, name)
+
+    def _after_exit(self, returncode: Optional[int]):
+        if returncode not in (0, None) and not self._checked:
+            self._checked = True
+            self._links.check(self._serial)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = self._process.wait(timeout)
+        self._after_exit(returncode)
+        return returncode
+
+    def communicate(self, input: Optional[bytes] = None, timeout: Optional[float] = None):
+        stdout, stderr = self._process.communicate(input, timeout)
+        if self._process.returncode != 0 and is_link_error(stderr or b""):
+            self._links.mark_down(self._serial)
+            fallback = self._links.alternative(self._serial)
+            if fallback is not None:
+                print(f"[BILGI] Komut diğer bağlantıdan tekrarlanıyor: {fallback}")
+                self._serial = fallback
+                self._process = self._transport.inner.popen(["-s", fallback] + self._args,
+                                                            stdin=self._stdin)
+                stdout, stderr = self._process.communicate(input, timeout)
+        self._after_exit(self._process.returncode)
+        return stdout, stderr
+
+
+class RoutingTransport:
+    """
+    Başka bir taşımayı sarar; "-s seri" ile verilen komutları LinkManager'ın
+    seçtiği bağlantıya yönlendirir. İlk yönlendirmede cihazlar taranır ve ölçülür.
+    """
+
+    def __init__(self, inner, links: Optional[LinkManager] = None):
+        self.inner = inner
+        self.adb_path = getattr(inner, "adb_path", "adb")
+        self.live = getattr(inner, "live", True)
+        self.links = links or LinkManager(inner)
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _ensure_ready(self):
+        if self._ready:
+            return
+        with self._ready_lock:
+            if not self._ready:
+                self.links.refresh()
+                self.links.start_refresh()
+                self._ready = True
+
+    def collapse_devices(self, devices: List[Dict]) -> List[Dict]:
+        """Aynı telefonun bağlantılarını tek cihaz olarak listeler (bkz. LinkManager.collapse)"""
+        self._ensure_ready()
+        return self.links.collapse(devices)
+
+    def _routed(self, args: List[str]) -> Tuple[Optional[str], List[str]]:
+        serial, rest = split_serial(args)
+        if serial is None or not rest:
+            return None, args
+        self._ensure_ready()
+        target = self.links.route(serial, rest[0] in BULK_COMMANDS)
+        return target, ["-s", target] + rest
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+        serial, routed = self._routed(args)
+        returncode, stdout, stderr = self.inner.run(routed, timeout)
+        if serial is not None and returncode != 0 and is_link_error(stderr):
+            # Bağlantı koptu: aynı komutu cihazın diğer bağlantısından tekrarla
+            self.links.mark_down(serial)
+            fallback = self.links.alternative(serial)
+            if fallback is not None:
+                print(f"[BILGI] Komut diğer bağlantıdan tekrarlanıyor: {fallback}")
+                returncode, stdout, stderr = self.inner.run(["-s", fallback] + routed[2:], timeout)
+        return returncode, stdout, stderr
+
+    def popen(self, args: List[str], stdin: bool = False):
+        serial, routed = self._routed(args)
+        process = self.inner.popen(routed, stdin=stdin)
+        if serial is None:
+            return process
+        # Akışlar yarıda aktarılamaz; kopma tespit edilirse sonraki deneme
+        # (ör. devam ettirilebilir pull) diğer bağlantıya gider
+        return _RoutedProcess(self, process, serial, routed[2:], stdin)
+
+    def close(self):
+        self.links.stop_refresh()
+        if hasattr(self.inner, "close"):
+            self.inner.close()
@@ -5,11 +5,19 @@ Eksik paketleri ve ADB'yi otomatik olarak kurar
 import os
 import sys
 import subprocess
+import time
 import zipfile
 import shutil
 from pathlib import Path
-from urllib.request import urlretrieve
-from urllib.error import URLError
+from urllib.parse import urljoin, urlparse
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+from xml.etree import ElementTree
+
+import config
+import integrity
+import adb_locator
+import stream_copy
 
 
 class AutoInstaller:
@@ -56,116 +64,328 @@ class AutoInstaller:
             return False
     
     def check_adb(self):
-        """ADB'nin kurulu olup olmadığını kontrol eder"""
-        # Önce sistem PATH'inde kontrol et
-        try:
-            result = subprocess.run(
-                ["adb", "version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                print("[OK] ADB sistem PATH'inde bulundu")
-                return True, "system"
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+        """
+        ADB'nin kurulu olup olmadığını kontrol eder
         
-        # Sonra proje klasöründe kontrol et
-        if self.adb_path.exists():
-            print("[OK] ADB proje klasöründe bulundu")
-            return True, str(self.adb_path)
+        Sonuç adb_locator ile paylaşılan durum dosyasına yazılır; adb dosyası
+        değişmediyse sonraki açılışlarda `adb version` çalıştırılmaz.
+        """
+        found = adb_locator.locate_adb(self.project_root)
+        if not found:
+            return False, None
         
-        return False, None
+        if found["source"] == "system":
+            print("[OK] ADB sistem PATH'inde bulundu")
+            return True, "system"
+        
+        print("[OK] ADB proje klasöründe bulundu")
+        return True, found["path"]
     
-    def download_platform_tools(self):
-        """Android Platform Tools'u indirir"""
+    def download_platform_tools(self, url=None, sha256=None):
+        """
+        Android Platform Tools'u indirir
+        
+        Bağlantı koparsa HTTP Range ile kaldığı yerden devam eder; sunucudaki
+        dosya değiştiyse (If-Range/ETag) baştan indirilir. İndirme bitince
+        sabitlenmiş SHA-256 ile, sabitlenmemişse SDK deposu manifestinin
+        yayımladığı SHA-1 ile karşılaştırılır (bkz. config.PLATFORM_TOOLS);
+        doğrulanamayan dosya kullanılmaz.
+        
+        Args:
+            url: İndirme adresi (None ise config.PLATFORM_TOOLS["url"], o da
+                 None ise manifestteki güncel sürüm)
+            sha256: Beklenen SHA-256 (None ise config.PLATFORM_TOOLS["sha256"]
+                    veya manifestteki SHA-1)
+        
+        Returns:
+            İndirilen ZIP dosyasının yolu veya başarısızsa None
+        """
         print("\n[KURULUM] Android Platform Tools indiriliyor...")
         
-        # Google'ın resmi Platform Tools indirme URL'i
-        # Bu URL genellikle stabil kalır
-        url = "https://dl.google.com/android/repository/platform-tools-latest-windows.zip"
+        settings = config.PLATFORM_TOOLS
+        url = url or settings["url"]
+        digest = (sha256 or (settings["sha256"] if url == settings["url"] else None) or "").lower()
+        expected = ("sha256", digest) if digest else None
+        if expected is None:
+            resolved = None
+            if not settings["manifest_sha1"]:
+                print("[HATA] SHA-256 sabitlenmemiş ve manifestteki SHA-1'e güven kapalı")
+            elif urlparse(settings["manifest_url"]).scheme != "https":
+                # SHA-1 değerine güven manifestin HTTPS ile alınmasına dayanır
+                print("[HATA] SDK deposu manifesti HTTPS ile alınmıyor")
+            else:
+                try:
+                    resolved = self._resolve_manifest_sha1(settings, url)
+                except (URLError, OSError, ElementTree.ParseError) as e:
+                    print(f"[HATA] SDK deposu manifesti okunamadı: {str(e)}")
+            if resolved is None:
+                print("[HATA] İndirilecek dosyanın checksum değeri bulunamadı, kurulum yapılmadı")
+                print("[BILGI] config.PLATFORM_TOOLS içinde url ve sha256 değerlerini birlikte verin "
+                      "veya platform-tools klasörünü manuel olarak kurun")
+                return None
+            url, sha1 = resolved
+            expected = ("sha1", sha1)
+            print("[UYARI] Sürüm sabitlenmedi; arşiv SDK deposu manifestindeki SHA-1 ile doğrulanacak")
+        algorithm, checksum = expected
         
         zip_path = self.project_root / "platform-tools.zip"
+        part_path = self.project_root / "platform-tools.zip.part"
         
-        # İndirme progress callback
-        def show_progress(block_num, block_size, total_size):
-            if total_size > 0:
-                percent = min(100, (block_num * block_size * 100) // total_size)
-                if block_num % 10 == 0:  # Her 10 blokta bir göster
-                    print(f"\r[BILGI] İndiriliyor... %{percent}", end='', flush=True)
-        
-        try:
-            print(f"[BILGI] İndirme başlıyor: {url}")
-            print("[BILGI] Bu işlem birkaç dakika sürebilir...")
-            urlretrieve(url, zip_path, show_progress)
-            print("\n[OK] İndirme tamamlandı")
+        # Önceki bir çalıştırmadan kalan doğrulanmış ZIP varsa tekrar indirme
+        if zip_path.exists() and integrity.hash_file(str(zip_path), algorithm) == checksum:
+            print("[OK] Daha önce indirilmiş ZIP dosyası kullanılıyor")
             return str(zip_path)
-        except URLError as e:
-            print(f"\n[HATA] İndirme hatası: {str(e)}")
-            print("[BILGI] İnternet bağlantınızı kontrol edin")
-            print("[BILGI] Alternatif: Manuel olarak indirip platform-tools klasörüne koyabilirsiniz")
-            return None
-        except Exception as e:
-            print(f"\n[HATA] Beklenmeyen hata: {str(e)}")
+        
+        print(f"[BILGI] İndirme başlıyor: {url}")
+        print("[BILGI] Bu işlem birkaç dakika sürebilir...")
+        
+        attempt = 0
+        while True:
+            try:
+                self._download_range(url, part_path, settings)
+                break
+            except (URLError, OSError) as e:
+                attempt += 1
+                if attempt > settings["retries"]:
+                    print(f"\n[HATA] İndirme hatası: {str(e)}")
+                    print("[BILGI] İnternet bağlantınızı kontrol edin (tekrar çalıştırınca kaldığı yerden devam eder)")
+                    print("[BILGI] Alternatif: Manuel olarak indirip platform-tools klasörüne koyabilirsiniz")
+                    return None
+                print(f"\n[UYARI] Bağlantı koptu ({str(e)}), tekrar deneniyor ({attempt}/{settings['retries']})...")
+                time.sleep(settings["retry_delay"])
+        print("\n[OK] İndirme tamamlandı")
+        
+        etag_path = self._etag_path(part_path)
+        actual = integrity.hash_file(str(part_path), algorithm)
+        if actual != checksum:
+            print(f"[HATA] {algorithm.upper()} doğrulaması başarısız! Dosya silindi.")
+            print(f"[BILGI] Beklenen: {checksum}")
+            print(f"[BILGI] Hesaplanan: {actual}")
+            part_path.unlink()
+            if etag_path.exists():
+                etag_path.unlink()
             return None
+        print(f"[OK] {algorithm.upper()} doğrulandı")
+        
+        os.replace(part_path, zip_path)
+        if etag_path.exists():
+            etag_path.unlink()
+        return str(zip_path)
     
-    def extract_platform_tools(self, zip_path):
-        """Platform Tools ZIP dosyasını çıkarır"""
-        print(f"\n[KURULUM] ZIP dosyası açılıyor: {zip_path}")
+    @staticmethod
+    def _resolve_manifest_sha1(settings, url=None):
+        """
+        SDK deposu manifestinden platform-tools arşivini ve SHA-1 değerini bulur
+        
+        Manifest güncel sürümü gösterir (sabitlemez) ve arşivler için yalnızca
+        SHA-1 yayımlar; SHA-1 olmayan checksum'lar atlanır.
+        
+        Args:
+            settings: config.PLATFORM_TOOLS
+            url: Aranacak indirme adresi (None ise settings["host_os"] için güncel arşiv)
+        
+        Returns:
+            (url, sha1) veya arşiv manifestte yoksa None
+        """
+        request = Request(settings["manifest_url"])
+        with urlopen(request, timeout=settings["timeout"]) as response:
+            root = ElementTree.fromstring(response.read())
+        
+        def local_name(element):
+            return element.tag.rsplit("}", 1)[-1]
+        
+        def child(element, name):
+            return next((c for c in element if local_name(c) == name), None)
+        
+        wanted = os.path.basename(urlparse(url).path) if url else None
+        for package in root.iter():
+            if local_name(package) != "remotePackage" or package.get("path") != "platform-tools":
+                continue
+            archives = child(package, "archives")
+            for archive in (archives if archives is not None else []):
+                complete = child(archive, "complete")
+                host_os = child(archive, "host-os")
+                if complete is None:
+                    continue
+                archive_url = child(complete, "url")
+                checksum = child(complete, "checksum")
+                if archive_url is None or checksum is None or not checksum.text:
+                    continue
+                name = archive_url.text.strip()
+                if wanted is not None:
+                    if os.path.basename(name) != wanted:
+                        continue
+                elif host_os is None or host_os.text.strip() != settings["host_os"]:
+                    continue
+                if checksum.get("type", "sha1").lower() != "sha1":
+                    continue
+                return (url or urljoin(settings["manifest_url"], name),
+                        checksum.text.strip().lower())
+        return None
+    
+    @staticmethod
+    def _etag_path(part_path):
+        """.part dosyasının ETag kaydı (devam ederken If-Range ile gönderilir)"""
+        return part_path.with_name(part_path.name + ".etag")
+    
+    @classmethod
+    def _download_range(cls, url, part_path, settings):
+        """
+        .part dosyasının sonundan itibaren indirmeye devam eder
+        
+        Devam isteği If-Range ile .part dosyasını başlatan yanıtın ETag'ini
+        gönderir; sunucudaki dosya değiştiyse veya Range desteklenmiyorsa
+        (200 yanıtı) dosya baştan yazılır. ETag kaydı yoksa devam edilmez,
+        böylece farklı sürümlerin byte'ları birleştirilmez.
+        """
+        etag_path = cls._etag_path(part_path)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        etag = etag_path.read_text(encoding="utf-8").strip() if etag_path.exists() else ""
+        request = Request(url)
+        if offset and etag:
+            request.add_header("Range", f"bytes={offset}-")
+            request.add_header("If-Range", etag)
+        else:
+            offset = 0
         
         try:
-            # Geçici bir klasöre çıkar
-            temp_extract_dir = self.project_root / "temp_extract"
-            temp_extract_dir.mkdir(exist_ok=True)
+            response = urlopen(request, timeout=settings["timeout"])
+        except HTTPError as e:
+            if e.code == 416:
+                # İstenen aralık dosya sonunun ötesinde: .part zaten tamamlanmış
+                return
+            raise
+        
+        with response:
+            if offset and response.status == 206:
+                mode = "ab"
+                print(f"[BILGI] Kaldığı yerden devam ediliyor: {offset // (1024 * 1024)} MB")
+            else:
+                mode = "wb"
+                offset = 0
+                # Zayıf ETag (W/) If-Range'de kullanılamaz
+                etag = response.headers.get("ETag") or ""
+                if etag and not etag.startswith("W/"):
+                    etag_path.write_text(etag, encoding="utf-8")
+                elif etag_path.exists():
+                    etag_path.unlink()
+            length = response.headers.get("Content-Length")
+            total_size = offset + int(length) if length else 0
             
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # ZIP içindeki tüm dosyaları çıkar
-                zip_ref.extractall(temp_extract_dir)
+            state = {"downloaded": offset, "percent": -1}
             
-            # platform-tools klasörünü bul ve taşı
-            extracted_platform_tools = None
+            def on_progress(count):
+                state["downloaded"] += count
+                if total_size > 0:
+                    percent = min(100, state["downloaded"] * 100 // total_size)
+                    if percent != state["percent"]:
+                        state["percent"] = percent
+                        print(f"\r[BILGI] İndiriliyor... %{percent}", end='', flush=True)
             
-            # Önce doğrudan platform-tools klasörünü ara
-            if (temp_extract_dir / "platform-tools").exists():
-                extracted_platform_tools = temp_extract_dir / "platform-tools"
-            else:
-                # İç içe klasörleri kontrol et
-                for item in temp_extract_dir.iterdir():
-                    if item.is_dir() and (item / "adb.exe").exists():
-                        extracted_platform_tools = item
-                        break
+            with open(part_path, mode) as f:
+                stream_copy.copy_stream(response, f, settings["chunk_size"],
+                                        on_progress=on_progress)
             
-            if extracted_platform_tools and (extracted_platform_tools / "adb.exe").exists():
-                # Eski klasörü sil (varsa)
-                if self.platform_tools_dir.exists():
-                    shutil.rmtree(self.platform_tools_dir)
-                
-                # Yeni klasörü taşı
-                shutil.move(str(extracted_platform_tools), str(self.platform_tools_dir))
-                
-                # Geçici klasörü temizle
-                try:
-                    shutil.rmtree(temp_extract_dir)
-                except:
-                    pass
+            downloaded = state["downloaded"]
+            if total_size and downloaded < total_size:
+                raise URLError(f"bağlantı erken kapandı ({downloaded}/{total_size} byte)")
+    
+    def extract_platform_tools(self, zip_path, members=None):
+        """
+        Platform Tools ZIP dosyasını çıkarır
+        
+        Yalnızca gerekli dosyalar ZIP'ten doğrudan platform-tools yanındaki
+        geçici klasöre akıtılır; ardından klasörler yer değiştirilir, böylece
+        yarıda kalan bir çıkarma mevcut kurulumu bozmaz.
+        
+        Args:
+            zip_path: ZIP dosyası
+            members: Çıkarılacak dosya adları (None ise config.PLATFORM_TOOLS["members"])
+        
+        Returns:
+            Başarı durumu
+        """
+        print(f"\n[KURULUM] ZIP dosyası açılıyor: {zip_path}")
+        
+        if members is None:
+            members = config.PLATFORM_TOOLS["members"]
+        staging_dir = self.project_root / "platform-tools.new"
+        old_dir = self.project_root / "platform-tools.old"
+        
+        try:
+            for leftover in (staging_dir, old_dir):
+                if leftover.exists():
+                    shutil.rmtree(leftover)
+            
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                selected = self._select_members(zip_ref, members)
+                if not selected or self.adb_path.name not in selected:
+                    print("[HATA] ZIP içinde platform-tools klasörü bulunamadı")
+                    return False
                 
-                print("[OK] ZIP dosyası başarıyla açıldı")
-                return True
-            else:
-                print("[HATA] ZIP içinde platform-tools klasörü bulunamadı")
-                return False
+                staging_dir.mkdir()
+                for relative, info in selected.items():
+                    target = staging_dir / relative
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with zip_ref.open(info) as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                    # Unix izinlerini (çalıştırılabilir bit) koru
+                    mode = (info.external_attr >> 16) & 0o777
+                    if mode:
+                        os.chmod(target, mode)
+            
+            # Klasörleri yer değiştir: eski -> .old, yeni -> platform-tools
+            if self.platform_tools_dir.exists():
+                os.replace(self.platform_tools_dir, old_dir)
+            try:
+                os.replace(staging_dir, self.platform_tools_dir)
+            except OSError:
+                if old_dir.exists():
+                    os.replace(old_dir, self.platform_tools_dir)
+                raise
+            shutil.rmtree(old_dir, ignore_errors=True)
+            
+            print(f"[OK] ZIP dosyası başarıyla açıldı ({len(selected)} dosya)")
+            return True
                 
         except Exception as e:
             print(f"[HATA] ZIP açma hatası: {str(e)}")
             # Geçici klasörü temizle
-            try:
-                if temp_extract_dir.exists():
-                    shutil.rmtree(temp_extract_dir)
-            except:
-                pass
+            shutil.rmtree(staging_dir, ignore_errors=True)
             return False
     
+    @staticmethod
+    def _select_members(zip_ref, members):
+        """
+        ZIP içindeki platform-tools klasörünün dosyalarını seçer
+        
+        Returns:
+            {platform-tools içindeki göreli yol: ZipInfo}
+        """
+        # adb.exe'nin bulunduğu klasör platform-tools kökü kabul edilir
+        root = None
+        for info in zip_ref.infolist():
+            name = info.filename.replace("\\", "/")
+            if name.rsplit("/", 1)[-1] == "adb.exe":
+                root = name[:-len("adb.exe")]
+                break
+        if root is None:
+            return {}
+        
+        selected = {}
+        for info in zip_ref.infolist():
+            name = info.filename.replace("\\", "/")
+            if info.is_dir() or not name.startswith(root):
+                continue
+            relative = name[len(root):]
+            # Güvenlik: klasör dışına yazmaya çalışan girdileri atla
+            if not relative or relative.startswith("/") or ".." in relative.split("/"):
+                continue
+            if members is not None and relative not in members:
+                continue
+            selected[relative] = info
+        return selected
+    
     def install_adb(self):
         """ADB'yi kurar (indirir ve çıkarır)"""
         # Önce kontrol et
@@ -0,0 +1,189 @@
+"""
+Bütünlük Doğrulama Modülü
+İndirilen dosyaların telefondaki asıllarıyla aynı olduğunu hash ile kontrol eder
+"""
+import os
+import mmap
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+import config
+
+
+# Telefonda kullanılan hash komutları (toybox/busybox)
+REMOTE_HASH_COMMANDS = {
+    "md5": "md5sum",
+    "sha1": "sha1sum",
+    "sha256": "sha256sum"
+}
+
+# hashlib'e tek seferde verilen blok boyutu (GIL bu sürede serbest kalır)
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def hash_file(path: str, algorithm: str = "md5") -> str:
+    """
+    Dosyanın hash değerini bellek eşlemeli (mmap) okuma ile hesaplar
+
+    Args:
+        path: Yerel dosya yolu
+        algorithm: Hash algoritması (md5, sha1, sha256)
+
+    Returns:
+        Hex formatında hash değeri
+    """
+    digest = hashlib.new(algorithm)
+    size = os.path.getsize(path)
+
+    # Boş dosyalar mmap ile açılamaz
+    if size == 0:
+        return digest.hexdigest()
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for start in range(0, size, HASH_BLOCK_SIZE):
+                    digest.update(view[start:start + HASH_BLOCK_SIZE])
+
+    return digest.hexdigest()
+
+
+def hash_files(paths: List[str], algorithm: str = "md5",
+               max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Birden fazla dosyayı iş parçacığı havuzunda paralel olarak hash'ler
+
+    Args:
+        paths: Yerel dosya yolları
+        algorithm: Hash algoritması
+        max_workers: İş parçacığı sayısı (None ise config.VERIFY'dan alınır)
+
+    Returns:
+        Dosya yolu -> hash değeri (okunamayan dosyalar için None)
+    """
+    if max_workers is None:
+        max_workers = config.VERIFY["workers"]
+
+    def _safe_hash(path):
+        try:
+            return hash_file(path, algorithm)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(_safe_hash, paths)))
+
+
+def hash_local_tree(local_path: str, algorithm: str = "md5",
+                    max_workers: Optional[int] = None,
+                    file_key: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Yerel dosya veya dizindeki tüm dosyaları hash'ler
+
+    Args:
+        local_path: Yerel dosya veya dizin yolu
+        algorithm: Hash algoritması
+        max_workers: İş parçacığı sayısı
+        file_key: Tek dosya için kullanılacak anahtar (None ise dosya adı)
+
+    Returns:
+        Göreli yol ("/" ayraçlı) -> hash değeri
+    """
+    if os.path.isfile(local_path):
+        hashes = hash_files([local_path], algorithm, max_workers)
+        return {file_key or os.path.basename(local_path): hashes[local_path]}
+
+    relative_paths = {}
+    for root, _, files in os.walk(local_path):
+        for name in files:
+            full_path = os.path.join(root, name)
+            relative = os.path.relpath(full_path, local_path).replace(os.sep, "/")
+            relative_paths[full_path] = relative
+
+    hashes = hash_files(list(relative_paths), algorithm, max_workers)
+    return {relative_paths[path]: digest for path, digest in hashes.items()}
+
+
+def split_checksum_line(line: str) -> Optional[Tuple[str, str]]:
+    """
+    "<hash>  <yol>" satırını (hash, yol) olarak ayırır
+
+    Yol olduğu gibi korunur; dosya adının başındaki/sonundaki boşluklar
+    adın parçasıdır. İkili kip işareti ("<hash> *<yol>") atlanır.
+
+    Returns:
+        (küçük harfli hash, yol) veya satır bu biçimde değilse None
+    """
+    digest, separator, rest = line.rstrip("\r\n").partition(" ")
+    if not separator or not digest:
+        return None
+    if rest[:1] in (" ", "*"):
+        rest = rest[1:]
+    if not rest:
+        return None
+    return digest.lower(), rest
+
+
+def parse_checksum_output(output: str, remote_path: str) -> Dict[str, str]:
+    """
+    md5sum/sha256sum çıktısını göreli yol -> hash sözlüğüne çevirir
+
+    Args:
+        output: Hash komutunun çıktısı ("<hash>  <yol>" satırları)
+        remote_path: Hash'lenen telefondaki dosya veya dizin yolu
+
+    Returns:
+        Göreli yol -> hash değeri
+    """
+    base = remote_path.rstrip("/")
+    checksums = {}
+
+    for line in output.splitlines():
+        parts = split_checksum_line(line)
+        if parts is None:
+            continue
+        digest, path = parts
+
+        if path == base:
+            relative = os.path.basename(base)
+        elif path.startswith(base + "/"):
+            relative = path[len(base) + 1:]
+        else:
+            continue
+        checksums[relative] = digest
+
+    return checksums
+
+
+def compare_checksums(remote: Dict[str, str],
+                      local: Dict[str, Optional[str]],
+                      algorithm: str = "md5") -> Dict:
+    """
+    Telefon ve bilgisayar tarafındaki hash değerlerini karşılaştırır
+
+    Args:
+        remote: Telefondaki göreli yol -> hash
+        local: Yereldeki göreli yol -> hash
+        algorithm: Kullanılan hash algoritması
+
+    Returns:
+        Doğrulama raporu (verified, checked, mismatches, missing)
+    """
+    mismatches = []
+    missing = []
+
+    for relative, remote_digest in sorted(remote.items()):
+        local_digest = local.get(relative)
+        if local_digest is None:
+            missing.append(relative)
+        elif local_digest != remote_digest:
+            mismatches.append(relative)
+
+    return {
+        "verified": not mismatches and not missing,
+        "algorithm": algorithm,
+        "checked": len(remote),
+        "mismatches": mismatches,
+        "missing": missing
+    }
@@ -0,0 +1,485 @@
+"""
+İş (Job) Modülü
+Tanımlayıcı iş dosyalarını (JSON/YAML) okur, işlemleri cihaz başına görevlere
+böler ve paralellik sınırlarıyla çalıştırır
+"""
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import config
+import media_filter
+import snapshot
+import whatsapp_crypt
+import whatsapp_export
+from adb_manager import ADBManager
+from media_pipeline import MediaPipeline
+
+try:
+    import yaml
+except ImportError:  # PyYAML isteğe bağlı; yoksa yalnızca JSON iş dosyaları okunur
+    yaml = None
+
+
+class OperationError(Exception):
+    """Bir işlemin başarısız olduğunu bildirir (görevin diğer işlemleri devam edebilir)"""
+
+
+def _write_json(path: str, data) -> str:
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return path
+
+
+def _job_path(output_dir: str, relative: str, option: str) -> str:
+    """
+    İş seçeneğindeki göreli yolu görev klasörüne bağlar
+
+    Raises:
+        OperationError: Yol mutlaksa, ".." içeriyorsa veya görev klasörünün dışına çıkıyorsa
+    """
+    if not isinstance(relative, str) or not relative or os.path.isabs(relative) \
+            or os.path.splitdrive(relative)[0] or ".." in relative.replace("\\", "/").split("/"):
+        raise OperationError(f"'{option}' görev klasörüne göre göreli bir yol olmalı: {relative!r}")
+    path = os.path.join(output_dir, relative)
+    root = os.path.realpath(output_dir)
+    if os.path.commonpath([root, os.path.realpath(path)]) != root:
+        raise OperationError(f"'{option}' görev klasörünün dışını gösteriyor: {relative!r}")
+    return path
+
+
+def _op_device_info(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    info = adb.get_device_info(serial)
+    if not info:
+        raise OperationError("Cihaz bilgileri alınamadı")
+    path = _write_json(os.path.join(output_dir, "device_info.json"), info)
+    return {"file": path, "properties": len(info)}
+
+
+def _op_apps(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    apps = adb.get_installed_apps(serial)
+    if not apps:
+        raise OperationError("Uygulama listesi alınamadı")
+    path = _write_json(os.path.join(output_dir, "installed_apps.json"),
+                       {"apps": apps, "count": len(apps)})
+    return {"file": path, "count": len(apps)}
+
+
+def _op_logcat(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    lines = int(options.get("lines", config.DEFAULT_LOG_LINES))
+    path = os.path.join(output_dir, "logcat.txt")
+    os.makedirs(output_dir, exist_ok=True)
+    if not adb.save_logcat(path, lines, serial):
+        raise OperationError("Logcat kaydedilemedi")
+    return {"file": path, "bytes": os.path.getsize(path)}
+
+
+def _op_whatsapp_backup(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    include_databases = options.get("databases", True)
+    include_media = options.get("media", True)
+    media_types = {
+        "include_images": options.get("images", True),
+        "include_videos": options.get("videos", True),
+        "include_audio": options.get("audio", True),
+        "include_documents": options.get("documents", True)
+    }
+    verify = options.get("verify", False)
+    storage = options.get("storage", "files")
+    filters = options.get("filters")
+    custom_media = include_media and (not all(media_types.values()) or bool(filters))
+
+    # İsteğe bağlı işleme hattı: true veya {"thumbnails": true, "algorithm": "md5"}
+    pipeline = None
+    pipeline_options = options.get("pipeline")
+    if include_media and pipeline_options:
+        pipeline_options = pipeline_options if isinstance(pipeline_options, dict) else {}
+        pipeline = MediaPipeline(os.path.join(output_dir, "whatsapp_backup", "media"),
+                                 algorithm=pipeline_options.get("algorithm"),
+                                 thumbnails=pipeline_options.get("thumbnails"))
+
+    try:
+        result = adb.backup_whatsapp_complete(
+            output_dir,
+            include_databases=include_databases,
+            include_media=include_media and not custom_media,
+            device_serial=serial,
+            verify=verify,
+            pipeline=pipeline,
+            storage=storage
+        )
+        if custom_media:
+            result["media"] = adb.backup_whatsapp_media(
+                output_dir, device_serial=serial, verify=verify, filters=filters,
+                pipeline=pipeline, storage=storage, **media_types
+            )
+            result["success"] = result["success"] or result["media"]["success"]
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+
+    # Anahtar verildiyse crypt14/crypt15 veritabanları yedeğin yanında çözülür
+    decrypted = None
+    if options.get("key") and result.get("databases") and result["databases"]["success"]:
+        try:
+            decrypted = whatsapp_crypt.decrypt_directory(result["databases"]["output_dir"],
+                                                         options["key"])
+        except whatsapp_crypt.DecryptionError as e:
+            decrypted = {"decrypted": [], "errors": [str(e)]}
+
+    # İstenirse çözülen msgstore.db mesajları NDJSON/Parquet olarak dışa aktarılır
+    exported = None
+    if options.get("export") and decrypted is not None:
+        exported = []
+        for database_path in decrypted["decrypted"]:
+            if os.path.basename(database_path) != "msgstore.db":
+                continue
+            output_format = options["export"] if isinstance(options["export"], str) else None
+            try:
+                exported.append(whatsapp_export.export_messages(database_path,
+                                                                output_format=output_format))
+            except whatsapp_export.ExportError as e:
+                decrypted["errors"].append(f"{os.path.basename(database_path)}: {str(e)}")
+
+    details = {"output_dir": os.path.join(output_dir, "whatsapp_backup"), "storage": storage}
+    if result.get("databases"):
+        details["databases"] = len(result["databases"]["downloaded_files"])
+        details["database_errors"] = result["databases"]["errors"]
+    if result.get("media"):
+        details["media_files"] = result["media"]["downloaded_count"]
+        details["media_errors"] = result["media"]["errors"]
+        if "matched_count" in result["media"]:
+            details["media_matched"] = result["media"]["matched_count"]
+        if result["media"].get("manifest"):
+            details["manifest"] = result["media"]["manifest"]
+            details["media_reused"] = result["media"]["reused_count"]
+    if pipeline is not None:
+        details["metadata"] = pipeline.result
+    if decrypted is not None:
+        details["decrypted"] = decrypted["decrypted"]
+        details["decrypt_errors"] = decrypted["errors"]
+    if exported is not None:
+        details["exported"] = exported
+    if verify:
+        details["verification"] = {
+            part: result[part].get("verification") for part in ("databases", "media")
+            if result.get(part)
+        }
+    if not result["success"]:
+        raise OperationError("WhatsApp yedeklemesi başarısız")
+    return details
+
+
+def _op_ab_backup(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    path = _job_path(output_dir, options.get("file", "backup.ab"), "file")
+    result = adb.create_backup(
+        path,
+        include_apk=options.get("apk", True),
+        include_shared=options.get("shared", True),
+        include_system=options.get("system", False),
+        include_all=options.get("all", True),
+        device_serial=serial
+    )
+    if not result["success"]:
+        raise OperationError(result.get("message", "Yedekleme başarısız"))
+    return {"file": path, "bytes": os.path.getsize(path)}
+
+
+def _op_pull(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    remote_path = options.get("remote")
+    if not remote_path:
+        raise OperationError("pull işlemi için 'remote' gerekli")
+    local_path = _job_path(output_dir, options.get("local", "pull"), "local")
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    result = adb.pull_file(remote_path, local_path, serial,
+                           resumable=options.get("resumable", True),
+                           verify=options.get("verify", False))
+    if not result["success"]:
+        raise OperationError(result.get("message") or result.get("stderr") or "Dosya çekilemedi")
+    return {"local_path": local_path, "verification": result.get("verification")}
+
+
+def _op_snapshot(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    try:
+        current = snapshot.capture(adb, serial, options.get("roots"))
+        path = snapshot.save(current, os.path.join(output_dir, "snapshot" + snapshot.SNAPSHOT_SUFFIX))
+        details = {"file": path, "apps": len(current["apps"]), "files": len(current["files"])}
+        if options.get("compare"):
+            # Önceki ziyaretin görüntüsüyle karşılaştır
+            result = snapshot.diff(snapshot.load(options["compare"]), current)
+            details["diff"] = _write_json(os.path.join(output_dir, "snapshot_diff.json"), result)
+            details["changes"] = {section: {kind: len(items) for kind, items in result[section].items()}
+                                  for section in ("apps", "properties", "files")}
+    except snapshot.SnapshotError as e:
+        raise OperationError(str(e))
+    return details
+
+
+def _op_whatsapp_restore(adb: ADBManager, serial: str, options: Dict, output_dir: str) -> Dict:
+    source = options.get("source")
+    if not source:
+        raise OperationError("whatsapp_restore işlemi için 'source' gerekli")
+    result = adb.restore_whatsapp(source, serial,
+                                  streams=options.get("streams"),
+                                  skip_existing=options.get("skip_existing"),
+                                  media_scan=options.get("media_scan"),
+                                  store_root=options.get("store"))
+    if not result["success"]:
+        raise OperationError(result.get("message") or "; ".join(result["errors"][:3])
+                             or f"{len(result['failed'])} dosya yazılamadı")
+    return {key: result[key] for key in ("remote_base", "total_count", "restored_count",
+                                         "restored_bytes", "skipped_count", "scanned", "seconds")}
+
+
+# İş dosyasında kullanılabilecek işlemler: type -> fonksiyon(adb, serial, options, output_dir)
+OPERATIONS: Dict[str, Callable] = {
+    "device_info": _op_device_info,
+    "apps": _op_apps,
+    "logcat": _op_logcat,
+    "whatsapp_backup": _op_whatsapp_backup,
+    "ab_backup": _op_ab_backup,
+    "pull": _op_pull,
+    "snapshot": _op_snapshot,
+    "whatsapp_restore": _op_whatsapp_restore
+}
+
+
+def load_job_file(path: str) -> Dict:
+    """
+    İş dosyasını okur (.json veya .yaml/.yml)
+
+    Raises:
+        ValueError: Dosya okunamazsa veya YAML desteği yoksa
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ValueError("YAML iş dosyası için PyYAML gerekli (pip install pyyaml) veya JSON kullanın")
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    if not isinstance(spec, dict):
+        raise ValueError("İş dosyası bir sözlük (mapping) olmalı")
+    return spec
+
+
+def validate_job_spec(spec: Dict) -> List[str]:
+    """
+    İş tanımını kontrol eder
+
+    Returns:
+        Hata mesajları (boşsa geçerli)
+    """
+    errors = []
+    jobs = spec.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        return ["'jobs' boş olmayan bir liste olmalı"]
+
+    for index, job in enumerate(jobs, 1):
+        name = job.get("name", f"job{index}") if isinstance(job, dict) else f"job{index}"
+        if not isinstance(job, dict):
+            errors.append(f"{name}: iş tanımı bir sözlük olmalı")
+            continue
+        # İş adı görev klasörünün adı olur; klasör dışına çıkamamalı
+        if not isinstance(name, str) or not name or name in (".", "..") \
+                or "/" in name or "\\" in name or os.path.splitdrive(name)[0]:
+            errors.append(f"{name!r}: 'name' klasör ayracı içermeyen bir ad olmalı")
+        devices = job.get("devices", "all")
+        if devices != "all" and not (isinstance(devices, list) and all(isinstance(d, str) for d in devices)):
+            errors.append(f"{name}: 'devices' \"all\" veya seri numarası listesi olmalı")
+        operations = job.get("operations")
+        if not isinstance(operations, list) or not operations:
+            errors.append(f"{name}: 'operations' boş olmayan bir liste olmalı")
+            continue
+        for operation in operations:
+            op_type = operation.get("type") if isinstance(operation, dict) else operation
+            if op_type not in OPERATIONS:
+                errors.append(f"{name}: bilinmeyen işlem '{op_type}' "
+                              f"(geçerli: {', '.join(sorted(OPERATIONS))})")
+            elif isinstance(operation, dict) and operation.get("filters") is not None:
+                try:
+                    media_filter.normalize_filters(operation["filters"])
+                except (TypeError, ValueError) as e:
+                    errors.append(f"{name}: {op_type} filtreleri geçersiz: {str(e)}")
+    return errors
+
+
+def _normalize_operation(operation) -> Dict:
+    if isinstance(operation, str):
+        return {"type": operation}
+    return dict(operation)
+
+
+def build_tasks(spec: Dict, connected: List[str]) -> List[Dict]:
+    """
+    İş tanımını cihaz başına görevlere böler
+
+    Args:
+        spec: Doğrulanmış iş tanımı
+        connected: Bağlı ve yetkili cihazların seri numaraları
+
+    Returns:
+        Görev listesi (her görev bir cihazda sırayla çalışan işlemlerdir)
+    """
+    tasks = []
+    for index, job in enumerate(spec["jobs"], 1):
+        name = job.get("name", f"job{index}")
+        devices = job.get("devices", "all")
+        serials = connected if devices == "all" else devices
+        operations = [_normalize_operation(op) for op in job["operations"]]
+        for serial in serials:
+            tasks.append({
+                "job": name,
+                "serial": serial,
+                "operations": operations,
+                "status": "pending" if serial in connected else "skipped",
+                "error": None if serial in connected else "Cihaz bağlı değil veya yetkilendirilmemiş",
+                "results": []
+            })
+    return tasks
+
+
+class JobScheduler:
+    """
+    Görevleri paralel çalıştıran zamanlayıcı
+
+    - En fazla `max_parallel` cihaz aynı anda işlenir
+    - Aynı cihazdaki görevler asla aynı anda çalışmaz (cihaz kilidi)
+    - `limits` ile işlem tipi başına eşzamanlılık sınırlanabilir
+      (örn. {"whatsapp_backup": 2} - USB hub bant genişliği için)
+    """
+
+    def __init__(self, adb: ADBManager, max_parallel: int = 4,
+                 limits: Optional[Dict[str, int]] = None,
+                 continue_on_error: bool = True,
+                 progress: Optional[Callable[[Dict], None]] = None,
+                 device_locks: Optional[Dict[str, threading.Lock]] = None):
+        """
+        Args:
+            adb: Kullanılacak ADBManager (iş parçacıkları arasında paylaşılır)
+            max_parallel: Aynı anda işlenecek en fazla görev
+            limits: İşlem tipi -> en fazla eşzamanlı çalışma sayısı
+            continue_on_error: False ise görevde ilk hatadan sonra kalan işlemler atlanır
+            progress: Her olayda çağrılır ({"event", "job", "serial", ...})
+            device_locks: Birden fazla zamanlayıcı aynı cihazları kullanıyorsa
+                          paylaşılan cihaz anahtarı (bkz. ADBManager.device_key)
+                          -> kilit sözlüğü
+        """
+        self.adb = adb
+        self.max_parallel = max(1, int(max_parallel))
+        self.limits = {
+            op_type: threading.BoundedSemaphore(max(1, int(limit)))
+            for op_type, limit in (limits or {}).items()
+        }
+        self.continue_on_error = continue_on_error
+        self.progress = progress
+        self._device_locks = device_locks if device_locks is not None else {}
+        self._lock = threading.Lock()
+
+    def _emit(self, event: str, task: Dict, **data):
+        if self.progress:
+            self.progress(dict(data, event=event, job=task["job"], serial=task["serial"],
+                               time=time.time()))
+
+    def _device_lock(self, serial: str) -> threading.Lock:
+        # Aynı telefonun USB ve kablosuz seri numaraları aynı kilidi paylaşır
+        key = self.adb.device_key(serial)
+        with self._lock:
+            return self._device_locks.setdefault(key, threading.Lock())
+
+    def _run_operation(self, task: Dict, operation: Dict, output_dir: str) -> Dict:
+        op_type = operation["type"]
+        options = {key: value for key, value in operation.items() if key != "type"}
+        limit = self.limits.get(op_type)
+        self._emit("operation_started", task, operation=op_type)
+        start = time.perf_counter()
+        result = {"operation": op_type, "status": "ok", "error": None, "details": None}
+        try:
+            if limit:
+                limit.acquire()
+            try:
+                with self.adb.tracer.span(op_type, "job", serial=task["serial"], job=task["job"]):
+                    result["details"] = OPERATIONS[op_type](self.adb, task["serial"], options, output_dir)
+            finally:
+                if limit:
+                    limit.release()
+        except OperationError as e:
+            result.update(status="failed", error=str(e))
+        except Exception as e:
+            result.update(status="failed", error=f"{type(e).__name__}: {str(e)}")
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        self._emit("operation_finished", task, operation=op_type,
+                   status=result["status"], error=result["error"], seconds=result["seconds"])
+        return result
+
+    def run_task(self, task: Dict, output_root: str) -> Dict:
+        """Bir görevin işlemlerini cihaz kilidi altında sırayla çalıştırır"""
+        if task["status"] == "skipped":
+            self._emit("task_skipped", task, error=task["error"])
+            return task
+
+        # output_dir görev oluşturulurken çağıran tarafından verilebilir (iş dosyasından değil)
+        # Kablosuz cihaz serisindeki ":" Windows klasör adında geçersizdir
+        output_dir = task.get("output_dir") or os.path.join(output_root, task["job"],
+                                                             task["serial"].replace(":", "_"))
+        os.makedirs(output_dir, exist_ok=True)
+        with self._device_lock(task["serial"]):
+            task["status"] = "running"
+            task["started_at"] = datetime.now().isoformat(timespec="seconds")
+            self._emit("task_started", task)
+            start = time.perf_counter()
+            for operation in task["operations"]:
+                if task["results"] and task["results"][-1]["status"] == "failed" \
+                        and not self.continue_on_error:
+                    task["results"].append({"operation": operation["type"], "status": "skipped",
+                                            "error": "Önceki işlem başarısız", "details": None,
+                                            "seconds": 0.0})
+                    continue
+                task["results"].append(self._run_operation(task, operation, output_dir))
+            task["seconds"] = round(time.perf_counter() - start, 3)
+
+        failed = [r for r in task["results"] if r["status"] != "ok"]
+        task["status"] = "failed" if failed else "ok"
+        task["output_dir"] = output_dir
+        self._emit("task_finished", task, status=task["status"], seconds=task["seconds"])
+        return task
+
+    def run(self, tasks: List[Dict], output_root: str) -> List[Dict]:
+        """
+        Tüm görevleri çalıştırır
+
+        Returns:
+            Sonuçlarıyla birlikte görev listesi (giriş sırasıyla)
+        """
+        with ThreadPoolExecutor(max_workers=self.max_parallel,
+                                thread_name_prefix="job") as executor:
+            futures = [executor.submit(self.run_task, task, output_root) for task in tasks]
+            for future in futures:
+                future.result()
+        return tasks
+
+
+def summarize(tasks: List[Dict]) -> Dict:
+    """Görev ve işlem sayılarını durumlarına göre sayar"""
+    summary = {"tasks": len(tasks), "ok": 0, "failed": 0, "skipped": 0,
+               "operations_ok": 0, "operations_failed": 0, "operations_skipped": 0}
+    for task in tasks:
+        summary[task["status"]] = summary.get(task["status"], 0) + 1
+        for result in task["results"]:
+            key = f"operations_{result['status']}"
+            summary[key] = summary.get(key, 0) + 1
+    return summary
+
+
+def write_report(path: str, report: Dict) -> str:
+    """Çalıştırma raporunu JSON olarak atomik yazar"""
+    return _write_json(path, report)
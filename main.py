@@ -303,18 +303,30 @@ def main():
             if not local_path:
                 local_path = os.path.join(output_dir, os.path.basename(remote_path))
             
+            verify_choice = input("İndirme sonrası bütünlük doğrulaması yapılsın mı? (e/H): ").strip().lower()
+            verify = verify_choice in ['e', 'evet', 'y', 'yes']
+            
             print(f"\nDosya çekiliyor...")
             print(f"Kaynak: {remote_path}")
             print(f"Hedef: {local_path}")
             
-            result = adb.pull_file(remote_path, local_path, selected_device)
+            # Büyük dosyalarda bağlantı koparsa kalınan yerden devam edilir
+            result = adb.pull_file(remote_path, local_path, selected_device,
+                                   resumable=True, verify=verify)
             
             if result["success"]:
                 print(f"[OK] {result.get('message', 'Dosya başarıyla çekildi')}")
                 if "file_size" in result:
                     print(f"  Dosya boyutu: {result['file_size']} bytes")
+                if "verification" in result:
+                    print(f"[OK] Bütünlük doğrulandı: {result['verification']['checked']} dosya")
             else:
-                print(f"[HATA] Hata: {result.get('stderr', 'Bilinmeyen hata')}")
+                print(f"[HATA] Hata: {result.get('message') or result.get('stderr', 'Bilinmeyen hata')}")
+                if "verification" in result:
+                    for relative in result["verification"]["mismatches"][:20]:
+                        print(f"  - Uyuşmayan: {relative}")
+                    for relative in result["verification"]["missing"][:20]:
+                        print(f"  - Eksik: {relative}")
         
         elif choice == "6":
             if not selected_device:
@@ -595,6 +607,9 @@ def main():
                 input("\nDevam etmek için Enter'a basın...")
                 continue
             
+            verify_choice = input("İndirme sonrası bütünlük doğrulaması yapılsın mı? (e/H): ").strip().lower()
+            verify = verify_choice in ['e', 'evet', 'y', 'yes']
+            
             print(f"\n[KURULUM] WhatsApp yedeklemesi başlatılıyor...")
             print(f"[BILGI] Veritabanları: {'Evet' if include_databases else 'Hayır'}")
             print(f"[BILGI] Medya dosyaları: {'Evet' if include_media else 'Hayır'}")
@@ -606,7 +621,8 @@ def main():
                     output_dir,
                     include_databases=include_databases,
                     include_media=False,  # Önce veritabanları
-                    device_serial=selected_device
+                    device_serial=selected_device,
+                    verify=verify
                 )
                 
                 if include_databases and result.get("databases"):
@@ -620,7 +636,8 @@ def main():
                         include_videos=vid_choice in ['e', 'evet', 'y', 'yes', ''],
                         include_audio=aud_choice in ['e', 'evet', 'y', 'yes', ''],
                         include_documents=doc_choice in ['e', 'evet', 'y', 'yes', ''],
-                        device_serial=selected_device
+                        device_serial=selected_device,
+                        verify=verify
                     )
                     result["media"] = media_result
             else:
@@ -628,7 +645,8 @@ def main():
                     output_dir,
                     include_databases=include_databases,
                     include_media=include_media,
-                    device_serial=selected_device
+                    device_serial=selected_device,
+                    verify=verify
                 )
             
             if result["success"]:
@@ -659,6 +677,11 @@ def main():
                         print(f"  - {error}")
         
         elif choice == "12":
+            for metrics_file in adb.export_metrics():
+                print(f"[OK] Metrikler kaydedildi: {metrics_file}")
+            trace_file = adb.export_trace()
+            if trace_file:
+                print(f"[OK] Trace kaydedildi: {trace_file} (Perfetto ile açılabilir)")
             print("\nÇıkılıyor...")
             break
         
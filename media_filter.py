@@ -0,0 +1,238 @@
+"""
+Medya Filtreleri
+Medya yedeklerindeki tarih, boyut ve tür filtrelerini telefonda çalışan tek
+bir find komutuna dönüştürür; sadece eşleşen dosyalar aktarılır
+"""
+import math
+import re
+import shlex
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Filtre anahtarları ve varsayılan değerleri
+DEFAULT_FILTERS = {
+    "modified_after": None,    # Bu tarihten sonra değişenler ("2024-05-01", "30d", epoch)
+    "modified_before": None,   # Bu tarihten önce değişenler
+    "min_size": None,          # En küçük boyut (byte veya "100K", "5M", "1G")
+    "max_size": None,          # En büyük boyut
+    "extensions": [],          # Sadece bu uzantılar ([".jpg", "mp4"])
+    "include": [],             # Sadece bu glob'larla eşleşenler ("IMG-2024*", "*/2024/*")
+    "exclude": [],             # Bu glob'larla eşleşenleri atla
+    "skip_sent": False,        # Gönderilen medya klasörlerini (Sent, .Sent) atla
+    "skip_statuses": False     # Durum (.Statuses) klasörünü atla
+}
+
+SENT_DIRS = ("Sent", ".Sent")
+STATUS_DIRS = (".Statuses",)
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+_RELATIVE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_size(value) -> int:
+    """
+    Boyut değerini byte'a çevirir
+
+    Args:
+        value: Sayı veya "500M", "1.5G", "200K" gibi metin
+
+    Raises:
+        ValueError: Geçersiz değer
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Geçersiz boyut: {value}")
+    if isinstance(value, (int, float)):
+        size = value
+    else:
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", str(value), re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Geçersiz boyut: {value}")
+        size = float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+    if size < 0:
+        raise ValueError(f"Geçersiz boyut: {value}")
+    return int(size)
+
+
+def parse_time(value, now: Optional[float] = None) -> float:
+    """
+    Tarih değerini epoch saniyeye çevirir
+
+    Args:
+        value: Epoch sayısı, ISO tarih ("2024-05-01", "2024-05-01T12:00")
+               veya göreli süre ("30d" = son 30 gün, "12h", "2w")
+        now: Göreli süreler için şimdiki zaman (None ise time.time())
+
+    Raises:
+        ValueError: Geçersiz değer
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Geçersiz tarih: {value}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    match = re.fullmatch(r"(\d+)\s*([mhdw])", text)
+    if match:
+        now = time.time() if now is None else now
+        return now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"Geçersiz tarih: {value}")
+
+
+def normalize_filters(filters: Optional[Dict], now: Optional[float] = None) -> Dict:
+    """
+    Filtre sözlüğünü doğrular ve tek biçime getirir (tarihler epoch,
+    boyutlar byte, uzantılar ".jpg" biçiminde küçük harf)
+
+    Raises:
+        ValueError: Bilinmeyen anahtar veya geçersiz değer
+    """
+    filters = dict(filters or {})
+    unknown = set(filters) - set(DEFAULT_FILTERS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen filtre: {', '.join(sorted(unknown))} "
+                         f"(geçerli: {', '.join(DEFAULT_FILTERS)})")
+
+    normalized = dict(DEFAULT_FILTERS)
+    normalized.update(filters)
+    for key in ("modified_after", "modified_before"):
+        if normalized[key] is not None:
+            normalized[key] = parse_time(normalized[key], now)
+    for key in ("min_size", "max_size"):
+        if normalized[key] is not None:
+            normalized[key] = parse_size(normalized[key])
+    for key in ("extensions", "include", "exclude"):
+        value = normalized[key]
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+            raise ValueError(f"'{key}' metin listesi olmalı")
+        normalized[key] = list(value)
+    normalized["extensions"] = ["." + ext.lstrip(".").lower() for ext in normalized["extensions"]]
+    return normalized
+
+
+def is_active(filters: Optional[Dict]) -> bool:
+    """Filtrelerden en az biri tanımlı mı"""
+    if not filters:
+        return False
+    return any(filters.get(key, default) != default for key, default in DEFAULT_FILTERS.items())
+
+
+def _glob_test(pattern: str) -> str:
+    # "/" içeren desenler tam yolla, diğerleri dosya adıyla eşleştirilir
+    return f"-path {shlex.quote(pattern)}" if "/" in pattern else f"-name {shlex.quote(pattern)}"
+
+
+def _any_of(tests: List[str]) -> str:
+    if len(tests) == 1:
+        return tests[0]
+    return "\\( " + " -o ".join(tests) + " \\)"
+
+
+def find_predicates(filters: Dict, device_now: Optional[float] = None) -> Tuple[str, str]:
+    """
+    Filtreleri find ifadesine çevirir
+
+    Args:
+        filters: normalize_filters ile hazırlanmış filtreler
+        device_now: Telefonun saati (epoch); tarih filtreleri telefonda
+                    -mmin ile değerlendirilir, saat farkı bu yüzden önemlidir
+
+    Returns:
+        (budanacak dizinler ifadesi, dosya ifadesi)
+    """
+    prune_names = []
+    if filters["skip_sent"]:
+        prune_names.extend(SENT_DIRS)
+    if filters["skip_statuses"]:
+        prune_names.extend(STATUS_DIRS)
+    prune = ""
+    if prune_names:
+        prune = f"-type d {_any_of([f'-name {shlex.quote(n)}' for n in prune_names])}"
+
+    tests = ["-type f"]
+    device_now = time.time() if device_now is None else device_now
+    # -mmin dakika hassasiyetinde olduğu için sınırlar bir dakika geniş tutulur;
+    # kesin karşılaştırma dosya listesi alındıktan sonra matches() ile yapılır
+    if filters["modified_after"] is not None:
+        minutes = math.ceil((device_now - filters["modified_after"]) / 60) + 1
+        tests.append(f"-mmin -{max(minutes, 1)}")
+    if filters["modified_before"] is not None:
+        minutes = math.floor((device_now - filters["modified_before"]) / 60) - 1
+        if minutes >= 0:
+            tests.append(f"-mmin +{minutes}")
+    if filters["min_size"]:
+        tests.append(f"-size +{filters['min_size'] - 1}c")
+    if filters["max_size"] is not None:
+        tests.append(f"-size -{filters['max_size'] + 1}c")
+    if filters["extensions"]:
+        tests.append(_any_of([f"-iname {shlex.quote('*' + ext)}" for ext in filters["extensions"]]))
+    if filters["include"]:
+        tests.append(_any_of([_glob_test(p) for p in filters["include"]]))
+    if filters["exclude"]:
+        tests.append("! " + _any_of([_glob_test(p) for p in filters["exclude"]]))
+    return prune, " ".join(tests)
+
+
+def build_find_command(roots: List[str], filters: Dict, action: str,
+                       device_now: Optional[float] = None) -> str:
+    """
+    Tüm kök dizinleri tek seferde tarayan find komutunu oluşturur
+
+    Args:
+        roots: Taranacak telefondaki dizinler
+        filters: normalize_filters ile hazırlanmış filtreler
+        action: Eşleşen dosyalar için çalıştırılacak komut ("stat -c '%s %Y %n'",
+                "sha256sum" ...); find ... -exec <action> {} + olarak eklenir
+        device_now: Telefonun saati (epoch)
+    """
+    prune, tests = find_predicates(filters, device_now)
+    parts = ["find"] + [shlex.quote(root.rstrip("/")) for root in roots]
+    if prune:
+        parts += ["\\(", prune, "\\)", "-prune", "-o"]
+    parts += [tests, f"-exec {action} {{}} +"]
+    return " ".join(parts)
+
+
+# Eşleşen dosyaların boyut ve değişiklik zamanı find ile aynı çağrıda alınır
+STAT_ACTION = "stat -c '%s %Y %n'"
+
+# Listenin sonuna eklenen satır; görülmezse liste yarıda kalmıştır (bağlantı
+# koptu, süre aşıldı). find'ın çıkış kodu kullanılmaz: olmayan bir kök dizin de
+# 1 döndürür.
+LISTING_END = "--find-listing-end--"
+
+
+def parse_stat_output(output: Union[str, Iterable[str]]) -> List[Dict]:
+    """
+    "stat -c '%s %Y %n'" çıktısını dosya listesine çevirir
+
+    Args:
+        output: Çıktı metni veya satırları (örn. CommandStream.iter_lines())
+
+    Returns:
+        [{"path", "size", "mtime"}] listesi
+    """
+    lines = output.splitlines() if isinstance(output, str) else output
+    entries = []
+    for line in lines:
+        parts = line.split(" ", 2)
+        if len(parts) != 3 or not parts[0].isdigit() or not parts[1].isdigit():
+            continue
+        entries.append({"path": parts[2], "size": int(parts[0]), "mtime": int(parts[1])})
+    return entries
+
+
+def matches(entry: Dict, filters: Dict) -> bool:
+    """
+    Tarih sınırlarını saniye hassasiyetinde kontrol eder (telefondaki -mmin
+    testi dakika hassasiyetinde olduğu için sınırdaki dosyalar burada elenir)
+    """
+    if filters["modified_after"] is not None and entry["mtime"] < filters["modified_after"]:
+        return False
+    if filters["modified_before"] is not None and entry["mtime"] >= filters["modified_before"]:
+        return False
+    return True
@@ -0,0 +1,266 @@
+"""
+Medya İşleme Hattı
+Aktarım sürerken indirilen medya dosyalarını süreç havuzunda işler (hash,
+EXIF/dosya adı tarihi, küçük resim) ve dosya başına bir metadata tablosu yazar
+"""
+import os
+import re
+import csv
+import struct
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow isteğe bağlı; yoksa küçük resim üretilmez
+    Image = None
+
+TABLE_COLUMNS = ["path", "size", "mtime", "hash", "date", "date_source", "thumbnail", "error"]
+
+# IMG-20240131-WA0001.jpg, VID-20240131-WA0001.mp4, PTT-20240131-WA0001.opus ...
+_FILENAME_DATE = re.compile(r"(?:^|[^0-9])(20\d{2})(\d{2})(\d{2})(?:[-_ ]?(\d{2})(\d{2})(\d{2}))?(?:[^0-9]|$)")
+
+# EXIF etiketleri
+_EXIF_IFD_POINTER = 0x8769
+_DATETIME_ORIGINAL = 0x9003
+_DATETIME = 0x0132
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _read_exif_date(path: str) -> Optional[str]:
+    """
+    JPEG dosyasının EXIF DateTimeOriginal (yoksa DateTime) değerini okur
+    (Pillow gerektirmez; sadece APP1 bölümü okunur)
+
+    Returns:
+        ISO tarih ("2024-01-31T12:00:00") veya bulunamazsa None
+    """
+    with open(path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            marker = f.read(4)
+            if len(marker) < 4 or marker[0] != 0xFF or marker[1] in (0xD9, 0xDA):
+                return None
+            length = struct.unpack(">H", marker[2:])[0]
+            if length < 2:
+                return None
+            if marker[1] != 0xE1:
+                f.seek(length - 2, os.SEEK_CUR)
+                continue
+            segment = f.read(length - 2)
+            if not segment.startswith(b"Exif\x00\x00"):
+                continue
+            return _parse_tiff_date(segment[6:])
+
+
+def _parse_tiff_date(tiff: bytes) -> Optional[str]:
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+
+    def read_ifd(offset: int) -> Dict[int, tuple]:
+        entries = {}
+        if offset + 2 > len(tiff):
+            return entries
+        count = struct.unpack(endian + "H", tiff[offset:offset + 2])[0]
+        for i in range(count):
+            start = offset + 2 + i * 12
+            if start + 12 > len(tiff):
+                break
+            tag, kind, number, value = struct.unpack(endian + "HHII", tiff[start:start + 12])
+            entries[tag] = (kind, number, value)
+        return entries
+
+    def read_ascii(entry) -> Optional[str]:
+        kind, number, value = entry
+        if kind != 2 or number < 19 or value + number > len(tiff):
+            return None
+        text = tiff[value:value + 19].decode("ascii", errors="replace")
+        try:
+            return datetime.strptime(text, "%Y:%m:%d %H:%M:%S").isoformat()
+        except ValueError:
+            return None
+
+    ifd0 = read_ifd(struct.unpack(endian + "I", tiff[4:8])[0])
+    if _EXIF_IFD_POINTER in ifd0:
+        exif = read_ifd(ifd0[_EXIF_IFD_POINTER][2])
+        if _DATETIME_ORIGINAL in exif:
+            date = read_ascii(exif[_DATETIME_ORIGINAL])
+            if date:
+                return date
+    if _DATETIME in ifd0:
+        return read_ascii(ifd0[_DATETIME])
+    return None
+
+
+def date_from_filename(name: str) -> Optional[str]:
+    """Dosya adındaki tarihi (WhatsApp: IMG-20240131-WA0001.jpg) ISO biçiminde döndürür"""
+    match = _FILENAME_DATE.search(name)
+    if not match:
+        return None
+    parts = [int(p) for p in match.groups() if p is not None]
+    try:
+        return datetime(*parts).isoformat()
+    except ValueError:
+        return None
+
+
+def _make_thumbnail(path: str, thumbnail_path: str, size) -> str:
+    with Image.open(path) as image:
+        image.thumbnail(tuple(size))
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        image.convert("RGB").save(thumbnail_path, "JPEG", quality=80)
+    return thumbnail_path
+
+
+def process_file(path: str, base_dir: str, options: Dict) -> Dict:
+    """
+    Tek dosyayı işler (süreç havuzunda çalışır)
+
+    Args:
+        path: Yerel dosya yolu
+        base_dir: Tablodaki göreli yolların kökü
+        options: algorithm, thumbnails, thumbnail_size, thumbnail_dir
+
+    Returns:
+        Tablo satırı (TABLE_COLUMNS)
+    """
+    relative = os.path.relpath(path, base_dir).replace(os.sep, "/")
+    row = dict.fromkeys(TABLE_COLUMNS, "")
+    row["path"] = relative
+    try:
+        stat = os.stat(path)
+        row["size"] = stat.st_size
+        row["mtime"] = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+
+        digest = hashlib.new(options["algorithm"])
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        row["hash"] = digest.hexdigest()
+
+        date, source = None, ""
+        if path.lower().endswith((".jpg", ".jpeg")):
+            date, source = _read_exif_date(path), "exif"
+        if not date:
+            date, source = date_from_filename(os.path.basename(path)), "filename"
+        if not date:
+            date, source = row["mtime"], "mtime"
+        row["date"], row["date_source"] = date, source
+
+        if options["thumbnails"] and Image is not None and \
+                path.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
+            thumbnail_path = os.path.join(options["thumbnail_dir"],
+                                          os.path.splitext(relative)[0] + ".jpg")
+            _make_thumbnail(path, thumbnail_path, options["thumbnail_size"])
+            row["thumbnail"] = os.path.relpath(
+                thumbnail_path, os.path.dirname(options["thumbnail_dir"])).replace(os.sep, "/")
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+def process_files(paths: List[str], base_dir: str, options: Dict) -> List[Dict]:
+    """Dosya grubunu işler (havuza dosya başına değil grup başına iş gönderilir)"""
+    return [process_file(path, base_dir, options) for path in paths]
+
+
+class MediaPipeline:
+    """
+    İndirilen dosyaları aktarım sürerken arka planda işleyen aşama
+
+    Kullanım:
+        with MediaPipeline(media_dir) as pipeline:
+            adb.backup_whatsapp_media(output_dir, pipeline=pipeline)
+        pipeline.result  # {"table", "files", "errors"}
+    """
+
+    def __init__(self, base_dir: str, table_path: Optional[str] = None,
+                 workers: Optional[int] = None, algorithm: Optional[str] = None,
+                 thumbnails: Optional[bool] = None):
+        """
+        Args:
+            base_dir: İşlenecek dosyaların kök klasörü (tablodaki yollar buna göre)
+            table_path: Metadata tablosu (None ise base_dir'in üst klasöründe
+                        config.MEDIA_PIPELINE["table"])
+            workers: Süreç sayısı (None ise config.MEDIA_PIPELINE["workers"])
+            algorithm: Hash algoritması (None ise config.MEDIA_PIPELINE["algorithm"])
+            thumbnails: Küçük resim üret (Pillow gerekir)
+        """
+        settings = config.MEDIA_PIPELINE
+        self.base_dir = base_dir
+        # Tablo ve küçük resimler medya klasörünün yanına yazılır (içine değil)
+        parent_dir = os.path.dirname(os.path.abspath(base_dir))
+        self.table_path = table_path or os.path.join(parent_dir, settings["table"])
+        self.workers = workers or settings["workers"]
+        self.options = {
+            "algorithm": algorithm or settings["algorithm"],
+            "thumbnails": settings["thumbnails"] if thumbnails is None else thumbnails,
+            "thumbnail_size": settings["thumbnail_size"],
+            "thumbnail_dir": os.path.join(os.path.dirname(os.path.abspath(self.table_path)),
+                                          settings["thumbnail_dir"])
+        }
+        if self.options["thumbnails"] and Image is None:
+            print("[UYARI] Küçük resim için Pillow gerekli (pip install pillow); atlanıyor")
+            self.options["thumbnails"] = False
+        self._executor = None
+        self._futures = []
+        self.result = None
+
+    def submit(self, paths: List[str]):
+        """İndirmesi tamamlanan dosyaları işleme kuyruğuna ekler"""
+        if not paths:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._futures.append(self._executor.submit(process_files, list(paths),
+                                                   self.base_dir, self.options))
+
+    def close(self) -> Dict:
+        """
+        Bekleyen işlerin bitmesini bekler ve metadata tablosunu (CSV) yazar
+
+        Returns:
+            {"table", "files", "errors"}
+        """
+        if self.result is not None:
+            return self.result
+        rows = []
+        try:
+            for future in self._futures:
+                rows.extend(future.result())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+        rows.sort(key=lambda row: row["path"])
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.table_path)), exist_ok=True)
+        temp_path = self.table_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temp_path, self.table_path)
+
+        self.result = {
+            "table": self.table_path,
+            "files": len(rows),
+            "errors": sum(1 for row in rows if row["error"])
+        }
+        return self.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,278 @@
+"""
+Metrik Toplama Modülü
+ADB komutlarının süre/sayı bilgilerini ve aktarım hızlarını toplar,
+JSON ve Prometheus metin formatında dışa aktarır
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional, Sequence
+
+
+# Komut süresi histogram sınırları (saniye)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Prometheus metrik isimlerinin ön eki
+METRIC_PREFIX = "adb_manager"
+
+
+def command_type(command: Sequence[str]) -> str:
+    """
+    ADB komut listesinden metrik etiketi olarak kullanılacak komut tipini çıkarır
+
+    Örnekler: ["-s", "X", "pull", ...] -> "pull",
+              ["shell", "ls /sdcard"] -> "shell:ls"
+
+    Args:
+        command: ADB'ye verilen argüman listesi
+
+    Returns:
+        Komut tipi
+    """
+    args = list(command)
+    if len(args) >= 2 and args[0] == "-s":
+        args = args[2:]
+    if not args:
+        return "unknown"
+
+    name = args[0]
+    if name in ("shell", "exec-out", "exec-in") and len(args) > 1:
+        words = args[1].split()
+        if words:
+            return f"{name}:{os.path.basename(words[0])}"
+    return name
+
+
+class _Histogram:
+    """Kümülatif kova (bucket) sayaçlı basit histogram"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {str(bound): n for bound, n in zip(self.buckets, self.counts)}
+        }
+
+
+class MetricsCollector:
+    """ADB işlemleri için bellek içi metrik toplayıcı (thread-safe)"""
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        """
+        Args:
+            buckets: Süre histogramı sınırları (saniye)
+        """
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Tüm metrikleri sıfırlar"""
+        with self._lock:
+            self.started_at = time.time()
+            self.commands = {}
+            self.histograms = {}
+            self.retries = {}
+            self.transfer = {
+                "bytes": 0,
+                "files": 0,
+                "seconds": 0.0,
+                "count": 0
+            }
+
+    def record_command(self, command_type: str, duration: float,
+                       success: bool, timed_out: bool = False):
+        """
+        Bir ADB komutunun sonucunu kaydeder
+
+        Args:
+            command_type: Komut tipi (bkz. command_type())
+            duration: Süre (saniye)
+            success: Komut başarılı mı
+            timed_out: Komut zaman aşımına mı uğradı
+        """
+        with self._lock:
+            stats = self.commands.setdefault(
+                command_type, {"calls": 0, "errors": 0, "timeouts": 0}
+            )
+            stats["calls"] += 1
+            if not success:
+                stats["errors"] += 1
+            if timed_out:
+                stats["timeouts"] += 1
+
+            histogram = self.histograms.get(command_type)
+            if histogram is None:
+                histogram = self.histograms[command_type] = _Histogram(self.buckets)
+            histogram.observe(duration)
+
+    def record_transfer(self, bytes_count: int, files: int, duration: float):
+        """
+        Bir dosya aktarımını kaydeder
+
+        Args:
+            bytes_count: Aktarılan byte sayısı
+            files: Aktarılan dosya sayısı
+            duration: Aktarım süresi (saniye)
+        """
+        with self._lock:
+            self.transfer["bytes"] += bytes_count
+            self.transfer["files"] += files
+            self.transfer["seconds"] += duration
+            self.transfer["count"] += 1
+
+    def record_retry(self, operation: str):
+        """Bir tekrar denemesini kaydeder"""
+        with self._lock:
+            self.retries[operation] = self.retries.get(operation, 0) + 1
+
+    def throughput(self) -> float:
+        """Şu ana kadarki ortalama aktarım hızı (byte/s; aktarım yoksa 0)"""
+        with self._lock:
+            seconds = self.transfer["seconds"]
+            return self.transfer["bytes"] / seconds if seconds > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        """
+        Metriklerin anlık kopyasını döndürür
+
+        Returns:
+            JSON'a çevrilebilir metrik sözlüğü
+        """
+        with self._lock:
+            seconds = self.transfer["seconds"]
+            throughput = self.transfer["bytes"] / seconds if seconds > 0 else 0.0
+            return {
+                "started_at": self.started_at,
+                "uptime_seconds": round(time.time() - self.started_at, 3),
+                "commands": {
+                    name: dict(stats, latency=self.histograms[name].to_dict())
+                    for name, stats in sorted(self.commands.items())
+                },
+                "transfer": dict(
+                    self.transfer,
+                    seconds=round(seconds, 6),
+                    throughput_bytes_per_second=round(throughput, 1)
+                ),
+                "retries": dict(self.retries)
+            }
+
+    def export_json(self, path: str) -> bool:
+        """
+        Metrikleri JSON dosyasına yazar
+
+        Args:
+            path: Hedef dosya yolu
+
+        Returns:
+            Başarı durumu
+        """
+        try:
+            _atomic_write(path, json.dumps(self.snapshot(), indent=2, ensure_ascii=False))
+            return True
+        except OSError as e:
+            print(f"[HATA] Metrik kaydetme hatası: {str(e)}")
+            return False
+
+    def to_prometheus(self) -> str:
+        """
+        Metrikleri Prometheus metin formatına (exposition format) çevirir
+
+        Returns:
+            Prometheus metin çıktısı
+        """
+        data = self.snapshot()
+        p = METRIC_PREFIX
+        lines = []
+
+        lines.append(f"# HELP {p}_commands_total ADB komut çağrı sayısı")
+        lines.append(f"# TYPE {p}_commands_total counter")
+        for name, stats in data["commands"].items():
+            ok_count = stats["calls"] - stats["errors"]
+            lines.append(f'{p}_commands_total{{command="{_escape(name)}",status="ok"}} {ok_count}')
+            lines.append(f'{p}_commands_total{{command="{_escape(name)}",status="error"}} {stats["errors"]}')
+
+        lines.append(f"# HELP {p}_command_timeouts_total Zaman aşımına uğrayan ADB komutları")
+        lines.append(f"# TYPE {p}_command_timeouts_total counter")
+        for name, stats in data["commands"].items():
+            lines.append(f'{p}_command_timeouts_total{{command="{_escape(name)}"}} {stats["timeouts"]}')
+
+        lines.append(f"# HELP {p}_command_duration_seconds ADB komut süreleri")
+        lines.append(f"# TYPE {p}_command_duration_seconds histogram")
+        for name, stats in data["commands"].items():
+            label = _escape(name)
+            latency = stats["latency"]
+            for bound, count in latency["buckets"].items():
+                lines.append(f'{p}_command_duration_seconds_bucket{{command="{label}",le="{bound}"}} {count}')
+            lines.append(f'{p}_command_duration_seconds_bucket{{command="{label}",le="+Inf"}} {latency["count"]}')
+            lines.append(f'{p}_command_duration_seconds_sum{{command="{label}"}} {latency["sum"]}')
+            lines.append(f'{p}_command_duration_seconds_count{{command="{label}"}} {latency["count"]}')
+
+        transfer = data["transfer"]
+        lines.append(f"# HELP {p}_transfer_bytes_total Aktarılan toplam byte")
+        lines.append(f"# TYPE {p}_transfer_bytes_total counter")
+        lines.append(f"{p}_transfer_bytes_total {transfer['bytes']}")
+        lines.append(f"# HELP {p}_transfer_files_total Aktarılan toplam dosya")
+        lines.append(f"# TYPE {p}_transfer_files_total counter")
+        lines.append(f"{p}_transfer_files_total {transfer['files']}")
+        lines.append(f"# HELP {p}_transfer_seconds_total Aktarımda geçen toplam süre")
+        lines.append(f"# TYPE {p}_transfer_seconds_total counter")
+        lines.append(f"{p}_transfer_seconds_total {transfer['seconds']}")
+        lines.append(f"# HELP {p}_transfer_throughput_bytes_per_second Ortalama aktarım hızı")
+        lines.append(f"# TYPE {p}_transfer_throughput_bytes_per_second gauge")
+        lines.append(f"{p}_transfer_throughput_bytes_per_second {transfer['throughput_bytes_per_second']}")
+
+        lines.append(f"# HELP {p}_retries_total Tekrar deneme sayısı")
+        lines.append(f"# TYPE {p}_retries_total counter")
+        for operation, count in sorted(data["retries"].items()):
+            lines.append(f'{p}_retries_total{{operation="{_escape(operation)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path: str) -> bool:
+        """
+        Metrikleri node exporter textfile collector'ün okuyabileceği
+        .prom dosyasına atomik olarak yazar
+
+        Args:
+            path: Hedef dosya yolu (*.prom)
+
+        Returns:
+            Başarı durumu
+        """
+        try:
+            _atomic_write(path, self.to_prometheus())
+            return True
+        except OSError as e:
+            print(f"[HATA] Metrik kaydetme hatası: {str(e)}")
+            return False
+
+
+def _escape(value: str) -> str:
+    """Prometheus etiket değerindeki özel karakterleri kaçırır"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path: str, content: str):
+    """Dosyayı önce geçici isimle yazıp yerine taşır (okuyucular yarım dosya görmez)"""
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
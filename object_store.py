@@ -0,0 +1,576 @@
+"""
+İçerik Adresli Nesne Deposu
+Yedeklenen dosyalar içeriklerinin SHA-256 hash'iyle bir kez saklanır; her
+yedekleme çalıştırması sadece hangi yolun hangi nesneyi gösterdiğini yazan bir
+manifest bırakır. Aynı medya birden fazla telefonda veya her günlük yedekte
+bulunsa da diskte tek kopyası olur. Nesnelerin kaç manifestte kullanıldığı
+(referans sayısı) tutulur; eski manifestler silindiğinde artık kullanılmayan
+nesneler çöp toplama ile silinir.
+
+Klasör yapısı:
+    objects/
+        objects/ab/ab12...ef        (nesneler, hash'in ilk iki hanesine göre)
+        manifests/<seri>/<zaman>.json  (serideki ":" yerine "_")
+        refs.json                   (hash -> referans sayısı)
+        refs.lock, session.lock     (süreçler arası kilit dosyaları)
+
+Aynı depoyu farklı süreçler (zamanlayıcı, object_store.py komutları) birlikte
+kullanabilir: refs.json güncellemeleri refs.lock ile sıralanır; yedekleme
+oturumları session.lock'u paylaşımlı tutar, gc ise onu özel alır. Böylece
+gc, bir yedeklemenin depoda bulduğu (has/touch) ama manifestini henüz
+yazmadığı nesneleri silemez.
+
+Kullanım:
+    python object_store.py list
+    python object_store.py prune --keep 7
+    python object_store.py retain --daily 7 --weekly 4
+    python object_store.py gc
+    python object_store.py restore FAKE0001/20240501_020000 output/geri_yukleme
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import config
+import stream_copy
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+OBJECT_DIR = "objects"
+MANIFEST_DIR = "manifests"
+REFS_FILE = "refs.json"
+REFS_LOCK = "refs.lock"
+SESSION_LOCK = "session.lock"
+
+
+class _FileLock:
+    """
+    Süreçler arası okuma/yazma kilidi (kilit dosyası)
+
+    POSIX'te fcntl.flock kullanılır; her alma ayrı bir dosya açtığı için aynı
+    süreçteki iş parçacıkları da birbirini bekler. Windows'ta msvcrt yalnızca
+    özel kilit verir: süreç içindeki paylaşımlı kullanıcılar sayılır ve
+    dosyayı tek bir özel kilitle tutar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._guard = threading.Lock()
+        self._shared_count = 0
+        self._shared_handle = None
+
+    def _acquire(self, shared: bool) -> BinaryIO:
+        handle = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        handle.seek(0)
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.05)
+        except BaseException:
+            handle.close()
+            raise
+        return handle
+
+    @staticmethod
+    def _release(handle: BinaryIO):
+        try:
+            if fcntl is None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
+
+    @contextmanager
+    def exclusive(self):
+        handle = self._acquire(shared=False)
+        try:
+            yield
+        finally:
+            self._release(handle)
+
+    @contextmanager
+    def shared(self):
+        if fcntl is not None:
+            handle = self._acquire(shared=True)
+            try:
+                yield
+            finally:
+                self._release(handle)
+            return
+        with self._guard:
+            if self._shared_count == 0:
+                self._shared_handle = self._acquire(shared=False)
+            self._shared_count += 1
+        try:
+            yield
+        finally:
+            with self._guard:
+                self._shared_count -= 1
+                if self._shared_count == 0:
+                    self._release(self._shared_handle)
+                    self._shared_handle = None
+
+
+# Aynı kilit dosyası için süreç içinde tek nesne (Windows paylaşım sayacı)
+_locks: Dict[str, _FileLock] = {}
+_locks_guard = threading.Lock()
+
+
+def _file_lock(path: str) -> _FileLock:
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), _FileLock(path))
+
+
+def device_dir(device: Optional[str]) -> str:
+    """Cihazın manifest klasörü adı (kablosuz "ip:port" serilerinde ":" Windows'ta geçersizdir)"""
+    return (device or "unknown").replace(":", "_")
+
+
+class ObjectStoreError(Exception):
+    """Manifest veya nesne bulunamadı"""
+
+
+class ObjectStore:
+    """
+    İçerik adresli (SHA-256) nesne deposu
+
+    Dosyalar bütün olarak hash'lenir (medya dosyaları değişmediği için parça
+    bazlı bölme ek kazanç getirmez). Nesne yazma geçici dosya + os.replace ile
+    atomiktir; aynı içerik tekrar gelirse geçici dosya silinir.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Depo klasörü (None ise config.OBJECT_STORE["root"]); tüm cihazlar
+                  ve çalıştırmalar arasında paylaşılması tekilleştirmeyi sağlar
+        """
+        self.root = root or config.OBJECT_STORE["root"]
+        self.objects_dir = os.path.join(self.root, OBJECT_DIR)
+        self.manifests_dir = os.path.join(self.root, MANIFEST_DIR)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        self._refs_lock = _file_lock(os.path.join(self.root, REFS_LOCK))
+        self._session_lock = _file_lock(os.path.join(self.root, SESSION_LOCK))
+
+    def session(self):
+        """
+        Yedekleme oturumu: depoda bulunan nesnelere güvenilen (has/touch) andan
+        manifest yazılana kadar tutulur; açık oturum varken gc beklemede kalır.
+        Oturum içinde gc çağrılmamalıdır (kendini bekler).
+
+            with store.session():
+                ...
+                store.write_manifest(...)
+        """
+        return self._session_lock.shared()
+
+    # --- Nesneler ---
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def touch(self, digest: str):
+        """Nesnenin zamanını günceller (gc'nin bekleme süresi yeniden başlar)"""
+        os.utime(self.path(digest))
+
+    def put_stream(self, stream: BinaryIO) -> Tuple[str, int, bool]:
+        """
+        Akıştaki içeriği hash'leyerek saklar
+
+        Returns:
+            (hash, boyut, yeni nesne mi)
+        """
+        chunk_size = config.OBJECT_STORE["chunk_size"]
+        digest = hashlib.sha256()
+        temp_path = os.path.join(self.objects_dir,
+                                 f"incoming.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                size = stream_copy.copy_stream(stream, f, chunk_size, on_data=digest.update)
+            hexdigest = digest.hexdigest()
+            path = self.path(hexdigest)
+            if os.path.exists(path):
+                os.remove(temp_path)
+                self.touch(hexdigest)
+                return hexdigest, size, False
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+            return hexdigest, size, True
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put_file(self, local_path: str) -> Tuple[str, int, bool]:
+        """Yerel dosyayı saklar (bkz. put_stream)"""
+        with open(local_path, "rb") as f:
+            return self.put_stream(f)
+
+    # --- Manifestler ---
+
+    def _manifest_path(self, manifest_id: str) -> str:
+        device, _, name = manifest_id.partition("/")
+        if not device or not name or "/" in name or device in (".", "..") or name in (".", ".."):
+            raise ObjectStoreError(f"Geçersiz manifest: {manifest_id}")
+        return os.path.join(self.manifests_dir, device, name + ".json")
+
+    def _read_refs(self) -> Dict[str, int]:
+        path = os.path.join(self.root, REFS_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_refs(self, refs: Dict[str, int]):
+        path = os.path.join(self.root, REFS_FILE)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(refs, f)
+        os.replace(temp_path, path)
+
+    def write_manifest(self, device: str, entries: List[Dict],
+                       metadata: Optional[Dict] = None) -> str:
+        """
+        Çalıştırmanın manifestini yazar ve nesnelerin referans sayısını artırır
+
+        Args:
+            device: Cihaz seri numarası (manifest klasörü)
+            entries: [{"path", "hash", "size", "mtime"}] - path "/" ayraçlı göreli yol
+            metadata: Manifeste eklenecek ek bilgiler (kaynak klasör vb.)
+
+        Returns:
+            Manifest kimliği ("<klasör>/<zaman>", klasör için bkz. device_dir)
+        """
+        device = device or "unknown"
+        folder = device_dir(device)
+        created = datetime.now()
+        with self._refs_lock.exclusive():
+            name = created.strftime("%Y%m%d_%H%M%S")
+            suffix = 1
+            while os.path.exists(self._manifest_path(f"{folder}/{name}")):
+                suffix += 1
+                name = f"{created.strftime('%Y%m%d_%H%M%S')}_{suffix}"
+            manifest_id = f"{folder}/{name}"
+            path = self._manifest_path(manifest_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            manifest = dict(metadata or {}, id=manifest_id, device=device,
+                            created=created.isoformat(timespec="seconds"),
+                            files=len(entries), bytes=sum(e["size"] for e in entries),
+                            entries=entries)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+
+            # Referans sayısı manifestteki farklı nesne başına bir artar
+            refs = self._read_refs()
+            for digest in {entry["hash"] for entry in entries}:
+                refs[digest] = refs.get(digest, 0) + 1
+            self._write_refs(refs)
+            os.replace(temp_path, path)
+        return manifest_id
+
+    def add_entries(self, manifest_id: str, entries: List[Dict]):
+        """
+        Yazılmış manifeste dosya ekler (aynı yol varsa yenisi geçerlidir); aynı
+        çalıştırmada ayrı alınan dosyalar (örn. veritabanları) tek manifestte toplanır
+
+        Args:
+            entries: write_manifest ile aynı biçimde girdiler
+        """
+        with self._refs_lock.exclusive():
+            manifest = self.load_manifest(manifest_id)
+            old_digests = {entry["hash"] for entry in manifest["entries"]}
+            merged = {entry["path"]: entry for entry in manifest["entries"]}
+            merged.update((entry["path"], entry) for entry in entries)
+            manifest["entries"] = [merged[path] for path in sorted(merged)]
+            manifest["files"] = len(manifest["entries"])
+            manifest["bytes"] = sum(entry["size"] for entry in manifest["entries"])
+            new_digests = {entry["hash"] for entry in manifest["entries"]}
+
+            path = self._manifest_path(manifest_id)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            refs = self._read_refs()
+            for digest in new_digests - old_digests:
+                refs[digest] = refs.get(digest, 0) + 1
+            for digest in old_digests - new_digests:
+                count = refs.get(digest, 0) - 1
+                if count > 0:
+                    refs[digest] = count
+                else:
+                    refs.pop(digest, None)
+            self._write_refs(refs)
+            os.replace(temp_path, path)
+
+    def load_manifest(self, manifest_id: str) -> Dict:
+        path = self._manifest_path(manifest_id)
+        if not os.path.exists(path):
+            raise ObjectStoreError(f"Manifest bulunamadı: {manifest_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_manifests(self, device: Optional[str] = None) -> List[str]:
+        """Manifest kimlikleri (cihaz ve zamana göre eskiden yeniye)"""
+        devices = [device_dir(device)] if device else sorted(os.listdir(self.manifests_dir))
+        manifests = []
+        for name in devices:
+            directory = os.path.join(self.manifests_dir, name)
+            if not os.path.isdir(directory):
+                continue
+            manifests.extend(f"{name}/{file[:-5]}" for file in sorted(os.listdir(directory))
+                             if file.endswith(".json"))
+        return manifests
+
+    @staticmethod
+    def manifest_time(manifest_id: str) -> datetime:
+        """Manifestin oluşturulma zamanı (kimlikteki "<zaman>" kısmından, dosya okunmaz)"""
+        name = manifest_id.rpartition("/")[2]
+        try:
+            return datetime.strptime(name[:15], "%Y%m%d_%H%M%S")
+        except ValueError:
+            raise ObjectStoreError(f"Geçersiz manifest: {manifest_id}")
+
+    def latest_manifest(self, device: str) -> Optional[Dict]:
+        manifests = self.list_manifests(device)
+        return self.load_manifest(manifests[-1]) if manifests else None
+
+    def devices(self) -> List[str]:
+        """Manifesti olan cihazların seri numaraları (klasör adı değil, manifestteki seri)"""
+        devices = set()
+        for name in sorted(os.listdir(self.manifests_dir)):
+            manifest = self.latest_manifest(name)
+            if manifest:
+                devices.add(manifest.get("device", name))
+        return sorted(devices)
+
+    def delete_manifest(self, manifest_id: str) -> int:
+        """
+        Manifesti siler ve nesnelerin referans sayısını azaltır (nesneler gc ile silinir)
+
+        Returns:
+            Referansı sıfıra düşen nesne sayısı
+        """
+        released = 0
+        with self._refs_lock.exclusive():
+            manifest = self.load_manifest(manifest_id)
+            refs = self._read_refs()
+            for digest in {entry["hash"] for entry in manifest["entries"]}:
+                count = refs.get(digest, 0) - 1
+                if count > 0:
+                    refs[digest] = count
+                else:
+                    refs.pop(digest, None)
+                    released += 1
+            os.remove(self._manifest_path(manifest_id))
+            self._write_refs(refs)
+        return released
+
+    def prune(self, keep: int, device: Optional[str] = None) -> List[str]:
+        """
+        Her cihaz için son `keep` manifest dışındakileri siler
+
+        Returns:
+            Silinen manifest kimlikleri
+        """
+        removed = []
+        devices = [device] if device else sorted(os.listdir(self.manifests_dir))
+        for name in devices:
+            manifests = self._filled_manifests(name, removed)
+            for manifest_id in manifests[:max(0, len(manifests) - max(1, keep))]:
+                self.delete_manifest(manifest_id)
+                removed.append(manifest_id)
+        return removed
+
+    def _filled_manifests(self, device: str, removed: List[str]) -> List[str]:
+        """
+        Cihazın dosya içeren manifestleri; boş manifestler (başarısız eski
+        çalıştırmalar) saklanan yedek sayılmaz, silinip `removed`a eklenir
+        """
+        manifests = []
+        for manifest_id in self.list_manifests(device):
+            if self.load_manifest(manifest_id)["files"]:
+                manifests.append(manifest_id)
+            else:
+                self.delete_manifest(manifest_id)
+                removed.append(manifest_id)
+        return manifests
+
+    @classmethod
+    def select_retained(cls, manifest_ids: List[str], daily: int, weekly: int) -> List[str]:
+        """
+        Saklama politikasına göre tutulacak manifestler
+
+        Son `daily` günün (yedek olan günler) ve son `weekly` haftanın her birinden
+        en yeni manifest tutulur; en yeni manifest her zaman tutulur.
+        """
+        ordered = sorted(manifest_ids, key=cls.manifest_time, reverse=True)
+        keep = set(ordered[:1])
+        days, weeks = set(), set()
+        for manifest_id in ordered:
+            created = cls.manifest_time(manifest_id)
+            day, week = created.date(), created.isocalendar()[:2]
+            if day not in days and len(days) < daily:
+                days.add(day)
+                keep.add(manifest_id)
+            if week not in weeks and len(weeks) < weekly:
+                weeks.add(week)
+                keep.add(manifest_id)
+        return [manifest_id for manifest_id in manifest_ids if manifest_id in keep]
+
+    def retain(self, daily: int, weekly: int, device: Optional[str] = None) -> List[str]:
+        """
+        Saklama politikası dışında kalan manifestleri siler (bkz. select_retained)
+
+        Her manifest tam bir zaman noktasıdır (değişmeyen dosyalar da önceki
+        nesneleri gösterir); aradaki manifestlerin silinmesi zinciri bozmaz.
+        Silme yalnızca referans sayılarını düşürür, yer gc ile açılır; tutulan
+        yedeklerin verisi tekrar okunmaz.
+
+        Returns:
+            Silinen manifest kimlikleri
+        """
+        removed = []
+        devices = [device] if device else sorted(os.listdir(self.manifests_dir))
+        for name in devices:
+            manifests = self._filled_manifests(name, removed)
+            keep = set(self.select_retained(manifests, daily, weekly))
+            for manifest_id in manifests:
+                if manifest_id not in keep:
+                    self.delete_manifest(manifest_id)
+                    removed.append(manifest_id)
+        return removed
+
+    def gc(self, grace_seconds: Optional[float] = None) -> Dict:
+        """
+        Referansı olmayan nesneleri siler
+
+        Açık yedekleme oturumları (bkz. session) bitene kadar beklenir. Hiçbir
+        manifestte geçmeyen ama `grace_seconds`ten yeni nesneler de silinmez
+        (oturum açmadan depoya yazan eski istemciler için).
+
+        Returns:
+            {"removed", "freed_bytes", "kept"}
+        """
+        if grace_seconds is None:
+            grace_seconds = config.OBJECT_STORE["gc_grace_seconds"]
+        now = time.time()
+        removed = freed = kept = 0
+        with self._session_lock.exclusive(), self._refs_lock.exclusive():
+            refs = self._read_refs()
+            for prefix in os.listdir(self.objects_dir):
+                directory = os.path.join(self.objects_dir, prefix)
+                if not os.path.isdir(directory):
+                    continue
+                for digest in os.listdir(directory):
+                    path = os.path.join(directory, digest)
+                    if refs.get(digest, 0) > 0:
+                        kept += 1
+                        continue
+                    stat = os.stat(path)
+                    if now - stat.st_mtime < grace_seconds:
+                        kept += 1
+                        continue
+                    os.remove(path)
+                    removed += 1
+                    freed += stat.st_size
+        return {"removed": removed, "freed_bytes": freed, "kept": kept}
+
+    def restore(self, manifest_id: str, output_dir: str, prefix: str = "") -> int:
+        """
+        Manifestteki dosyaları normal klasör yapısına kopyalar
+
+        Returns:
+            Kopyalanan dosya sayısı
+        """
+        # Kopyalama sürerken gc nesneleri silmesin
+        with self.session():
+            manifest = self.load_manifest(manifest_id)
+            root = os.path.abspath(output_dir)
+            count = 0
+            for entry in manifest["entries"]:
+                if not entry["path"].startswith(prefix):
+                    continue
+                local_path = os.path.abspath(os.path.join(root, *entry["path"].split("/")))
+                if not local_path.startswith(root + os.sep):
+                    raise ObjectStoreError(f"Geçersiz yol: {entry['path']}")
+                if not self.has(entry["hash"]):
+                    raise ObjectStoreError(f"Nesne eksik: {entry['hash']} ({entry['path']})")
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                shutil.copyfile(self.path(entry["hash"]), local_path)
+                if entry.get("mtime") is not None:
+                    os.utime(local_path, (entry["mtime"], entry["mtime"]))
+                count += 1
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İçerik adresli yedek deposu yönetimi")
+    parser.add_argument("--root", default=None,
+                        help=f"Depo klasörü (varsayılan: {config.OBJECT_STORE['root']})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="Manifestleri listele")
+    list_parser.add_argument("--device", default=None)
+    prune_parser = subparsers.add_parser("prune", help="Eski manifestleri sil ve çöp topla")
+    prune_parser.add_argument("--keep", type=int, required=True, help="Cihaz başına saklanacak manifest")
+    prune_parser.add_argument("--device", default=None)
+    retain_parser = subparsers.add_parser("retain", help="Günlük/haftalık saklama politikası uygula ve çöp topla")
+    retain_parser.add_argument("--daily", type=int, default=config.SCHEDULE["retention"]["daily"],
+                               help="Tutulacak son gün sayısı")
+    retain_parser.add_argument("--weekly", type=int, default=config.SCHEDULE["retention"]["weekly"],
+                               help="Tutulacak son hafta sayısı")
+    retain_parser.add_argument("--device", default=None)
+    subparsers.add_parser("gc", help="Kullanılmayan nesneleri sil")
+    restore_parser = subparsers.add_parser("restore", help="Manifesti klasöre çıkar")
+    restore_parser.add_argument("manifest", help="Manifest kimliği (<seri>/<zaman>)")
+    restore_parser.add_argument("output", help="Hedef klasör")
+    args = parser.parse_args()
+
+    store = ObjectStore(args.root)
+    try:
+        if args.command == "list":
+            for manifest_id in store.list_manifests(args.device):
+                manifest = store.load_manifest(manifest_id)
+                print(f"{manifest_id}  {manifest['files']} dosya, {manifest['bytes']} bytes")
+        elif args.command == "restore":
+            count = store.restore(args.manifest, args.output)
+            print(f"[OK] {count} dosya geri yüklendi: {args.output}")
+        else:
+            if args.command == "prune":
+                removed = store.prune(args.keep, args.device)
+                print(f"[OK] {len(removed)} manifest silindi")
+            elif args.command == "retain":
+                removed = store.retain(args.daily, args.weekly, args.device)
+                print(f"[OK] {len(removed)} manifest silindi")
+            result = store.gc()
+            print(f"[OK] {result['removed']} nesne silindi ({result['freed_bytes']} bytes), "
+                  f"{result['kept']} nesne kullanımda")
+    except ObjectStoreError as e:
+        print(f"[HATA] {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Paket (Pack) Deposu
+Çok sayıda küçük dosyayı ayrı ayrı oluşturmak yerine içeriklerini büyük paket
+dosyalarının sonuna ekler. Her dosya için yol, paket, konum, uzunluk, hash ve
+değişiklik zamanı bir dizin (index.jsonl) dosyasına yazılır; listeleme
+bellekten, tek dosya çıkarma doğrudan konumdan okuyarak yapılır.
+
+Klasör yapısı:
+    media.pack/
+        pack-00001.pack
+        pack-00002.pack
+        index.jsonl
+
+Kullanım:
+    python pack_store.py list output/whatsapp_backup/media.pack Images/
+    python pack_store.py extract output/whatsapp_backup/media.pack Images/IMG-1.jpg IMG-1.jpg
+    python pack_store.py export output/whatsapp_backup/media.pack output/media_klasoru
+    python pack_store.py compact output/whatsapp_backup/media.pack
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+import config
+import stream_copy
+
+INDEX_FILE = "index.jsonl"
+PACK_PREFIX = "pack-"
+PACK_SUFFIX = ".pack"
+
+
+class PackStoreError(Exception):
+    """Depo açılamıyor veya istenen dosya depoda yok"""
+
+
+class PackStore:
+    """
+    Ekleme yapılan (append-only) paket dosyası deposu
+
+    - Dosyalar paketlere bölünmeden eklenir; paket config.PACK_STORE["pack_size"]
+      boyutunu geçince yenisine geçilir
+    - Dizin satırları sadece içerik diske yazıldıktan sonra eklenir; program
+      yarıda kalırsa dizinde olmayan artık byte'lar bir sonraki açılışta kesilir
+    - Aynı yol tekrar eklenirse son kayıt geçerlidir; eski kayıtların yeri
+      compact ile geri alınır
+    """
+
+    def __init__(self, root: str, algorithm: Optional[str] = None,
+                 pack_size: Optional[int] = None):
+        """
+        Args:
+            root: Depo klasörü (yoksa oluşturulur)
+            algorithm: Dizindeki hash algoritması (None ise config.PACK_STORE["algorithm"])
+            pack_size: Paket dosyası boyut sınırı (None ise config.PACK_STORE["pack_size"])
+        """
+        self.root = root
+        self.algorithm = algorithm or config.PACK_STORE["algorithm"]
+        self.pack_size = pack_size or config.PACK_STORE["pack_size"]
+        self.entries: Dict[str, Dict] = {}
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._pack = None
+        self._pack_name = None
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Dizini okur; paket sonunda dizinde olmayan byte'ları keser"""
+        index_path = os.path.join(self.root, INDEX_FILE)
+        if os.path.exists(index_path):
+            complete = 0
+            with open(index_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Yarım yazılmış son satır
+                    complete += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry["path"]] = entry
+            if complete < os.path.getsize(index_path):
+                # Yarım satır kesilir; yoksa sonraki kayıt onun arkasına eklenip okunamaz
+                with open(index_path, "r+b") as f:
+                    f.truncate(complete)
+
+        packs = self._pack_files()
+        sizes = {name: os.path.getsize(os.path.join(self.root, name)) for name in packs}
+        self.entries = {path: entry for path, entry in self.entries.items()
+                        if entry["offset"] + entry["length"] <= sizes.get(entry["pack"], -1)}
+        if packs:
+            last = packs[-1]
+            end = max((entry["offset"] + entry["length"] for entry in self.entries.values()
+                       if entry["pack"] == last), default=0)
+            if sizes[last] > end:
+                with open(os.path.join(self.root, last), "r+b") as f:
+                    f.truncate(end)
+            self._pack_name = last
+
+    def _pack_files(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root)
+                      if name.startswith(PACK_PREFIX) and name.endswith(PACK_SUFFIX))
+
+    def _open_pack(self, size: int) -> BinaryIO:
+        """Yazılacak paketi açar; sınır aşılacaksa yeni pakete geçer"""
+        if self._pack is not None and self._pack.tell() > 0 \
+                and self._pack.tell() + size > self.pack_size:
+            self._pack.close()
+            self._pack = None
+            number = int(self._pack_name[len(PACK_PREFIX):-len(PACK_SUFFIX)]) + 1
+            self._pack_name = f"{PACK_PREFIX}{number:05d}{PACK_SUFFIX}"
+        if self._pack is None:
+            if self._pack_name is None:
+                self._pack_name = f"{PACK_PREFIX}{1:05d}{PACK_SUFFIX}"
+            self._pack = open(os.path.join(self.root, self._pack_name), "ab")
+            if self._pack.tell() > 0 and self._pack.tell() + size > self.pack_size:
+                return self._open_pack(size)
+        return self._pack
+
+    def add_stream(self, path: str, stream: BinaryIO, mtime: Optional[float] = None,
+                   size: int = 0) -> Dict:
+        """
+        Akıştaki içeriği pakete ekler
+
+        Args:
+            path: Depodaki yol ("/" ayraçlı, örn. "Images/Sent/IMG-1.jpg")
+            stream: read() destekleyen ikili akış (sonuna kadar okunur)
+            mtime: Değişiklik zamanı (epoch)
+            size: Bilinen boyut (sadece paket seçimi için; 0 ise bilinmiyor)
+
+        Returns:
+            Dizin kaydı {"path", "pack", "offset", "length", "hash", "mtime"}
+        """
+        chunk_size = config.PACK_STORE["chunk_size"]
+        digest = hashlib.new(self.algorithm)
+        with self._lock:
+            pack = self._open_pack(size)
+            offset = pack.tell()
+            length = stream_copy.copy_stream(stream, pack, chunk_size, on_data=digest.update)
+            entry = {
+                "path": path.replace("\\", "/").lstrip("/"),
+                "pack": self._pack_name,
+                "offset": offset,
+                "length": length,
+                "hash": digest.hexdigest(),
+                "mtime": mtime
+            }
+            self.entries[entry["path"]] = entry
+            self._pending.append(json.dumps(entry, ensure_ascii=False))
+            if len(self._pending) >= config.PACK_STORE["index_interval"]:
+                self._flush()
+        return entry
+
+    def is_current(self, path: str, length: int, mtime: Optional[float]) -> bool:
+        """Yolun kaydı aynı boyut ve değişiklik zamanıyla zaten depoda mı (tekrar eklemeye gerek yok)"""
+        entry = self.entries.get(path.replace("\\", "/").lstrip("/"))
+        return entry is not None and mtime is not None and entry["mtime"] is not None \
+            and entry["length"] == length and int(entry["mtime"]) == int(mtime)
+
+    def add_file(self, path: str, local_path: str) -> Dict:
+        """Yerel dosyayı pakete ekler (değişiklik zamanı korunur)"""
+        stat = os.stat(local_path)
+        with open(local_path, "rb") as f:
+            return self.add_stream(path, f, mtime=stat.st_mtime, size=stat.st_size)
+
+    def _flush(self):
+        # Önce içerik, sonra dizin: dizindeki her kayıt diskteki veriyi gösterir
+        if self._pack is not None:
+            self._pack.flush()
+            os.fsync(self._pack.fileno())
+        if self._pending:
+            with open(os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8") as f:
+                f.write("\n".join(self._pending) + "\n")
+            self._pending = []
+
+    def flush(self):
+        """Bekleyen dizin kayıtlarını yazar"""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._pack is not None:
+                self._pack.close()
+                self._pack = None
+
+    def compact(self) -> Dict:
+        """
+        Sadece geçerli kayıtları (her yolun son hali) yeni paketlere kopyalar,
+        dizini bunlarla değiştirir ve eski paketleri siler
+
+        Yeni paketler mevcutların arkasından numaralanır; dizin atomik olarak
+        değiştirilene kadar eski kayıtlar geçerli kalır. Yarıda kalırsa eski
+        depo bozulmaz, artık paketler bir sonraki compact ile silinir.
+
+        Returns:
+            {"entries", "before_bytes", "after_bytes"}
+        """
+        chunk_size = config.PACK_STORE["chunk_size"]
+        with self._lock:
+            self._flush()
+            if self._pack is not None:
+                self._pack.close()
+                self._pack = None
+            old_packs = self._pack_files()
+            before = sum(os.path.getsize(os.path.join(self.root, name)) for name in old_packs)
+            number = int(old_packs[-1][len(PACK_PREFIX):-len(PACK_SUFFIX)]) + 1 if old_packs else 1
+            self._pack_name = f"{PACK_PREFIX}{number:05d}{PACK_SUFFIX}"
+
+            entries = {}
+            # Paketler baştan sona bir kez okunur
+            for entry in sorted(self.entries.values(), key=lambda e: (e["pack"], e["offset"])):
+                pack = self._open_pack(entry["length"])
+                moved = dict(entry, pack=self._pack_name, offset=pack.tell())
+                with open(os.path.join(self.root, entry["pack"]), "rb") as source:
+                    source.seek(entry["offset"])
+                    remaining = entry["length"]
+                    while remaining > 0:
+                        chunk = source.read(min(chunk_size, remaining))
+                        if not chunk:
+                            raise PackStoreError(f"Paket dosyası eksik: {entry['pack']}")
+                        pack.write(chunk)
+                        remaining -= len(chunk)
+                entries[moved["path"]] = moved
+            if self._pack is not None:
+                self._pack.flush()
+                os.fsync(self._pack.fileno())
+
+            index_path = os.path.join(self.root, INDEX_FILE)
+            with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entries[path], ensure_ascii=False) + "\n"
+                             for path in sorted(entries))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(index_path + ".tmp", index_path)
+            self.entries = entries
+
+            live = {entry["pack"] for entry in entries.values()} | {self._pack_name}
+            for name in self._pack_files():
+                if name not in live:
+                    os.remove(os.path.join(self.root, name))
+            after = sum(os.path.getsize(os.path.join(self.root, name)) for name in self._pack_files())
+        return {"entries": len(entries), "before_bytes": before, "after_bytes": after}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def list(self, prefix: str = "") -> List[Dict]:
+        """Yolu prefix ile başlayan kayıtlar (yola göre sıralı)"""
+        return [self.entries[path] for path in sorted(self.entries) if path.startswith(prefix)]
+
+    def _entry(self, path: str) -> Dict:
+        entry = self.entries.get(path.replace("\\", "/").lstrip("/"))
+        if entry is None:
+            raise PackStoreError(f"Depoda bulunamadı: {path}")
+        return entry
+
+    def iter_content(self, path: str) -> Iterator[bytes]:
+        """Dosya içeriğini parça parça üretir (paketten doğrudan konumla okunur)"""
+        entry = self._entry(path)
+        if entry["pack"] == self._pack_name:
+            self.flush()
+        chunk_size = config.PACK_STORE["chunk_size"]
+        with open(os.path.join(self.root, entry["pack"]), "rb") as f:
+            f.seek(entry["offset"])
+            remaining = entry["length"]
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise PackStoreError(f"Paket dosyası eksik: {entry['pack']}")
+                remaining -= len(chunk)
+                yield chunk
+
+    def read(self, path: str) -> bytes:
+        return b"".join(self.iter_content(path))
+
+    def hash_entry(self, path: str, algorithm: str) -> str:
+        """Kaydı verilen algoritmayla hash'ler (dizindeki algoritma aynıysa okumaz)"""
+        entry = self._entry(path)
+        if algorithm == self.algorithm:
+            return entry["hash"]
+        digest = hashlib.new(algorithm)
+        for chunk in self.iter_content(path):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def extract(self, path: str, local_path: str) -> str:
+        """Tek dosyayı diske çıkarır (değişiklik zamanı geri yüklenir)"""
+        entry = self._entry(path)
+        parent_dir = os.path.dirname(local_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(local_path, "wb") as f:
+            for chunk in self.iter_content(path):
+                f.write(chunk)
+        if entry["mtime"] is not None:
+            os.utime(local_path, (entry["mtime"], entry["mtime"]))
+        return local_path
+
+    def export(self, output_dir: str, prefix: str = "") -> int:
+        """
+        Depoyu normal klasör yapısına çıkarır
+
+        Kayıtlar paket ve konum sırasıyla okunur (paketler baştan sona bir kez okunur).
+
+        Returns:
+            Çıkarılan dosya sayısı
+        """
+        entries = sorted(self.list(prefix), key=lambda e: (e["pack"], e["offset"]))
+        root = os.path.abspath(output_dir)
+        for entry in entries:
+            local_path = os.path.abspath(os.path.join(root, *entry["path"].split("/")))
+            if not local_path.startswith(root + os.sep):
+                raise PackStoreError(f"Geçersiz yol: {entry['path']}")
+            self.extract(entry["path"], local_path)
+        return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paket deposu listeleme ve çıkarma")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="Dosyaları listele")
+    list_parser.add_argument("store", help="Depo klasörü (media.pack)")
+    list_parser.add_argument("prefix", nargs="?", default="", help="Yol öneki (Images/)")
+    extract_parser = subparsers.add_parser("extract", help="Tek dosya çıkar")
+    extract_parser.add_argument("store")
+    extract_parser.add_argument("path", help="Depodaki yol")
+    extract_parser.add_argument("output", help="Yazılacak dosya")
+    export_parser = subparsers.add_parser("export", help="Tümünü klasöre çıkar")
+    export_parser.add_argument("store")
+    export_parser.add_argument("output", help="Hedef klasör")
+    export_parser.add_argument("--prefix", default="", help="Sadece bu önekle başlayanlar")
+    compact_parser = subparsers.add_parser("compact", help="Eski kayıtların yerini geri al")
+    compact_parser.add_argument("store")
+    args = parser.parse_args()
+
+    if not os.path.isfile(os.path.join(args.store, INDEX_FILE)):
+        print(f"[HATA] Paket deposu bulunamadı: {args.store}")
+        sys.exit(1)
+    try:
+        with PackStore(args.store) as store:
+            if args.command == "list":
+                entries = store.list(args.prefix)
+                for entry in entries:
+                    print(f"{entry['length']:>12}  {entry['path']}")
+                print(f"{len(entries)} dosya, {sum(e['length'] for e in entries)} bytes")
+            elif args.command == "extract":
+                print(f"[OK] {store.extract(args.path, args.output)}")
+            elif args.command == "compact":
+                result = store.compact()
+                print(f"[OK] {result['entries']} dosya, {result['before_bytes']} -> "
+                      f"{result['after_bytes']} bytes")
+            else:
+                count = store.export(args.output, args.prefix)
+                print(f"[OK] {count} dosya çıkarıldı: {args.output}")
+    except PackStoreError as e:
+        print(f"[HATA] {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
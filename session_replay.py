@@ -0,0 +1,172 @@
+"""
+Oturum Kaydı ve Tekrar Oynatma
+Gerçek bir cihazla yapılan oturumu kaydeder; daha sonra aynı senaryoyu
+telefon olmadan tekrar oynatıp süre ve adb çağrı sayılarını karşılaştırır
+
+Kullanım:
+    python session_replay.py record oturumlar/musteri1 --scenario whatsapp_backup
+    python session_replay.py replay oturumlar/musteri1
+    python session_replay.py replay oturumlar/musteri1 --realtime --report sonuc.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from typing import Callable, Dict
+
+from adb_manager import ADBManager
+from transport import RecordingTransport, ReplayTransport, SubprocessTransport
+
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+
+def _scenario_whatsapp_backup(adb: ADBManager, serial: str, output_dir: str):
+    adb.backup_whatsapp_complete(output_dir, device_serial=serial)
+
+
+def _scenario_device_info(adb: ADBManager, serial: str, output_dir: str):
+    adb.get_device_info(serial)
+    adb.get_installed_apps(serial)
+    adb.find_whatsapp_paths(serial)
+
+
+def _scenario_logcat(adb: ADBManager, serial: str, output_dir: str):
+    adb.save_logcat(os.path.join(output_dir, "logcat.txt"), 1000, serial)
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "whatsapp_backup": _scenario_whatsapp_backup,
+    "device_info": _scenario_device_info,
+    "logcat": _scenario_logcat
+}
+
+
+def _run_scenario(adb: ADBManager, scenario: str, serial: str, output_dir: str) -> float:
+    """Senaryoyu çalıştırır (cihaz listeleme dahil) ve süresini döndürür"""
+    start = time.perf_counter()
+    adb.get_devices()
+    SCENARIOS[scenario](adb, serial, output_dir)
+    return time.perf_counter() - start
+
+
+def record(args) -> int:
+    """Gerçek adb ile senaryoyu çalıştırıp oturumu kaydeder"""
+    inner_adb = ADBManager(adb_path=args.adb)
+    serial = args.serial
+    if not serial:
+        devices = [d for d in inner_adb.get_devices() if d["status"] == "device"]
+        if not devices:
+            print("[HATA] Cihaz bulunamadı!")
+            return 1
+        serial = devices[0]["serial"]
+
+    if os.path.exists(os.path.join(args.session, "session.jsonl")):
+        print(f"[HATA] Oturum zaten mevcut: {args.session}")
+        return 1
+
+    transport = RecordingTransport(
+        SubprocessTransport(inner_adb.adb_path), args.session,
+        metadata={"scenario": args.scenario, "serial": serial}
+    )
+    output_dir = args.output or tempfile.mkdtemp(prefix="adb_record_")
+    try:
+        adb = ADBManager(transport=transport)
+        print(f"[BILGI] Kaydediliyor: {args.scenario} ({serial})")
+        duration = _run_scenario(adb, args.scenario, serial, output_dir)
+    finally:
+        transport.close()
+        if not args.output:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    print(f"[OK] Oturum kaydedildi: {args.session}")
+    print(f"[BILGI] {transport.calls} adb çağrısı, {duration:.2f} s")
+    return 0
+
+
+def replay(args) -> int:
+    """Kaydedilmiş oturumu tekrar oynatır ve kayıtla karşılaştırır"""
+    transport = ReplayTransport(args.session, realtime=args.realtime)
+    metadata = transport.header.get("metadata", {})
+    scenario = metadata.get("scenario")
+    if scenario not in SCENARIOS:
+        print(f"[HATA] Bilinmeyen senaryo: {scenario}")
+        return 1
+
+    output_dir = tempfile.mkdtemp(prefix="adb_replay_")
+    try:
+        adb = ADBManager(adb_path="adb", transport=transport)
+        duration = _run_scenario(adb, scenario, metadata.get("serial"), output_dir)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    recorded_seconds = transport.summary.get("wall_seconds")
+    report = {
+        "scenario": scenario,
+        "serial": metadata.get("serial"),
+        "realtime": args.realtime,
+        "wall_seconds": round(duration, 4),
+        "recorded_wall_seconds": recorded_seconds,
+        "recorded_calls": transport.recorded_calls,
+        "replayed_calls": transport.replayed,
+        "unmatched_calls": transport.unmatched,
+        "unused_recordings": transport.remaining(),
+        "metrics": adb.metrics.snapshot()
+    }
+
+    print("=" * 60)
+    print(f"Senaryo: {scenario} ({metadata.get('serial')})")
+    if recorded_seconds:
+        print(f"Süre: {duration:.3f} s (kayıt: {recorded_seconds:.3f} s)")
+    else:
+        print(f"Süre: {duration:.3f} s")
+    print(f"adb çağrısı: {transport.replayed} / {transport.recorded_calls} kayıt")
+    if transport.unmatched:
+        print(f"[UYARI] Kayıtta bulunmayan {len(transport.unmatched)} komut:")
+        for command in transport.unmatched[:10]:
+            print(f"  - {' '.join(command)}")
+    if report["unused_recordings"]:
+        print(f"[UYARI] Kullanılmayan {report['unused_recordings']} kayıt (komut sayısı azalmış olabilir)")
+    print("=" * 60)
+
+    if args.report:
+        parent_dir = os.path.dirname(args.report)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"[OK] Rapor kaydedildi: {args.report}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ADB oturum kaydı ve tekrar oynatma")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Gerçek cihazla oturum kaydet")
+    record_parser.add_argument("session", help="Oturum klasörü")
+    record_parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="whatsapp_backup")
+    record_parser.add_argument("--serial", default=None, help="Cihaz seri numarası")
+    record_parser.add_argument("--adb", default=None, help="adb yolu (None ise otomatik bulunur)")
+    record_parser.add_argument("--output", default=None, help="Yedeklerin yazılacağı klasör")
+
+    replay_parser = subparsers.add_parser("replay", help="Kaydedilmiş oturumu tekrar oynat")
+    replay_parser.add_argument("session", help="Oturum klasörü")
+    replay_parser.add_argument("--realtime", action="store_true",
+                               help="Kaydedilen sürelerle oynat (varsayılan: olabildiğince hızlı)")
+    replay_parser.add_argument("--report", default=None, help="JSON rapor dosyası")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        sys.exit(record(args))
+    sys.exit(replay(args))
+
+
+if __name__ == "__main__":
+    main()
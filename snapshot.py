@@ -0,0 +1,324 @@
+"""
+Cihaz Anlık Görüntüsü (Snapshot)
+Telefonun sistem özelliklerini (getprop), yüklü uygulamalarını (paket adı,
+sürüm kodu, APK yolu) ve seçilen dizinlerdeki dosya listesini (yol, boyut,
+değişiklik zamanı) tek bir sıkıştırılmış dosyaya yazar. İki görüntü
+karşılaştırılarak iki ziyaret arasında telefonda neyin değiştiği raporlanır.
+
+Dosya listesi yola göre sıralı saklanır; karşılaştırma iki sıralı listenin
+tek geçişte birleştirilmesiyle (sorted merge) yapılır, 500 bin dosyalık
+görüntüler birkaç saniyede karşılaştırılır.
+
+Dosya biçimi (gzip sıkıştırılmış JSON):
+    {"version": 1, "device": ..., "created": ..., "roots": [...],
+     "properties": {anahtar: değer},
+     "apps": {paket: {"version_code": 123, "path": "/data/app/.../base.apk"}},
+     "files": [[yol, boyut, mtime], ...]}
+
+Kullanım:
+    python snapshot.py capture --serial FAKE0001 --root /sdcard/DCIM
+    python snapshot.py diff output/snapshots/FAKE0001/20240501_020000.snap.gz \\
+                            output/snapshots/FAKE0001/20240601_020000.snap.gz
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import config
+import media_filter
+from deadline import Deadline
+
+FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snap.gz"
+
+_PROP_LINE = re.compile(r"^\[(.*?)\]: \[(.*)$")
+
+
+class SnapshotError(Exception):
+    """Görüntü alınamadı veya dosya okunamadı"""
+
+
+def parse_getprop(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    "getprop" çıktısını sözlüğe çevirir ("[anahtar]: [değer]" satırları;
+    birden fazla satıra yayılan değerler birleştirilir)
+    """
+    properties = {}
+    key = None
+    value_lines: List[str] = []
+    for line in lines:
+        if key is None:
+            match = _PROP_LINE.match(line)
+            if not match:
+                continue
+            key, value = match.group(1), match.group(2)
+            value_lines = [value]
+        else:
+            value_lines.append(line)
+        if value_lines[-1].endswith("]"):
+            properties[key] = "\n".join(value_lines)[:-1]
+            key = None
+    return properties
+
+
+def parse_package_list(lines: Iterable[str]) -> Dict[str, Dict]:
+    """
+    "pm list packages -f --show-versioncode" çıktısını sözlüğe çevirir
+
+    Returns:
+        {paket: {"version_code": int veya None, "path": APK yolu veya None}}
+    """
+    apps = {}
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("package:"):
+            continue
+        entry = line[len("package:"):]
+        version_code = None
+        if " versionCode:" in entry:
+            entry, code = entry.rsplit(" versionCode:", 1)
+            version_code = int(code) if code.isdigit() else None
+        path = None
+        if "=" in entry:
+            path, entry = entry.rsplit("=", 1)
+        apps[entry] = {"version_code": version_code, "path": path}
+    return apps
+
+
+def capture(adb, device_serial: Optional[str] = None,
+            roots: Optional[List[str]] = None) -> Dict:
+    """
+    Cihazın anlık görüntüsünü alır
+
+    Her bölüm tek bir adb komutuyla akış olarak okunur (bkz. ADBManager.stream_shell_command).
+
+    Args:
+        adb: ADBManager
+        device_serial: Cihaz seri numarası
+        roots: Dosya listesi alınacak telefondaki dizinler (None ise config.SNAPSHOT["roots"])
+
+    Raises:
+        SnapshotError: Özellikler, uygulamalar veya dosya listesi alınamazsa
+    """
+    roots = list(roots or config.SNAPSHOT["roots"])
+    shell_timeout = config.TIMEOUTS["shell"]
+
+    with adb.stream_shell_command("getprop", device_serial, timeout=shell_timeout) as stream:
+        properties = parse_getprop(stream.iter_lines())
+    if not stream.success:
+        raise SnapshotError(f"Sistem özellikleri alınamadı: {stream.stderr.strip()}")
+
+    with adb.stream_shell_command("pm list packages -f --show-versioncode", device_serial,
+                                  timeout=shell_timeout) as stream:
+        apps = parse_package_list(stream.iter_lines())
+    if not stream.success or not apps:
+        # Android 9 öncesinde --show-versioncode yok; sürüm yerine APK yolu karşılaştırılır
+        with adb.stream_shell_command("pm list packages -f", device_serial,
+                                      timeout=shell_timeout) as stream:
+            apps = parse_package_list(stream.iter_lines())
+        if not stream.success:
+            raise SnapshotError(f"Uygulama listesi alınamadı: {stream.stderr.strip()}")
+
+    find_command = media_filter.build_find_command(roots, media_filter.normalize_filters(None),
+                                                   media_filter.STAT_ACTION)
+    # Büyük ağaçlarda liste uzun sürebilir; sadece çıktı durursa süre aşılır
+    with adb.stream_shell_command(f"{find_command} 2>/dev/null", device_serial,
+                                  timeout=Deadline(inactivity=shell_timeout)) as stream:
+        files = [[entry["path"], entry["size"], entry["mtime"]]
+                 for entry in media_filter.parse_stat_output(stream.iter_lines())]
+    # find erişilemeyen alt dizinlerde sıfırdan farklı döner; çıktı yine geçerlidir
+    if stream.timed_out or (stream.returncode != 0 and not files):
+        raise SnapshotError(f"Dosya listesi alınamadı: {stream.timeout_message or roots}")
+    files.sort()
+
+    return {
+        "version": FORMAT_VERSION,
+        "device": device_serial or properties.get("ro.serialno") or "unknown",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "roots": roots,
+        "properties": properties,
+        "apps": apps,
+        "files": files
+    }
+
+
+def default_path(device: str) -> str:
+    """Görüntünün varsayılan yolu (<dir>/<seri>/<zaman>.snap.gz)"""
+    name = datetime.now().strftime("%Y%m%d_%H%M%S") + SNAPSHOT_SUFFIX
+    return os.path.join(config.SNAPSHOT["dir"], device.replace(":", "_"), name)
+
+
+def save(snapshot: Dict, path: str) -> str:
+    """Görüntüyü sıkıştırılmış JSON olarak yazar (geçici dosya + os.replace)"""
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8",
+                   compresslevel=config.SNAPSHOT["compress_level"]) as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+    return path
+
+
+def load(path: str) -> Dict:
+    """
+    Görüntü dosyasını okur
+
+    Raises:
+        SnapshotError: Dosya yoksa, bozuksa veya sürümü desteklenmiyorsa
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Görüntü okunamadı: {path} ({str(e)})")
+    if snapshot.get("version") != FORMAT_VERSION:
+        raise SnapshotError(f"Desteklenmeyen görüntü sürümü: {snapshot.get('version')}")
+    return snapshot
+
+
+def diff_files(old: List[List], new: List[List]) -> Dict[str, List]:
+    """
+    Yola göre sıralı iki dosya listesini tek geçişte karşılaştırır
+
+    Args:
+        old, new: [[yol, boyut, mtime]] listeleri (yola göre sıralı)
+
+    Returns:
+        {"added": [yol], "removed": [yol], "modified": [{"path", "old", "new"}]}
+    """
+    added, removed, modified = [], [], []
+    i = j = 0
+    old_count, new_count = len(old), len(new)
+    while i < old_count and j < new_count:
+        old_path, new_path = old[i][0], new[j][0]
+        if old_path == new_path:
+            if old[i][1] != new[j][1] or old[i][2] != new[j][2]:
+                modified.append({"path": old_path,
+                                 "old": {"size": old[i][1], "mtime": old[i][2]},
+                                 "new": {"size": new[j][1], "mtime": new[j][2]}})
+            i += 1
+            j += 1
+        elif old_path < new_path:
+            removed.append(old_path)
+            i += 1
+        else:
+            added.append(new_path)
+            j += 1
+    removed.extend(row[0] for row in old[i:])
+    added.extend(row[0] for row in new[j:])
+    return {"added": added, "removed": removed, "modified": modified}
+
+
+def _diff_maps(old: Dict, new: Dict) -> Tuple[List[str], List[str], List[str]]:
+    """(eklenen, silinen, değişen) anahtarlar (sıralı)"""
+    added = sorted(new.keys() - old.keys())
+    removed = sorted(old.keys() - new.keys())
+    changed = sorted(key for key in old.keys() & new.keys() if old[key] != new[key])
+    return added, removed, changed
+
+
+def diff(old: Dict, new: Dict) -> Dict:
+    """
+    İki görüntüyü karşılaştırır
+
+    Returns:
+        {"apps": {"installed", "removed", "updated"},
+         "properties": {"added", "removed", "changed"},
+         "files": {"added", "removed", "modified"}}
+    """
+    installed, removed_apps, changed_apps = _diff_maps(old["apps"], new["apps"])
+    added_props, removed_props, changed_props = _diff_maps(old["properties"], new["properties"])
+    return {
+        "old": {"device": old["device"], "created": old["created"]},
+        "new": {"device": new["device"], "created": new["created"]},
+        "apps": {
+            "installed": [dict(new["apps"][p], package=p) for p in installed],
+            "removed": [dict(old["apps"][p], package=p) for p in removed_apps],
+            "updated": [{"package": p, "old": old["apps"][p], "new": new["apps"][p]}
+                        for p in changed_apps]
+        },
+        "properties": {
+            "added": {key: new["properties"][key] for key in added_props},
+            "removed": {key: old["properties"][key] for key in removed_props},
+            "changed": {key: {"old": old["properties"][key], "new": new["properties"][key]}
+                        for key in changed_props}
+        },
+        "files": diff_files(old["files"], new["files"])
+    }
+
+
+def summary_lines(result: Dict, limit: Optional[int] = None) -> List[str]:
+    """Karşılaştırma sonucunu okunabilir satırlara çevirir (her bölümde en fazla limit öğe)"""
+    limit = config.SNAPSHOT["summary_limit"] if limit is None else limit
+    lines = []
+
+    def section(title: str, items: List[str]):
+        lines.append(f"{title}: {len(items)}")
+        lines.extend(f"  {item}" for item in items[:limit])
+        if len(items) > limit:
+            lines.append(f"  ... ve {len(items) - limit} tane daha")
+
+    apps = result["apps"]
+    section("Yüklenen uygulamalar", [app["package"] for app in apps["installed"]])
+    section("Kaldırılan uygulamalar", [app["package"] for app in apps["removed"]])
+    section("Güncellenen uygulamalar",
+            [f"{app['package']} ({app['old']['version_code']} -> {app['new']['version_code']})"
+             for app in apps["updated"]])
+    props = result["properties"]
+    section("Değişen özellikler",
+            [f"{key}: {change['old']} -> {change['new']}" for key, change in props["changed"].items()]
+            + [f"+ {key}: {value}" for key, value in props["added"].items()]
+            + [f"- {key}" for key in props["removed"]])
+    files = result["files"]
+    section("Eklenen dosyalar", files["added"])
+    section("Silinen dosyalar", files["removed"])
+    section("Değişen dosyalar", [change["path"] for change in files["modified"]])
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cihaz anlık görüntüsü alma ve karşılaştırma")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    capture_parser = subparsers.add_parser("capture", help="Görüntü al")
+    capture_parser.add_argument("output", nargs="?", default=None,
+                                help=f"Görüntü dosyası (varsayılan: {config.SNAPSHOT['dir']}/<seri>/<zaman>{SNAPSHOT_SUFFIX})")
+    capture_parser.add_argument("--serial", "-s", default=None, help="Cihaz seri numarası")
+    capture_parser.add_argument("--root", action="append", default=None,
+                                help="Dosya listesi alınacak dizin (birden fazla verilebilir)")
+    diff_parser = subparsers.add_parser("diff", help="İki görüntüyü karşılaştır")
+    diff_parser.add_argument("old", help="Eski görüntü")
+    diff_parser.add_argument("new", help="Yeni görüntü")
+    diff_parser.add_argument("--json", default=None, help="Sonucun tamamını JSON olarak yaz")
+    diff_parser.add_argument("--limit", type=int, default=None, help="Bölüm başına gösterilecek öğe")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "capture":
+            from adb_manager import ADBManager
+            adb = ADBManager()
+            snapshot = capture(adb, args.serial, args.root)
+            path = save(snapshot, args.output or default_path(snapshot["device"]))
+            print(f"[OK] Görüntü kaydedildi: {path} ({len(snapshot['properties'])} özellik, "
+                  f"{len(snapshot['apps'])} uygulama, {len(snapshot['files'])} dosya)")
+        else:
+            result = diff(load(args.old), load(args.new))
+            for line in summary_lines(result, args.limit):
+                print(line)
+            if args.json:
+                with open(args.json, "w", encoding="utf-8") as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+                print(f"[OK] Karşılaştırma kaydedildi: {args.json}")
+    except SnapshotError as e:
+        print(f"[HATA] {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
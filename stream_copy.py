@@ -0,0 +1,114 @@
+"""
+Akış Kopyalama
+Boru, tar üyesi veya HTTP yanıtı gibi akışları dosyaya parça başına yeni
+bytes nesnesi oluşturmadan kopyalar. Veri önceden ayrılmış tek bir bytearray'e
+readinto ile okunur ve memoryview dilimiyle yazılır; Linux'ta kaynak bir boru
+ise ve verinin Python'da işlenmesi (hash) gerekmiyorsa os.splice ile çekirdek
+içinde doğrudan dosyaya aktarılır.
+"""
+import io
+import os
+import stat
+from typing import BinaryIO, Callable, Optional
+
+# os.splice: Linux, Python 3.10+
+HAS_SPLICE = hasattr(os, "splice")
+
+
+def _splice_source(source) -> Optional[int]:
+    """Kaynak splice ile okunabilecek bir boruysa dosya tanımlayıcısını döndürür"""
+    if not HAS_SPLICE or not isinstance(source, (io.BufferedReader, io.FileIO)):
+        return None
+    try:
+        fd = source.fileno()
+        return fd if stat.S_ISFIFO(os.fstat(fd).st_mode) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _splice(source_fd: int, target: BinaryIO, chunk_size: int,
+            on_progress: Optional[Callable[[int], None]]) -> Optional[int]:
+    """
+    Borudaki veriyi çekirdek içinde dosyaya aktarır
+
+    Returns:
+        Aktarılan byte sayısı; hedef dosya sistemi splice desteklemiyorsa
+        (hiç veri aktarılmadan) None
+    """
+    target.flush()
+    target_fd = target.fileno()
+    total = 0
+    while True:
+        try:
+            count = os.splice(source_fd, target_fd, chunk_size)
+        except OSError:
+            if total == 0:
+                return None
+            raise
+        if count == 0:
+            return total
+        total += count
+        if on_progress:
+            on_progress(count)
+
+
+def copy_stream(source, target: BinaryIO, chunk_size: int,
+                on_data: Optional[Callable[[memoryview], None]] = None,
+                on_progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Akışı sonuna kadar hedef dosyaya kopyalar
+
+    Args:
+        source: Okunacak akış (henüz okunmamış olmalı; splice tampondaki
+                veriyi görmez)
+        target: Yazılacak ikili dosya
+        chunk_size: Tampon boyutu (byte)
+        on_data: Her parçanın memoryview'ı ile çağrılır (hash için); verilirse
+                 splice kullanılmaz. memoryview sadece çağrı süresince geçerlidir.
+        on_progress: Her parçada aktarılan byte sayısıyla çağrılır
+
+    Returns:
+        Kopyalanan byte sayısı
+    """
+    if on_data is None:
+        source_fd = _splice_source(source)
+        if source_fd is not None:
+            try:
+                target.fileno()
+            except (OSError, io.UnsupportedOperation):
+                source_fd = None
+        if source_fd is not None:
+            total = _splice(source_fd, target, chunk_size, on_progress)
+            if total is not None:
+                return total
+
+    total = 0
+    if not hasattr(source, "readinto"):
+        # readinto desteklemeyen akışlar için (ör. kayıt sarmalayıcıları)
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return total
+            target.write(chunk)
+            if on_data:
+                on_data(memoryview(chunk))
+            total += len(chunk)
+            if on_progress:
+                on_progress(len(chunk))
+
+    # readinto1 tek okuma yapar: yavaş bağlantıda tampon dolmadan ilerleme görülür
+    readinto = getattr(source, "readinto1", None) or source.readinto
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        while True:
+            count = readinto(view)
+            if not count:
+                return total
+            chunk = view[:count]
+            target.write(chunk)
+            if on_data:
+                on_data(chunk)
+            chunk.release()
+            total += count
+            if on_progress:
+                on_progress(count)
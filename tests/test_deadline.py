@@ -0,0 +1,72 @@
+"""
+deadline.Deadline testleri: tahmini süre, uzatma ve hareketsizlik sınırı
+"""
+import unittest
+from unittest import mock
+
+import config
+from deadline import DEADLINE, INACTIVITY, Deadline
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def setUp(self):
+        settings = mock.patch.dict(config.TIMEOUTS, {"grace": 0, "slack": 1, "min_throughput": 10,
+                                                     "expected_throughput": 100})
+        settings.start()
+        self.addCleanup(settings.stop)
+
+    def test_estimate_from_expected_size(self):
+        deadline = Deadline(expected_bytes=1000, throughput=50, inactivity=0, startup=5)
+
+        self.assertEqual(deadline.limit, 25)
+        self.assertEqual(Deadline(expected_bytes=1000, inactivity=0).limit, 10)
+
+    def test_healthy_transfer_is_extended(self):
+        deadline = Deadline(expected_bytes=1000, inactivity=0)
+        start = deadline.start
+
+        self.assertIsNone(deadline.check(500, start + 5))
+        # Tahmin aşıldı ama hız (900/12 = 75 byte/s) sınırın üstünde: kalan süre eklenir
+        self.assertIsNone(deadline.check(900, start + 12))
+        self.assertAlmostEqual(deadline.limit, 12 + 100 / 75)
+        self.assertIsNone(deadline.check(950, start + 13))
+        self.assertIsNone(deadline.check(1000, start + 100))
+
+    def test_slow_transfer_is_not_extended(self):
+        deadline = Deadline(expected_bytes=1000, inactivity=0)
+
+        # 50 byte / 11 s < min_throughput
+        self.assertEqual(deadline.check(50, deadline.start + 11), DEADLINE)
+
+    def test_fixed_limit_is_not_extended(self):
+        deadline = Deadline(expected_bytes=1000, limit=10, inactivity=0)
+
+        self.assertIsNone(deadline.check(900, deadline.start + 10))
+        self.assertEqual(deadline.check(999, deadline.start + 11), DEADLINE)
+
+    def test_no_limit_without_expected_size(self):
+        deadline = Deadline(inactivity=0)
+
+        self.assertIsNone(deadline.limit)
+        self.assertIsNone(deadline.check(0, deadline.start + 10 ** 6))
+
+    def test_inactivity(self):
+        deadline = Deadline(inactivity=5, first_progress=30)
+        start = deadline.start
+
+        self.assertIsNone(deadline.check(0, start + 20))
+        self.assertIsNone(deadline.check(1, start + 29))
+        self.assertIsNone(deadline.check(1, start + 34))
+        self.assertEqual(deadline.check(1, start + 35), INACTIVITY)
+        self.assertIn("5 saniye", deadline.describe(INACTIVITY))
+
+    def test_no_first_progress(self):
+        deadline = Deadline(inactivity=5, first_progress=30)
+
+        self.assertEqual(deadline.check(0, deadline.start + 31), INACTIVITY)
+        self.assertIn("30 saniye", deadline.describe(INACTIVITY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+installer.download_platform_tools testleri (yerel http.server ile)
+"""
+import hashlib
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import config
+from installer import AutoInstaller
+
+
+PAYLOAD = bytes(range(256)) * 400
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Range ve If-Range destekleyen basit dosya sunucusu"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        body, status = server.payload, 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range == server.etag):
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.end_headers()
+                return
+            body, status = body[start:], 206
+        self.send_response(status)
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DownloadPlatformToolsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.payload = PAYLOAD
+        self.server.etag = '"v1"'
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/platform-tools.zip"
+
+        self.root = Path(tempfile.mkdtemp())
+        self.installer = AutoInstaller()
+        self.installer.project_root = self.root
+        self.part_path = self.root / "platform-tools.zip.part"
+        self.etag_path = self.root / "platform-tools.zip.part.etag"
+
+        settings = mock.patch.dict(config.PLATFORM_TOOLS, {"retries": 0, "retry_delay": 0,
+                                                           "timeout": 5, "chunk_size": 4096})
+        settings.start()
+        self.addCleanup(settings.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def download(self, sha256=None):
+        return self.installer.download_platform_tools(
+            self.url, sha256 or hashlib.sha256(PAYLOAD).hexdigest())
+
+    def test_fresh_download_is_verified(self):
+        zip_path = self.download()
+
+        self.assertEqual(Path(zip_path).read_bytes(), PAYLOAD)
+        self.assertNotIn("Range", self.server.requests[0])
+        self.assertFalse(self.part_path.exists())
+        self.assertFalse(self.etag_path.exists())
+
+    def test_resumes_with_range_and_if_range(self):
+        self.part_path.write_bytes(PAYLOAD[:1000])
+        self.etag_path.write_text('"v1"', encoding="utf-8")
+
+        zip_path = self.download()
+
+        self.assertEqual(Path(zip_path).read_bytes(), PAYLOAD)
+        request = self.server.requests[0]
+        self.assertEqual(request["Range"], "bytes=1000-")
+        self.assertEqual(request["If-Range"], '"v1"')
+
+    def test_restarts_when_file_changed(self):
+        # Sunucudaki dosya değişti: If-Range tutmaz, 200 ile baştan indirilir
+        self.part_path.write_bytes(b"x" * 1000)
+        self.etag_path.write_text('"v0"', encoding="utf-8")
+
+        zip_path = self.download()
+
+        self.assertEqual(Path(zip_path).read_bytes(), PAYLOAD)
+        self.assertEqual(self.server.requests[0]["If-Range"], '"v0"')
+
+    def test_no_resume_without_etag(self):
+        self.part_path.write_bytes(b"x" * 1000)
+
+        zip_path = self.download()
+
+        self.assertEqual(Path(zip_path).read_bytes(), PAYLOAD)
+        self.assertNotIn("Range", self.server.requests[0])
+
+    def test_checksum_mismatch_is_refused(self):
+        self.assertIsNone(self.download(sha256="0" * 64))
+
+        self.assertFalse((self.root / "platform-tools.zip").exists())
+        self.assertFalse(self.part_path.exists())
+        self.assertFalse(self.etag_path.exists())
+
+    def test_unpinned_download_needs_https_manifest(self):
+        with mock.patch.dict(config.PLATFORM_TOOLS, {"url": None, "sha256": None,
+                                                     "manifest_url": self.url}):
+            self.assertIsNone(self.installer.download_platform_tools())
+        self.assertEqual(self.server.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
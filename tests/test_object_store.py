@@ -0,0 +1,96 @@
+"""
+object_store testleri: saklama seçimi ve referans sayıları
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from object_store import ObjectStore, REFS_FILE
+
+
+class SelectRetainedTest(unittest.TestCase):
+
+    def test_daily_and_weekly_across_midnight(self):
+        # 2026-01-04 Pazar (hafta 1), 2026-01-05 Pazartesi (hafta 2)
+        manifests = ["dev/20260103_100000", "dev/20260104_090000", "dev/20260104_235900",
+                     "dev/20260105_000100", "dev/20260105_080000"]
+
+        kept = ObjectStore.select_retained(manifests, daily=2, weekly=2)
+
+        self.assertEqual(kept, ["dev/20260104_235900", "dev/20260105_080000"])
+
+    def test_iso_weeks_across_year_boundary(self):
+        # 2025-12-28 Pazar 2025'in 52. haftası; 2025-12-29 ve 2026-01-01 ise 2026'nın 1. haftası
+        manifests = ["dev/20251228_120000", "dev/20251229_120000",
+                     "dev/20260101_120000", "dev/20260105_120000"]
+
+        kept = ObjectStore.select_retained(manifests, daily=0, weekly=3)
+
+        self.assertEqual(kept, ["dev/20251228_120000", "dev/20260101_120000",
+                                "dev/20260105_120000"])
+
+    def test_same_second_suffix_and_newest_always_kept(self):
+        manifests = ["dev/20260105_080000", "dev/20260105_080000_2"]
+
+        self.assertEqual(ObjectStore.select_retained(manifests, daily=1, weekly=0),
+                         ["dev/20260105_080000"])
+        self.assertEqual(ObjectStore.select_retained(manifests[::-1], daily=0, weekly=0),
+                         ["dev/20260105_080000_2"])
+
+
+class RefcountTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = ObjectStore(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def put(self, content: bytes) -> str:
+        return self.store.put_stream(io.BytesIO(content))[0]
+
+    def refs(self):
+        with open(os.path.join(self.root, REFS_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def entry(path: str, digest: str) -> dict:
+        return {"path": path, "hash": digest, "size": 1, "mtime": 0}
+
+    def test_refcounts_follow_manifests(self):
+        a, b, c = self.put(b"a"), self.put(b"b"), self.put(b"c")
+        # Aynı nesne bir manifestte birden çok yolda geçse de bir kez sayılır
+        first = self.store.write_manifest("dev", [self.entry("x/a", a), self.entry("y/a", a),
+                                                  self.entry("b", b)])
+        second = self.store.write_manifest("dev", [self.entry("a", a)])
+        self.assertEqual(self.refs(), {a: 2, b: 1})
+
+        # Aynı yol yeni hash'le eklenince eski nesnenin referansı düşer
+        self.store.add_entries(first, [self.entry("b", c), self.entry("c", c)])
+        self.assertEqual(self.refs(), {a: 2, c: 1})
+        self.assertEqual(self.store.load_manifest(first)["files"], 4)
+
+        self.assertEqual(self.store.delete_manifest(second), 0)
+        self.assertEqual(self.refs(), {a: 1, c: 1})
+        self.assertEqual(self.store.delete_manifest(first), 2)
+        self.assertEqual(self.refs(), {})
+
+        result = self.store.gc(grace_seconds=0)
+        self.assertEqual(result["removed"], 3)
+        self.assertFalse(any(self.store.has(digest) for digest in (a, b, c)))
+
+    def test_wireless_serial_folder(self):
+        digest = self.put(b"a")
+        manifest_id = self.store.write_manifest("192.168.1.5:5555", [self.entry("a", digest)])
+
+        self.assertTrue(manifest_id.startswith("192.168.1.5_5555/"))
+        self.assertEqual(self.store.list_manifests("192.168.1.5:5555"), [manifest_id])
+        self.assertEqual(self.store.devices(), ["192.168.1.5:5555"])
+
+
+if __name__ == "__main__":
+    unittest.main()
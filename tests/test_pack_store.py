@@ -0,0 +1,82 @@
+"""
+pack_store testleri: yarıda kalan yazmanın kesilmesi ve compact
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from pack_store import INDEX_FILE, PackStore
+
+
+class PackStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def pack_path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def test_crash_leftovers_are_truncated(self):
+        with PackStore(self.root) as store:
+            first = store.add_stream("a", io.BytesIO(b"A" * 100), mtime=1)
+            second = store.add_stream("b", io.BytesIO(b"B" * 50), mtime=2)
+        end = second["offset"] + second["length"]
+
+        # Çökme: içerik pakete yazılmış ama dizin satırı yarım kalmış
+        with open(self.pack_path(first["pack"]), "ab") as f:
+            f.write(b"C" * 70)
+        with open(self.pack_path(INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write('{"path": "c", "pack"')
+
+        with PackStore(self.root) as store:
+            self.assertEqual(os.path.getsize(self.pack_path(first["pack"])), end)
+            self.assertEqual(sorted(store.entries), ["a", "b"])
+            self.assertEqual(store.read("b"), b"B" * 50)
+            third = store.add_stream("c", io.BytesIO(b"D" * 10), mtime=3)
+            self.assertEqual(third["offset"], end)
+
+        with PackStore(self.root) as store:
+            self.assertEqual(store.read("c"), b"D" * 10)
+
+    def test_entries_past_pack_end_are_dropped(self):
+        with PackStore(self.root) as store:
+            store.add_stream("a", io.BytesIO(b"A" * 100))
+            entry = store.add_stream("b", io.BytesIO(b"B" * 50))
+        with open(self.pack_path(entry["pack"]), "r+b") as f:
+            f.truncate(entry["offset"] + 10)
+
+        with PackStore(self.root) as store:
+            self.assertEqual(sorted(store.entries), ["a"])
+            self.assertEqual(os.path.getsize(self.pack_path(entry["pack"])), 100)
+
+    def test_compact_keeps_latest_versions(self):
+        with PackStore(self.root, pack_size=64) as store:
+            store.add_stream("a", io.BytesIO(b"1" * 40), mtime=1, size=40)
+            store.add_stream("b", io.BytesIO(b"2" * 40), mtime=2, size=40)
+            store.add_stream("a", io.BytesIO(b"3" * 30), mtime=3, size=30)
+            old_packs = store._pack_files()
+            self.assertEqual(len(old_packs), 3)
+
+            result = store.compact()
+
+            self.assertEqual(result, {"entries": 2, "before_bytes": 110, "after_bytes": 70})
+            self.assertTrue(set(old_packs).isdisjoint(store._pack_files()))
+            self.assertEqual(store.read("a"), b"3" * 30)
+            self.assertTrue(store.is_current("a", 30, 3))
+            store.add_stream("c", io.BytesIO(b"4" * 5), size=5)
+
+        with PackStore(self.root, pack_size=64) as store:
+            self.assertEqual(sorted(store.entries), ["a", "b", "c"])
+            self.assertEqual(store.read("b"), b"2" * 40)
+            self.assertEqual(store.read("c"), b"4" * 5)
+            with open(self.pack_path(INDEX_FILE), "r", encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
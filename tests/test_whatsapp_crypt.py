@@ -0,0 +1,122 @@
+"""
+whatsapp_crypt testleri: crypt14/crypt15 başlığı ve dosya sonu (GCM etiketi, MD5) işleme
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+import whatsapp_crypt
+from whatsapp_crypt import DecryptionError, SQLITE_HEADER, decrypt_database, load_key
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+ROOT_KEY = "0123456789abcdef" * 4
+IV = bytes(range(16))
+GOOGLE_ID = b"g" * 16
+
+
+def _field(number: int, value: bytes) -> bytes:
+    return bytes([number << 3 | 2, len(value)]) + value
+
+
+def _header(version: int) -> bytes:
+    if version == 15:
+        # Özellik bayraklı (0x01) başlık, IV alan 3'ün içinde
+        prefix = _field(3, _field(1, IV))
+        return bytes([len(prefix), 0x01]) + prefix
+    # crypt14: IV, 16 byte'lık google_id'den sonra gelen alandır
+    prefix = _field(2, _field(4, GOOGLE_ID) + _field(6, IV))
+    return bytes([len(prefix)]) + prefix
+
+
+def _encrypt(plain: bytes, version: int, with_checksum: bool) -> bytes:
+    key, _ = load_key(ROOT_KEY)
+    header = _header(version)
+    # AESGCM.encrypt şifreli verinin sonuna 16 byte etiketi ekler
+    data = header + AESGCM(key).encrypt(IV, zlib.compress(plain), None)
+    if with_checksum:
+        data += hashlib.md5(data).digest()
+    return data
+
+
+@unittest.skipIf(AESGCM is None or whatsapp_crypt.Cipher is None, "cryptography gerekli")
+class DecryptDatabaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.plain = SQLITE_HEADER + os.urandom(50000)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, data: bytes, name: str = "msgstore.db.crypt15") -> str:
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_trailer_variants(self):
+        # Parça boyutları etiketin ve MD5'in parça sınırlarına denk geldiği durumları da kapsar
+        for version in (14, 15):
+            for with_checksum in (True, False):
+                path = self.write(_encrypt(self.plain, version, with_checksum),
+                                  f"msgstore.db.crypt{version}")
+                for chunk_size in (7, 16, 32, 4096, 1 << 20):
+                    with self.subTest(version=version, checksum=with_checksum, chunk=chunk_size):
+                        output = os.path.join(self.root, "msgstore.db")
+                        result = decrypt_database(path, output, key=ROOT_KEY,
+                                                  chunk_size=chunk_size)
+                        self.assertEqual(result["checksum"], with_checksum)
+                        self.assertEqual(result["bytes"], len(self.plain))
+                        with open(output, "rb") as f:
+                            self.assertEqual(f.read(), self.plain)
+
+    def test_corrupted_tag_is_rejected(self):
+        for with_checksum in (True, False):
+            with self.subTest(checksum=with_checksum):
+                data = bytearray(_encrypt(self.plain, 15, with_checksum))
+                # Etiketin ilk byte'ı (MD5 varsa ondan önce)
+                data[-33 if with_checksum else -16] ^= 0xFF
+                output = os.path.join(self.root, "msgstore.db")
+
+                with self.assertRaises(DecryptionError):
+                    decrypt_database(self.write(bytes(data)), output, key=ROOT_KEY)
+                self.assertFalse(os.path.exists(output))
+                self.assertFalse(os.path.exists(output + ".part"))
+
+    def test_wrong_key_is_rejected(self):
+        path = self.write(_encrypt(self.plain, 15, False))
+
+        with self.assertRaises(DecryptionError):
+            decrypt_database(path, os.path.join(self.root, "msgstore.db"), key="f" * 64)
+
+    def test_truncated_file_is_rejected(self):
+        data = _encrypt(self.plain, 14, True)
+
+        with self.assertRaises(DecryptionError):
+            decrypt_database(self.write(data[:len(data) // 2]),
+                             os.path.join(self.root, "msgstore.db"), key=ROOT_KEY)
+
+
+class ReadHeaderTest(unittest.TestCase):
+
+    def test_iv_is_read_for_both_versions(self):
+        for version in (14, 15):
+            with self.subTest(version=version):
+                path = os.path.join(tempfile.mkdtemp(), "db")
+                with open(path, "wb") as f:
+                    f.write(_header(version) + b"rest")
+                with open(path, "rb") as f:
+                    self.assertEqual(whatsapp_crypt.read_header(f), IV)
+                    self.assertEqual(f.read(), b"rest")
+                shutil.rmtree(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+İzleme (Tracing) Modülü
+ADBManager işlemlerinin iç içe süre aralıklarını (span) kaydeder ve
+Chrome trace event formatında (Perfetto / chrome://tracing) dışa aktarır
+"""
+import os
+import json
+import time
+import threading
+import functools
+import inspect
+from typing import Dict, List, Optional
+
+
+class _NoopSpan:
+    """İzleme kapalıyken kullanılan, hiçbir şey yapmayan span"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_tag(self, key: str, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """Tek bir zaman aralığı; çıkışta Tracer'a complete ("X") olayı olarak yazılır"""
+
+    __slots__ = ("tracer", "name", "category", "tags", "span_id", "parent_id", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, tags: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.tags = tags
+        self.span_id = None
+        self.parent_id = None
+        self.start = 0.0
+
+    def set_tag(self, key: str, value):
+        """Span'a sonradan etiket ekler (örn. aktarılan byte sayısı)"""
+        self.tags[key] = value
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent_id = stack[-1].span_id if stack else None
+        self.span_id = self.tracer._next_id()
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.tags["error"] = exc_type.__name__
+        self.tracer._finish(self, end)
+        return False
+
+
+class Tracer:
+    """
+    Hafif span toplayıcı
+
+    Kapalıyken span() paylaşılan no-op nesnesini döndürür; maliyeti tek bir
+    özellik kontrolüdür. enable()/disable() ile çalışma anında açılıp kapatılabilir.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 1_000_000):
+        """
+        Args:
+            enabled: Başlangıçta izleme açık mı
+            max_events: Bellekte tutulacak en fazla olay sayısı
+        """
+        self.enabled = enabled
+        self.max_events = max_events
+        self._events: List[Dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counter = 0
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self.dropped = 0
+
+    def enable(self):
+        """İzlemeyi açar"""
+        self.enabled = True
+
+    def disable(self):
+        """İzlemeyi kapatır (toplanan olaylar korunur)"""
+        self.enabled = False
+
+    def clear(self):
+        """Toplanan olayları siler"""
+        with self._lock:
+            self._events = []
+            self.dropped = 0
+
+    def span(self, name: str, category: str = "adb", **tags):
+        """
+        Yeni bir span başlatır (with bloğu ile kullanılır)
+
+        Args:
+            name: Span adı
+            category: Olay kategorisi (Perfetto'da filtrelemek için)
+            **tags: Ek etiketler (örn. serial="ABC123")
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, category, tags)
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _next_id(self) -> int:
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def _finish(self, span: _Span, end: float):
+        args = {key: _to_json_value(value) for key, value in span.tags.items()}
+        args["span_id"] = span.span_id
+        if span.parent_id is not None:
+            args["parent_id"] = span.parent_id
+
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round((span.start - self._origin) * 1_000_000, 3),
+            "dur": round((end - span.start) * 1_000_000, 3),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args
+        }
+        with self._lock:
+            if len(self._events) < self.max_events:
+                self._events.append(event)
+            else:
+                self.dropped += 1
+
+    def events(self) -> List[Dict]:
+        """Toplanan olayların kopyasını döndürür"""
+        with self._lock:
+            return list(self._events)
+
+    def export_chrome_trace(self, path: str) -> bool:
+        """
+        Olayları Chrome trace event JSON formatında yazar
+
+        Args:
+            path: Hedef dosya yolu (Perfetto'da açılabilir)
+
+        Returns:
+            Başarı durumu
+        """
+        events = self.events()
+        thread_names = {
+            threading.main_thread().ident: "main"
+        }
+        for thread in threading.enumerate():
+            thread_names.setdefault(thread.ident, thread.name)
+
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+             "args": {"name": name}}
+            for tid, name in thread_names.items()
+            if any(event["tid"] == tid for event in events)
+        ]
+
+        try:
+            parent_dir = os.path.dirname(path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "traceEvents": metadata + events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"dropped_events": self.dropped}
+                }, f, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"[HATA] Trace kaydetme hatası: {str(e)}")
+            return False
+
+
+def traced(name: Optional[str] = None, category: str = "adb"):
+    """
+    ADBManager metotlarını span ile saran dekoratör
+
+    Metodun `device_serial` parametresi varsa "serial" etiketi olarak eklenir.
+    Nesnenin `tracer` özelliği kapalıysa metot doğrudan çağrılır.
+
+    Args:
+        name: Span adı (None ise metot adı)
+        category: Olay kategorisi
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+        parameters = list(inspect.signature(func).parameters)
+        serial_index = parameters.index("device_serial") if "device_serial" in parameters else None
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return func(self, *args, **kwargs)
+
+            serial = kwargs.get("device_serial")
+            if serial is None and serial_index is not None and len(args) >= serial_index:
+                serial = args[serial_index - 1]
+
+            with tracer.span(span_name, category, serial=serial):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _to_json_value(value):
+    """Etiket değerini JSON'a yazılabilir hale getirir"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
@@ -0,0 +1,568 @@
+"""
+ADB Taşıma (Transport) Modülü
+adb süreçlerinin nasıl çalıştırılacağını soyutlar: doğrudan, kayıt ederek
+veya daha önce kaydedilmiş bir oturumdan tekrar oynatarak
+"""
+import os
+import io
+import json
+import time
+import base64
+import shutil
+import hashlib
+import threading
+import subprocess
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# Bu boyuttan büyük çıktılar oturum dosyasına değil blob klasörüne yazılır
+INLINE_LIMIT = 64 * 1024
+
+SESSION_FILE = "session.jsonl"
+BLOB_DIR = "blobs"
+
+
+class SubprocessTransport:
+    """adb'yi yerel süreç olarak çalıştıran varsayılan taşıma"""
+
+    def __init__(self, adb_path: str):
+        """
+        Args:
+            adb_path: adb çalıştırılabilir dosyasının yolu
+        """
+        self.adb_path = adb_path
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+        """
+        adb komutunu çalıştırır ve bitmesini bekler
+
+        Args:
+            args: adb argümanları (adb yolu hariç)
+            timeout: Zaman aşımı (saniye)
+
+        Returns:
+            (çıkış kodu, stdout, stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: Komut zaman aşımına uğrarsa
+        """
+        result = subprocess.run(
+            [self.adb_path] + list(args),
+            capture_output=True,
+            timeout=timeout
+        )
+        return result.returncode, result.stdout, result.stderr
+
+    def popen(self, args: List[str], stdin: bool = False) -> subprocess.Popen:
+        """
+        adb komutunu akış (stream) olarak başlatır
+
+        Args:
+            args: adb argümanları (adb yolu hariç)
+            stdin: stdin borusu açılsın mı
+
+        Returns:
+            stdout/stderr'i ikili (binary) borular olan süreç nesnesi
+        """
+        return subprocess.Popen(
+            [self.adb_path] + list(args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE if stdin else None
+        )
+
+    def close(self):
+        pass
+
+
+def _strip_serial(args: List[str]) -> List[str]:
+    if len(args) >= 2 and args[0] == "-s":
+        return args[2:]
+    return args
+
+
+def local_output_path(args: List[str]) -> Optional[str]:
+    """
+    Komutun bilgisayara yazdığı yolu döndürür (pull hedefi, backup -f dosyası)
+
+    Returns:
+        Yerel yol veya None
+    """
+    command = _strip_serial(args)
+    if not command:
+        return None
+    if command[0] == "pull" and len(command) >= 3:
+        return command[-1]
+    if command[0] == "backup" and "-f" in command:
+        index = command.index("-f")
+        if index + 1 < len(command):
+            return command[index + 1]
+    return None
+
+
+def session_key(args: List[str]) -> str:
+    """
+    Tekrar oynatmada eşleştirme anahtarı: yerel yollar yer tutucuyla değiştirilir
+    (kayıt ve oynatma farklı klasörlere yazabilsin diye)
+    """
+    normalized = list(args)
+    command = _strip_serial(normalized)
+    offset = len(normalized) - len(command)
+    local_path = local_output_path(args)
+    if local_path is not None:
+        index = len(normalized) - 1 - normalized[::-1].index(local_path)
+        normalized[index] = "<local>"
+    elif command[:1] == ["restore"] and len(command) >= 2:
+        normalized[offset + 1] = "<local>"
+    return json.dumps(normalized, ensure_ascii=False)
+
+
+def _resolve_pull_target(args: List[str], local_path: str) -> str:
+    """adb pull semantiği: hedef mevcut bir dizinse kaynak onun içine yazılır"""
+    command = _strip_serial(args)
+    if command[:1] == ["pull"] and os.path.isdir(local_path):
+        remote = command[-2].rstrip("/")
+        return os.path.join(local_path, remote.rsplit("/", 1)[-1])
+    return local_path
+
+
+class BlobStore:
+    """Oturum çıktılarını içerik adresli (sha256) olarak saklar"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        return digest
+
+    def put_file(self, source: str, move: bool = False) -> str:
+        """
+        Dosyayı blob olarak saklar
+
+        Args:
+            source: Kaynak dosya
+            move: True ise kaynak dosya kopyalanmak yerine taşınır
+        """
+        digest = hashlib.sha256()
+        os.makedirs(self.root, exist_ok=True)
+        if move:
+            with open(source, "rb") as src:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            temp_path = source
+        else:
+            temp_path = os.path.join(self.root, f"incoming.{threading.get_ident()}.tmp")
+            with open(source, "rb") as src, open(temp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        hexdigest = digest.hexdigest()
+        path = self.path(hexdigest)
+        if os.path.exists(path):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        return hexdigest
+
+    def get_bytes(self, digest: str) -> bytes:
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+
+
+class RecordingTransport:
+    """
+    Başka bir taşımayı sarar ve her komutu süresi, çıkış kodu, ikili çıktısı
+    ve bilgisayara yazdığı dosyalarla birlikte oturum klasörüne kaydeder
+    """
+
+    def __init__(self, inner, session_dir: str, metadata: Optional[Dict] = None):
+        """
+        Args:
+            inner: Asıl komutları çalıştıran taşıma (örn. SubprocessTransport)
+            session_dir: Oturumun kaydedileceği klasör
+            metadata: Başlığa yazılacak ek bilgiler (senaryo, cihaz vb.)
+        """
+        self.inner = inner
+        self.session_dir = session_dir
+        self.blobs = BlobStore(os.path.join(session_dir, BLOB_DIR))
+        os.makedirs(session_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._spools = 0
+        self._origin = time.perf_counter()
+        self._file = open(os.path.join(session_dir, SESSION_FILE), "w", encoding="utf-8")
+        self._write({
+            "type": "header",
+            "format": "adb-session",
+            "version": 1,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "metadata": metadata or {}
+        })
+
+    @property
+    def calls(self) -> int:
+        """Şimdiye kadar kaydedilen komut sayısı"""
+        return self._seq
+
+    def _write(self, entry: Dict):
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def _encode(self, data: bytes) -> Dict:
+        if len(data) <= INLINE_LIMIT:
+            return {"inline": base64.b64encode(data).decode("ascii")}
+        return {"blob": self.blobs.put_bytes(data), "size": len(data)}
+
+    def _encode_spool(self, spool_path: str) -> Dict:
+        """Akış çıktısının biriktirildiği geçici dosyayı kayda çevirir"""
+        size = os.path.getsize(spool_path)
+        if size <= INLINE_LIMIT:
+            with open(spool_path, "rb") as f:
+                data = f.read()
+            os.remove(spool_path)
+            return {"inline": base64.b64encode(data).decode("ascii")}
+        return {"blob": self.blobs.put_file(spool_path, move=True), "size": size}
+
+    def spool_path(self, name: str) -> str:
+        """Akış çıktısı için benzersiz geçici dosya yolu"""
+        with self._lock:
+            self._spools += 1
+            number = self._spools
+        return os.path.join(self.session_dir, BLOB_DIR, f"spool.{number}.{name}.tmp")
+
+    def _capture_outputs(self, args: List[str], target: Optional[str]) -> List[Dict]:
+        """Komutun yazdığı yerel dosyaları blob olarak saklar"""
+        if not target or not os.path.exists(target):
+            return []
+        if os.path.isfile(target):
+            return [{"path": "", "blob": self.blobs.put_file(target),
+                     "mtime": os.path.getmtime(target)}]
+
+        outputs = [{"path": "", "dir": True}]
+        for root, dirs, files in os.walk(target):
+            for name in dirs:
+                relative = os.path.relpath(os.path.join(root, name), target)
+                outputs.append({"path": relative.replace(os.sep, "/"), "dir": True})
+            for name in files:
+                full_path = os.path.join(root, name)
+                relative = os.path.relpath(full_path, target).replace(os.sep, "/")
+                outputs.append({"path": relative, "blob": self.blobs.put_file(full_path),
+                                "mtime": os.path.getmtime(full_path)})
+        return outputs
+
+    def _record(self, kind: str, args: List[str], start: float, end: float,
+                returncode: Optional[int], stdout, stderr,
+                timed_out: bool, target: Optional[str]):
+        """stdout/stderr bytes ya da biriktirme (spool) dosyası yolu olabilir"""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self._write({
+            "type": "call",
+            "seq": seq,
+            "kind": kind,
+            "args": list(args),
+            "key": session_key(args),
+            "start": round(start - self._origin, 6),
+            "duration": round(end - start, 6),
+            "returncode": returncode,
+            "timed_out": timed_out,
+            "stdout": self._encode(stdout) if isinstance(stdout, bytes) else self._encode_spool(stdout),
+            "stderr": self._encode(stderr) if isinstance(stderr, bytes) else self._encode_spool(stderr),
+            "outputs": self._capture_outputs(args, target)
+        })
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+        local_path = local_output_path(args)
+        target = _resolve_pull_target(args, local_path) if local_path else None
+        start = time.perf_counter()
+        try:
+            returncode, stdout, stderr = self.inner.run(args, timeout)
+        except subprocess.TimeoutExpired:
+            self._record("run", args, start, time.perf_counter(), None, b"", b"", True, None)
+            raise
+        self._record("run", args, start, time.perf_counter(), returncode, stdout, stderr,
+                     False, target)
+        return returncode, stdout, stderr
+
+    def popen(self, args: List[str], stdin: bool = False):
+        local_path = local_output_path(args)
+        target = _resolve_pull_target(args, local_path) if local_path else None
+        return _RecordingProcess(self, args, self.inner.popen(args, stdin), target)
+
+    def close(self):
+        """Oturum dosyasını kapatır"""
+        with self._lock:
+            if self._file.closed:
+                return
+            calls = self._seq
+        self._write({
+            "type": "end",
+            "calls": calls,
+            "wall_seconds": round(time.perf_counter() - self._origin, 6)
+        })
+        self._file.close()
+
+
+class _TeeReader:
+    """Okunan veriyi geçici dosyaya da yazan akış sarmalayıcısı (büyük akışlar bellekte tutulmaz)"""
+
+    def __init__(self, stream, spool_path: str):
+        self.stream = stream
+        self.spool_path = spool_path
+        os.makedirs(os.path.dirname(spool_path), exist_ok=True)
+        self._spool = open(spool_path, "wb")
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        if data:
+            self._spool.write(data)
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        data = self.stream.read1(size)
+        if data:
+            self._spool.write(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        count = self.stream.readinto(buffer)
+        if count:
+            with memoryview(buffer) as view:
+                self._spool.write(view[:count])
+        return count
+
+    def readinto1(self, buffer) -> int:
+        count = self.stream.readinto1(buffer)
+        if count:
+            with memoryview(buffer) as view:
+                self._spool.write(view[:count])
+        return count
+
+    def write_spool(self, data: bytes):
+        self._spool.write(data)
+
+    def finish(self) -> str:
+        self._spool.close()
+        return self.spool_path
+
+    def close(self):
+        self.stream.close()
+
+
+class _RecordingProcess:
+    """Kayıt sırasında gerçek süreci saran nesne; bittiğinde kaydı yazar"""
+
+    def __init__(self, recorder: RecordingTransport, args: List[str], process, target):
+        self._recorder = recorder
+        self._args = args
+        self._process = process
+        self._target = target
+        self._start = time.perf_counter()
+        self._recorded = False
+        self.stdout = _TeeReader(process.stdout, recorder.spool_path("stdout"))
+        self.stderr = _TeeReader(process.stderr, recorder.spool_path("stderr"))
+        self.stdin = process.stdin
+
+    @property
+    def returncode(self):
+        return self._process.returncode
+
+    def poll(self):
+        return self._process.poll()
+
+    def _finish(self, timed_out: bool = False):
+        if self._recorded:
+            return
+        self._recorded = True
+        self._recorder._record("popen", self._args, self._start, time.perf_counter(),
+                               self._process.returncode, self.stdout.finish(),
+                               self.stderr.finish(), timed_out,
+                               None if timed_out else self._target)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = self._process.wait(timeout)
+        self._finish()
+        return returncode
+
+    def communicate(self, input: Optional[bytes] = None, timeout: Optional[float] = None):
+        try:
+            stdout, stderr = self._process.communicate(input, timeout)
+        except subprocess.TimeoutExpired:
+            self._finish(timed_out=True)
+            raise
+        self.stdout.write_spool(stdout or b"")
+        self.stderr.write_spool(stderr or b"")
+        self._finish()
+        return stdout, stderr
+
+    def kill(self):
+        self._process.kill()
+
+
+class ReplayTransport:
+    """
+    Kaydedilmiş bir oturumu gerçek cihaz olmadan tekrar oynatır
+
+    Komutlar, yerel yollar hariç argümanlarına göre eşleştirilir; aynı komut
+    birden fazla kez kaydedildiyse kayıt sırasıyla döndürülür. Kayıtta
+    olmayan komutlar hata döndürür ve `unmatched` listesine eklenir.
+    """
+
+    # İlerlemeye bağlı süre sınırları uygulanmaz; kayıttaki sonuç (süre aşımı
+    # dahil) aynen döndürülür
+    live = False
+
+    def __init__(self, session_dir: str, realtime: bool = False):
+        """
+        Args:
+            session_dir: Kaydedilmiş oturum klasörü
+            realtime: True ise kaydedilen süreler kadar beklenir (orijinal hız),
+                      False ise olabildiğince hızlı oynatılır
+        """
+        self.session_dir = session_dir
+        self.realtime = realtime
+        self.blobs = BlobStore(os.path.join(session_dir, BLOB_DIR))
+        self.header: Dict = {}
+        self.summary: Dict = {}
+        self._queues: Dict[str, deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.unmatched: List[List[str]] = []
+
+        with open(os.path.join(session_dir, SESSION_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["type"] == "header":
+                    self.header = entry
+                elif entry["type"] == "end":
+                    self.summary = entry
+                elif entry["type"] == "call":
+                    self._queues[entry["key"]].append(entry)
+
+        self.recorded_calls = sum(len(queue) for queue in self._queues.values())
+
+    def remaining(self) -> int:
+        """Henüz oynatılmamış kayıt sayısı"""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _next(self, args: List[str]) -> Optional[Dict]:
+        key = session_key(args)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self.replayed += 1
+                return queue.popleft()
+            self.unmatched.append(list(args))
+            return None
+
+    def _decode(self, payload: Dict) -> bytes:
+        if "inline" in payload:
+            return base64.b64decode(payload["inline"])
+        return self.blobs.get_bytes(payload["blob"])
+
+    def _restore_outputs(self, args: List[str], entry: Dict):
+        """Kayıtta komutun yazdığı dosyaları yeni yerel yola geri yazar"""
+        local_path = local_output_path(args)
+        if not local_path or not entry.get("outputs"):
+            return
+        target = _resolve_pull_target(args, local_path)
+        for output in entry["outputs"]:
+            path = os.path.join(target, output["path"]) if output["path"] else target
+            if output.get("dir"):
+                os.makedirs(path, exist_ok=True)
+                continue
+            parent_dir = os.path.dirname(path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            shutil.copyfile(self.blobs.path(output["blob"]), path)
+            os.utime(path, (output["mtime"], output["mtime"]))
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+        entry = self._next(args)
+        if entry is None:
+            return 1, b"", f"replay: kayıtta bulunmayan komut: {args}".encode("utf-8")
+
+        if self.realtime:
+            time.sleep(entry["duration"] if timeout is None else min(entry["duration"], timeout))
+        if entry["timed_out"]:
+            raise subprocess.TimeoutExpired(args, timeout)
+
+        self._restore_outputs(args, entry)
+        return entry["returncode"], self._decode(entry["stdout"]), self._decode(entry["stderr"])
+
+    def popen(self, args: List[str], stdin: bool = False):
+        entry = self._next(args)
+        return _ReplayProcess(self, args, entry)
+
+    def close(self):
+        pass
+
+
+class _ReplayProcess:
+    """Kayıttan oluşturulan, subprocess.Popen benzeri süreç nesnesi"""
+
+    def __init__(self, transport: ReplayTransport, args: List[str], entry: Optional[Dict]):
+        self._transport = transport
+        self._args = args
+        self._entry = entry
+        self._start = time.perf_counter()
+        self._finished = False
+        self.stdin = io.BytesIO()
+        if entry is None:
+            self.stdout = io.BytesIO(b"")
+            self.stderr = io.BytesIO(f"replay: kayıtta bulunmayan komut: {args}".encode("utf-8"))
+            self._returncode = 1
+        else:
+            self.stdout = io.BytesIO(transport._decode(entry["stdout"]))
+            self.stderr = io.BytesIO(transport._decode(entry["stderr"]))
+            self._returncode = entry["returncode"]
+        self.returncode = None
+
+    def _finish(self, timeout: Optional[float] = None):
+        if self._finished:
+            return
+        if self._entry is not None:
+            if self._transport.realtime:
+                remaining = self._entry["duration"] - (time.perf_counter() - self._start)
+                if timeout is not None:
+                    remaining = min(remaining, timeout)
+                if remaining > 0:
+                    time.sleep(remaining)
+            if self._entry["timed_out"]:
+                raise subprocess.TimeoutExpired(self._args, timeout)
+            self._transport._restore_outputs(self._args, self._entry)
+        self._finished = True
+        self.returncode = self._returncode
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        self._finish(timeout)
+        return self.returncode
+
+    def communicate(self, input: Optional[bytes] = None, timeout: Optional[float] = None):
+        self._finish(timeout)
+        return self.stdout.read(), self.stderr.read()
+
+    def kill(self):
+        self._finished = True
+        self.returncode = -9
@@ -0,0 +1,312 @@
+"""
+WhatsApp Veritabanı Şifre Çözme
+msgstore.db.crypt14 / .crypt15 dosyalarını anahtar dosyası (root ile alınan
+files/key veya encrypted_backup.key) ya da 64 haneli uçtan uca yedek anahtarı
+ile çözer. AES-GCM şifre çözme ve zlib açma tek geçişte, parça parça yapılır;
+veritabanı hiçbir zaman tamamen belleğe alınmaz.
+
+Kullanım:
+    python whatsapp_crypt.py msgstore.db.crypt14 --key key
+    python whatsapp_crypt.py msgstore.db.crypt15 --key 0123...cdef -o msgstore.db
+
+Not: `cryptography` paketi gerekir (pip install cryptography)
+"""
+import os
+import sys
+import hmac
+import zlib
+import hashlib
+import argparse
+from typing import Dict, Optional, Tuple
+
+import config
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # cryptography isteğe bağlı; yoksa sadece şifre çözme kullanılamaz
+    Cipher = None
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+CRYPT14_KEY_FILE_SIZE = 158
+KEY_SIZE = 32
+TAG_SIZE = 16
+CHECKSUM_SIZE = 16
+
+
+class DecryptionError(Exception):
+    """Anahtar veya dosya geçersiz, ya da doğrulama başarısız"""
+
+
+def _derive_backup_key(root_key: bytes) -> bytes:
+    """Uçtan uca yedek kök anahtarından crypt15 şifreleme anahtarını türetir (HKDF)"""
+    private_key = hmac.new(b"\x00" * 32, root_key, hashlib.sha256).digest()
+    return hmac.new(private_key, b"backup encryption\x01", hashlib.sha256).digest()
+
+
+def load_key(key: str) -> Tuple[bytes, str]:
+    """
+    Anahtarı yükler
+
+    Args:
+        key: 64 haneli hex uçtan uca yedek anahtarı veya anahtar dosyası yolu
+             (files/key -> crypt14, encrypted_backup.key -> crypt15)
+
+    Returns:
+        (32 byte AES anahtarı, anahtar türü)
+
+    Raises:
+        DecryptionError: Anahtar okunamazsa
+    """
+    text = key.strip().replace(" ", "").replace("-", "")
+    if len(text) == 64 and all(c in "0123456789abcdefABCDEF" for c in text):
+        return _derive_backup_key(bytes.fromhex(text)), "e2e"
+
+    if not os.path.isfile(key):
+        raise DecryptionError(f"Anahtar dosyası bulunamadı veya 64 haneli anahtar değil: {key}")
+    with open(key, "rb") as f:
+        data = f.read()
+
+    hex_text = data.strip()
+    if len(hex_text) == 64 and all(c in b"0123456789abcdefABCDEF" for c in hex_text):
+        return _derive_backup_key(bytes.fromhex(hex_text.decode("ascii"))), "e2e"
+    if len(data) < KEY_SIZE:
+        raise DecryptionError(f"Anahtar dosyası çok kısa: {len(data)} byte")
+    # Her iki dosya da Java ile serileştirilmiş bir byte dizisidir; anahtar son 32 byte'tır
+    if len(data) == CRYPT14_KEY_FILE_SIZE:
+        return data[-KEY_SIZE:], "key"
+    return _derive_backup_key(data[-KEY_SIZE:]), "encrypted_backup.key"
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if position >= len(data):
+            raise DecryptionError("Dosya başlığı bozuk")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def _protobuf_fields(data: bytes) -> Dict[int, list]:
+    """Protobuf mesajındaki alanları (alan no -> değer listesi) çıkarır"""
+    fields = {}
+    position = 0
+    while position < len(data):
+        tag, position = _read_varint(data, position)
+        number, wire_type = tag >> 3, tag & 0x07
+        if wire_type == 0:
+            value, position = _read_varint(data, position)
+        elif wire_type == 2:
+            length, position = _read_varint(data, position)
+            value = data[position:position + length]
+            position += length
+        elif wire_type == 5:
+            value, position = data[position:position + 4], position + 4
+        elif wire_type == 1:
+            value, position = data[position:position + 8], position + 8
+        else:
+            raise DecryptionError(f"Dosya başlığı bozuk (protobuf tipi {wire_type})")
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def read_header(f) -> bytes:
+    """
+    crypt14/crypt15 başlığını okur ve IV'yi döndürür; dosya konumu şifreli
+    verinin başına gelir
+
+    Başlık: 1 byte protobuf boyutu, isteğe bağlı 0x01 özellik bayrağı,
+    ardından BackupPrefix protobuf'u (crypt14: alan 2 / crypt15: alan 3 IV içerir)
+    """
+    prefix = f.read(2)
+    if len(prefix) < 2:
+        raise DecryptionError("Dosya çok kısa")
+    size = prefix[0]
+    if prefix[1] != 0x01:
+        f.seek(-1, os.SEEK_CUR)
+    fields = _protobuf_fields(f.read(size))
+
+    if 3 in fields:
+        cipher_fields = _protobuf_fields(fields[3][0])
+    elif 2 in fields:
+        cipher_fields = _protobuf_fields(fields[2][0])
+    else:
+        raise DecryptionError("Desteklenmeyen dosya (crypt14/crypt15 başlığı bulunamadı)")
+    # IV 16 byte'lık son alandır (crypt14'te google_id de 16 byte olduğu için)
+    candidates = [values[-1] for number, values in sorted(cipher_fields.items())
+                  if isinstance(values[-1], bytes) and len(values[-1]) == 16]
+    if not candidates:
+        raise DecryptionError("Dosya başlığında IV bulunamadı")
+    return candidates[-1]
+
+
+def _inflate(inflater, data: bytes, dst, chunk_size: int) -> int:
+    """zlib verisini açıp yazar; çıktı da parça boyutuyla sınırlı tutulur"""
+    written = 0
+    while data:
+        output = inflater.decompress(data, chunk_size)
+        dst.write(output)
+        written += len(output)
+        data = inflater.unconsumed_tail
+    return written
+
+
+def decrypt_database(encrypted_path: str, output_path: Optional[str] = None,
+                     key: Optional[str] = None, key_bytes: Optional[bytes] = None,
+                     chunk_size: Optional[int] = None) -> Dict:
+    """
+    crypt14/crypt15 veritabanını çözer ve .db olarak yazar
+
+    Dosya parça parça okunur: AES-GCM çözülen her parça hemen zlib ile açılıp
+    diske yazılır. Dosya sonundaki GCM etiketi (ve varsa MD5 sağlaması) için
+    sadece son 32 byte bekletilir. Doğrulama başarısız olursa yarım dosya silinir.
+
+    Args:
+        encrypted_path: Şifreli veritabanı
+        output_path: Çıktı (None ise uzantısız ad: msgstore.db)
+        key: Anahtar dosyası yolu veya 64 haneli anahtar
+        key_bytes: Önceden yüklenmiş 32 byte anahtar (key yerine)
+        chunk_size: Okuma parça boyutu (None ise config.DECRYPT["chunk_size"])
+
+    Returns:
+        {"success", "output", "bytes", "checksum"}
+
+    Raises:
+        DecryptionError: Anahtar yanlışsa, dosya bozuksa veya cryptography yoksa
+    """
+    if Cipher is None:
+        raise DecryptionError("Şifre çözme için cryptography paketi gerekli (pip install cryptography)")
+    if key_bytes is None:
+        if key is None:
+            raise DecryptionError("Anahtar verilmedi")
+        key_bytes, _ = load_key(key)
+    chunk_size = chunk_size or config.DECRYPT["chunk_size"]
+    if output_path is None:
+        output_path = os.path.splitext(encrypted_path)[0]
+    part_path = output_path + ".part"
+
+    checksum = hashlib.md5()
+    inflater = zlib.decompressobj()
+    written = 0
+    try:
+        with open(encrypted_path, "rb") as src, open(part_path, "wb") as dst:
+            iv = read_header(src)
+            header_end = src.tell()
+            src.seek(0)
+            checksum.update(src.read(header_end))
+
+            decryptor = Cipher(algorithms.AES(key_bytes), modes.GCM(iv)).decryptor()
+            held = b""   # Son TAG_SIZE + CHECKSUM_SIZE byte sona kadar bekletilir
+            first = True
+            trailer = TAG_SIZE + CHECKSUM_SIZE
+            while True:
+                block = src.read(chunk_size)
+                if not block:
+                    break
+                data = held + block
+                ready, held = data[:-trailer], data[-trailer:]
+                if not ready:
+                    continue
+                checksum.update(ready)
+                plain = decryptor.update(ready)
+                if first and plain:
+                    if plain[:1] != b"\x78":
+                        raise DecryptionError("Anahtar yanlış veya dosya bozuk (zlib başlığı yok)")
+                    first = False
+                written += _inflate(inflater, plain, dst, chunk_size)
+
+            if len(held) < TAG_SIZE:
+                raise DecryptionError("Dosya çok kısa")
+            # Sonda MD5 sağlaması var mı (tek parça yedeklerde var, çok parçalılarda yok)
+            with_checksum = checksum.copy()
+            with_checksum.update(held[:TAG_SIZE])
+            has_checksum = len(held) == trailer and with_checksum.digest() == held[TAG_SIZE:]
+            if has_checksum:
+                tag = held[:TAG_SIZE]
+            else:
+                tail = held[:-TAG_SIZE]
+                plain = decryptor.update(tail)
+                if first and plain and plain[:1] != b"\x78":
+                    raise DecryptionError("Anahtar yanlış veya dosya bozuk (zlib başlığı yok)")
+                written += _inflate(inflater, plain, dst, chunk_size)
+                tag = held[-TAG_SIZE:]
+            try:
+                decryptor.finalize_with_tag(tag)
+            except InvalidTag:
+                raise DecryptionError("Doğrulama başarısız: anahtar yanlış veya dosya bozuk")
+            output = inflater.flush()
+            dst.write(output)
+            written += len(output)
+            if not inflater.eof:
+                raise DecryptionError("Sıkıştırılmış veri eksik (dosya yarım kalmış olabilir)")
+
+        with open(part_path, "rb") as f:
+            if f.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+                raise DecryptionError("Çözülen dosya SQLite veritabanı değil")
+        os.replace(part_path, output_path)
+    except zlib.error as e:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise DecryptionError(f"Anahtar yanlış veya dosya bozuk: {str(e)}")
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return {
+        "success": True,
+        "output": output_path,
+        "bytes": written,
+        "checksum": has_checksum
+    }
+
+
+def decrypt_directory(databases_dir: str, key: str) -> Dict:
+    """
+    Klasördeki tüm .crypt14/.crypt15 dosyalarını çözer (anahtar bir kez yüklenir)
+
+    Returns:
+        {"decrypted": [çıktı yolları], "errors": [mesajlar]}
+    """
+    key_bytes, _ = load_key(key)
+    decrypted, errors = [], []
+    for name in sorted(os.listdir(databases_dir)):
+        if not name.endswith((".crypt14", ".crypt15")):
+            continue
+        try:
+            result = decrypt_database(os.path.join(databases_dir, name), key_bytes=key_bytes)
+            decrypted.append(result["output"])
+        except DecryptionError as e:
+            errors.append(f"{name}: {str(e)}")
+    return {"decrypted": decrypted, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WhatsApp crypt14/crypt15 veritabanı şifre çözme")
+    parser.add_argument("input", help="Şifreli veritabanı (msgstore.db.crypt15) veya klasör")
+    parser.add_argument("--key", required=True,
+                        help="Anahtar dosyası (key / encrypted_backup.key) veya 64 haneli anahtar")
+    parser.add_argument("-o", "--output", default=None, help="Çıktı dosyası (tek dosya için)")
+    args = parser.parse_args()
+
+    try:
+        if os.path.isdir(args.input):
+            result = decrypt_directory(args.input, args.key)
+            for path in result["decrypted"]:
+                print(f"[OK] {path}")
+            for error in result["errors"]:
+                print(f"[HATA] {error}")
+            sys.exit(1 if result["errors"] else 0)
+        result = decrypt_database(args.input, args.output, key=args.key)
+        print(f"[OK] Veritabanı çözüldü: {result['output']} ({result['bytes']} bytes)")
+    except DecryptionError as e:
+        print(f"[HATA] {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
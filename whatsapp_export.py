@@ -0,0 +1,338 @@
+"""
+WhatsApp Mesaj Dışa Aktarma
+Çözülmüş msgstore.db veritabanındaki mesajları sohbet ve medya bilgileriyle
+birlikte NDJSON veya Parquet dosyasına yazar. Mesajlar _id üzerinden anahtar
+tabanlı sayfalama (WHERE _id > son ORDER BY _id LIMIT n) ile sayfa sayfa okunur;
+bellekte hiçbir zaman bir sayfadan fazlası tutulmaz. Medya içeren her mesaj
+whatsapp_backup/media altındaki yerel dosyasıyla eşleştirilir.
+
+Kullanım:
+    python whatsapp_export.py output/whatsapp_backup/databases/msgstore.db
+    python whatsapp_export.py msgstore.db --media output/whatsapp_backup/media --format parquet
+
+Not: Parquet için `pyarrow` paketi gerekir (pip install pyarrow)
+"""
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import pathlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+import config
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow isteğe bağlı; yoksa sadece NDJSON yazılır
+    pyarrow = None
+
+COLUMNS = ["id", "chat", "chat_subject", "from_me", "sender", "key_id", "timestamp", "date",
+           "type", "status", "text", "media_device_path", "media_mime", "media_size", "media_file"]
+
+FORMATS = {"ndjson": ".ndjson", "parquet": ".parquet"}
+
+# Telefondaki medya klasörü -> yedekteki klasör (ADBManager.backup_whatsapp_media ile aynı)
+MEDIA_FOLDERS = {
+    "WhatsApp Images": "Images",
+    "WhatsApp Video": "Videos",
+    "WhatsApp Audio": "Audio",
+    "WhatsApp Documents": "Documents"
+}
+
+
+class ExportError(Exception):
+    """Veritabanı okunamıyor, şema tanınmıyor veya çıktı yazılamıyor"""
+
+
+def _columns(connection: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+
+
+def _pick(available: set, alias: str, column: str) -> str:
+    """Sürümler arasında olmayabilen sütunlar için NULL seçer"""
+    return f"{alias}.{column}" if column in available else "NULL"
+
+
+def _build_query(connection: sqlite3.Connection) -> str:
+    """
+    Şemaya uygun mesaj sorgusunu döndürür
+
+    Yeni şema (2021+): message + chat + jid + message_media tabloları
+    Eski şema: messages + chat_list tabloları
+    Sorgu iki parametre alır: son _id ve sayfa boyutu
+    """
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    if {"message", "chat", "jid"} <= tables:
+        message = _columns(connection, "message")
+        media = _columns(connection, "message_media") if "message_media" in tables else set()
+        media_join = "LEFT JOIN message_media mm ON mm.message_row_id = m._id" if media else ""
+        return f"""
+            SELECT m._id, cj.raw_string, c.subject, m.from_me, sj.raw_string, m.key_id,
+                   m.timestamp, m.message_type, {_pick(message, "m", "status")}, m.text_data,
+                   {_pick(media, "mm", "file_path")}, {_pick(media, "mm", "mime_type")},
+                   {_pick(media, "mm", "file_size")}, {_pick(media, "mm", "media_name")}
+            FROM message m
+            LEFT JOIN chat c ON c._id = m.chat_row_id
+            LEFT JOIN jid cj ON cj._id = c.jid_row_id
+            LEFT JOIN jid sj ON sj._id = {_pick(message, "m", "sender_jid_row_id")}
+            {media_join}
+            WHERE m._id > ?
+            ORDER BY m._id
+            LIMIT ?"""
+
+    if "messages" in tables:
+        message = _columns(connection, "messages")
+        chat_join = ("LEFT JOIN chat_list cl ON cl.key_remote_jid = m.key_remote_jid"
+                     if "chat_list" in tables else "")
+        subject = "cl.subject" if chat_join else "NULL"
+        return f"""
+            SELECT m._id, m.key_remote_jid, {subject}, m.key_from_me,
+                   {_pick(message, "m", "remote_resource")}, m.key_id, m.timestamp,
+                   {_pick(message, "m", "media_wa_type")}, {_pick(message, "m", "status")},
+                   COALESCE(m.data, {_pick(message, "m", "media_caption")}),
+                   NULL, {_pick(message, "m", "media_mime_type")},
+                   {_pick(message, "m", "media_size")}, {_pick(message, "m", "media_name")}
+            FROM messages m
+            {chat_join}
+            WHERE m._id > ?
+            ORDER BY m._id
+            LIMIT ?"""
+
+    raise ExportError("Tanınmayan veritabanı şeması (message veya messages tablosu yok)")
+
+
+class MediaIndex:
+    """
+    Yedekteki medya dosyalarının dizini
+
+    Klasör bir kez taranır; eşleştirme önce telefondaki yolun yedekteki
+    karşılığıyla, bulunamazsa sadece dosya adıyla yapılır.
+    """
+
+    def __init__(self, media_dir: Optional[str]):
+        self.media_dir = media_dir
+        self.paths = set()
+        self.names = {}
+        if media_dir and os.path.isdir(media_dir):
+            self._scan(media_dir, "")
+
+    def _scan(self, directory: str, prefix: str):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    self._scan(entry.path, relative + "/")
+                elif entry.is_file(follow_symlinks=False):
+                    self.paths.add(relative)
+                    self.names.setdefault(entry.name, relative)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def find(self, device_path: Optional[str], name: Optional[str]) -> Optional[str]:
+        """
+        Args:
+            device_path: Telefondaki yol ("Media/WhatsApp Images/Sent/IMG-....jpg")
+            name: Dosya adı (eski şemada tek bilgi budur)
+
+        Returns:
+            Medya klasörüne göre yol ("Images/Sent/IMG-....jpg") veya None
+        """
+        if not self.paths:
+            return None
+        if device_path:
+            parts = device_path.replace("\\", "/").split("/")
+            for position, part in enumerate(parts):
+                if part in MEDIA_FOLDERS:
+                    candidate = "/".join([MEDIA_FOLDERS[part]] + parts[position + 1:])
+                    if candidate in self.paths:
+                        return candidate
+                    break
+            name = parts[-1] or name
+        if name:
+            return self.names.get(os.path.basename(name))
+        return None
+
+
+def iter_messages(database_path: str, media: Optional[MediaIndex] = None,
+                  batch_size: Optional[int] = None):
+    """
+    Mesajları sayfa sayfa üretir
+
+    Args:
+        database_path: Çözülmüş msgstore.db
+        media: Yerel medya dizini (None ise media_file boş kalır)
+        batch_size: Sayfa boyutu (None ise config.EXPORT["batch_size"])
+
+    Yields:
+        COLUMNS sırasında demet (tuple) listeleri; her liste bir sayfadır
+
+    Raises:
+        ExportError: Veritabanı açılamazsa veya şema tanınmazsa
+    """
+    batch_size = batch_size or config.EXPORT["batch_size"]
+    if not os.path.isfile(database_path):
+        raise ExportError(f"Veritabanı bulunamadı: {database_path}")
+    try:
+        connection = sqlite3.connect(pathlib.Path(os.path.abspath(database_path)).as_uri() + "?mode=ro",
+                                     uri=True)
+    except sqlite3.Error as e:
+        raise ExportError(f"Veritabanı açılamadı: {str(e)}")
+
+    try:
+        try:
+            query = _build_query(connection)
+        except sqlite3.DatabaseError as e:
+            raise ExportError(f"Veritabanı okunamadı: {str(e)}")
+        last_id = -1
+        while True:
+            rows = connection.execute(query, (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            page = []
+            for (message_id, chat, subject, from_me, sender, key_id, timestamp, message_type,
+                 status, text, device_path, mime, size, media_name) in rows:
+                media_file = None
+                if media is not None and (device_path or media_name):
+                    media_file = media.find(device_path, media_name)
+                date = None
+                if timestamp:
+                    date = datetime.fromtimestamp(timestamp / 1000, timezone.utc) \
+                        .isoformat(timespec="seconds")
+                page.append((message_id, chat, subject, bool(from_me), sender, key_id, timestamp,
+                             date, message_type, status, text, device_path or media_name, mime,
+                             size, media_file))
+            yield page
+            if len(rows) < batch_size:
+                return
+    finally:
+        connection.close()
+
+
+def _parquet_schema():
+    return pyarrow.schema([
+        ("id", pyarrow.int64()), ("chat", pyarrow.string()), ("chat_subject", pyarrow.string()),
+        ("from_me", pyarrow.bool_()), ("sender", pyarrow.string()), ("key_id", pyarrow.string()),
+        ("timestamp", pyarrow.int64()), ("date", pyarrow.string()), ("type", pyarrow.int64()),
+        ("status", pyarrow.int64()), ("text", pyarrow.string()),
+        ("media_device_path", pyarrow.string()), ("media_mime", pyarrow.string()),
+        ("media_size", pyarrow.int64()), ("media_file", pyarrow.string())
+    ])
+
+
+def export_messages(database_path: str, output_path: Optional[str] = None,
+                    media_dir: Optional[str] = None, output_format: Optional[str] = None,
+                    batch_size: Optional[int] = None,
+                    progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    Mesajları NDJSON veya Parquet dosyasına aktarır
+
+    Her sayfa okunduğu gibi yazılır (Parquet'te bir satır grubu olur); çıktı
+    önce .part dosyasına yazılır, tamamlanınca adı değiştirilir.
+
+    Args:
+        database_path: Çözülmüş msgstore.db
+        output_path: Çıktı (None ise veritabanının yanında msgstore.messages.ndjson)
+        media_dir: Yedekteki medya klasörü (None ise databases klasörünün
+                   yanındaki media klasörü varsa o kullanılır)
+        output_format: "ndjson" veya "parquet" (None ise config.EXPORT["format"])
+        batch_size: Sayfa boyutu (None ise config.EXPORT["batch_size"])
+        progress: Her sayfadan sonra o ana kadarki mesaj sayısıyla çağrılır
+
+    Returns:
+        {"success", "output", "format", "messages", "media_messages", "media_linked"}
+
+    Raises:
+        ExportError: Veritabanı okunamazsa, format geçersizse veya pyarrow yoksa
+    """
+    output_format = (output_format or config.EXPORT["format"]).lower()
+    if output_format not in FORMATS:
+        raise ExportError(f"Geçersiz format: {output_format} (geçerli: {', '.join(FORMATS)})")
+    if output_format == "parquet" and pyarrow is None:
+        raise ExportError("Parquet için pyarrow paketi gerekli (pip install pyarrow)")
+    if output_path is None:
+        output_path = os.path.splitext(database_path)[0] + ".messages" + FORMATS[output_format]
+    if media_dir is None:
+        candidate = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(database_path))), "media")
+        media_dir = candidate if os.path.isdir(candidate) else None
+
+    media = MediaIndex(media_dir)
+    part_path = output_path + ".part"
+    parent_dir = os.path.dirname(output_path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+
+    messages = media_messages = media_linked = 0
+    media_file_index = COLUMNS.index("media_file")
+    media_path_index = COLUMNS.index("media_device_path")
+    try:
+        if output_format == "parquet":
+            schema = _parquet_schema()
+            with pyarrow.parquet.ParquetWriter(part_path, schema) as writer:
+                for page in iter_messages(database_path, media, batch_size):
+                    columns = list(zip(*page))
+                    writer.write_table(pyarrow.Table.from_arrays(
+                        [pyarrow.array(values, type=field.type)
+                         for values, field in zip(columns, schema)], schema=schema))
+                    messages += len(page)
+                    media_messages += sum(1 for value in columns[media_path_index] if value)
+                    media_linked += sum(1 for value in columns[media_file_index] if value)
+                    if progress:
+                        progress(messages)
+        else:
+            with open(part_path, "w", encoding="utf-8", newline="\n") as f:
+                encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+                for page in iter_messages(database_path, media, batch_size):
+                    f.write("".join(encode(dict(zip(COLUMNS, row))) + "\n" for row in page))
+                    messages += len(page)
+                    media_messages += sum(1 for row in page if row[media_path_index])
+                    media_linked += sum(1 for row in page if row[media_file_index])
+                    if progress:
+                        progress(messages)
+        os.replace(part_path, output_path)
+    except sqlite3.DatabaseError as e:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise ExportError(f"Veritabanı okunamadı: {str(e)}")
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return {
+        "success": True,
+        "output": output_path,
+        "format": output_format,
+        "messages": messages,
+        "media_messages": media_messages,
+        "media_linked": media_linked
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WhatsApp mesajlarını NDJSON/Parquet olarak dışa aktarma")
+    parser.add_argument("database", help="Çözülmüş veritabanı (msgstore.db)")
+    parser.add_argument("-o", "--output", default=None, help="Çıktı dosyası")
+    parser.add_argument("--media", default=None, help="Yedekteki medya klasörü (whatsapp_backup/media)")
+    parser.add_argument("--format", default=None, choices=sorted(FORMATS),
+                        help=f"Çıktı formatı (varsayılan: {config.EXPORT['format']})")
+    parser.add_argument("--batch-size", type=int, default=None, help="Sayfa başına mesaj sayısı")
+    args = parser.parse_args()
+
+    try:
+        result = export_messages(args.database, args.output, media_dir=args.media,
+                                 output_format=args.format, batch_size=args.batch_size)
+    except ExportError as e:
+        print(f"[HATA] {str(e)}")
+        sys.exit(1)
+    print(f"[OK] {result['messages']} mesaj aktarıldı: {result['output']}")
+    print(f"     Medya: {result['media_linked']}/{result['media_messages']} mesaj yerel dosyayla eşleşti")
+
+
+if __name__ == "__main__":
+    main()
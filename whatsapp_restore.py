@@ -0,0 +1,218 @@
+"""
+WhatsApp Yedeğini Telefona Geri Yükleme
+Bilgisayardaki whatsapp_backup klasörünü (ayrı dosyalar ve/veya media.pack
+paket deposu) veya nesne deposundaki bir manifesti yeni telefona aktarır.
+Aktarım ADBManager.restore_whatsapp ile paralel tar akışlarıyla yapılır
+(değişiklik zamanları korunur, telefonda aynısı olan dosyalar atlanır),
+sonunda medya taraması tek komutla başlatılır.
+
+Kullanım:
+    python whatsapp_restore.py output --serial YENI_TELEFON
+    python whatsapp_restore.py output/whatsapp_backup --serial YENI_TELEFON --streams 8
+    python whatsapp_restore.py FAKE0001/20240501_020000 --serial YENI_TELEFON   # nesne deposu manifesti
+"""
+import os
+import sys
+import argparse
+from contextlib import nullcontext
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+import config
+from object_store import ObjectStore, ObjectStoreError
+from pack_store import INDEX_FILE, PackStore
+
+# Yedekteki klasör -> telefondaki Media altındaki klasör (backup_whatsapp_media ile aynı eşleme)
+MEDIA_FOLDERS = {
+    "Images": "WhatsApp Images",
+    "Videos": "WhatsApp Video",
+    "Audio": "WhatsApp Audio",
+    "Documents": "WhatsApp Documents"
+}
+
+DATABASE_SUFFIXES = (".db", ".db.crypt12", ".db.crypt14", ".db.crypt15")
+
+
+class RestoreSourceError(Exception):
+    """Geri yüklenecek yedek bulunamadı veya okunamadı"""
+
+
+class _RangeReader:
+    """Paket dosyasının bir bölümünü okuyan akış (kayıt sonunda EOF verir)"""
+
+    def __init__(self, path: str, offset: int, length: int):
+        self._file = open(path, "rb")
+        self._file.seek(offset)
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def remote_relative(store_path: str) -> Optional[str]:
+    """
+    Yedekteki yolu telefondaki WhatsApp klasörüne göre yola çevirir
+
+    "Images/Sent/IMG-1.jpg" -> "Media/WhatsApp Images/Sent/IMG-1.jpg",
+    "Databases/msgstore.db.crypt14" -> "Databases/msgstore.db.crypt14";
+    tanınmayan yollar için None
+    """
+    top, _, rest = store_path.replace("\\", "/").lstrip("/").partition("/")
+    if not rest or ".." in rest.split("/"):
+        return None
+    if top in MEDIA_FOLDERS:
+        return f"Media/{MEDIA_FOLDERS[top]}/{rest}"
+    if top == "Databases" and "/" not in rest and rest.endswith(DATABASE_SUFFIXES):
+        return f"Databases/{rest}"
+    return None
+
+
+def _item(store_path: str, size: int, mtime: Optional[float],
+          opener: Callable[[], BinaryIO]) -> Optional[Dict]:
+    path = remote_relative(store_path)
+    if path is None:
+        return None
+    return {"path": path, "size": size, "mtime": int(mtime or 0), "open": opener}
+
+
+def _directory_items(backup_dir: str) -> List[Dict]:
+    items: Dict[str, Dict] = {}
+
+    # Paket deposu önce okunur; aynı yol ayrı dosya olarak da varsa dosya geçerlidir
+    pack_dir = os.path.join(backup_dir, config.PACK_STORE["dir_name"])
+    if os.path.isfile(os.path.join(pack_dir, INDEX_FILE)):
+        with PackStore(pack_dir) as pack:
+            for entry in pack.list():
+                pack_path = os.path.join(pack.root, entry["pack"])
+                item = _item(entry["path"], entry["length"], entry["mtime"],
+                             lambda p=pack_path, e=entry: _RangeReader(p, e["offset"], e["length"]))
+                if item:
+                    items[item["path"]] = item
+
+    media_dir = os.path.join(backup_dir, "media")
+    for local_folder in MEDIA_FOLDERS:
+        root = os.path.join(media_dir, local_folder)
+        for directory, _, files in os.walk(root):
+            for name in files:
+                local_path = os.path.join(directory, name)
+                relative = os.path.relpath(local_path, media_dir).replace(os.sep, "/")
+                stat = os.stat(local_path)
+                item = _item(relative, stat.st_size, stat.st_mtime,
+                             lambda p=local_path: open(p, "rb"))
+                if item:
+                    items[item["path"]] = item
+
+    databases_dir = os.path.join(backup_dir, "databases")
+    if os.path.isdir(databases_dir):
+        for name in sorted(os.listdir(databases_dir)):
+            local_path = os.path.join(databases_dir, name)
+            # root_ ile başlayanlar /data/data'dan alındı; root olmadan geri yazılamaz
+            if name.startswith("root_") or not os.path.isfile(local_path):
+                continue
+            stat = os.stat(local_path)
+            item = _item(f"Databases/{name}", stat.st_size, stat.st_mtime,
+                         lambda p=local_path: open(p, "rb"))
+            if item:
+                items[item["path"]] = item
+    return [items[path] for path in sorted(items)]
+
+
+def _manifest_items(manifest_id: str, store_root: Optional[str]) -> List[Dict]:
+    store = ObjectStore(store_root)
+    try:
+        manifest = store.load_manifest(manifest_id)
+    except ObjectStoreError as e:
+        raise RestoreSourceError(str(e))
+    items = []
+    for entry in manifest["entries"]:
+        if not store.has(entry["hash"]):
+            raise RestoreSourceError(f"Nesne eksik: {entry['hash']} ({entry['path']})")
+        item = _item(entry["path"], entry["size"], entry.get("mtime"),
+                     lambda p=store.path(entry["hash"]): open(p, "rb"))
+        if item:
+            items.append(item)
+    return sorted(items, key=lambda item: item["path"])
+
+
+def is_manifest_id(source: str) -> bool:
+    """Kaynak bir klasör değil, nesne deposu manifest kimliği mi ("<seri>/<zaman>")"""
+    return source.count("/") == 1 and not source.startswith((".", "/")) and not os.path.exists(source)
+
+
+def source_session(source: str, store_root: Optional[str] = None):
+    """
+    Geri yükleme boyunca tutulacak bağlam: manifest kaynağında nesne deposu
+    oturumu (nesneler aktarım sırasında açılır; gc bu sürede silmesin)
+    """
+    if is_manifest_id(source):
+        return ObjectStore(store_root).session()
+    return nullcontext()
+
+
+def load_items(source: str, store_root: Optional[str] = None) -> List[Dict]:
+    """
+    Geri yüklenecek dosyaları toplar
+
+    Args:
+        source: whatsapp_backup klasörü, onu içeren çıktı klasörü veya nesne
+                deposu manifest kimliği ("<seri>/<zaman>")
+        store_root: Nesne deposu (None ise config.OBJECT_STORE["root"])
+
+    Returns:
+        [{"path": WhatsApp klasörüne göre yol, "size", "mtime", "open": akış açan fonksiyon}]
+
+    Raises:
+        RestoreSourceError: Kaynak bulunamazsa veya geri yüklenecek dosya yoksa
+    """
+    if os.path.isdir(source):
+        nested = os.path.join(source, "whatsapp_backup")
+        items = _directory_items(nested if os.path.isdir(nested) else source)
+    elif is_manifest_id(source):
+        items = _manifest_items(source, store_root)
+    else:
+        raise RestoreSourceError(f"Yedek bulunamadı: {source}")
+    if not items:
+        raise RestoreSourceError(f"Geri yüklenecek dosya yok: {source}")
+    return items
+
+
+def main():
+    settings = config.RESTORE
+    parser = argparse.ArgumentParser(description="WhatsApp yedeğini telefona geri yükle")
+    parser.add_argument("source", help="whatsapp_backup klasörü veya manifest kimliği (<seri>/<zaman>)")
+    parser.add_argument("--serial", "-s", default=None, help="Hedef cihaz seri numarası")
+    parser.add_argument("--streams", type=int, default=settings["streams"], help="Paralel akış sayısı")
+    parser.add_argument("--store", default=None, help="Nesne deposu klasörü (manifest için)")
+    parser.add_argument("--no-skip", action="store_true", help="Telefonda aynısı olan dosyaları da yaz")
+    parser.add_argument("--no-scan", action="store_true", help="Medya taramasını başlatma")
+    args = parser.parse_args()
+
+    from adb_manager import ADBManager
+    adb = ADBManager()
+    result = adb.restore_whatsapp(args.source, args.serial, streams=args.streams,
+                                  skip_existing=not args.no_skip, media_scan=not args.no_scan,
+                                  store_root=args.store)
+    for error in result["errors"]:
+        print(f"[UYARI] {error}")
+    if not result["success"]:
+        print(f"[HATA] Geri yükleme tamamlanamadı: {len(result['failed'])} dosya yazılamadı")
+        sys.exit(1)
+    print(f"[OK] {result['restored_count']} dosya ({result['restored_bytes'] / (1024 * 1024):.1f} MB) "
+          f"yüklendi, {result['skipped_count']} dosya telefonda zaten vardı "
+          f"({result['seconds']:.1f} s): {result['remote_base']}")
+
+
+if __name__ == "__main__":
+    main()